@@ -3,7 +3,7 @@ from urllib.parse import parse_qs
 
 from django.contrib.auth.models import AnonymousUser
 from asgiref.sync import sync_to_async
-from rest_framework_simplejwt.authentication import JWTAuthentication
+from apps.users.authentication import CachedJWTAuthentication
 
 log = logging.getLogger("ws.jwt")
 
@@ -16,7 +16,7 @@ class JWTAuthMiddleware:
     """
     def __init__(self, inner):
         self.inner = inner
-        self.jwt_auth = JWTAuthentication()
+        self.jwt_auth = CachedJWTAuthentication()
 
     async def __call__(self, scope, receive, send):
         # 1) Leer token desde querystring (?token=...)
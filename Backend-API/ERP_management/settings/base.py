@@ -4,6 +4,8 @@ from datetime import timedelta
 import os
 import logging
 
+from celery.schedules import crontab
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 BASE_APPS = [
@@ -70,6 +72,8 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'simple_history.middleware.HistoryRequestMiddleware',
     'csp.middleware.CSPMiddleware',
+    'apps.core.middleware.CrudEventBufferMiddleware',
+    'apps.core.db_routing.ReadReplicaMiddleware',
 ]
 
 ROOT_URLCONF = 'ERP_management.urls'
@@ -109,7 +113,7 @@ REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.users.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
     'DEFAULT_FILTER_BACKENDS': ['django_filters.rest_framework.DjangoFilterBackend'],
@@ -223,6 +227,25 @@ CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
 CELERY_TIMEZONE = TIME_ZONE
 CELERY_TASK_ALWAYS_EAGER = os.getenv("CELERY_TASK_ALWAYS_EAGER", "False") == "True"
+CELERY_BEAT_SCHEDULE = {
+    # Mueve a NotificationArchive las leídas con más de NOTIFICATION_RETENTION_DAYS días
+    "notifications-retention": {
+        "task": "apps.notifications.tasks.archive_read_notifications_task",
+        "schedule": crontab(hour=3, minute=30),
+    },
+    # Snapshots mensuales incrementales (CustomerStatement y LedgerSnapshot)
+    "financial-statement-snapshots": {
+        "task": "apps.financial.tasks.build_statement_snapshots_task",
+        "schedule": crontab(hour=2, minute=0),
+    },
+    "accounting-ledger-snapshots": {
+        "task": "apps.accounting.tasks.build_ledger_snapshots_task",
+        "schedule": crontab(hour=2, minute=30),
+    },
+}
+
+# Notificaciones
+NOTIFICATION_RETENTION_DAYS = int(os.getenv("NOTIFICATION_RETENTION_DAYS", "90"))
 
 # ✅ Channels base (hosts se setean en local/production)
 CHANNEL_LAYERS = {
@@ -235,5 +258,11 @@ CHANNEL_LAYERS = {
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 APPEND_SLASH = False
 
-DATABASE_ROUTERS: list[str] = []
+DATABASE_ROUTERS: list[str] = ['apps.core.db_routing.ReadReplicaRouter']
 MYSQL_RO_ENABLED: bool = False
+
+# Réplica de lectura (opt-in por vista/repositorio, ver apps/core/db_routing.py).
+# El alias tiene que existir en DATABASES; sin réplica el router no hace nada.
+READ_REPLICA_ALIAS = 'replica'
+READ_REPLICA_ENABLED = os.getenv('READ_REPLICA_ENABLED', 'False') == 'True'
+READ_REPLICA_STICKY_SECONDS = int(os.getenv('READ_REPLICA_STICKY_SECONDS', '5'))
@@ -38,6 +38,9 @@ DATABASES = {
     'default': dj_database_url.config(default=os.getenv('DATABASE_URL', 'postgres://inventory_user:inventory_pass@db:5432/inventory_db'))
 }
 
+if os.getenv('REPLICA_DATABASE_URL'):
+    DATABASES['replica'] = dj_database_url.parse(os.environ['REPLICA_DATABASE_URL'])
+
 MYSQL_RO_ENABLED = False
 
 # ── ESTÁTICOS Y MEDIA ──────────────────────────────────────────
@@ -85,6 +85,13 @@ if not DATABASE_URL:
     raise ImproperlyConfigured("La variable DATABASE_URL no está definida en producción")
 DATABASES = {'default': dj_database_url.parse(DATABASE_URL, conn_max_age=600)}
 
+# Réplica de lectura (opt-in con READ_REPLICA_ENABLED; ver apps.core.db_routing)
+REPLICA_DATABASE_URL = os.getenv('REPLICA_DATABASE_URL')
+if REPLICA_DATABASE_URL:
+    DATABASES['replica'] = dj_database_url.parse(REPLICA_DATABASE_URL, conn_max_age=600)
+elif READ_REPLICA_ENABLED:
+    raise ImproperlyConfigured("READ_REPLICA_ENABLED=True requiere REPLICA_DATABASE_URL en producción")
+
 # ── HTTPS Y SEGURIDAD ──────────────────────────────────────────
 SECURE_PROXY_SSL_HEADER        = ('HTTP_X_FORWARDED_PROTO', 'https')
 SECURE_SSL_REDIRECT            = True
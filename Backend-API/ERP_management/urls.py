@@ -13,6 +13,7 @@ api_patterns = [
     path('users/', include('apps.users.api.urls')),         # Usuarios
     path('inventory/', include('apps.products.api.urls')),  # Productos
     path('customers/', include('apps.customers.api.urls')),  # Clientes
+    path('financial/', include('apps.financial.api.urls')),  # Cuentas corrientes
     path('suppliers/', include('apps.suppliers.api.urls')),  # Proveedores
     path('purchases/', include('apps.purchases.api.urls')),  # Compras
     path('expenses/', include('apps.expenses.api.urls')),    # Gastos
@@ -33,6 +33,9 @@ class AccountingEntry(BaseModel):
         verbose_name = "Asiento contable"
         verbose_name_plural = "Asientos contables"
         ordering = ["-entry_date", "-created_at"]
+        indexes = [
+            models.Index(fields=["status", "entry_date"], name="acc_entry_status_date_idx"),
+        ]
 
     def __str__(self) -> str:
         suffix = self.reference or f"#{self.pk or 'nuevo'}"
@@ -9,6 +9,10 @@ from apps.products.models.base_model import BaseModel
 class LedgerSnapshot(BaseModel):
     period = models.CharField(max_length=10)
     account_code = models.CharField(max_length=50)
+    opening_balance = models.DecimalField(max_digits=18, decimal_places=2, default=Decimal("0.00"))
+    debit_total = models.DecimalField(max_digits=18, decimal_places=2, default=Decimal("0.00"))
+    credit_total = models.DecimalField(max_digits=18, decimal_places=2, default=Decimal("0.00"))
+    # Saldo de cierre del período (apertura + debe − haber)
     balance = models.DecimalField(max_digits=18, decimal_places=2, default=Decimal("0.00"))
     generated_on = models.DateTimeField(default=timezone.now)
 
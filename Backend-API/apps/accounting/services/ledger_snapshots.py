@@ -0,0 +1,149 @@
+# apps/accounting/services/ledger_snapshots.py
+"""
+Snapshots mensuales del mayor contable (``LedgerSnapshot``).
+
+- Una fila por (período 'YYYY-MM', cuenta) con saldo inicial, debe, haber y
+  cierre (``balance``), para cada cuenta con movimientos en el mes o saldo
+  distinto de cero. Sólo cuentan las líneas activas de asientos registrados.
+- Por mes: un GROUP BY ``account_code`` sobre las líneas del mes, los cierres
+  del período anterior y un upsert por lotes de ``SNAPSHOT_BATCH_SIZE`` cuentas.
+- Incremental: retoma desde el último período construido (se recalcula). Si
+  después de esa corrida se registró o modificó un asiento de un mes anterior,
+  arranca desde ese mes.
+"""
+import logging
+from datetime import date
+from decimal import Decimal
+from typing import Dict, Optional
+
+from django.db import transaction
+from django.db.models import Max, Min, Q, Sum
+from django.utils import timezone
+
+from apps.accounting.models import AccountingEntry, AccountingEntryLine, AccountingEntryStatus, LedgerSnapshot
+from apps.core.db_routing import for_read
+from apps.financial.services.periods import (
+    last_closed_month,
+    month_end,
+    month_label,
+    month_start,
+    months_between,
+    next_month,
+    parse_month,
+    previous_month,
+)
+
+logger = logging.getLogger(__name__)
+
+ZERO = Decimal("0")
+SNAPSHOT_BATCH_SIZE = 500
+SNAPSHOT_MAX_MONTHS = 24
+SNAPSHOT_FIELDS = ["opening_balance", "debit_total", "credit_total", "balance", "generated_on"]
+
+
+def posted_lines():
+    return AccountingEntryLine.objects.filter(status=True, entry__status=AccountingEntryStatus.POSTED)
+
+
+def _totals(lines) -> Dict[str, Decimal]:
+    return {
+        r["account_code"]: (r["debit"] or ZERO) - (r["credit"] or ZERO)
+        for r in lines.values("account_code").annotate(debit=Sum("debit"), credit=Sum("credit")).order_by()
+    }
+
+
+def _first_month() -> Optional[date]:
+    last = LedgerSnapshot.objects.filter(status=True).aggregate(period=Max("period"), at=Max("generated_on"))
+    if last["period"] is None:
+        first = posted_lines().aggregate(first=Min("entry__entry_date"))["first"]
+        return month_start(first) if first else None
+
+    first = parse_month(last["period"])
+    # Asientos cargados o modificados después de la última corrida con fecha anterior
+    late = (
+        AccountingEntry.objects.filter(status=AccountingEntryStatus.POSTED, entry_date__lt=first)
+        .filter(Q(created_at__gt=last["at"]) | Q(modified_at__gt=last["at"]))
+        .aggregate(first=Min("entry_date"))["first"]
+    )
+    return month_start(late) if late else first
+
+
+def build_ledger_month(month: date, batch_size: int = SNAPSHOT_BATCH_SIZE) -> int:
+    period, prev = month_label(month), month_label(previous_month(month))
+    openings = dict(
+        LedgerSnapshot.objects.filter(status=True, period=prev).values_list("account_code", "balance")
+    )
+    if not openings:
+        # Primer período (o hueco): saldo previo desde el historial
+        openings = _totals(posted_lines().filter(entry__entry_date__lt=month))
+    activity = {
+        r["account_code"]: r
+        for r in posted_lines()
+        .filter(entry__entry_date__gte=month, entry__entry_date__lte=month_end(month))
+        .values("account_code")
+        .annotate(debit=Sum("debit"), credit=Sum("credit"))
+        .order_by()
+    }
+
+    codes = sorted({code for code, balance in openings.items() if balance} | set(activity))
+    now = timezone.now()
+    for start in range(0, len(codes), batch_size):
+        snapshots = []
+        for code in codes[start:start + batch_size]:
+            opening = openings.get(code, ZERO)
+            row = activity.get(code)
+            debit = (row["debit"] or ZERO) if row else ZERO
+            credit = (row["credit"] or ZERO) if row else ZERO
+            snapshots.append(LedgerSnapshot(
+                period=period,
+                account_code=code,
+                opening_balance=opening,
+                debit_total=debit,
+                credit_total=credit,
+                balance=opening + debit - credit,
+                generated_on=now,
+            ))
+        with transaction.atomic():
+            LedgerSnapshot.objects.bulk_create(
+                snapshots,
+                update_conflicts=True,
+                unique_fields=["period", "account_code"],
+                update_fields=SNAPSHOT_FIELDS,
+            )
+    # Cuentas que ya no tienen saldo ni movimientos en el período
+    LedgerSnapshot.objects.filter(period=period).exclude(account_code__in=codes).delete()
+    return len(codes)
+
+
+def build_ledger_snapshots(
+    start: Optional[date] = None,
+    until: Optional[date] = None,
+    batch_size: int = SNAPSHOT_BATCH_SIZE,
+    max_months: int = SNAPSHOT_MAX_MONTHS,
+) -> Dict[str, int]:
+    """Construye los períodos pendientes; devuelve {'months': meses, 'rows': snapshots}."""
+    first = month_start(start) if start else _first_month()
+    until = month_start(until) if until else last_closed_month()
+    if first is None or first > until:
+        return {"months": 0, "rows": 0}
+
+    months = list(months_between(first, until))[:max_months]
+    rows = sum(build_ledger_month(month, batch_size) for month in months)
+    logger.info("[Accounting][snapshots] %s snapshots en %s meses (%s..%s)", rows, len(months), months[0], months[-1])
+    return {"months": len(months), "rows": rows}
+
+
+def account_balances(as_of: date) -> Dict[str, Decimal]:
+    """Saldo por cuenta al cierre de ``as_of``: último snapshot cerrado + líneas posteriores."""
+    closed = as_of if as_of == month_end(as_of) else previous_month(as_of)
+    snapshots = for_read(LedgerSnapshot.objects.filter(status=True, period__lte=month_label(closed)))
+    base = snapshots.aggregate(period=Max("period"))["period"]
+
+    balances: Dict[str, Decimal] = {}
+    tail = for_read(posted_lines()).filter(entry__entry_date__lte=as_of)
+    if base is not None:
+        balances.update(snapshots.filter(period=base).values_list("account_code", "balance"))
+        tail = tail.filter(entry__entry_date__gte=next_month(parse_month(base)))
+    for code, delta in _totals(tail).items():
+        balances[code] = balances.get(code, ZERO) + delta
+    return {code: balance for code, balance in sorted(balances.items()) if balance}
@@ -0,0 +1,9 @@
+# apps/accounting/tasks.py
+from celery import shared_task
+
+
+@shared_task
+def build_ledger_snapshots_task():
+    """Snapshots mensuales del mayor (Celery Beat): ver services.ledger_snapshots."""
+    from apps.accounting.services.ledger_snapshots import build_ledger_snapshots
+    return build_ledger_snapshots()
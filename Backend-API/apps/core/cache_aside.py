@@ -0,0 +1,227 @@
+# apps/core/cache_aside.py
+"""
+Cache-aside compartido para los listados cacheados a mano.
+
+- Single-flight: ante un miss, sólo el worker que consigue el lock
+  (``cache.add``) reconstruye la clave; el resto espera el resultado en vez
+  de repetir la misma consulta.
+- Stale-while-revalidate: cada entrada tiene un vencimiento "blando" (TTL) y
+  uno "duro" (TTL + ventana stale). Pasado el blando, un worker reconstruye y
+  los demás siguen sirviendo la copia anterior.
+- Jitter sobre el TTL para que las claves creadas juntas no venzan juntas.
+- Métricas por prefijo (hit / stale / miss / wait / rebuild y ms de rebuild),
+  acumuladas en memoria y volcadas a la cache cada ``STATS_FLUSH_SECONDS``;
+  se consultan con ``cache_aside_stats``.
+
+Las claves llevan la generación de sus tags (``generate_cache_key``): una
+invalidación cambia la clave, así que después de una escritura nunca se sirve
+una copia stale; la ráfaga que sigue espera al único rebuild. El rebuild lee
+del primario (``primary_reads``) aunque la vista use la réplica.
+"""
+import logging
+import random
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.response import Response
+
+from apps.core.db_routing import primary_reads
+from apps.core.pagination import Pagination
+
+logger = logging.getLogger(__name__)
+
+LOCK_TTL = 30  # segundos; tope de un rebuild antes de que otro worker lo reintente
+WAIT_TIMEOUT = 2.0  # cuánto espera un worker sin lock antes de construir por su cuenta
+POLL_INTERVAL = 0.02
+TTL_JITTER = 0.1  # ±10 %
+STATS_FLUSH_SECONDS = 5
+STATS_KEY_PREFIX = "cache_aside:stats"
+STATS_FIELDS = ("hit", "stale", "miss", "wait", "rebuild", "rebuild_ms")
+
+_MISSING = object()
+
+
+def list_cache_filters(request) -> Dict[str, Any]:
+    """Query params + paginación por defecto: la parte variable de la clave de un listado."""
+    params = request.query_params.copy()
+    filters = {k: params.get(k) for k in params}
+    filters.setdefault("page", params.get("page", 1))
+    filters.setdefault("page_size", params.get("page_size", Pagination.page_size))
+    return filters
+
+
+def jittered(ttl: int) -> int:
+    return max(1, round(ttl * random.uniform(1 - TTL_JITTER, 1 + TTL_JITTER)))
+
+
+class CacheAsideStats:
+    """Contadores por prefijo, agregados entre procesos vía ``cache.incr``."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = defaultdict(Counter)
+        self._last_flush = time.monotonic()
+
+    def record(self, prefix: str, **values: int) -> None:
+        with self._lock:
+            self._pending[prefix].update(values)
+            due = time.monotonic() - self._last_flush >= STATS_FLUSH_SECONDS
+        if due:
+            self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, defaultdict(Counter)
+            self._last_flush = time.monotonic()
+        if not pending:
+            return
+        try:
+            known = set(cache.get(f"{STATS_KEY_PREFIX}:prefixes") or ())
+            if not known.issuperset(pending):
+                cache.set(f"{STATS_KEY_PREFIX}:prefixes", sorted(known | set(pending)), None)
+            for prefix, counter in pending.items():
+                for field, value in counter.items():
+                    key = f"{STATS_KEY_PREFIX}:{prefix}:{field}"
+                    try:
+                        cache.incr(key, value)
+                    except ValueError:
+                        if not cache.add(key, value, None):
+                            cache.incr(key, value)
+        except Exception as e:
+            logger.debug("[Cache][aside] stats flush error: %s", e)
+
+    def snapshot(self, prefixes: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, int]]:
+        self.flush()
+        if prefixes is None:
+            prefixes = cache.get(f"{STATS_KEY_PREFIX}:prefixes") or ()
+        prefixes = list(prefixes)
+        keys = [f"{STATS_KEY_PREFIX}:{p}:{f}" for p in prefixes for f in STATS_FIELDS]
+        found = cache.get_many(keys)
+        return {
+            p: {f: int(found.get(f"{STATS_KEY_PREFIX}:{p}:{f}", 0)) for f in STATS_FIELDS}
+            for p in prefixes
+        }
+
+    def reset(self, prefixes: Optional[Iterable[str]] = None) -> None:
+        with self._lock:
+            self._pending.clear()
+        if prefixes is None:
+            prefixes = cache.get(f"{STATS_KEY_PREFIX}:prefixes") or ()
+        cache.delete_many([f"{STATS_KEY_PREFIX}:{p}:{f}" for p in prefixes for f in STATS_FIELDS])
+
+
+stats = CacheAsideStats()
+
+
+def _read(key: str):
+    try:
+        return cache.get(key)
+    except Exception as e:
+        logger.debug("[Cache][aside] get error (%s): %s", key, e)
+        return None
+
+
+def _acquire(lock_key: str) -> bool:
+    try:
+        return cache.add(lock_key, 1, LOCK_TTL)
+    except Exception as e:
+        logger.debug("[Cache][aside] lock error (%s): %s", lock_key, e)
+        return True  # sin cache no hay con quién coordinar
+
+
+def _rebuild(key: str, lock_key: str, prefix: str, build: Callable[[], Any], ttl: int, stale_ttl: int):
+    t0 = time.perf_counter()
+    try:
+        with primary_reads():
+            value = build()
+        soft = jittered(ttl)
+        try:
+            cache.set(key, {"value": value, "fresh_until": time.time() + soft}, soft + stale_ttl)
+        except Exception as e:
+            logger.debug("[Cache][aside] set error (%s): %s", key, e)
+        return value
+    finally:
+        cache.delete(lock_key)
+        stats.record(prefix, rebuild=1, rebuild_ms=round((time.perf_counter() - t0) * 1000))
+
+
+def get_or_build(
+    key: str,
+    build: Callable[[], Any],
+    ttl: int,
+    *,
+    prefix: str,
+    stale_ttl: Optional[int] = None,
+) -> Any:
+    """
+    Devuelve el valor cacheado en ``key`` o lo construye con ``build()``
+    (una sola vez entre todos los workers). ``prefix`` agrupa las métricas.
+    """
+    stale_ttl = ttl if stale_ttl is None else stale_ttl
+    lock_key = f"{key}:lock"
+
+    entry = _read(key)
+    if entry is not None:
+        if time.time() < entry["fresh_until"]:
+            stats.record(prefix, hit=1)
+            return entry["value"]
+        if not _acquire(lock_key):
+            stats.record(prefix, stale=1)  # otro worker ya revalida
+            return entry["value"]
+        return _rebuild(key, lock_key, prefix, build, ttl, stale_ttl)
+
+    stats.record(prefix, miss=1)
+    if _acquire(lock_key):
+        return _rebuild(key, lock_key, prefix, build, ttl, stale_ttl)
+
+    # Otro worker está construyendo la misma clave: esperamos su resultado
+    stats.record(prefix, wait=1)
+    deadline = time.monotonic() + WAIT_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(POLL_INTERVAL)
+        found = cache.get_many([key, lock_key])
+        if key in found:
+            return found[key]["value"]
+        if lock_key not in found:
+            # El rebuild falló o no era cacheable: tomamos la posta
+            if _acquire(lock_key):
+                return _rebuild(key, lock_key, prefix, build, ttl, stale_ttl)
+    return build()
+
+
+class _Uncacheable(Exception):
+    def __init__(self, response):
+        self.response = response
+
+
+def cached_response(
+    key: str,
+    build: Callable[[], Response],
+    ttl: int,
+    *,
+    prefix: str,
+    stale_ttl: Optional[int] = None,
+) -> Response:
+    """
+    ``get_or_build`` para vistas DRF: ``build`` devuelve una Response y sólo
+    se cachea ``response.data`` de las 200; el resto (400, etc.) se devuelve tal
+    cual. Con ``DEBUG`` no se cachea, como hacían los bloques que reemplaza.
+    """
+    if settings.DEBUG:
+        return build()
+
+    def _data():
+        response = build()
+        if response.status_code != status.HTTP_200_OK:
+            raise _Uncacheable(response)
+        return response.data
+
+    try:
+        return Response(get_or_build(key, _data, ttl, prefix=prefix, stale_ttl=stale_ttl))
+    except _Uncacheable as exc:
+        return exc.response
@@ -1,21 +1,43 @@
 import json
 import logging
+from urllib.parse import parse_qs
+
 from channels.generic.websocket import AsyncWebsocketConsumer
 
+from apps.core.crud_events import CRUD_GROUP, delivering_group, subscription_group
+
 log = logging.getLogger("ws.crud")
 
+# Máximo de grupos por conexión
+MAX_SUBSCRIPTIONS = 50
+
+
 class CrudEventConsumer(AsyncWebsocketConsumer):
+    """
+    Eventos CRUD del backend.
+
+    Suscripción (opcional) por query string: ``?groups=products,stocks.SubproductStock``.
+    Sin ``groups`` el cliente recibe todo (grupo ``crud_events``). En caliente:
+    ``{"action": "subscribe" | "unsubscribe", "groups": [...]}``.
+    Con ``?batch=1`` cada lote llega como ``{"events": [...]}``; si no, un
+    mensaje por evento. Un evento que llega por varios de los grupos suscriptos
+    se entrega una sola vez.
+    """
+
     async def connect(self):
         user = self.scope.get("user")
         if not user or getattr(user, "is_anonymous", True):
             log.info(f"[WS][crud][reject] anonymous user")
             await self.close(code=4401)
             return
-        self.group_name = "crud_events"
+        query = parse_qs(self.scope.get("query_string", b"").decode())
+        requested = [g for raw in query.get("groups", []) for g in raw.split(",") if g]
+        self.batch_mode = query.get("batch", ["0"])[0] in ("1", "true")
+        self.groups_joined = set()
         try:
-            await self.channel_layer.group_add(self.group_name, self.channel_name)
+            await self._join(self._resolve(requested) if requested else [CRUD_GROUP])
             await self.accept()
-            log.info(f"[WS][crud][accept] user={getattr(user,'id',None)} group={self.group_name}")
+            log.info(f"[WS][crud][accept] user={getattr(user,'id',None)} groups={sorted(self.groups_joined)}")
         except Exception as e:
             log.warning(f"[WS][crud][error] on connect: {e}")
             await self.close(code=1011)
@@ -24,12 +46,12 @@ class CrudEventConsumer(AsyncWebsocketConsumer):
         import time
         start = time.time()
         try:
-            had_group = hasattr(self, "group_name") and getattr(self, "group_name", None)
+            groups = getattr(self, "groups_joined", set())
             log.info(
-                f"[WS][crud][disconnect] start group_discard group={getattr(self, 'group_name', None)} channel={self.channel_name}"
+                f"[WS][crud][disconnect] start group_discard groups={sorted(groups)} channel={self.channel_name}"
             )
-            if had_group:
-                await self.channel_layer.group_discard(self.group_name, self.channel_name)
+            for group in list(groups):
+                await self.channel_layer.group_discard(group, self.channel_name)
         except Exception as e:
             log.warning(f"[WS][crud][disconnect][warn] {e}")
         finally:
@@ -37,9 +59,52 @@ class CrudEventConsumer(AsyncWebsocketConsumer):
             log.info(f"[WS][crud][disconnect] code={close_code} elapsed={elapsed:.3f}s")
 
     async def receive(self, text_data=None, bytes_data=None):
-        # Este consumer es solo para enviar eventos desde el backend
-        pass
+        try:
+            msg = json.loads(text_data or "{}")
+        except ValueError:
+            return
+        action = msg.get("action") if isinstance(msg, dict) else None
+        requested = msg.get("groups") if isinstance(msg, dict) else None
+        if action not in ("subscribe", "unsubscribe") or not isinstance(requested, list):
+            return
+        groups = self._resolve([g for g in requested if isinstance(g, str)])
+        if action == "subscribe":
+            await self._join(groups)
+        else:
+            for group in groups:
+                if group in self.groups_joined:
+                    await self.channel_layer.group_discard(group, self.channel_name)
+                    self.groups_joined.discard(group)
+        await self.send(text_data=json.dumps({"subscriptions": sorted(self.groups_joined)}))
+
+    def _resolve(self, requested):
+        groups = []
+        for sub in requested:
+            group = subscription_group(sub)
+            if group and group not in groups:
+                groups.append(group)
+        return groups
+
+    async def _join(self, groups):
+        for group in groups:
+            if group in self.groups_joined or len(self.groups_joined) >= MAX_SUBSCRIPTIONS:
+                continue
+            await self.channel_layer.group_add(group, self.channel_name)
+            self.groups_joined.add(group)
+
+    async def crud_batch(self, event):
+        events = event["events"]
+        group = event.get("group")
+        if group:
+            events = [e for e in events if delivering_group(e, self.groups_joined) == group]
+            if not events:
+                return
+        if self.batch_mode:
+            await self.send(text_data=json.dumps({"events": events}))
+            return
+        for data in events:
+            await self.send(text_data=json.dumps(data))
 
     async def crud_event(self, event):
-        # Enviar el evento al frontend
+        # Formato anterior (un evento por mensaje)
         await self.send(text_data=json.dumps(event["data"]))
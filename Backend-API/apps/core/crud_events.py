@@ -0,0 +1,191 @@
+# apps/core/crud_events.py
+"""
+Pipeline de salida de eventos CRUD por WebSocket.
+
+- Cada evento se encola con ``transaction.on_commit``: si la transacción se
+  revierte, el evento nunca sale.
+- Dentro de un scope de buffer (request HTTP vía ``CrudEventBufferMiddleware``,
+  o ``with buffered_crud_events():`` en tasks/comandos) los eventos se acumulan
+  y se coalescen por objeto: varias actualizaciones del mismo (app, model, id)
+  salen como una sola con el último payload.
+- Al cerrar el scope se envía UN mensaje por grupo con todos sus eventos, y
+  los de todos los grupos salen juntos (``asyncio.gather`` en un único
+  ``async_to_sync``): un round trip al channel layer, no uno por grupo.
+  Grupos: ``crud_events`` (todo, clientes legacy), ``crud_events.<app>`` y
+  ``crud_events.<app>.<model>``; ``CrudEventConsumer`` suscribe a cada cliente
+  sólo a lo que pidió.
+- En una request el envío queda para después de mandar la respuesta
+  (``CrudEventBufferMiddleware``): no suma latencia.
+- Cada lote lleva el grupo por el que salió: un cliente suscripto a varios
+  grupos que cubren el mismo evento (p. ej. ``products`` y
+  ``products.Product``) lo entrega una sola vez, por el más amplio
+  (``delivering_group``).
+"""
+import asyncio
+import decimal
+import logging
+import re
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import partial
+from typing import Dict, List, Optional
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+CRUD_GROUP = "crud_events"
+_SUBSCRIPTION_RE = re.compile(r"^[a-z0-9_]+(\.[a-z0-9_]+)?$")
+
+_buffer: ContextVar[Optional["CrudEventBuffer"]] = ContextVar("crud_event_buffer", default=None)
+
+
+def _decimal_to_float(obj):
+    if isinstance(obj, dict):
+        return {k: _decimal_to_float(v) for k, v in obj.items()}
+    elif isinstance(obj, list):
+        return [_decimal_to_float(v) for v in obj]
+    elif isinstance(obj, decimal.Decimal):
+        return float(obj)
+    return obj
+
+
+def crud_group(app: Optional[str] = None, model: Optional[str] = None) -> str:
+    """Nombre del grupo de Channels para una app o un app.model."""
+    parts = [CRUD_GROUP] + [p.lower() for p in (app, model) if p]
+    return ".".join(parts)
+
+
+def subscription_group(subscription: str) -> Optional[str]:
+    """'products' | 'products.Product' → grupo; None si el formato es inválido."""
+    sub = (subscription or "").strip().lower()
+    if not _SUBSCRIPTION_RE.match(sub):
+        return None
+    return crud_group(*sub.split("."))
+
+
+def event_groups(event: dict) -> tuple:
+    """Grupos que reciben el evento, del más amplio al más específico."""
+    return CRUD_GROUP, crud_group(event["app"]), crud_group(event["app"], event["model"])
+
+
+def delivering_group(event: dict, joined) -> Optional[str]:
+    """El grupo por el que un suscriptor de ``joined`` debe entregar el evento."""
+    return next((group for group in event_groups(event) if group in joined), None)
+
+
+class CrudEventBuffer:
+    """Eventos pendientes de un scope, coalescidos por (app, model, id)."""
+
+    def __init__(self):
+        self._events: Dict[tuple, dict] = {}
+        self._seq = 0
+
+    def add(self, event: dict) -> None:
+        obj_id = event["payload"].get("id") if isinstance(event["payload"], dict) else None
+        if obj_id is None:
+            self._seq += 1
+            self._events[("_", self._seq)] = event
+            return
+
+        key = (event["app"], event["model"], obj_id)
+        previous = self._events.pop(key, None)
+        if previous is not None:
+            if event["event"] == "update" and previous["event"] == "create":
+                # El cliente todavía no vio el alta: sale como create con el estado final
+                event = dict(event, event="create")
+            elif event["event"] == "delete" and previous["event"] == "create":
+                return  # alta y baja en el mismo scope: no hay nada que avisar
+        self._events[key] = event
+
+    def drain(self) -> List[dict]:
+        events = list(self._events.values())
+        self._events.clear()
+        return events
+
+
+async def _group_send_all(channel_layer, by_group: Dict[str, List[dict]]) -> list:
+    return await asyncio.gather(
+        *(
+            channel_layer.group_send(group, {"type": "crud_batch", "group": group, "events": batch})
+            for group, batch in by_group.items()
+        ),
+        return_exceptions=True,
+    )
+
+
+def send_crud_events(events: List[dict]) -> None:
+    """Un group_send por grupo destino con todos sus eventos, concurrentes."""
+    if not events:
+        return
+    channel_layer = get_channel_layer()
+    if not channel_layer:
+        logger.debug("crud_events: no channel_layer available")
+        return
+
+    by_group: Dict[str, List[dict]] = {}
+    for evt in events:
+        for group in event_groups(evt):
+            by_group.setdefault(group, []).append(evt)
+
+    try:
+        results = async_to_sync(_group_send_all)(channel_layer, by_group)
+    except Exception as e:
+        # Nunca romper la petición por un fallo de Channels
+        logger.exception("crud_events: error sending %s events: %s", len(events), e)
+        return
+    for (group, batch), result in zip(by_group.items(), results):
+        if isinstance(result, Exception):
+            logger.error("crud_events: error sending %s events to %s: %s", len(batch), group, result)
+    logger.info("[WS][crud][send] %s eventos → %s grupos", len(events), len(by_group))
+
+
+def _emit(event: dict) -> None:
+    buffer = _buffer.get()
+    if buffer is not None:
+        buffer.add(event)
+    else:
+        send_crud_events([event])
+
+
+def publish_crud_event(event_type: str, app: str, model: str, data) -> None:
+    """Encola un evento CRUD; sale tras el commit (o de inmediato fuera de una transacción)."""
+    event = {
+        "event": event_type,
+        "app": app,
+        "model": model,
+        "payload": _decimal_to_float(data),
+    }
+    transaction.on_commit(partial(_emit, event))
+
+
+def flush_crud_events() -> None:
+    buffer = _buffer.get()
+    if buffer is not None:
+        send_crud_events(buffer.drain())
+
+
+@contextmanager
+def buffered_crud_events(flush: bool = True):
+    """
+    Acumula y coalesce los eventos emitidos dentro del bloque; se envían al
+    salir. Los scopes anidados se unen al exterior (y reciben None).
+
+    Con ``flush=False`` no se envía nada al salir: quien abrió el scope recibe
+    el buffer y elige cuándo llamar a ``send_crud_events(buffer.drain())``.
+    """
+    if _buffer.get() is not None:
+        yield None
+        return
+    buffer = CrudEventBuffer()
+    token = _buffer.set(buffer)
+    try:
+        yield buffer
+    finally:
+        try:
+            if flush:
+                send_crud_events(buffer.drain())
+        finally:
+            _buffer.reset(token)
@@ -0,0 +1,194 @@
+# apps/core/db_routing.py
+"""
+Ruteo de lecturas a la réplica.
+
+- Nada va a la réplica por defecto: cada vista/repositorio lo pide
+  explícitamente (``@replica_reads``, ``with use_read_replica():`` o
+  ``for_read(qs)``). Sólo conviene para lecturas que toleran unos segundos de
+  lag: catálogo, historial de stock, ledgers, métricas.
+- Las escrituras siempre van a ``default`` (aunque el objeto se haya leído
+  de la réplica).
+- Read-your-writes: apenas hay una escritura en el contexto, las lecturas
+  siguientes vuelven al primario. ``ReadReplicaMiddleware`` además fija la
+  sesión al primario durante ``READ_REPLICA_STICKY_SECONDS`` después de un
+  POST/PUT/PATCH/DELETE o de cualquier escritura, para que el próximo GET del
+  mismo usuario vea lo que acaba de guardar.
+- Dentro de una transacción todo se lee del primario.
+- Las caches compartidas se llenan siempre desde el primario
+  (``primary_reads``): la stickiness sólo cubre a quien escribió, así que
+  otro usuario que llena la cache justo después de una invalidación dejaría
+  guardadas filas viejas de la réplica bajo la versión nueva del tag.
+
+Se activa con ``READ_REPLICA_ENABLED`` y un alias ``READ_REPLICA_ALIAS``
+definido en ``DATABASES``; si falta cualquiera de los dos, el router no hace nada.
+"""
+import hashlib
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import wraps
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+
+logger = logging.getLogger(__name__)
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+STICKY_KEY_PREFIX = "db:replica:sticky"
+
+
+@dataclass
+class ReplicaState:
+    use_replica: bool = False
+    pinned: bool = False  # hubo (o hay reciente) una escritura: leer del primario
+
+
+_state: ContextVar[Optional[ReplicaState]] = ContextVar("read_replica_state", default=None)
+
+
+def replica_alias() -> Optional[str]:
+    """Alias de la réplica si está habilitada y configurada; si no, None."""
+    alias = getattr(settings, "READ_REPLICA_ALIAS", "replica")
+    if not getattr(settings, "READ_REPLICA_ENABLED", False) or alias not in settings.DATABASES:
+        return None
+    return alias
+
+
+def read_alias() -> str:
+    """Base desde la que conviene leer ahora mismo (réplica o primario)."""
+    alias = replica_alias()
+    state = _state.get()
+    if alias is None or (state is not None and state.pinned):
+        return DEFAULT_DB_ALIAS
+    if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+        return DEFAULT_DB_ALIAS
+    return alias
+
+
+def for_read(queryset):
+    """Opt-in por repositorio: el queryset se evalúa contra la réplica si corresponde."""
+    return queryset.using(read_alias())
+
+
+def pin_primary() -> None:
+    state = _state.get()
+    if state is not None:
+        state.pinned = True
+
+
+@contextmanager
+def use_read_replica():
+    """Dentro del bloque, las lecturas ruteadas van a la réplica (tasks, comandos, vistas)."""
+    current = _state.get()
+    token = _state.set(ReplicaState(use_replica=True, pinned=bool(current and current.pinned)))
+    try:
+        yield
+    finally:
+        state = _state.get()
+        _state.reset(token)
+        if current is not None and state.pinned:
+            current.pinned = True  # una escritura adentro también fija al contexto de afuera
+
+
+@contextmanager
+def primary_reads():
+    """
+    Dentro del bloque todo se lee del primario, sin fijar la sesión: para
+    construir lo que se guarda en una cache compartida ante un miss.
+    """
+    current = _state.get()
+    state = ReplicaState()
+    token = _state.set(state)
+    try:
+        yield
+    finally:
+        _state.reset(token)
+        if current is not None and state.pinned:
+            current.pinned = True  # una escritura adentro sí fija al contexto de afuera
+
+
+def replica_reads(view_func):
+    """
+    Decorador para vistas de lectura. Va debajo de ``@api_view``: sólo aplica
+    a métodos seguros, así que un GET/PUT sobre la misma vista sigue leyendo
+    del primario en el PUT.
+    """
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        if request.method not in SAFE_METHODS:
+            return view_func(request, *args, **kwargs)
+        with use_read_replica():
+            return view_func(request, *args, **kwargs)
+    return wrapper
+
+
+class ReadReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is None or not state.use_replica:
+            return None
+        alias = read_alias()
+        return alias if alias != DEFAULT_DB_ALIAS else None
+
+    def db_for_write(self, model, **hints):
+        pin_primary()
+        # Explícito: sin esto Django escribiría en la base de la que se leyó la instancia
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Primario y réplica tienen los mismos datos
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return None
+
+
+def _sticky_key(request) -> Optional[str]:
+    """Identifica la sesión: token (JWT) o cookie de sesión."""
+    raw = request.META.get("HTTP_AUTHORIZATION") or getattr(
+        getattr(request, "session", None), "session_key", None
+    )
+    if not raw:
+        return None
+    return f"{STICKY_KEY_PREFIX}:{hashlib.sha256(raw.encode()).hexdigest()[:32]}"
+
+
+class ReadReplicaMiddleware:
+    """
+    Mantiene el estado de ruteo de la request y la stickiness por sesión:
+    después de una escritura, esa sesión lee del primario por unos segundos
+    (el lag esperable de la réplica).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if replica_alias() is None:
+            return self.get_response(request)
+
+        key = _sticky_key(request)
+        pinned = False
+        if key:
+            try:
+                pinned = bool(cache.get(key))
+            except Exception as e:
+                logger.debug("[DB][replica] sticky get error: %s", e)
+                pinned = True  # ante la duda, primario
+
+        state = ReplicaState(pinned=pinned or request.method not in SAFE_METHODS)
+        token = _state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.reset(token)
+
+        if key and state.pinned:
+            try:
+                cache.set(key, 1, getattr(settings, "READ_REPLICA_STICKY_SECONDS", 5))
+            except Exception as e:
+                logger.debug("[DB][replica] sticky set error: %s", e)
+        return response
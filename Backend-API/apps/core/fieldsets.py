@@ -0,0 +1,142 @@
+"""
+Sparse fieldsets para los serializers (``?fields=`` / ``?expand=``).
+
+- ``fields=id,code,name``: sólo esos campos. Con puntos se eligen campos de
+  una relación anidada (``fields=id,subproducts.id,subproducts.current_stock``).
+- ``expand=subproducts,product_images``: relaciones anidadas a incluir. Si se
+  pide ``fields`` o ``expand``, las relaciones anidadas que no figuren en
+  ninguno de los dos no se serializan (ni se prefetchean, ver apps.core.prefetch).
+- Sin parámetros la representación es la completa de siempre.
+"""
+from dataclasses import dataclass
+from typing import FrozenSet, Optional, Tuple
+
+from rest_framework import serializers
+from rest_framework.relations import ManyRelatedField
+
+FIELDS_PARAM = "fields"
+EXPAND_PARAM = "expand"
+MAX_FIELDSET_ITEMS = 100
+
+
+@dataclass(frozen=True)
+class Fieldset:
+    only: Optional[FrozenSet[str]]        # None = todos los campos simples
+    expand: FrozenSet[str]                # relaciones anidadas pedidas
+    children: Tuple[Tuple[str, "Fieldset"], ...] = ()
+
+    @classmethod
+    def parse(cls, fields: str = "", expand: str = "") -> Optional["Fieldset"]:
+        field_paths = _split(fields)
+        expand_paths = _split(expand)
+        if not field_paths and not expand_paths:
+            return None
+        return cls._build(field_paths, expand_paths, restrict=bool(field_paths))
+
+    @classmethod
+    def _build(cls, field_paths, expand_paths, restrict):
+        heads = {p[0] for p in field_paths}
+        nested = {}
+        for path in (*field_paths, *expand_paths):
+            if len(path) > 1:
+                nested.setdefault(path[0], ([], []))
+        for name, (sub_fields, sub_expand) in nested.items():
+            sub_fields.extend(p[1:] for p in field_paths if len(p) > 1 and p[0] == name)
+            sub_expand.extend(p[1:] for p in expand_paths if len(p) > 1 and p[0] == name)
+        children = tuple(sorted(
+            (name, cls._build(f, e, restrict=bool(f)))
+            for name, (f, e) in nested.items()
+        ))
+        return cls(
+            only=frozenset(heads) if restrict else None,
+            expand=frozenset(p[0] for p in expand_paths) | frozenset(nested),
+            children=children,
+        )
+
+    def wants(self, name: str, nested: bool = False) -> bool:
+        if self.only is not None and name in self.only:
+            return True
+        if nested:
+            return name in self.expand
+        return self.only is None
+
+    def child(self, name: str) -> Optional["Fieldset"]:
+        """Selección para la relación ``name``; None = representación completa."""
+        return dict(self.children).get(name)
+
+    @property
+    def cache_token(self) -> str:
+        """Representación estable, para claves de cache."""
+        parts = [f"f={','.join(sorted(self.only))}" if self.only is not None else "",
+                 f"e={','.join(sorted(self.expand))}" if self.expand else ""]
+        parts += [f"{name}({child.cache_token})" for name, child in self.children]
+        return ";".join(p for p in parts if p)
+
+
+def _split(raw: str):
+    items = [p.strip() for p in (raw or "").split(",") if p.strip()][:MAX_FIELDSET_ITEMS]
+    return [tuple(s for s in p.replace("__", ".").split(".") if s) for p in items]
+
+
+def fieldset_from_request(request) -> Optional[Fieldset]:
+    if request is None:
+        return None
+    params = getattr(request, "query_params", None) or getattr(request, "GET", {})
+    return Fieldset.parse(params.get(FIELDS_PARAM, ""), params.get(EXPAND_PARAM, ""))
+
+
+def is_nested_field(field) -> bool:
+    return isinstance(field, (serializers.BaseSerializer, ManyRelatedField))
+
+
+class SparseFieldsetMixin:
+    """
+    Poda los campos del serializer según el Fieldset de la request raíz (o el
+    pasado con ``fieldset=``). Sólo aplica al leer: con ``data=`` el serializer
+    valida con todos sus campos.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._fieldset = kwargs.pop("fieldset", None)
+        super().__init__(*args, **kwargs)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        fieldset = self.fieldset
+        if fieldset is None:
+            return fields
+        return {
+            name: f for name, f in fields.items()
+            if f.write_only or fieldset.wants(name, nested=is_nested_field(f))
+        }
+
+    @property
+    def fieldset(self) -> Optional[Fieldset]:
+        if "_resolved_fieldset" not in self.__dict__:
+            self.__dict__["_resolved_fieldset"] = self._resolve_fieldset()
+        return self.__dict__["_resolved_fieldset"]
+
+    def _resolve_fieldset(self):
+        path, node = [], self
+        while node.parent is not None:
+            if node.field_name:
+                path.append(node.field_name)
+            node = node.parent
+        root = node
+        if hasattr(root, "initial_data"):
+            return None
+        fieldset = getattr(root, "_fieldset", None)
+        if fieldset is None and isinstance(root, serializers.ListSerializer):
+            fieldset = getattr(root.child, "_fieldset", None)
+        if fieldset is None:
+            fieldset = fieldset_from_request(root.context.get("request"))
+        for name in reversed(path):
+            if fieldset is None:
+                break
+            fieldset = fieldset.child(name)
+        return fieldset
+
+    def wants_field(self, name: str) -> bool:
+        """Para campos que se agregan fuera de ``fields`` (p. ej. en to_representation)."""
+        fieldset = self.fieldset
+        return fieldset is None or fieldset.wants(name)
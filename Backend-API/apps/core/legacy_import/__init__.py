@@ -0,0 +1,26 @@
+from .pipeline import (
+    CHUNK_SIZE,
+    Checkpoint,
+    Column,
+    ForeignKey,
+    IdMaps,
+    TableResult,
+    TableSpec,
+    import_mode,
+    load_table,
+)
+from .readers import find_source, read_rows
+
+__all__ = [
+    "CHUNK_SIZE",
+    "Checkpoint",
+    "Column",
+    "ForeignKey",
+    "IdMaps",
+    "TableResult",
+    "TableSpec",
+    "find_source",
+    "import_mode",
+    "load_table",
+    "read_rows",
+]
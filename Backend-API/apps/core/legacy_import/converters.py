@@ -0,0 +1,76 @@
+# apps/core/legacy_import/converters.py
+"""
+Conversión de valores legacy. Los CSV traen todo como texto (vacío = NULL) y
+los DBF ya tipado; cada conversor acepta ambos.
+"""
+from datetime import date, datetime, time
+from decimal import Decimal, InvalidOperation
+from typing import Optional
+
+DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y", "%Y%m%d", "%m/%d/%Y")
+
+
+def _blank(value) -> bool:
+    return value is None or (isinstance(value, str) and not value.strip())
+
+
+def to_str(value, max_length: Optional[int] = None) -> str:
+    if _blank(value):
+        return ""
+    text = str(value).strip()
+    return text[:max_length] if max_length else text
+
+
+def to_int(value) -> Optional[int]:
+    if _blank(value):
+        return None
+    try:
+        return int(Decimal(str(value).strip()))
+    except (InvalidOperation, ValueError):
+        return None
+
+
+def to_decimal(value, places: int = 3) -> Optional[Decimal]:
+    if _blank(value):
+        return None
+    try:
+        return round(Decimal(str(value).strip().replace(",", ".")), places)
+    except (InvalidOperation, ValueError):
+        return None
+
+
+def to_date(value) -> Optional[date]:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if _blank(value):
+        return None
+    text = str(value).strip()[:10]
+    try:
+        return date.fromisoformat(text)  # formato de los dumps de MySQL, sin strptime
+    except ValueError:
+        pass
+    for fmt in DATE_FORMATS[1:]:
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def to_time(value) -> Optional[time]:
+    if isinstance(value, time):
+        return value
+    if _blank(value):
+        return None
+    try:
+        return time.fromisoformat(str(value).strip())
+    except ValueError:
+        return None
+
+
+def to_bool(value) -> bool:
+    if isinstance(value, bool):
+        return value
+    return to_str(value).lower() in {"1", "t", "true", "s", "si", "y", "yes"}
@@ -0,0 +1,306 @@
+# apps/core/legacy_import/pipeline.py
+"""
+Carga masiva de tablas legacy con upsert por clave legacy.
+
+- Cada tabla se describe con un ``TableSpec``: modelo destino, clave única
+  (``legacy_id``, ``code``...), columnas y FKs a resolver.
+- Las filas se leen en streaming y se escriben por lotes con
+  ``bulk_create(update_conflicts=True)``: sin ``save()`` por fila, sin señales
+  y reimportar la misma exportación no duplica.
+- Las FKs se resuelven contra ``IdMaps``: un dict clave legacy → pk por modelo,
+  cargado con una query y completado con lo que se va importando.
+- ``import_mode`` silencia las señales de modelo y junta las invalidaciones de
+  cache (se aplican una vez al final); los derivados se recalculan con los
+  hooks ``after_chunk`` / ``after_load`` de cada tabla.
+- Cada lote es una transacción; al confirmarse se graba el checkpoint (filas
+  consumidas por tabla), así que una corrida cortada retoma desde ahí.
+- Si el lote choca con otra restricción única (no la clave), se reintenta fila
+  por fila y sólo las que fallan quedan como rechazadas.
+"""
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from django.db import IntegrityError, transaction
+from django.db.models import signals
+
+from apps.core.legacy_import.readers import chunked
+from apps.products.utils.cache_tags import deferred_invalidation
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 2000
+MAX_REJECTED_SAMPLES = 20
+MUTED_SIGNALS = (signals.pre_save, signals.post_save, signals.pre_delete, signals.post_delete, signals.m2m_changed)
+
+
+@dataclass(frozen=True)
+class Column:
+    field: str
+    source: str
+    convert: Callable = lambda value: value
+    default: object = None  # si la conversión da None
+    required: bool = False  # sin valor ni default, la fila se rechaza
+
+
+@dataclass(frozen=True)
+class ForeignKey:
+    field: str
+    source: str
+    model: type
+    lookup: str = "legacy_id"
+    required: bool = False
+
+
+@dataclass(frozen=True)
+class TableSpec:
+    name: str
+    model: type
+    key: Tuple[str, ...]
+    columns: Tuple[Column, ...]
+    foreign_keys: Tuple[ForeignKey, ...] = ()
+    prepare: Optional[Callable[[object, dict], None]] = None  # ajustes por fila
+    before_write: Optional[Callable[[List], None]] = None  # dentro de la transacción, antes del upsert
+    after_chunk: Optional[Callable[[List], None]] = None  # dentro de la transacción del lote
+    after_load: Tuple[Callable[[], object], ...] = ()
+    derived_fields: Tuple[str, ...] = ()  # los que completa ``prepare``
+
+    @property
+    def key_attnames(self) -> Tuple[str, ...]:
+        return tuple(self.model._meta.get_field(f).attname for f in self.key)
+
+    @property
+    def update_fields(self) -> List[str]:
+        fields = [c.field for c in self.columns] + [fk.field for fk in self.foreign_keys] + list(self.derived_fields)
+        return [f for f in dict.fromkeys(fields) if f not in self.key]
+
+
+@dataclass
+class TableResult:
+    table: str
+    rows: int = 0
+    written: int = 0
+    rejected: int = 0
+    seconds: float = 0.0
+    resumed_from: int = 0
+    samples: List[str] = field(default_factory=list)
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+class IdMaps:
+    """Mapas en memoria clave legacy → pk, uno por (modelo, campo)."""
+
+    def __init__(self):
+        self._maps: Dict[tuple, Dict[object, int]] = {}
+
+    @staticmethod
+    def _normalize(model, lookup, value):
+        return model._meta.get_field(lookup).to_python(value)
+
+    def _map(self, model, lookup) -> Dict[object, int]:
+        key = (model, lookup)
+        if key not in self._maps:
+            self._maps[key] = dict(
+                model._base_manager.exclude(**{f"{lookup}__isnull": True}).values_list(lookup, "pk").iterator()
+            )
+        return self._maps[key]
+
+    def resolve(self, model, lookup, value) -> Optional[int]:
+        if value is None or value == "":
+            return None
+        try:
+            return self._map(model, lookup).get(self._normalize(model, lookup, value))
+        except Exception:
+            return None
+
+    def update(self, model, lookup, objects) -> None:
+        """Suma los recién importados si el mapa ya está cargado."""
+        mapping = self._maps.get((model, lookup))
+        if mapping is not None:
+            mapping.update((getattr(obj, lookup), obj.pk) for obj in objects if obj.pk is not None)
+
+
+class Checkpoint:
+    """Filas ya importadas por tabla, en un JSON que se reescribe de forma atómica."""
+
+    def __init__(self, path: Path, restart: bool = False):
+        self.path = Path(path)
+        self.state = {} if restart or not self.path.exists() else json.loads(self.path.read_text())
+
+    def offset(self, table: str, source: Path) -> int:
+        entry = self.state.get(table) or {}
+        return entry.get("offset", 0) if entry.get("source") == source.name else 0
+
+    def save(self, table: str, source: Path, offset: int) -> None:
+        self.state[table] = {"source": source.name, "offset": offset}
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.state, indent=2))
+        os.replace(tmp, self.path)
+
+
+@contextmanager
+def import_mode():
+    """
+    Sin señales de modelo y con la invalidación de cache diferida. Afecta a
+    todo el proceso: es para el comando de importación, no para el servidor.
+    """
+    saved = [(signal, signal.receivers) for signal in MUTED_SIGNALS]
+    for signal, _ in saved:
+        signal.receivers = []
+        signal.sender_receivers_cache.clear()
+    try:
+        with deferred_invalidation():
+            yield
+    finally:
+        for signal, receivers in saved:
+            signal.receivers = receivers
+            signal.sender_receivers_cache.clear()
+
+
+def _build(spec: TableSpec, row: dict, id_maps: IdMaps, user):
+    values = {}
+    for column in spec.columns:
+        value = column.convert(row.get(column.source))
+        if value is None:
+            value = column.default
+            if value is None and column.required:
+                raise ValueError(f"{column.source} vacío o inválido")
+        values[column.field] = value
+    for fk in spec.foreign_keys:
+        pk = id_maps.resolve(fk.model, fk.lookup, row.get(fk.source))
+        if pk is None and fk.required:
+            raise ValueError(f"{fk.source}={row.get(fk.source)!r} sin {fk.model.__name__}")
+        values[f"{fk.field}_id"] = pk
+    obj = spec.model(**values)
+    if user is not None:
+        obj.created_by = user
+    if spec.prepare:
+        spec.prepare(obj, row)
+    if any(getattr(obj, f) in (None, "") for f in spec.key_attnames):
+        raise ValueError(f"fila sin clave {'/'.join(spec.key)}")
+    return obj
+
+
+def _fill_pks(spec: TableSpec, objects: List) -> None:
+    """Completa los pk de las filas actualizadas (no todos los motores los devuelven)."""
+    missing = [obj for obj in objects if obj.pk is None]
+    if not missing or len(spec.key) != 1:
+        return
+    key = spec.key[0]
+    found = dict(
+        spec.model._base_manager.filter(**{f"{key}__in": [getattr(o, key) for o in missing]}).values_list(key, "pk")
+    )
+    for obj in missing:
+        obj.pk = found.get(getattr(obj, key))
+
+
+def _upsert(spec: TableSpec, objects: List, chunk_size: int) -> None:
+    spec.model.objects.bulk_create(
+        objects,
+        batch_size=chunk_size,
+        update_conflicts=True,
+        unique_fields=list(spec.key),
+        update_fields=spec.update_fields,
+    )
+    _fill_pks(spec, objects)
+
+
+def _write(spec: TableSpec, pending: List[Tuple[int, object]], chunk_size: int):
+    """
+    Escribe el lote en una transacción. Ante un IntegrityError (otra
+    restricción única, p.ej. ``Category.name``) lo reintenta fila por fila con
+    un savepoint cada una. Devuelve (escritos, [(nro de fila, error)]).
+    """
+    objects = [obj for _, obj in pending]
+    if not objects:
+        return [], []
+    try:
+        with transaction.atomic():
+            if spec.before_write:
+                spec.before_write(objects)
+            _upsert(spec, objects, chunk_size)
+            if spec.after_chunk:
+                spec.after_chunk(objects)
+        return objects, []
+    except IntegrityError as e:
+        logger.info("[LegacyImport] %s: lote con conflicto (%s), fila por fila", spec.name, e)
+
+    written, failed = [], []
+    with transaction.atomic():
+        if spec.before_write:
+            spec.before_write(objects)
+        for n, obj in pending:
+            obj.pk = None
+            try:
+                with transaction.atomic():
+                    _upsert(spec, [obj], chunk_size)
+            except IntegrityError as e:
+                failed.append((n, e))
+                continue
+            written.append(obj)
+        if written and spec.after_chunk:
+            spec.after_chunk(written)
+    return written, failed
+
+
+def load_table(
+    spec: TableSpec,
+    rows: Iterable[dict],
+    source: Path,
+    *,
+    id_maps: IdMaps,
+    checkpoint: Checkpoint,
+    chunk_size: int = CHUNK_SIZE,
+    user=None,
+    progress: Optional[Callable[[TableResult], None]] = None,
+) -> TableResult:
+    offset = checkpoint.offset(spec.name, source)
+    result = TableResult(spec.name, resumed_from=offset)
+    started = time.monotonic()
+    for chunk in chunked(rows, chunk_size, skip=offset):
+        by_key = {}
+        for n, row in enumerate(chunk, start=offset + 1):
+            try:
+                obj = _build(spec, row, id_maps, user)
+            except ValueError as e:
+                result.rejected += 1
+                if len(result.samples) < MAX_REJECTED_SAMPLES:
+                    result.samples.append(f"fila {n}: {e}")
+                continue
+            # Clave repetida dentro del lote: gana la última (ON CONFLICT no toca dos veces la misma fila)
+            key = tuple(getattr(obj, f) for f in spec.key_attnames)
+            by_key.pop(key, None)
+            by_key[key] = (n, obj)
+
+        objects, failed = _write(spec, list(by_key.values()), chunk_size)
+        for n, error in failed:
+            result.rejected += 1
+            if len(result.samples) < MAX_REJECTED_SAMPLES:
+                result.samples.append(f"fila {n}: {error}")
+        for lookup in spec.key:
+            id_maps.update(spec.model, lookup, objects)
+
+        offset += len(chunk)
+        checkpoint.save(spec.name, source, offset)
+        result.rows += len(chunk)
+        result.written += len(objects)
+        result.seconds = time.monotonic() - started
+        if progress:
+            progress(result)
+
+    for hook in spec.after_load:
+        hook()
+    result.seconds = time.monotonic() - started
+    logger.info(
+        "[LegacyImport] %s: %s filas (%s rechazadas) en %.1fs, %.0f filas/s",
+        spec.name, result.rows, result.rejected, result.seconds, result.rows_per_second,
+    )
+    return result
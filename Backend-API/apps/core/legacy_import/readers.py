@@ -0,0 +1,47 @@
+# apps/core/legacy_import/readers.py
+"""Lectura en streaming de exportaciones legacy (CSV de MySQL o DBF de VFP9)."""
+import csv
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional
+
+SUPPORTED_SUFFIXES = (".csv", ".dbf")
+
+
+def read_csv(path: Path, encoding: str = "utf-8", delimiter: str = ",") -> Iterator[dict]:
+    with open(path, newline="", encoding=encoding) as fh:
+        for row in csv.DictReader(fh, delimiter=delimiter):
+            yield {(k or "").strip().lower(): v for k, v in row.items()}
+
+
+def read_dbf(path: Path, encoding: Optional[str] = None) -> Iterator[dict]:
+    try:
+        from dbfread import DBF
+    except ImportError:
+        raise RuntimeError("Para leer .dbf hace falta instalar dbfread") from None
+    # load=False: recorre el archivo registro a registro, sin cargarlo entero
+    yield from DBF(str(path), encoding=encoding, lowernames=True, load=False)
+
+
+def find_source(directory: Path, table: str) -> Optional[Path]:
+    """``<tabla>.csv`` o ``<tabla>.dbf`` dentro de ``directory`` (sin distinguir mayúsculas)."""
+    for candidate in sorted(directory.iterdir()):
+        if candidate.stem.lower() == table and candidate.suffix.lower() in SUPPORTED_SUFFIXES:
+            return candidate
+    return None
+
+
+def read_rows(path: Path, encoding: str = "utf-8", delimiter: str = ",") -> Iterator[dict]:
+    if path.suffix.lower() == ".dbf":
+        return read_dbf(path, encoding=encoding)
+    return read_csv(path, encoding=encoding, delimiter=delimiter)
+
+
+def chunked(rows: Iterable[dict], size: int, skip: int = 0) -> Iterator[List[dict]]:
+    """Lotes de ``size`` filas, salteando las ``skip`` primeras (ya importadas)."""
+    iterator = islice(iter(rows), skip, None)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
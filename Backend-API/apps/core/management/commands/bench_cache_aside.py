@@ -0,0 +1,102 @@
+import statistics
+import threading
+import time
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+
+from apps.core.cache_aside import get_or_build, stats
+from apps.products.utils.cache_keys import generate_cache_key
+from apps.products.utils.cache_tags import invalidate_tags
+
+BENCH_PREFIX = "bench_cache_aside"
+BENCH_TTL = 300
+
+
+def legacy_get_or_build(key, build, ttl, **kwargs):
+    """Bloque anterior de las vistas: get, y ante un miss cada request reconstruye."""
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+    value = build()
+    cache.set(key, value, ttl)
+    return value
+
+
+def run_burst(fetch, build, concurrency):
+    """Invalida el prefijo y larga ``concurrency`` requests idénticas a la vez."""
+    invalidate_tags(BENCH_PREFIX)
+    key = generate_cache_key(BENCH_PREFIX, page=1, page_size=20)
+    barrier = threading.Barrier(concurrency)
+    latencies, errors = [], []
+
+    def worker():
+        try:
+            barrier.wait()
+            t0 = time.perf_counter()
+            fetch(key, build, BENCH_TTL, prefix=BENCH_PREFIX)
+            latencies.append((time.perf_counter() - t0) * 1000)
+        except Exception as e:  # pragma: no cover - sólo reporte
+            errors.append(e)
+        finally:
+            connections.close_all()
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    if errors:
+        raise errors[0]
+    return latencies
+
+
+class BuildCounter:
+    """Builder de prueba: una consulta real + latencia simulada de un listado pesado."""
+
+    def __init__(self, build_ms):
+        self.build_ms = build_ms
+        self.builds = 0
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            self.builds += 1
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        time.sleep(self.build_ms / 1000)
+        return {"count": 0, "results": []}
+
+
+class Command(BaseCommand):
+    help = (
+        "Load test de una ráfaga de requests idénticas justo después de invalidar: "
+        "el bloque get/set anterior contra get_or_build (single-flight). Reporta "
+        "cuántas veces se reconstruyó la página y la latencia de la ráfaga."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=32, help='Requests simultáneas por ráfaga')
+        parser.add_argument('--bursts', type=int, default=5, help='Ráfagas por variante')
+        parser.add_argument('--build-ms', type=float, default=50, help='Costo simulado del rebuild')
+
+    def handle(self, *args, **options):
+        concurrency, bursts = options['concurrency'], options['bursts']
+        if concurrency < 1 or bursts < 1:
+            raise CommandError("--concurrency y --bursts deben ser positivos")
+
+        self.stdout.write(
+            f"{'variante':<12} {'rebuilds/ráfaga':>16} {'p50 ms':>8} {'max ms':>8}"
+        )
+        for label, fetch in (("anterior", legacy_get_or_build), ("cache-aside", get_or_build)):
+            counter = BuildCounter(options['build_ms'])
+            latencies = []
+            for _ in range(bursts):
+                latencies += run_burst(fetch, counter, concurrency)
+            self.stdout.write(
+                f"{label:<12} {counter.builds / bursts:>16,.1f} "
+                f"{statistics.median(latencies):>8,.1f} {max(latencies):>8,.1f}"
+            )
+        self.stdout.write(f"métricas: {stats.snapshot([BENCH_PREFIX])[BENCH_PREFIX]}")
+        stats.reset([BENCH_PREFIX])
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from apps.core.cache_aside import stats
+
+
+class Command(BaseCommand):
+    help = "Muestra las métricas de cache-aside por prefijo (hits, stale, misses, esperas y rebuilds)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('prefixes', nargs='*', help='Prefijos a mostrar (por defecto, todos los vistos)')
+        parser.add_argument('--reset', action='store_true', help='Pone los contadores en cero después de mostrarlos')
+
+    def handle(self, *args, **options):
+        snapshot = stats.snapshot(options['prefixes'] or None)
+        if not snapshot:
+            self.stdout.write("Sin métricas registradas.")
+            return
+        self.stdout.write(
+            f"{'prefijo':<32} {'hit':>8} {'stale':>7} {'miss':>7} {'wait':>7} "
+            f"{'rebuild':>8} {'ms/rebuild':>11} {'hit %':>6}"
+        )
+        for prefix, row in sorted(snapshot.items()):
+            served = row['hit'] + row['stale'] + row['miss']
+            hit_pct = (row['hit'] + row['stale']) * 100 / served if served else 0
+            ms = row['rebuild_ms'] / row['rebuild'] if row['rebuild'] else 0
+            self.stdout.write(
+                f"{prefix:<32} {row['hit']:>8,} {row['stale']:>7,} {row['miss']:>7,} {row['wait']:>7,} "
+                f"{row['rebuild']:>8,} {ms:>11,.1f} {hit_pct:>5.1f}%"
+            )
+        if options['reset']:
+            stats.reset(snapshot)
@@ -0,0 +1,29 @@
+# apps/core/middleware.py
+from functools import partial
+
+from apps.core.crud_events import buffered_crud_events, send_crud_events
+
+
+class CrudEventBufferMiddleware:
+    """
+    Agrupa los eventos CRUD emitidos durante la request: se coalescen por
+    objeto y salen en un único mensaje por grupo cuando el servidor cierra la
+    respuesta (``HttpResponse.close``, después de enviar el cuerpo), así el
+    channel layer no suma latencia a la request.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with buffered_crud_events(flush=False) as buffer:
+            try:
+                response = self.get_response(request)
+            except Exception:
+                if buffer is not None:
+                    send_crud_events(buffer.drain())
+                raise
+        events = buffer.drain() if buffer is not None else []
+        if events:
+            response._resource_closers.append(partial(send_crud_events, events))
+        return response
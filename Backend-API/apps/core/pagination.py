@@ -1,4 +1,15 @@
+import base64
+import binascii
+import json
+from collections import OrderedDict
+
+from django.db import connection
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 class Pagination(PageNumberPagination):
     """
@@ -7,3 +18,139 @@ class Pagination(PageNumberPagination):
     page_size = 10  # Número de productos por página
     page_size_query_param = 'page_size'  # Permitir cambiar el tamaño de la página mediante un parámetro
     max_page_size = 100  # Tamaño máximo de página permitido
+
+
+class KeysetPagination(Pagination):
+    """
+    Paginación por cursor (keyset) sobre (created_at, id) descendente, opcional.
+
+    Se activa con ``?cursor=`` (vacío = primera página) o ``?pagination=cursor``;
+    si la request trae ``page`` o no pide cursor se comporta exactamente como
+    ``Pagination`` (mismo shape de respuesta).
+
+    En modo cursor no hay OFFSET: cada página es ``WHERE (created_at, id) < cursor
+    ORDER BY created_at DESC, id DESC LIMIT n+1``. El total se controla con
+    ``?count=none|approx|exact`` (por defecto ``none``: no se ejecuta COUNT).
+    Respuesta: ``{next, previous, results}`` más ``count`` si se pidió
+    (``count_is_estimate`` indica si es aproximado).
+    """
+    cursor_query_param = 'cursor'
+    mode_query_param = 'pagination'
+    count_query_param = 'count'
+    ordering_fields = ('created_at', 'id')
+    invalid_cursor_message = 'Cursor inválido.'
+
+    def is_cursor_mode(self, request):
+        if self.page_query_param in request.query_params:
+            return False
+        return (
+            self.cursor_query_param in request.query_params
+            or request.query_params.get(self.mode_query_param) == 'cursor'
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_mode = self.is_cursor_mode(request)
+        if not self.cursor_mode:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        self.page_size_value = self.get_page_size(request) or self.page_size
+        position, reverse = self.decode_cursor(request)
+        field, tiebreak = self.ordering_fields
+
+        self.total = self.get_total(queryset, request)
+        if reverse:
+            qs = queryset.order_by(field, tiebreak)
+            if position:
+                qs = qs.filter(Q(**{f'{field}__gt': position[0]}) | Q(**{field: position[0], f'{tiebreak}__gt': position[1]}))
+        else:
+            qs = queryset.order_by(f'-{field}', f'-{tiebreak}')
+            if position:
+                qs = qs.filter(Q(**{f'{field}__lt': position[0]}) | Q(**{field: position[0], f'{tiebreak}__lt': position[1]}))
+
+        rows = list(qs[:self.page_size_value + 1])
+        has_more = len(rows) > self.page_size_value
+        rows = rows[:self.page_size_value]
+        if reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = bool(position), has_more
+        else:
+            self.has_next, self.has_previous = has_more, bool(position)
+        self.page_rows = rows
+        return rows
+
+    # ── Cursor ───────────────────────────────────────────────────────────────
+
+    def encode_cursor(self, obj, reverse=False):
+        field, tiebreak = self.ordering_fields
+        raw = json.dumps({'v': getattr(obj, field).isoformat(), 'i': getattr(obj, tiebreak), 'r': int(reverse)})
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, request):
+        """(posición | None, reverse)."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            data = json.loads(base64.urlsafe_b64decode(encoded + '=' * (-len(encoded) % 4)))
+            value = parse_datetime(data['v'])
+            if value is None:
+                raise ValueError
+            return (value, int(data['i'])), bool(data.get('r'))
+        except (TypeError, ValueError, KeyError, binascii.Error, UnicodeDecodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def _link(self, cursor):
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.mode_query_param)
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_next_link(self):
+        if not self.cursor_mode:
+            return super().get_next_link()
+        if not self.has_next or not self.page_rows:
+            return None
+        return self._link(self.encode_cursor(self.page_rows[-1]))
+
+    def get_previous_link(self):
+        if not self.cursor_mode:
+            return super().get_previous_link()
+        if not self.has_previous or not self.page_rows:
+            return None
+        return self._link(self.encode_cursor(self.page_rows[0], reverse=True))
+
+    # ── Total ────────────────────────────────────────────────────────────────
+
+    def get_total(self, queryset, request):
+        """(count, es_estimado) o None si no se pidió."""
+        mode = request.query_params.get(self.count_query_param, 'none')
+        if mode == 'exact':
+            return queryset.count(), False
+        if mode == 'approx':
+            estimate = self.estimate_count(queryset)
+            return (queryset.count(), False) if estimate is None else (estimate, True)
+        return None
+
+    @staticmethod
+    def estimate_count(queryset):
+        """Estimación del planner de PostgreSQL (sin recorrer filas); None en otros motores."""
+        if connection.vendor != 'postgresql':
+            return None
+        sql, params = queryset.order_by().values('pk').query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
+
+    def get_paginated_response(self, data):
+        if not self.cursor_mode:
+            return super().get_paginated_response(data)
+        payload = OrderedDict()
+        if self.total is not None:
+            payload['count'], payload['count_is_estimate'] = self.total
+        payload['next'] = self.get_next_link()
+        payload['previous'] = self.get_previous_link()
+        payload['results'] = data
+        return Response(payload)
@@ -0,0 +1,158 @@
+"""
+Planificador de prefetch a partir del árbol de campos de un serializer.
+
+``plan_queryset(ProductSerializer, qs)`` recorre los campos (no write-only) del
+serializer y aplica al queryset:
+
+- ``select_related`` para cada FK/OneToOne que se lee vía ``source`` con
+  puntos (``category.name``) o por un serializer anidado simple;
+- ``Prefetch`` para cada serializer anidado ``many=True`` sobre una relación
+  inversa o M2M, con su propio plan (recursivo);
+- los hints que declare cada serializer:
+
+    * ``prefetch_select_related``: rutas extra que se leen en
+      ``to_representation`` (p. ej. los usuarios de auditoría);
+    * ``prepare_queryset(queryset)`` (classmethod): anotaciones que reemplazan
+      consultas por fila de ``SerializerMethodField``.
+
+Así la cantidad de queries de una respuesta queda fija (1 + una por relación
+anidada) sin importar el tamaño de la página. Con un sparse fieldset
+(apps.core.fieldsets) sólo se planifican las relaciones pedidas.
+"""
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, Optional, Set
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+from rest_framework.relations import ManyRelatedField
+
+
+@dataclass
+class QueryPlan:
+    serializer_class: type
+    select: Set[str] = field(default_factory=set)
+    prefetch: Dict[str, Optional["QueryPlan"]] = field(default_factory=dict)
+
+    def apply(self, queryset):
+        if self.select:
+            queryset = queryset.select_related(*sorted(self.select))
+        lookups = []
+        for lookup, child in sorted(self.prefetch.items()):
+            if child is None:
+                lookups.append(lookup)
+                continue
+            related = _related_model(queryset.model, lookup.split("__"))
+            lookups.append(Prefetch(lookup, queryset=child.apply(related._default_manager.all())))
+        if lookups:
+            queryset = queryset.prefetch_related(*lookups)
+        prepare = getattr(self.serializer_class, "prepare_queryset", None)
+        if prepare is not None:
+            queryset = prepare(queryset)
+        return queryset
+
+
+def prune_prefetches(queryset, fieldset):
+    """
+    Quita de un queryset armado por un repositorio los prefetch de relaciones
+    que el fieldset no pide (el nombre del lookup debe coincidir con el campo).
+    """
+    if fieldset is None:
+        return queryset
+    keep = [
+        lookup for lookup in queryset._prefetch_related_lookups
+        if fieldset.wants(getattr(lookup, "prefetch_to", lookup).split("__")[0], nested=True)
+    ]
+    return queryset.prefetch_related(None).prefetch_related(*keep)
+
+
+def plan_queryset(serializer_class, queryset, fieldset=None):
+    """
+    Devuelve ``queryset`` con el select_related/prefetch que necesita el
+    serializer; con ``fieldset`` (apps.core.fieldsets) sólo para lo pedido.
+    """
+    return build_plan(serializer_class, queryset.model, fieldset).apply(queryset)
+
+
+@lru_cache(maxsize=256)
+def build_plan(serializer_class, model, fieldset=None) -> QueryPlan:
+    """Plan (cacheado por serializer, modelo y fieldset) para serializar ``model``."""
+    plan = QueryPlan(serializer_class)
+    serializer = serializer_class(fieldset=fieldset) if fieldset is not None else serializer_class()
+    _walk(plan, serializer, model, prefix=(), back_ref=None)
+    return plan
+
+
+# ── Recorrido ────────────────────────────────────────────────────────────────
+
+def _walk(plan, serializer, model, prefix, back_ref):
+    wants = getattr(serializer, "wants_field", None)
+    for path in getattr(serializer, "prefetch_select_related", ()):
+        parts = path.replace("__", ".").split(".")
+        if wants is None or wants(parts[0]):
+            _add_select(plan, model, prefix, parts, back_ref)
+
+    for f in serializer.fields.values():
+        if f.write_only:
+            continue
+        parts = [] if f.source == "*" else f.source.split(".")
+
+        if isinstance(f, serializers.ListSerializer) or isinstance(f, ManyRelatedField):
+            rel = _relation(model, parts[0]) if len(parts) == 1 else None
+            if rel is None or not (rel.one_to_many or rel.many_to_many):
+                continue
+            lookup = "__".join((*prefix, parts[0]))
+            if isinstance(f, ManyRelatedField):
+                plan.prefetch.setdefault(lookup, None)
+                continue
+            child = QueryPlan(type(f.child))
+            reverse = rel.field.name if rel.one_to_many and rel.auto_created else None
+            _walk(child, f.child, rel.related_model, prefix=(), back_ref=reverse)
+            plan.prefetch[lookup] = child
+        elif isinstance(f, serializers.BaseSerializer):
+            path = _forward_path(model, parts)
+            if len(path) != len(parts):
+                continue
+            if path:
+                _add_select(plan, model, prefix, path, back_ref)
+            _walk(plan, f, _related_model(model, path) if path else model, (*prefix, *path), None)
+        elif len(parts) > 1:
+            _add_select(plan, model, prefix, parts, back_ref)
+
+
+def _add_select(plan, model, prefix, parts, back_ref):
+    # La FK hacia el padre de un prefetch inverso ya viene cacheada por Django
+    if not prefix and back_ref and parts and parts[0] == back_ref:
+        return
+    path = _forward_path(model, parts)
+    if path:
+        plan.select.add("__".join((*prefix, *path)))
+
+
+# ── Metadatos del modelo ─────────────────────────────────────────────────────
+
+def _relation(model, name):
+    try:
+        f = model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return None
+    return f if f.is_relation else None
+
+
+def _forward_path(model, parts):
+    """Prefijo más largo de ``parts`` compuesto por FK/OneToOne hacia adelante."""
+    path = []
+    for name in parts:
+        rel = _relation(model, name)
+        if rel is None or not (rel.one_to_one or (rel.many_to_one and rel.concrete)):
+            break
+        path.append(name)
+        model = rel.related_model
+    return path
+
+
+def _related_model(model, parts):
+    for name in parts:
+        model = model._meta.get_field(name).related_model
+    return model
@@ -0,0 +1,65 @@
+import threading
+import time
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from rest_framework import status
+from rest_framework.response import Response
+
+from apps.core.cache_aside import cached_response, get_or_build, stats
+from apps.core.management.commands.bench_cache_aside import BENCH_PREFIX, legacy_get_or_build, run_burst
+
+
+class _SlowBuild:
+    def __init__(self, value="page", delay=0.05):
+        self.value, self.delay, self.calls = value, delay, 0
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        return self.value
+
+
+class CacheAsideTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        stats.reset([BENCH_PREFIX, "test"])
+
+    def test_burst_after_invalidation_rebuilds_once(self):
+        legacy = _SlowBuild()
+        run_burst(legacy_get_or_build, legacy, concurrency=12)
+        self.assertGreater(legacy.calls, 1)
+
+        build = _SlowBuild()
+        for _ in range(2):  # cada ráfaga arranca con el prefijo recién invalidado
+            run_burst(get_or_build, build, concurrency=12)
+        self.assertEqual(build.calls, 2)
+
+        snapshot = stats.snapshot([BENCH_PREFIX])[BENCH_PREFIX]
+        self.assertEqual(snapshot["rebuild"], 2)
+        self.assertEqual(snapshot["miss"], 24)
+
+    def test_serves_stale_while_another_worker_revalidates(self):
+        build = _SlowBuild(value="fresh", delay=0)
+        cache.set("k", {"value": "stale", "fresh_until": time.time() - 1}, 60)
+
+        cache.add("k:lock", 1, 30)  # otro worker está reconstruyendo
+        self.assertEqual(get_or_build("k", build, 60, prefix="test"), "stale")
+        self.assertEqual(build.calls, 0)
+
+        cache.delete("k:lock")
+        self.assertEqual(get_or_build("k", build, 60, prefix="test"), "fresh")
+        self.assertEqual(get_or_build("k", build, 60, prefix="test"), "fresh")
+        self.assertEqual(build.calls, 1)
+        self.assertEqual(stats.snapshot(["test"])["test"]["stale"], 1)
+
+    def test_only_successful_responses_are_cached(self):
+        responses = [Response({"detail": "bad"}, status=status.HTTP_400_BAD_REQUEST), Response({"results": []})]
+        build = lambda: responses.pop(0)  # noqa: E731
+
+        self.assertEqual(cached_response("r", build, 60, prefix="test").status_code, 400)
+        self.assertEqual(cached_response("r", build, 60, prefix="test").data, {"results": []})
+        self.assertEqual(cached_response("r", build, 60, prefix="test").data, {"results": []})
+        self.assertIsNone(cache.get("r:lock"))
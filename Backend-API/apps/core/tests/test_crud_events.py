@@ -0,0 +1,159 @@
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import transaction
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase
+
+from apps.core import crud_events
+from apps.core.middleware import CrudEventBufferMiddleware
+
+from apps.core.crud_events import (
+    CRUD_GROUP, buffered_crud_events, crud_group, publish_crud_event, subscription_group,
+)
+
+
+class CrudEventPipelineTests(TestCase):
+    def setUp(self):
+        self.layer = get_channel_layer()
+        self.channels = {}
+        for group in (CRUD_GROUP, crud_group("products"), crud_group("products", "Product"), crud_group("stocks")):
+            channel = async_to_sync(self.layer.new_channel)()
+            async_to_sync(self.layer.group_add)(group, channel)
+            self.channels[group] = channel
+
+    def tearDown(self):
+        async_to_sync(self.layer.flush)()
+
+    def _receive_all(self, group):
+        channel = self.channels[group]
+        messages = []
+        while self.layer.channels.get(channel):
+            messages.append(async_to_sync(self.layer.receive)(channel))
+        return messages
+
+    def test_events_are_coalesced_and_sent_once_per_group(self):
+        with buffered_crud_events():
+            with self.captureOnCommitCallbacks(execute=True):
+                publish_crud_event("update", "products", "Product", {"id": 1, "name": "a"})
+                publish_crud_event("update", "products", "Product", {"id": 1, "name": "b"})
+                publish_crud_event("create", "products", "Product", {"id": 2})
+                publish_crud_event("delete", "products", "Product", {"id": 2})
+                publish_crud_event("update", "stocks", "ProductStock", {"id": 7})
+
+        firehose = self._receive_all(CRUD_GROUP)
+        self.assertEqual(len(firehose), 1)
+        self.assertEqual(firehose[0]["type"], "crud_batch")
+        self.assertEqual(firehose[0]["group"], CRUD_GROUP)
+        events = firehose[0]["events"]
+        self.assertEqual([(e["event"], e["payload"]["id"]) for e in events], [("update", 1), ("update", 7)])
+        self.assertEqual(events[0]["payload"]["name"], "b")
+
+        model_batch = self._receive_all(crud_group("products", "Product"))
+        self.assertEqual(len(model_batch), 1)
+        self.assertEqual(len(model_batch[0]["events"]), 1)
+        stocks_batch = self._receive_all(crud_group("stocks"))
+        self.assertEqual([e["model"] for e in stocks_batch[0]["events"]], ["ProductStock"])
+
+    def test_create_then_update_keeps_create_with_latest_payload(self):
+        with buffered_crud_events():
+            with self.captureOnCommitCallbacks(execute=True):
+                publish_crud_event("create", "products", "Product", {"id": 3, "name": "x"})
+                publish_crud_event("update", "products", "Product", {"id": 3, "name": "y"})
+        events = self._receive_all(CRUD_GROUP)[0]["events"]
+        self.assertEqual(events, [{"event": "create", "app": "products", "model": "Product",
+                                   "payload": {"id": 3, "name": "y"}}])
+
+    def test_rolled_back_events_are_not_sent(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            try:
+                with transaction.atomic():
+                    publish_crud_event("update", "products", "Product", {"id": 1})
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+        self.assertEqual(callbacks, [])
+        self.assertEqual(self._receive_all(CRUD_GROUP), [])
+
+    def test_all_groups_go_out_in_one_channel_layer_call(self):
+        with mock.patch.object(crud_events, "async_to_sync", wraps=async_to_sync) as bridge:
+            with self.captureOnCommitCallbacks(execute=True):
+                publish_crud_event("update", "products", "Product", {"id": 1})
+        self.assertEqual(bridge.call_count, 1)
+        for group in (CRUD_GROUP, crud_group("products"), crud_group("products", "Product")):
+            self.assertEqual(len(self._receive_all(group)), 1)
+
+    def test_middleware_sends_after_the_response_is_closed(self):
+        def view(request):
+            with self.captureOnCommitCallbacks(execute=True):
+                publish_crud_event("update", "products", "Product", {"id": 4})
+            return HttpResponse("ok")
+
+        response = CrudEventBufferMiddleware(view)(RequestFactory().get("/"))
+        self.assertEqual(self._receive_all(CRUD_GROUP), [])
+        response.close()
+        self.assertEqual([e["payload"]["id"] for e in self._receive_all(CRUD_GROUP)[0]["events"]], [4])
+
+    def test_subscription_group_validation(self):
+        self.assertEqual(subscription_group("products.Product"), "crud_events.products.product")
+        self.assertEqual(subscription_group("stocks"), "crud_events.stocks")
+        self.assertIsNone(subscription_group("a.b.c"))
+        self.assertIsNone(subscription_group("../*"))
+
+
+class CrudEventConsumerTests(TestCase):
+    def test_client_only_receives_subscribed_groups(self):
+        from types import SimpleNamespace
+        from channels.testing import WebsocketCommunicator
+        from apps.core.consumers.crud_event_consumer import CrudEventConsumer
+
+        async def scenario():
+            communicator = WebsocketCommunicator(
+                CrudEventConsumer.as_asgi(), "/ws/crud-events/?groups=stocks.ProductStock"
+            )
+            communicator.scope["user"] = SimpleNamespace(id=1, is_anonymous=False)
+            connected, _ = await communicator.connect()
+            self.assertTrue(connected)
+            layer = get_channel_layer()
+            batch = {"type": "crud_batch", "events": [
+                {"event": "update", "app": "stocks", "model": "ProductStock", "payload": {"id": 1}},
+            ]}
+            await layer.group_send(crud_group("products"), dict(batch, events=[{"event": "update"}]))
+            await layer.group_send(crud_group("stocks", "ProductStock"), batch)
+            received = await communicator.receive_json_from()
+            self.assertEqual(received["model"], "ProductStock")
+            self.assertTrue(await communicator.receive_nothing())
+            await communicator.disconnect()
+
+        async_to_sync(scenario)()
+
+    def test_overlapping_subscriptions_deliver_each_event_once(self):
+        from types import SimpleNamespace
+        from channels.testing import WebsocketCommunicator
+        from apps.core.consumers.crud_event_consumer import CrudEventConsumer
+
+        product = {"event": "update", "app": "products", "model": "Product", "payload": {"id": 1}}
+        category = {"event": "update", "app": "products", "model": "Category", "payload": {"id": 2}}
+
+        async def scenario():
+            communicator = WebsocketCommunicator(
+                CrudEventConsumer.as_asgi(), "/ws/crud-events/?groups=products,products.Product&batch=1"
+            )
+            communicator.scope["user"] = SimpleNamespace(id=1, is_anonymous=False)
+            connected, _ = await communicator.connect()
+            self.assertTrue(connected)
+            layer = get_channel_layer()
+            # Lo mismo que publica send_crud_events: cada evento a todos sus grupos
+            for group, events in (
+                (crud_group("products"), [product, category]),
+                (crud_group("products", "Product"), [product]),
+                (crud_group("products", "Category"), [category]),
+            ):
+                await layer.group_send(group, {"type": "crud_batch", "group": group, "events": events})
+            received = await communicator.receive_json_from()
+            self.assertEqual(received["events"], [product, category])
+            self.assertTrue(await communicator.receive_nothing())
+            await communicator.disconnect()
+
+        async_to_sync(scenario)()
@@ -0,0 +1,80 @@
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, TransactionTestCase, override_settings
+
+from apps.core.cache_aside import get_or_build
+from apps.core.db_routing import ReadReplicaMiddleware, for_read, primary_reads, replica_reads, use_read_replica
+from apps.users.models.user_model import User
+
+
+def _user(username):
+    return User.objects.create_user(
+        username=username, email=f"{username}@example.com", password=None, name="Re", last_name="Plica",
+    )
+
+
+@replica_reads
+def _count_view(request):
+    if request.method == "POST":
+        _user(request.POST["username"])
+    return HttpResponse(str(User.objects.count()))
+
+
+@override_settings(READ_REPLICA_ENABLED=True)
+class ReadReplicaRoutingTests(TransactionTestCase):
+    # Dos SQLite: lo escrito en el primario no existe en la "réplica",
+    # así que el resultado de cada lectura delata a qué base fue.
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        cache.clear()
+        _user("primary-only")
+
+    def test_reads_go_to_replica_only_when_opted_in(self):
+        self.assertEqual(User.objects.count(), 1)
+        with use_read_replica():
+            self.assertEqual(User.objects.count(), 0)
+            self.assertEqual(for_read(User.objects.all()).db, "replica")
+
+        with override_settings(READ_REPLICA_ENABLED=False), use_read_replica():
+            self.assertEqual(User.objects.count(), 1)
+
+    def test_write_pins_following_reads_to_primary(self):
+        replica_user = User.objects.using("replica").create(
+            username="replica-copy", email="copy@example.com", name="Co", last_name="Py",
+        )
+        with use_read_replica():
+            self.assertEqual(User.objects.count(), 1)
+            fetched = User.objects.get(pk=replica_user.pk)  # leído de la réplica
+            fetched.name = "Changed"
+            fetched.save()  # la escritura va al primario, no a la réplica
+            self.assertEqual(User.objects.count(), 2)
+        self.assertFalse(User.objects.using("replica").filter(name="Changed").exists())
+        self.assertTrue(User.objects.filter(name="Changed").exists())
+
+    def test_shared_cache_is_filled_from_primary(self):
+        with use_read_replica():
+            # Otro usuario, sin stickiness: el miss se construye desde el primario
+            self.assertEqual(get_or_build("replica:users", User.objects.count, 60, prefix="test"), 1)
+            with primary_reads():
+                self.assertEqual(User.objects.count(), 1)
+            # ...sin fijar el resto de la request al primario
+            self.assertEqual(User.objects.count(), 0)
+
+    def test_session_reads_its_writes(self):
+        factory = RequestFactory()
+        middleware = ReadReplicaMiddleware(_count_view)
+
+        def call(method, token, **data):
+            request = getattr(factory, method)("/", data, HTTP_AUTHORIZATION=f"Bearer {token}")
+            return int(middleware(request).content)
+
+        self.assertEqual(call("get", "alice"), 0)
+        self.assertEqual(call("post", "alice", username="alice-new"), 2)
+        # Alice ve lo que escribió; Bob sigue leyendo de la réplica
+        self.assertEqual(call("get", "alice"), 2)
+        self.assertEqual(call("get", "bob"), 0)
+
+        with override_settings(READ_REPLICA_STICKY_SECONDS=0):
+            call("post", "carol", username="carol-new")
+        self.assertEqual(call("get", "carol"), 0)
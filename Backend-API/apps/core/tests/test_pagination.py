@@ -0,0 +1,63 @@
+from urllib.parse import parse_qs, urlparse
+
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from apps.core.pagination import KeysetPagination
+from apps.notifications.models.notification_model import Notification
+from apps.users.models.user_model import User
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        user = User.objects.create_user(
+            username="pager", email="pager@example.com", password="x", name="Pag", last_name="Er",
+        )
+        Notification.objects.bulk_create([Notification(user=user, title=f"n{i}") for i in range(25)])
+        # Empates de created_at: el id desempata
+        Notification.objects.filter(title__in=["n3", "n4", "n5", "n6"]).update(created_at=timezone.now())
+        self.qs = Notification.objects.all()
+        self.expected = list(self.qs.order_by("-created_at", "-id").values_list("id", flat=True))
+
+    def _page(self, query):
+        request = Request(self.factory.get("/notifications/", query))
+        paginator = KeysetPagination()
+        rows = paginator.paginate_queryset(self.qs, request)
+        return [r.id for r in rows], paginator.get_paginated_response([]).data
+
+    @staticmethod
+    def _cursor(link):
+        return parse_qs(urlparse(link).query)["cursor"][0]
+
+    def test_walks_forward_and_back_without_gaps(self):
+        seen, query, pages = [], {"cursor": "", "page_size": 10}, []
+        while True:
+            ids, data = self._page(query)
+            seen += ids
+            pages.append((ids, data))
+            if not data["next"]:
+                break
+            query = {"cursor": self._cursor(data["next"]), "page_size": 10}
+        self.assertEqual(seen, self.expected)
+        self.assertEqual(len(pages), 3)
+        self.assertNotIn("count", pages[0][1])
+        self.assertIsNone(pages[0][1]["previous"])
+
+        back_ids, _ = self._page({"cursor": self._cursor(pages[2][1]["previous"]), "page_size": 10})
+        self.assertEqual(back_ids, pages[1][0])
+
+    def test_count_modes_and_page_number_fallback(self):
+        _, data = self._page({"pagination": "cursor", "count": "exact"})
+        self.assertEqual((data["count"], data["count_is_estimate"]), (25, False))
+
+        _, data = self._page({"page": 2})
+        self.assertEqual(data["count"], 25)
+        self.assertIn("page=3", data["next"])
+
+    def test_invalid_cursor_is_404(self):
+        from rest_framework.exceptions import NotFound
+        with self.assertRaises(NotFound):
+            self._page({"cursor": "not-a-cursor"})
@@ -1,6 +1,6 @@
 from django.urls import path
 
-from apps.core.views import dashboard_view, mysql_readonly_health_view, public_home_view
+from apps.core.views import dashboard_view, mysql_readonly_health_view, public_home_view, read_replica_health_view
 from apps.core.views_public import service_health_view
 
 urlpatterns = [
@@ -8,4 +8,5 @@ urlpatterns = [
     path('dashboard/', dashboard_view, name='dashboard'),  # Dashboard (autenticado)
     path('health/', service_health_view, name='service-health'),
     path('health/mysql-readonly/', mysql_readonly_health_view, name='mysql-readonly-health'),
+    path('health/read-replica/', read_replica_health_view, name='read-replica-health'),
 ]
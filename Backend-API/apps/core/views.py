@@ -1,9 +1,11 @@
+from django.db import DatabaseError, connections
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from drf_spectacular.utils import extend_schema
 
+from apps.core.db_routing import replica_alias
 from ERP_management.settings.base import MYSQL_RO_ENABLED
 
 
@@ -77,3 +79,38 @@ def mysql_readonly_health_view(request):
 
     # MySQL deshabilitado en esta versión; se mantiene endpoint solo como indicador de flag
     return Response({"status": "disabled", "result": None}, status=status.HTTP_200_OK)
+
+
+@extend_schema(
+    operation_id="read_replica_health",
+    description="Estado de la réplica de lectura usada por las vistas de catálogo, historial y métricas.",
+    responses={
+        200: {
+            "type": "object",
+            "properties": {
+                "status": {"type": "string"},
+                "alias": {"type": "string", "nullable": True},
+            },
+        },
+        503: {
+            "type": "object",
+            "properties": {
+                "status": {"type": "string"},
+                "detail": {"type": "string"},
+            },
+        },
+    },
+)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def read_replica_health_view(request):
+    """Endpoint de salud de la réplica de lectura (SELECT 1 contra el alias configurado)."""
+    alias = replica_alias()
+    if alias is None:
+        return Response({"status": "disabled", "alias": None}, status=status.HTTP_200_OK)
+    try:
+        with connections[alias].cursor() as cursor:
+            cursor.execute("SELECT 1")
+    except DatabaseError as e:
+        return Response({"status": "error", "detail": str(e)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+    return Response({"status": "ok", "alias": alias}, status=status.HTTP_200_OK)
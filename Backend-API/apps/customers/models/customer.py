@@ -9,7 +9,7 @@ from apps.customers.models.tax_condition import TaxCondition
 class Customer(BaseModel):
     """Cliente del ERP (tabla CLIENTES)."""
 
-    legacy_id = models.IntegerField(null=True, blank=True, db_index=True, verbose_name="ID legacy")
+    legacy_id = models.IntegerField(null=True, blank=True, unique=True, verbose_name="ID legacy")
     code = models.IntegerField(null=True, blank=True, db_index=True, verbose_name="Código interno")
     name = models.CharField(max_length=255, verbose_name="Nombre")
     address = models.CharField(max_length=255, blank=True, verbose_name="Domicilio")
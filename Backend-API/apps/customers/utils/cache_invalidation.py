@@ -1,4 +1,4 @@
-from apps.products.utils.redis_access import delete_keys_by_pattern
+from apps.products.utils.cache_tags import invalidate_tags
 from .cache_keys import (
     CUSTOMER_LIST_CACHE_PREFIX,
     CUSTOMER_PRODUCT_LIST_CACHE_PREFIX,
@@ -6,8 +6,8 @@ from .cache_keys import (
 
 
 def invalidate_customer_cache():
-    delete_keys_by_pattern(CUSTOMER_LIST_CACHE_PREFIX)
+    invalidate_tags(CUSTOMER_LIST_CACHE_PREFIX)
 
 
 def invalidate_customer_product_cache():
-    delete_keys_by_pattern(CUSTOMER_PRODUCT_LIST_CACHE_PREFIX)
+    invalidate_tags(CUSTOMER_PRODUCT_LIST_CACHE_PREFIX)
@@ -4,14 +4,20 @@ from decimal import Decimal, InvalidOperation
 
 from django.core.exceptions import ValidationError
 from django.db import models, transaction
-from django.db.models import Sum, Q, Prefetch
+from django.db.models import Q, Prefetch
 from django.utils import timezone
 
 from apps.cuts.models.cutting_order_model import CuttingOrder, CuttingOrderItem
 from apps.users.models.user_model import User
 from apps.products.models.product_model import Product
 from apps.products.models.subproduct_model import Subproduct
-from apps.stocks.models import SubproductStock  # ⬅️ Ajusta si tu módulo difiere
+from apps.stocks.services.reservations import (
+    annotate_item_stock,
+    available_qty,
+    available_quantities,
+    refresh_subproduct_reservations,
+    reserved_qty_excluding_order,
+)
 
 
 class CuttingOrderRepository:
@@ -30,18 +36,30 @@ class CuttingOrderRepository:
     # Lecturas convenientes
     # -----------------------
 
+    # FKs que lee CuttingOrderSerializer (workflow_status sale del pedido)
+    ORDER_RELATIONS = ('order', 'assigned_to', 'created_by', 'modified_by', 'deleted_by', 'product')
+
+    @staticmethod
+    def items_prefetch() -> Prefetch:
+        """
+        Ítems con subproducto/padre y, anotados en la misma query, el stock y las
+        reservas de cada subproducto (ver annotate_item_stock). El serializer arma
+        item_current_stock y warnings con eso, sin queries por orden ni por ítem.
+        """
+        return Prefetch(
+            'items',
+            queryset=annotate_item_stock(
+                CuttingOrderItem.objects.select_related('subproduct', 'subproduct__parent')
+            ),
+        )
+
     @staticmethod
     def get_by_id(order_id: int) -> Optional[CuttingOrder]:
         try:
             return (
                 CuttingOrder.objects
-                .select_related('assigned_to', 'created_by', 'product')
-                .prefetch_related(
-                    Prefetch(
-                        'items',
-                        queryset=CuttingOrderItem.objects.select_related('subproduct', 'subproduct__parent')
-                    )
-                )
+                .select_related(*CuttingOrderRepository.ORDER_RELATIONS)
+                .prefetch_related(CuttingOrderRepository.items_prefetch())
                 .get(id=order_id, status=True)
             )
         except CuttingOrder.DoesNotExist:
@@ -52,13 +70,8 @@ class CuttingOrderRepository:
         return (
             CuttingOrder.objects
             .filter(status=True)
-            .select_related('assigned_to', 'created_by', 'product')
-            .prefetch_related(
-                Prefetch(
-                    'items',
-                    queryset=CuttingOrderItem.objects.select_related('subproduct', 'subproduct__parent')
-                )
-            )
+            .select_related(*CuttingOrderRepository.ORDER_RELATIONS)
+            .prefetch_related(CuttingOrderRepository.items_prefetch())
         )
 
     @staticmethod
@@ -68,13 +81,8 @@ class CuttingOrderRepository:
         return (
             CuttingOrder.objects
             .filter(assigned_to=user, status=True)
-            .select_related('assigned_to', 'created_by', 'product')
-            .prefetch_related(
-                Prefetch(
-                    'items',
-                    queryset=CuttingOrderItem.objects.select_related('subproduct', 'subproduct__parent')
-                )
-            )
+            .select_related(*CuttingOrderRepository.ORDER_RELATIONS)
+            .prefetch_related(CuttingOrderRepository.items_prefetch())
         )
 
     # -----------------------
@@ -84,30 +92,17 @@ class CuttingOrderRepository:
     @staticmethod
     def _reserved_qty(subproduct_id: int, exclude_order_id: Optional[int] = None) -> Decimal:
         """
-        Suma de cutting_quantity en órdenes activas (pending/in_process) para un subproducto.
+        Cantidad reservada en órdenes activas (pending/in_process) para un subproducto,
+        leída del agregado SubproductReservation.
         """
-        qs = CuttingOrderItem.objects.filter(
-            subproduct_id=subproduct_id,
-            order__status=True,
-            order__workflow_status__in=['pending', 'in_process'],
-        )
-        if exclude_order_id:
-            qs = qs.exclude(order_id=exclude_order_id)
-        return qs.aggregate(total=Sum('cutting_quantity'))['total'] or Decimal("0")
+        return reserved_qty_excluding_order(subproduct_id, exclude_order_id)
 
     @staticmethod
     def _available(subproduct: Subproduct, exclude_order_id: Optional[int] = None) -> Decimal:
         """
         Disponibilidad = stock físico - reservas lógicas (otras órdenes activas).
-        ⚠️ Si tu modelo usa 'current_stock' en vez de 'quantity', cambia la línea marcada.
         """
-        try:
-            ss = SubproductStock.objects.get(subproduct=subproduct, status=True)
-            base_qty = Decimal(ss.quantity)  # ⬅️ CAMBIA a ss.current_stock si corresponde
-        except SubproductStock.DoesNotExist:
-            base_qty = Decimal("0")
-        reserved = CuttingOrderRepository._reserved_qty(subproduct.id, exclude_order_id=exclude_order_id)
-        return base_qty - Decimal(reserved)
+        return available_qty(subproduct.id, exclude_order_id=exclude_order_id)
 
     @staticmethod
     def _coerce_items(items: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -147,10 +142,10 @@ class CuttingOrderRepository:
         """
         acc = {}
         for it in items:
-            sub_id = it['subproduct'].id
-            acc[sub_id] = acc.get(sub_id, Decimal("0")) + it['cutting_quantity']
-        merged = [{'subproduct': Subproduct.objects.get(pk=sid), 'cutting_quantity': qty} for sid, qty in acc.items()]
-        return merged
+            sub = it['subproduct']
+            merged = acc.setdefault(sub.id, {'subproduct': sub, 'cutting_quantity': Decimal("0")})
+            merged['cutting_quantity'] += it['cutting_quantity']
+        return list(acc.values())
 
     @staticmethod
     def _validate_items_vs_product_and_stock(
@@ -185,10 +180,11 @@ class CuttingOrderRepository:
         # 3) Disponibilidad por subproducto (considerando reservas lógicas)
         # Re-merge para sumar por subproducto (por si vinieron duplicados)
         merged = CuttingOrderRepository._merge_duplicate_items(items)
+        available_by_id = available_quantities((it['subproduct'].id for it in merged), exclude_order_id)
         for it in merged:
             sub = it['subproduct']
             qty_needed = it['cutting_quantity']
-            available = CuttingOrderRepository._available(sub, exclude_order_id=exclude_order_id)
+            available = available_by_id[sub.id]
             if qty_needed > available:
                 raise ValidationError(
                     f"Stock insuficiente para el subproducto ID {sub.id}. "
@@ -322,16 +318,12 @@ class CuttingOrderRepository:
                     cutting_quantity=it['cutting_quantity']
                 ) for it in merged
             ])
+            refresh_subproduct_reservations(it['subproduct'].id for it in merged)
 
         return (
             CuttingOrder.objects
-            .select_related('assigned_to', 'created_by', 'product')
-            .prefetch_related(
-                Prefetch(
-                    'items',
-                    queryset=CuttingOrderItem.objects.select_related('subproduct', 'subproduct__parent')
-                )
-            )
+            .select_related(*CuttingOrderRepository.ORDER_RELATIONS)
+            .prefetch_related(CuttingOrderRepository.items_prefetch())
             .get(pk=order.pk)
         )
 
@@ -436,6 +428,7 @@ class CuttingOrderRepository:
                         cutting_quantity=it['cutting_quantity']
                     ) for it in merged
                 ])
+                refresh_subproduct_reservations(it['subproduct'].id for it in merged)
 
         # completed_at al pasar a completed
         if 'workflow_status' in data and data['workflow_status'] == 'completed' and not order.completed_at:
@@ -444,13 +437,8 @@ class CuttingOrderRepository:
 
         return (
             CuttingOrder.objects
-            .select_related('assigned_to', 'created_by', 'product')
-            .prefetch_related(
-                Prefetch(
-                    'items',
-                    queryset=CuttingOrderItem.objects.select_related('subproduct', 'subproduct__parent')
-                )
-            )
+            .select_related(*CuttingOrderRepository.ORDER_RELATIONS)
+            .prefetch_related(CuttingOrderRepository.items_prefetch())
             .get(pk=order.pk)
         )
 
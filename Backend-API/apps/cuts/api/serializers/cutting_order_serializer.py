@@ -15,6 +15,13 @@ from apps.products.api.serializers.base_serializer import BaseSerializer  # Base
 from apps.orders.models.order import CustomerOrder
 from apps.orders.models.order_line import CustomerOrderLine
 from apps.orders.choices import OrderStatus
+from apps.stocks.services.reservations import (
+    available_qty,
+    available_quantities,
+    reservation_summary_for_order,
+    reservation_summary_from_items,
+    reserved_qty_excluding_order,
+)
 
 User = get_user_model()  # Modelo de usuario del proyecto
 
@@ -92,7 +99,10 @@ class CuttingOrderItemSerializer(serializers.ModelSerializer):
         """
         Devuelve el stock actual del subproducto, si existe registro en SubproductStock.
         Ajusta a ss.current_stock si tu modelo usa ese nombre.
+        Los listados lo traen anotado (CuttingOrderRepository.items_prefetch).
         """
+        if hasattr(obj, 'stock_quantity'):
+            return obj.stock_quantity
         try:
             ss = SubproductStock.objects.get(subproduct=obj.subproduct, status=True)
             return ss.quantity  # ⬅️ CAMBIA a ss.current_stock si corresponde en tu modelo real
@@ -183,31 +193,16 @@ class CuttingOrderSerializer(BaseSerializer):
 
     def _reserved_qty(self, subproduct_id: int, exclude_order_id=None) -> Decimal:
         """
-        Cantidad reservada (suma de cutting_quantity) para un subproducto
-        en órdenes activas (pending/in_process). Puede excluir una orden (update).
+        Cantidad reservada para un subproducto en órdenes activas (pending/in_process),
+        leída del agregado SubproductReservation. Puede excluir una orden (update).
         """
-        qs = CuttingOrderItem.objects.filter(
-            subproduct_id=subproduct_id,
-            order__status=True,
-            order__order__status__in=[OrderStatus.PENDING, OrderStatus.IN_PROCESS],
-        )
-        if exclude_order_id:
-            qs = qs.exclude(order_id=exclude_order_id)
-        return qs.aggregate(total=Sum('cutting_quantity'))['total'] or Decimal("0")
+        return reserved_qty_excluding_order(subproduct_id, exclude_order_id)
 
     def _available(self, subproduct: Subproduct, exclude_order_id=None) -> Decimal:
         """
         Disponibilidad = stock físico - reservas lógicas (otras órdenes activas).
-        Ajusta el campo 'quantity' si en tu modelo real es 'current_stock'.
         """
-        try:
-            ss = SubproductStock.objects.get(subproduct=subproduct, status=True)
-            qty = ss.quantity  # ⬅️ CAMBIAR a ss.current_stock si corresponde
-        except SubproductStock.DoesNotExist:
-            qty = Decimal("0")
-
-        reserved = self._reserved_qty(subproduct.id, exclude_order_id=exclude_order_id)
-        return Decimal(qty) - Decimal(reserved)
+        return available_qty(subproduct.id, exclude_order_id=exclude_order_id)
 
     # ------------------ VALIDACIONES DE ALTO NIVEL ------------------
 
@@ -274,11 +269,22 @@ class CuttingOrderSerializer(BaseSerializer):
                 # Acumular
                 qty_per_subproduct[subproduct.id] += qty
 
-            # 2.a) Disponibilidad (stock físico - reservas en otras órdenes)
+            # 2.a) Subproductos activos (una sola query para todos los ítems)
+            active_ids = set(
+                Subproduct.objects.filter(pk__in=list(qty_per_subproduct), status=True)
+                .values_list('pk', flat=True)
+            )
+            inactive = [sid for sid in qty_per_subproduct if sid not in active_ids]
+            if inactive:
+                raise serializers.ValidationError({
+                    'items': f"El subproducto {inactive[0]} no está activo."
+                })
+
+            # 2.b) Disponibilidad (stock físico - reservas en otras órdenes)
             exclude_order_id = self.instance.id if self.instance else None
+            available_by_id = available_quantities(qty_per_subproduct, exclude_order_id=exclude_order_id)
             for subproduct_id, total_needed in qty_per_subproduct.items():
-                sub = Subproduct.objects.get(pk=subproduct_id, status=True)
-                available = self._available(sub, exclude_order_id=exclude_order_id)
+                available = available_by_id[subproduct_id]
                 if total_needed > available:
                     raise serializers.ValidationError({
                         'items': (
@@ -404,19 +410,21 @@ class CuttingOrderSerializer(BaseSerializer):
         data = super().to_representation(instance)
 
         # assigned_to → username legible
-        if instance.assigned_to_id:
-            data["assigned_to"] = getattr(instance.assigned_to, "username", None)
-        else:
-            data["assigned_to"] = None
+        if "assigned_to" in data:
+            if instance.assigned_to_id:
+                data["assigned_to"] = getattr(instance.assigned_to, "username", None)
+            else:
+                data["assigned_to"] = None
 
         # product → nombre/desc/str
-        prod = getattr(instance, "product", None)
-        if prod is not None:
-            name = getattr(prod, "name", None)
-            description = getattr(prod, "description", None)
-            data["product"] = name or description or str(prod)
-        else:
-            data["product"] = None
+        if "product" in data:
+            prod = getattr(instance, "product", None)
+            if prod is not None:
+                name = getattr(prod, "name", None)
+                description = getattr(prod, "description", None)
+                data["product"] = name or description or str(prod)
+            else:
+                data["product"] = None
 
         return data
 
@@ -434,7 +442,14 @@ class CuttingOrderSerializer(BaseSerializer):
             return []
 
         results = []
-        items = instance.items.select_related('subproduct', 'subproduct__parent')
+        # Con los ítems prefetcheados y anotados (listados) no hay queries extra
+        prefetched = getattr(instance, '_prefetched_objects_cache', {}).get('items')
+        items = list(prefetched) if prefetched is not None else []
+        summary = reservation_summary_from_items(instance, items) if prefetched is not None else None
+        if summary is None:
+            items = list(instance.items.select_related('subproduct', 'subproduct__parent'))
+            # Reservas de otras órdenes para todos los ítems en un número fijo de queries
+            summary = reservation_summary_for_order(instance.id, [it.subproduct_id for it in items])
         seen = set()
 
         for it in items:
@@ -443,28 +458,10 @@ class CuttingOrderSerializer(BaseSerializer):
                 continue
             seen.add(sub.id)
 
-            # Reservas en otras órdenes
-            qs = (
-                CuttingOrderItem.objects
-                .filter(
-                    subproduct_id=sub.id,
-                    order__status=True,
-                    order__order__status__in=[OrderStatus.PENDING, OrderStatus.IN_PROCESS],
-                )
-                .exclude(order_id=instance.id)
-            )
-
-            other_reserved = qs.aggregate(total=Sum('cutting_quantity'))['total'] or Decimal("0")
-            other_orders_count = qs.values('order_id').distinct().count()
-
-            # Stock base del subproducto (ajustar 'quantity' si tu campo real es 'current_stock')
-            try:
-                ss = SubproductStock.objects.get(subproduct=sub, status=True)
-                base_qty = Decimal(ss.quantity)  # ⬅️ CAMBIAR a ss.current_stock si corresponde
-            except SubproductStock.DoesNotExist:
-                base_qty = Decimal("0")
-
-            available_excl_others = base_qty - Decimal(other_reserved)
+            info = summary[sub.id]
+            other_reserved = info["other_reserved_qty"]
+            other_orders_count = info["other_active_orders_count"]
+            available_excl_others = info["available_excluding_others"]
 
             # Derivados separados
             brand = getattr(sub, 'brand', None) or getattr(getattr(sub, 'parent', None), 'brand', None)
@@ -12,7 +12,9 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from drf_spectacular.utils import extend_schema
 
+from apps.core.fieldsets import fieldset_from_request
 from apps.core.pagination import Pagination
+from apps.core.prefetch import prune_prefetches
 from apps.cuts.api.serializers.cutting_order_serializer import CuttingOrderSerializer
 from apps.cuts.api.repositories.cutting_order_repository import CuttingOrderRepository
 from apps.cuts.docs.cutting_order_doc import (
@@ -53,7 +55,8 @@ logger = logging.getLogger(__name__)
 @permission_classes([IsAuthenticated])
 @list_cache
 def cutting_order_assigned_list(request):
-    qs = CuttingOrderRepository.get_cutting_orders_assigned_to(request.user)
+    # Sin ?expand=items (o fields=...items...) no se traen los ítems
+    qs = prune_prefetches(CuttingOrderRepository.get_cutting_orders_assigned_to(request.user), fieldset_from_request(request))
     paginator = Pagination()
     page = paginator.paginate_queryset(qs, request)
     serializer = CuttingOrderSerializer(page, many=True, context={'request': request})
@@ -72,7 +75,8 @@ def cutting_order_assigned_list(request):
 @permission_classes([IsAuthenticated])  # cualquier usuario autenticado puede ver el historial
 @list_cache
 def cutting_order_list(request):
-    qs = CuttingOrderRepository.get_all_active()
+    # Sin ?expand=items (o fields=...items...) no se traen los ítems
+    qs = prune_prefetches(CuttingOrderRepository.get_all_active(), fieldset_from_request(request))
 
     f = CuttingOrderFilter(request.GET, queryset=qs, request=request)
     if not f.is_valid():
@@ -0,0 +1,145 @@
+import random
+import statistics
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Prefetch
+
+from apps.cuts.api.repositories.cutting_order_repository import CuttingOrderRepository
+from apps.cuts.api.serializers.cutting_order_serializer import CuttingOrderSerializer
+from apps.cuts.models.cutting_order_model import CuttingOrder, CuttingOrderItem
+from apps.orders.choices import OrderStatus
+from apps.orders.models import CustomerOrder
+from apps.products.models import Category, Product, Subproduct
+from apps.stocks.models import SubproductStock
+from apps.stocks.services.reservations import refresh_subproduct_reservations
+
+
+class _Rollback(Exception):
+    pass
+
+
+def seed_cutting_orders(user, orders, items_per_order, subproducts=None, tag="bench"):
+    """
+    Crea ``orders`` órdenes de corte activas con ``items_per_order`` ítems cada
+    una sobre un mismo producto (los subproductos se comparten entre órdenes,
+    así hay reservas cruzadas y warnings). Devuelve las órdenes creadas.
+    """
+    subproducts = subproducts or max(items_per_order * 3, 30)
+    if items_per_order > subproducts:
+        raise ValueError("items_per_order no puede superar la cantidad de subproductos")
+    rng = random.Random(orders * 1000 + items_per_order)
+
+    category = Category.objects.create(name=f"{tag}-{rng.randint(0, 10**9)}", created_by=user)
+    product = Product.objects.create(
+        code=f"{tag}-{rng.randint(0, 10**9)}", name="Bobina bench", category=category,
+        has_subproducts=True, created_by=user,
+    )
+    subs = Subproduct.objects.bulk_create([
+        Subproduct(parent=product, brand="B", number_coil=f"{tag}-{n}", created_by=user)
+        for n in range(subproducts)
+    ])
+    SubproductStock.objects.bulk_create([
+        SubproductStock(subproduct=s, quantity=Decimal("100000"), created_by=user) for s in subs
+    ])
+
+    customer_orders = CustomerOrder.objects.bulk_create([
+        CustomerOrder(created_by=user, status=OrderStatus.PENDING) for _ in range(orders)
+    ])
+    cutting_orders = CuttingOrder.objects.bulk_create([
+        CuttingOrder(
+            order=co, order_number=co.pk, product=product, customer="ACME",
+            quantity_to_cut=Decimal("100000"), created_by=user,
+        )
+        for co in customer_orders
+    ])
+    CuttingOrderItem.objects.bulk_create([
+        CuttingOrderItem(order=order, subproduct=sub, cutting_quantity=Decimal(rng.randint(1, 20)))
+        for order in cutting_orders
+        for sub in rng.sample(subs, items_per_order)
+    ])
+    refresh_subproduct_reservations(s.pk for s in subs)
+    return cutting_orders
+
+
+def legacy_queryset():
+    """Queryset anterior del listado (ítems sin anotar), sólo para comparar."""
+    return (
+        CuttingOrder.objects.filter(status=True)
+        .select_related('assigned_to', 'created_by', 'product')
+        .prefetch_related(Prefetch(
+            'items', queryset=CuttingOrderItem.objects.select_related('subproduct', 'subproduct__parent'),
+        ))
+    )
+
+
+class QueryCounter:
+    """execute_wrapper que cuenta queries (sin el límite del log de DEBUG)."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def serialize(queryset):
+    return CuttingOrderSerializer(queryset, many=True, context={'request': None}).data
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide queries y latencia al serializar el listado de órdenes de corte, con "
+        "el queryset anterior y con los ítems anotados del repositorio. Los datos "
+        "sintéticos se crean dentro de una transacción que se revierte al final."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--orders', type=int, default=200, help='Órdenes de corte a crear')
+        parser.add_argument('--items', type=int, default=10, help='Ítems por orden')
+        parser.add_argument('--repeat', type=int, default=3, help='Repeticiones por variante')
+
+    def handle(self, *args, **options):
+        if options['orders'] < 1 or options['items'] < 1:
+            raise CommandError("--orders e --items deben ser positivos")
+        from apps.users.models.user_model import User
+
+        self.stdout.write(f"motor: {connection.vendor}")
+        try:
+            with transaction.atomic():
+                user = User.objects.create_user(
+                    username=f"bench-cuts-{random.randint(0, 10**9)}", email="bench@example.com",
+                    password=None, name="Bench", last_name="Cuts",
+                )
+                t0 = time.perf_counter()
+                orders = seed_cutting_orders(user, options['orders'], options['items'])
+                ids = [o.pk for o in orders]
+                self.stdout.write(
+                    f"seed {len(ids)} órdenes × {options['items']} ítems: {time.perf_counter() - t0:,.1f}s"
+                )
+
+                self.stdout.write(f"{'variante':<12} {'queries':>8} {'p50 (ms)':>10} {'max (ms)':>10}")
+                for label, build in (
+                    ("anterior", legacy_queryset),
+                    ("anotado", CuttingOrderRepository.get_all_active),
+                ):
+                    self._report(label, lambda: build().filter(pk__in=ids).order_by('pk'), options['repeat'])
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def _report(self, label, build_qs, repeat):
+        samples, counter = [], QueryCounter()
+        for _ in range(max(repeat, 1)):
+            counter.count = 0
+            with connection.execute_wrapper(counter):
+                t0 = time.perf_counter()
+                serialize(build_qs())
+                samples.append((time.perf_counter() - t0) * 1000)
+        queries = counter.count
+        self.stdout.write(
+            f"{label:<12} {queries:>8,} {statistics.median(samples):>10,.1f} {max(samples):>10,.1f}"
+        )
@@ -18,6 +18,12 @@ from apps.stocks.services import (
     ensure_subproduct_status_from_stock,
     sync_parent_product_stock,
 )
+from apps.stocks.services.reservations import (
+    available_qty,
+    refresh_subproduct_reservations,
+    reservation_summary_for_order,
+    reserved_qty_excluding_order,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -34,64 +40,41 @@ def _dec(x) -> Decimal:
 
 def _reserved_qty_for_subproduct(subproduct_id: int, exclude_order_id: Optional[int] = None) -> Decimal:
     """
-    Suma de cantidades reservadas (órdenes activas) para un subproducto.
-    Considera órdenes con estado 'pending' o 'in_process'.
+    Cantidades reservadas (órdenes activas) para un subproducto, leídas del
+    agregado SubproductReservation. Puede excluir lo reservado por una orden.
     """
-    qs = CuttingOrderItem.objects.filter(
-        subproduct_id=subproduct_id,
-        order__status=True,
-        order__workflow_status__in=['pending', 'in_process'],
-    )
-    if exclude_order_id:
-        qs = qs.exclude(order_id=exclude_order_id)
-    total = qs.aggregate(total=models.Sum('cutting_quantity'))['total'] or Decimal("0")
-    return _dec(total)
+    return _dec(reserved_qty_excluding_order(subproduct_id, exclude_order_id))
 
 
 def _available_considering_reservations(subproduct: Subproduct, exclude_order_id: Optional[int] = None) -> Decimal:
     """
     available = stock_fisico - reservas_lógicas (otras órdenes activas).
-    ⚠️ Cambia 'ss.quantity' por 'ss.current_stock' si tu modelo lo usa.
     """
-    try:
-        ss = SubproductStock.objects.get(subproduct=subproduct, status=True)
-        base_qty = _dec(ss.quantity)  # ⚠️ cambiar a ss.current_stock si corresponde
-    except SubproductStock.DoesNotExist:
-        base_qty = Decimal("0")
-    reserved = _reserved_qty_for_subproduct(subproduct.id, exclude_order_id=exclude_order_id)
-    return base_qty - reserved
+    return _dec(available_qty(subproduct.id, exclude_order_id=exclude_order_id))
 
 
 def active_reservations_summary_for_order(order: CuttingOrder) -> List[Dict]:
     """
     Devuelve, por cada ítem de la orden, si hay reservas activas (de otras órdenes)
     del mismo subproducto. Útil para warnings en frontend.
+    Cantidad de queries constante, sin importar la cantidad de ítems.
     """
     if not isinstance(order, CuttingOrder) or not order.pk:
         return []
 
+    subs = {it.subproduct_id: it.subproduct for it in order.items.select_related("subproduct__parent")}
+    summary = reservation_summary_for_order(order.id, subs)
+
     results: List[Dict] = []
-    for it in order.items.select_related("subproduct"):
-        sub = it.subproduct
-        other_reserved = _reserved_qty_for_subproduct(sub.id, exclude_order_id=order.id)
-        other_orders_count = (
-            CuttingOrderItem.objects
-            .filter(
-                subproduct_id=sub.id,
-                order__status=True,
-                order__workflow_status__in=['pending', 'in_process'],
-            )
-            .exclude(order_id=order.id)
-            .values("order_id").distinct().count()
-        )
-        available = _available_considering_reservations(sub, exclude_order_id=order.id)
-        if other_orders_count > 0 and other_reserved > 0:
+    for sub_id, sub in subs.items():
+        info = summary[sub_id]
+        if info["other_active_orders_count"] > 0 and info["other_reserved_qty"] > 0:
             results.append({
-                "subproduct_id": sub.id,
+                "subproduct_id": sub_id,
                 "subproduct_str": str(sub),
-                "other_active_orders_count": other_orders_count,
-                "other_reserved_qty": _dec(other_reserved),
-                "available_excluding_others": _dec(available),
+                "other_active_orders_count": info["other_active_orders_count"],
+                "other_reserved_qty": _dec(info["other_reserved_qty"]),
+                "available_excluding_others": _dec(info["available_excluding_others"]),
             })
     return results
 
@@ -241,6 +224,8 @@ def create_full_cutting_order(
             CuttingOrderItem(order=order, subproduct=sub, cutting_quantity=qty)
             for sub, qty in merged
         ])
+        # bulk_create no emite señales: actualizar el agregado de reservas
+        refresh_subproduct_reservations(sub.id for sub, _ in merged)
 
     # Devolver con relaciones resueltas
     return (
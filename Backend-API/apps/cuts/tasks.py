@@ -1,7 +1,7 @@
 # apps/cuts/tasks.py
 from celery import shared_task
 from django.contrib.auth import get_user_model
-from apps.notifications.services.notification_service import create_notification
+from apps.notifications.services.notification_service import create_notification, create_notifications
 
 User = get_user_model()
 
@@ -97,8 +97,8 @@ def notify_cut_status_change(actor_user_id: int, order_id: int, new_status: str)
 
     # --- COMPLETED → admins ---
     if new_status == "completed":
-        admins = User.objects.filter(is_active=True, is_staff=True)
-        if not admins.exists():
+        admins = list(User.objects.filter(is_active=True, is_staff=True).values_list("pk", flat=True))
+        if not admins:
             return
 
         title = f"Order de corte - Pedido N° {order.order_number} completada"
@@ -110,15 +110,14 @@ def notify_cut_status_change(actor_user_id: int, order_id: int, new_status: str)
         )
         payload = _order_payload(order, actor=actor)
 
-        for admin in admins:
-            create_notification(
-                user=admin,
-                notif_type="cut_status",
-                title=title,
-                message=message,
-                payload=payload,
-                actor=actor,
-            )
+        create_notifications(
+            admins,
+            notif_type="cut_status",
+            title=title,
+            message=message,
+            payload=payload,
+            actor=actor,
+        )
         return
 
     # --- CANCELLED → asignado ---
@@ -1,2 +0,0 @@
-import unittest
-raise unittest.SkipTest("Legacy tests")
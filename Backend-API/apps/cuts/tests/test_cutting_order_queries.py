@@ -0,0 +1,52 @@
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.cuts.api.repositories.cutting_order_repository import CuttingOrderRepository
+from apps.cuts.management.commands.bench_cutting_orders import legacy_queryset, seed_cutting_orders, serialize
+from apps.orders.choices import OrderStatus
+from apps.stocks.services.reservations import refresh_subproduct_reservations
+from apps.users.models.user_model import User
+
+# órdenes (con pedido y usuarios por JOIN) + ítems anotados con stock y reservas
+LIST_QUERIES = 2
+
+
+class CuttingOrderListQueryCountTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username="cutter", email="cutter@example.com", password="x", name="Cu", last_name="Tter",
+        )
+        cls.orders = seed_cutting_orders(cls.user, orders=200, items_per_order=10, tag="qc")
+        # Una orden cerrada deja de reservar: no descuenta lo propio ni cuenta como otra orden
+        closed = cls.orders[0].order
+        closed.status = OrderStatus.COMPLETED
+        closed.save(update_fields=["status"])
+        refresh_subproduct_reservations(cls.orders[0].items.values_list("subproduct_id", flat=True))
+
+    def _list(self, queryset, limit):
+        ids = [o.pk for o in self.orders[:limit]]
+        with CaptureQueriesContext(connection) as ctx:
+            data = serialize(queryset().filter(pk__in=ids).order_by("pk"))
+        return data, len(ctx.captured_queries)
+
+    def test_query_count_is_constant(self):
+        small, small_queries = self._list(CuttingOrderRepository.get_all_active, 5)
+        full, full_queries = self._list(CuttingOrderRepository.get_all_active, 200)
+
+        self.assertEqual(len(full), 200)
+        self.assertEqual(sum(len(o["items"]) for o in full), 2000)
+        self.assertEqual(small_queries, LIST_QUERIES)
+        self.assertEqual(full_queries, LIST_QUERIES)
+
+    def test_annotated_output_matches_per_item_queries(self):
+        annotated, _ = self._list(CuttingOrderRepository.get_all_active, 30)
+        legacy, _ = self._list(legacy_queryset, 30)
+
+        self.assertEqual(annotated, legacy)
+        self.assertTrue(any(o["warnings"] for o in annotated))
+        self.assertEqual(annotated[0]["workflow_status"], OrderStatus.COMPLETED)
+        self.assertEqual(annotated[0]["items"][0]["item_current_stock"], Decimal("100000.00"))
@@ -0,0 +1,33 @@
+from decimal import Decimal
+
+from django.test import TestCase
+from rest_framework import serializers
+
+from apps.cuts.api.serializers.cutting_order_serializer import CuttingOrderSerializer
+from apps.cuts.management.commands.bench_cutting_orders import seed_cutting_orders
+from apps.products.models.subproduct_model import Subproduct
+from apps.users.models.user_model import User
+
+
+class CuttingOrderValidationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username="validator", email="validator@example.com", password="x", name="Va", last_name="Lid",
+        )
+        (cls.order,) = seed_cutting_orders(cls.user, orders=1, items_per_order=2, subproducts=3, tag="val")
+        cls.subs = list(Subproduct.objects.filter(parent=cls.order.product).order_by("pk"))
+
+    def _validate(self, sub):
+        serializer = CuttingOrderSerializer(instance=self.order)
+        return serializer.validate({"items": [{"subproduct": sub, "cutting_quantity": Decimal("1")}]})
+
+    def test_items_on_inactive_subproducts_are_rejected(self):
+        inactive = self.subs[0]
+        Subproduct.objects.filter(pk=inactive.pk).update(status=False)
+
+        with self.assertRaises(serializers.ValidationError) as ctx:
+            self._validate(inactive)
+        self.assertIn(f"{inactive.pk} no está activo", str(ctx.exception.detail["items"]))
+
+        self.assertIn("items", self._validate(self.subs[1]))
@@ -1,8 +1,6 @@
 import logging
 from datetime import datetime
 
-from django.conf import settings
-from django.core.cache import cache
 from django.shortcuts import get_object_or_404
 from django.core.exceptions import ValidationError
 from rest_framework import status
@@ -11,6 +9,7 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from drf_spectacular.utils import extend_schema
 
+from apps.core.cache_aside import cached_response, list_cache_filters
 from apps.core.pagination import Pagination
 from apps.core.utils import broadcast_crud_event
 from apps.expenses.api.repositories import ExpensePaymentRepository
@@ -29,21 +28,16 @@ from apps.expenses.utils.cache_invalidation import (
     invalidate_expense_cache,
     invalidate_expense_payment_cache,
 )
-from apps.expenses.utils.cache_keys import expense_payment_list_cache_key
+from apps.expenses.utils.cache_keys import (
+    EXPENSE_PAYMENT_LIST_CACHE_PREFIX,
+    expense_payment_list_cache_key,
+)
 from apps.expenses.services.workflows import register_payment_allocation
 
 logger = logging.getLogger(__name__)
 LIST_TTL = 60 * 5
 
 
-def _cache_filters(request):
-    params = request.query_params.copy()
-    filters = {k: params.get(k) for k in params}
-    filters.setdefault("page", params.get("page", 1))
-    filters.setdefault("page_size", params.get("page_size", Pagination.page_size))
-    return filters
-
-
 def _parse_date(value: str | None):
     if not value:
         return None
@@ -70,27 +64,21 @@ def _parse_int(value: str | None):
 @permission_classes([IsAuthenticated])
 def expense_payment_list_create_view(request):
     if request.method == "GET":
-        filters = _cache_filters(request)
+        def build():
+            qs = ExpensePaymentRepository.list_payments(
+                person_legacy_id=_parse_int(request.query_params.get("person")),
+                status=request.query_params.get("status"),
+                date_from=_parse_date(request.query_params.get("date_from")),
+                date_to=_parse_date(request.query_params.get("date_to")),
+            )
+            paginator = Pagination()
+            page = paginator.paginate_queryset(qs, request)
+            serializer = ExpensePaymentSerializer(page, many=True)
+            return paginator.get_paginated_response(serializer.data)
+
+        filters = list_cache_filters(request)
         cache_key = expense_payment_list_cache_key(**filters)
-        use_cache = not settings.DEBUG
-        if use_cache:
-            cached = cache.get(cache_key)
-            if cached is not None:
-                return Response(cached)
-
-        qs = ExpensePaymentRepository.list_payments(
-            person_legacy_id=_parse_int(request.query_params.get("person")),
-            status=request.query_params.get("status"),
-            date_from=_parse_date(request.query_params.get("date_from")),
-            date_to=_parse_date(request.query_params.get("date_to")),
-        )
-        paginator = Pagination()
-        page = paginator.paginate_queryset(qs, request)
-        serializer = ExpensePaymentSerializer(page, many=True)
-        response = paginator.get_paginated_response(serializer.data)
-        if use_cache:
-            cache.set(cache_key, response.data, LIST_TTL)
-        return response
+        return cached_response(cache_key, build, LIST_TTL, prefix=EXPENSE_PAYMENT_LIST_CACHE_PREFIX)
 
     serializer = ExpensePaymentSerializer(data=request.data)
     serializer.is_valid(raise_exception=True)
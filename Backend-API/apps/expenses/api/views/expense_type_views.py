@@ -1,7 +1,5 @@
 import logging
 
-from django.conf import settings
-from django.core.cache import cache
 from django.shortcuts import get_object_or_404
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
@@ -9,6 +7,7 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from drf_spectacular.utils import extend_schema
 
+from apps.core.cache_aside import cached_response, list_cache_filters
 from apps.core.pagination import Pagination
 from apps.core.utils import broadcast_crud_event
 from apps.expenses.api.repositories import ExpenseTypeRepository
@@ -21,42 +20,28 @@ from apps.expenses.docs.expense_doc import (
     expense_type_delete_doc,
 )
 from apps.expenses.utils.cache_invalidation import invalidate_expense_type_cache
-from apps.expenses.utils.cache_keys import expense_type_list_cache_key
+from apps.expenses.utils.cache_keys import EXPENSE_TYPE_LIST_CACHE_PREFIX, expense_type_list_cache_key
 
 logger = logging.getLogger(__name__)
 LIST_TTL = 60 * 5
 
 
-def _cache_filters(request):
-    params = request.query_params.copy()
-    filters = {k: params.get(k) for k in params}
-    filters.setdefault("page", params.get("page", 1))
-    filters.setdefault("page_size", params.get("page_size", Pagination.page_size))
-    return filters
-
-
 @extend_schema(methods=["GET"], **expense_type_list_doc)
 @extend_schema(methods=["POST"], **expense_type_create_doc)
 @api_view(["GET", "POST"])
 @permission_classes([IsAuthenticated])
 def expense_type_list_create_view(request):
     if request.method == "GET":
-        filters = _cache_filters(request)
-        cache_key = expense_type_list_cache_key(**filters)
-        use_cache = not settings.DEBUG
-        if use_cache:
-            cached = cache.get(cache_key)
-            if cached is not None:
-                return Response(cached)
+        def build():
+            qs = ExpenseTypeRepository.list_types(search=request.query_params.get("search"))
+            paginator = Pagination()
+            page = paginator.paginate_queryset(qs, request)
+            serializer = ExpenseTypeSerializer(page, many=True)
+            return paginator.get_paginated_response(serializer.data)
 
-        qs = ExpenseTypeRepository.list_types(search=request.query_params.get("search"))
-        paginator = Pagination()
-        page = paginator.paginate_queryset(qs, request)
-        serializer = ExpenseTypeSerializer(page, many=True)
-        response = paginator.get_paginated_response(serializer.data)
-        if use_cache:
-            cache.set(cache_key, response.data, LIST_TTL)
-        return response
+        filters = list_cache_filters(request)
+        cache_key = expense_type_list_cache_key(**filters)
+        return cached_response(cache_key, build, LIST_TTL, prefix=EXPENSE_TYPE_LIST_CACHE_PREFIX)
 
     serializer = ExpenseTypeSerializer(data=request.data)
     serializer.is_valid(raise_exception=True)
@@ -1,4 +1,4 @@
-from apps.products.utils.redis_access import delete_keys_by_pattern
+from apps.products.utils.cache_tags import invalidate_tags
 from .cache_keys import (
     EXPENSE_LIST_CACHE_PREFIX,
     EXPENSE_PAYMENT_LIST_CACHE_PREFIX,
@@ -7,12 +7,12 @@ from .cache_keys import (
 
 
 def invalidate_expense_type_cache():
-    delete_keys_by_pattern(EXPENSE_TYPE_LIST_CACHE_PREFIX)
+    invalidate_tags(EXPENSE_TYPE_LIST_CACHE_PREFIX)
 
 
 def invalidate_expense_cache():
-    delete_keys_by_pattern(EXPENSE_LIST_CACHE_PREFIX)
+    invalidate_tags(EXPENSE_LIST_CACHE_PREFIX)
 
 
 def invalidate_expense_payment_cache():
-    delete_keys_by_pattern(EXPENSE_PAYMENT_LIST_CACHE_PREFIX)
+    invalidate_tags(EXPENSE_PAYMENT_LIST_CACHE_PREFIX)
@@ -0,0 +1,21 @@
+from .report_serializers import (
+    AccountBalanceSerializer,
+    CustomerAgingSerializer,
+    CustomerBalanceSerializer,
+    ReportParamsSerializer,
+)
+from .statement_serializers import (
+    CustomerStatementSerializer,
+    StatementLineSerializer,
+    StatementParamsSerializer,
+)
+
+__all__ = [
+    "AccountBalanceSerializer",
+    "CustomerAgingSerializer",
+    "CustomerBalanceSerializer",
+    "CustomerStatementSerializer",
+    "ReportParamsSerializer",
+    "StatementLineSerializer",
+    "StatementParamsSerializer",
+]
@@ -0,0 +1,33 @@
+from django.utils import timezone
+from rest_framework import serializers
+
+from apps.financial.choices import CurrencyChoices
+
+
+class ReportParamsSerializer(serializers.Serializer):
+    """Fecha de corte (hoy por defecto) y moneda de los reportes de saldos."""
+
+    currency = serializers.ChoiceField(choices=CurrencyChoices.choices, default=CurrencyChoices.ARS)
+    as_of = serializers.DateField(required=False)
+
+    def validate(self, attrs):
+        attrs.setdefault("as_of", timezone.localdate())
+        return attrs
+
+
+class CustomerBalanceSerializer(serializers.Serializer):
+    customer_id = serializers.IntegerField()
+    customer_name = serializers.CharField()
+    balance = serializers.DecimalField(max_digits=18, decimal_places=2)
+
+
+class CustomerAgingSerializer(CustomerBalanceSerializer):
+    days_0_30 = serializers.DecimalField(max_digits=18, decimal_places=2, source="0_30")
+    days_31_60 = serializers.DecimalField(max_digits=18, decimal_places=2, source="31_60")
+    days_61_90 = serializers.DecimalField(max_digits=18, decimal_places=2, source="61_90")
+    over_90 = serializers.DecimalField(max_digits=18, decimal_places=2)
+
+
+class AccountBalanceSerializer(serializers.Serializer):
+    account_code = serializers.CharField()
+    balance = serializers.DecimalField(max_digits=18, decimal_places=2)
@@ -0,0 +1,60 @@
+from datetime import timedelta
+
+from django.utils import timezone
+from rest_framework import serializers
+
+from apps.financial.choices import CurrencyChoices
+from apps.financial.models import ReceivableLedgerEntry
+
+MAX_STATEMENT_DAYS = 366 * 5
+
+
+class StatementParamsSerializer(serializers.Serializer):
+    """Valida el rango pedido; por defecto, el mes en curso."""
+
+    currency = serializers.ChoiceField(choices=CurrencyChoices.choices, default=CurrencyChoices.ARS)
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+
+    def validate(self, attrs):
+        today = timezone.localdate()
+        attrs.setdefault("date_to", today)
+        attrs.setdefault("date_from", attrs["date_to"].replace(day=1))
+        if attrs["date_from"] > attrs["date_to"]:
+            raise serializers.ValidationError("date_from no puede ser posterior a date_to.")
+        if attrs["date_to"] - attrs["date_from"] > timedelta(days=MAX_STATEMENT_DAYS):
+            raise serializers.ValidationError("El rango no puede superar los 5 años.")
+        return attrs
+
+
+class StatementLineSerializer(serializers.ModelSerializer):
+    running_balance = serializers.DecimalField(max_digits=18, decimal_places=2, read_only=True)
+
+    class Meta:
+        model = ReceivableLedgerEntry
+        fields = [
+            "id",
+            "posted_at",
+            "entry_kind",
+            "entry_source",
+            "description",
+            "reference_number",
+            "debit_amount",
+            "credit_amount",
+            "running_balance",
+        ]
+
+
+class CustomerStatementSerializer(serializers.Serializer):
+    customer_id = serializers.IntegerField()
+    customer_name = serializers.CharField()
+    currency = serializers.CharField()
+    date_from = serializers.DateField()
+    date_to = serializers.DateField()
+    opening_balance = serializers.DecimalField(max_digits=18, decimal_places=2)
+    opening_snapshot_end = serializers.DateField(allow_null=True)
+    debit_total = serializers.DecimalField(max_digits=18, decimal_places=2)
+    credit_total = serializers.DecimalField(max_digits=18, decimal_places=2)
+    closing_balance = serializers.DecimalField(max_digits=18, decimal_places=2)
+    entries = StatementLineSerializer(many=True)
+    truncated = serializers.BooleanField()
@@ -0,0 +1,13 @@
+from django.urls import path
+
+from apps.financial.api.views.report_views import account_balances_view, customer_aging_view, customer_balances_view
+from apps.financial.api.views.statement_views import customer_statement_view
+
+app_name = "financial-api"
+
+urlpatterns = [
+    path("customers/<int:customer_id>/statement/", customer_statement_view, name="customer-statement"),
+    path("reports/balances/", customer_balances_view, name="customer-balances"),
+    path("reports/aging/", customer_aging_view, name="customer-aging"),
+    path("reports/account-balances/", account_balances_view, name="account-balances"),
+]
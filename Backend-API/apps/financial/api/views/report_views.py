@@ -0,0 +1,66 @@
+from drf_spectacular.utils import extend_schema
+from rest_framework.decorators import api_view, permission_classes
+
+from apps.accounting.services.ledger_snapshots import account_balances
+from apps.core.db_routing import for_read, replica_reads
+from apps.core.pagination import Pagination
+from apps.customers.models import Customer
+from apps.financial.api.serializers import (
+    AccountBalanceSerializer,
+    CustomerAgingSerializer,
+    CustomerBalanceSerializer,
+    ReportParamsSerializer,
+)
+from apps.financial.docs.financial_doc import account_balances_doc, customer_aging_doc, customer_balances_doc
+from apps.financial.services.receivable_reports import customer_aging, customer_balances
+from apps.users.permissions import CanViewFinancialReports
+
+
+def _params(request):
+    params = ReportParamsSerializer(data=request.query_params)
+    params.is_valid(raise_exception=True)
+    return params.validated_data
+
+
+def _paginated(request, rows, serializer_class, with_names=False):
+    paginator = Pagination()
+    page = paginator.paginate_queryset(rows, request)
+    if with_names:
+        # Nombres sólo de la página
+        names = dict(
+            for_read(Customer.objects.filter(id__in=[r["customer_id"] for r in page])).values_list("id", "name")
+        )
+        for row in page:
+            row["customer_name"] = names.get(row["customer_id"], "")
+    return paginator.get_paginated_response(serializer_class(page, many=True).data)
+
+
+@extend_schema(**customer_balances_doc)
+@api_view(["GET"])
+@permission_classes([CanViewFinancialReports])
+@replica_reads
+def customer_balances_view(request):
+    params = _params(request)
+    balances = customer_balances(params["as_of"], params["currency"])
+    rows = [{"customer_id": c, "balance": b} for c, b in sorted(balances.items())]
+    return _paginated(request, rows, CustomerBalanceSerializer, with_names=True)
+
+
+@extend_schema(**customer_aging_doc)
+@api_view(["GET"])
+@permission_classes([CanViewFinancialReports])
+@replica_reads
+def customer_aging_view(request):
+    params = _params(request)
+    rows = customer_aging(params["as_of"], params["currency"])
+    return _paginated(request, rows, CustomerAgingSerializer, with_names=True)
+
+
+@extend_schema(**account_balances_doc)
+@api_view(["GET"])
+@permission_classes([CanViewFinancialReports])
+@replica_reads
+def account_balances_view(request):
+    params = _params(request)
+    rows = [{"account_code": code, "balance": b} for code, b in account_balances(params["as_of"]).items()]
+    return _paginated(request, rows, AccountBalanceSerializer)
@@ -0,0 +1,54 @@
+from django.shortcuts import get_object_or_404
+from drf_spectacular.utils import extend_schema
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+
+from apps.core.db_routing import replica_reads
+from apps.customers.models import Customer
+from apps.financial.api.serializers import CustomerStatementSerializer, StatementParamsSerializer
+from apps.financial.docs.financial_doc import customer_statement_doc
+from apps.financial.repositories import ReceivableLedgerRepository
+from apps.users.permissions import CanViewFinancialReports
+
+STATEMENT_MAX_LINES = 1000
+
+
+@extend_schema(**customer_statement_doc)
+@api_view(["GET"])
+@permission_classes([CanViewFinancialReports])
+@replica_reads
+def customer_statement_view(request, customer_id: int):
+    """Estado de cuenta de un cliente para cualquier rango, sin recorrer el historial completo."""
+    customer = get_object_or_404(Customer.objects.only("id", "name"), pk=customer_id)
+    params = StatementParamsSerializer(data=request.query_params)
+    params.is_valid(raise_exception=True)
+    currency = params.validated_data["currency"]
+    date_from, date_to = params.validated_data["date_from"], params.validated_data["date_to"]
+
+    opening, snapshot = ReceivableLedgerRepository.opening_balance(customer.id, currency, date_from)
+    entries_qs = ReceivableLedgerRepository.entries_between(customer.id, currency, date_from, date_to)
+    debit_total, credit_total = ReceivableLedgerRepository.totals(entries_qs)
+
+    entries = list(entries_qs[:STATEMENT_MAX_LINES + 1])
+    truncated = len(entries) > STATEMENT_MAX_LINES
+    entries = entries[:STATEMENT_MAX_LINES]
+    running = opening
+    for entry in entries:
+        running += entry.debit_amount - entry.credit_amount
+        entry.running_balance = running
+
+    serializer = CustomerStatementSerializer({
+        "customer_id": customer.id,
+        "customer_name": customer.name,
+        "currency": currency,
+        "date_from": date_from,
+        "date_to": date_to,
+        "opening_balance": opening,
+        "opening_snapshot_end": snapshot.period_end if snapshot else None,
+        "debit_total": debit_total,
+        "credit_total": credit_total,
+        "closing_balance": opening + debit_total - credit_total,
+        "entries": entries,
+        "truncated": truncated,
+    })
+    return Response(serializer.data)
@@ -0,0 +1,86 @@
+from drf_spectacular.utils import OpenApiParameter, OpenApiResponse
+
+from apps.financial.api.serializers import (
+    AccountBalanceSerializer,
+    CustomerAgingSerializer,
+    CustomerBalanceSerializer,
+    CustomerStatementSerializer,
+)
+
+FINANCIAL_TAG = "Financial"
+
+customer_statement_doc = {
+    "tags": [FINANCIAL_TAG],
+    "summary": "Estado de cuenta de cliente",
+    "description": (
+        "Movimientos de la cuenta corriente en un rango de fechas con saldo inicial, "
+        "totales y saldo corrido por línea. El saldo inicial sale del último snapshot "
+        "(CustomerStatement) anterior al rango más los movimientos intermedios. "
+        "Devuelve hasta 1000 líneas; `truncated` indica si hay más (acotar el rango)."
+    ),
+    "operation_id": "customer_statement",
+    "parameters": [
+        OpenApiParameter("currency", location=OpenApiParameter.QUERY, description="Moneda (ARS por defecto)", type=str),
+        OpenApiParameter("date_from", location=OpenApiParameter.QUERY, description="Desde (YYYY-MM-DD)", type=str),
+        OpenApiParameter("date_to", location=OpenApiParameter.QUERY, description="Hasta (YYYY-MM-DD)", type=str),
+    ],
+    "responses": {
+        200: OpenApiResponse(response=CustomerStatementSerializer),
+        400: OpenApiResponse(description="Parámetros inválidos"),
+        404: OpenApiResponse(description="Cliente inexistente"),
+    },
+}
+
+_report_parameters = [
+    OpenApiParameter("as_of", location=OpenApiParameter.QUERY, description="Fecha de corte (YYYY-MM-DD, hoy por defecto)", type=str),
+    OpenApiParameter("page", location=OpenApiParameter.QUERY, description="Número de página", type=int),
+    OpenApiParameter("page_size", location=OpenApiParameter.QUERY, description="Tamaño de página (máx. 100)", type=int),
+]
+_currency_parameter = OpenApiParameter(
+    "currency", location=OpenApiParameter.QUERY, description="Moneda (ARS por defecto)", type=str,
+)
+
+customer_balances_doc = {
+    "tags": [FINANCIAL_TAG],
+    "summary": "Saldos de clientes",
+    "description": (
+        "Saldo de cuenta corriente por cliente a la fecha de corte (sólo distintos de cero). "
+        "Parte del último snapshot mensual cerrado y suma los movimientos posteriores."
+    ),
+    "operation_id": "customer_balances_report",
+    "parameters": [_currency_parameter, *_report_parameters],
+    "responses": {
+        200: OpenApiResponse(response=CustomerBalanceSerializer(many=True)),
+        400: OpenApiResponse(description="Parámetros inválidos"),
+    },
+}
+
+customer_aging_doc = {
+    "tags": [FINANCIAL_TAG],
+    "summary": "Antigüedad de saldos de clientes",
+    "description": (
+        "Saldo deudor por cliente repartido en tramos de 0-30, 31-60, 61-90 y más de 90 días "
+        "(los cobros cancelan primero lo más antiguo). Usa los snapshots mensuales más la cola."
+    ),
+    "operation_id": "customer_aging_report",
+    "parameters": [_currency_parameter, *_report_parameters],
+    "responses": {
+        200: OpenApiResponse(response=CustomerAgingSerializer(many=True)),
+        400: OpenApiResponse(description="Parámetros inválidos"),
+    },
+}
+
+account_balances_doc = {
+    "tags": [FINANCIAL_TAG],
+    "summary": "Saldos por cuenta contable",
+    "description": (
+        "Saldo (debe − haber) por cuenta a la fecha de corte, desde el último LedgerSnapshot "
+        "cerrado más las líneas de asientos registrados posteriores."
+    ),
+    "operation_id": "account_balances_report",
+    "parameters": _report_parameters,
+    "responses": {
+        200: OpenApiResponse(response=AccountBalanceSerializer(many=True)),
+        400: OpenApiResponse(description="Parámetros inválidos"),
+    },
+}
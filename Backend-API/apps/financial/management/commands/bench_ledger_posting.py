@@ -0,0 +1,84 @@
+import random
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from apps.customers.models import Customer
+from apps.financial.choices import LedgerEntryKind, LedgerEntrySource
+from apps.financial.models import ReceivableLedgerEntry
+from apps.financial.services.ledger_posting import RECEIVABLES, post_ledger_entries, post_ledger_entry, rebuild_stream
+
+
+def legacy_post(entry, user=None):
+    """Camino sin motor: guardar y recalcular el historial completo del cliente."""
+    entry.save(user=user)
+    rebuild_stream(RECEIVABLES, entry.customer_id, entry.currency)
+    return entry
+
+
+class _QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide la imputación de movimientos retroactivos y al final sobre un cliente con "
+        "N movimientos: recálculo completo del historial contra el motor incremental. "
+        "El cliente de prueba se borra al final."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--history', type=int, default=5000, help='Movimientos previos del cliente')
+        parser.add_argument('--postings', type=int, default=20, help='Imputaciones por variante y caso')
+
+    def handle(self, *args, **options):
+        history, postings = options['history'], options['postings']
+        if history < 1 or postings < 1:
+            raise CommandError("--history y --postings deben ser positivos")
+
+        customer = Customer.objects.create(name=f"bench-ledger-{random.randint(0, 10**9)}")
+        start = timezone.now() - timedelta(days=history)
+        try:
+            t0 = time.perf_counter()
+            post_ledger_entries(
+                [self._entry(customer, start + timedelta(days=n)) for n in range(history)]
+            )
+            self.stdout.write(f"{history:,} movimientos sembrados en {time.perf_counter() - t0:,.2f}s (lote)")
+            self.stdout.write(f"{'caso':<12} {'variante':<10} {'ms/imputación':>14} {'queries':>8}")
+            for case, offset in (("al final", lambda: timedelta(days=history + 1)),
+                                 ("retroactivo", lambda: timedelta(days=random.randint(0, history // 2)))):
+                for label, post in (("anterior", legacy_post), ("motor", post_ledger_entry)):
+                    counter = _QueryCounter()
+                    with connection.execute_wrapper(counter):
+                        t0 = time.perf_counter()
+                        for _ in range(postings):
+                            post(self._entry(customer, start + offset()))
+                        elapsed = time.perf_counter() - t0
+                    self.stdout.write(
+                        f"{case:<12} {label:<10} {elapsed * 1000 / postings:>14,.2f} {counter.count / postings:>8,.1f}"
+                    )
+            drift = rebuild_stream(RECEIVABLES, customer.id, "ARS")
+            if drift:
+                raise CommandError(f"El motor dejó {drift} saldos inconsistentes")
+        finally:
+            ReceivableLedgerEntry.objects.filter(customer=customer).delete()
+            Customer.objects.filter(pk=customer.pk).delete()
+
+    def _entry(self, customer, posted_at):
+        return ReceivableLedgerEntry(
+            customer=customer,
+            entry_kind=LedgerEntryKind.ADJUSTMENT,
+            entry_source=LedgerEntrySource.MANUAL,
+            posted_at=posted_at,
+            debit_amount=Decimal(random.randint(0, 10_000)) / 100,
+            credit_amount=Decimal(random.randint(0, 10_000)) / 100,
+        )
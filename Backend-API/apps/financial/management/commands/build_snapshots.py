@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.accounting.services.ledger_snapshots import build_ledger_snapshots
+from apps.financial.services.periods import parse_month
+from apps.financial.services.statement_snapshots import SNAPSHOT_BATCH_SIZE, build_customer_statements
+
+
+class Command(BaseCommand):
+    help = (
+        "Construye los snapshots mensuales de cuenta corriente (CustomerStatement) y del "
+        "mayor contable (LedgerSnapshot). Sin --from retoma desde el último mes construido, "
+        "igual que la tarea programada."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--from', dest='start', help='Reconstruir desde este mes (YYYY-MM)')
+        parser.add_argument('--batch-size', type=int, default=SNAPSHOT_BATCH_SIZE, help='Clientes/cuentas por lote')
+        parser.add_argument('--max-months', type=int, default=24, help='Meses como máximo en esta corrida')
+        parser.add_argument('--only', choices=['customers', 'accounts'], help='Construir sólo uno de los dos')
+
+    def handle(self, *args, **options):
+        try:
+            start = parse_month(options['start']) if options['start'] else None
+        except ValueError:
+            raise CommandError('--from tiene que tener formato YYYY-MM')
+        if options['batch_size'] < 1 or options['max_months'] < 1:
+            raise CommandError('--batch-size y --max-months tienen que ser positivos')
+
+        builders = {'customers': build_customer_statements, 'accounts': build_ledger_snapshots}
+        for name, build in builders.items():
+            if options['only'] and options['only'] != name:
+                continue
+            result = build(start=start, batch_size=options['batch_size'], max_months=options['max_months'])
+            self.stdout.write(f"{name}: {result['rows']} snapshots en {result['months']} meses")
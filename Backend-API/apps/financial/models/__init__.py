@@ -9,7 +9,7 @@ from .commercial_document import (
     QuoteDocument,
     DocumentLink,
 )
-from .ledger import ReceivableLedgerEntry, CustomerStatement
+from .ledger import ReceivableLedgerEntry, CustomerStatement, SnapshotRebuildMark
 
 __all__ = [
     "CommercialDocument",
@@ -23,4 +23,5 @@ __all__ = [
     "DocumentLink",
     "ReceivableLedgerEntry",
     "CustomerStatement",
+    "SnapshotRebuildMark",
 ]
@@ -75,6 +75,10 @@ class ReceivableLedgerEntry(BaseModel):
         indexes = [
             models.Index(fields=["customer", "posted_at"]),
             models.Index(fields=["currency"]),
+            # Stream (cliente, moneda) en orden de imputación: último saldo y ventanas retroactivas
+            models.Index(fields=["customer", "currency", "posted_at", "id"], name="receivable_stream_idx"),
+            # Cola posterior al último snapshot (reportes de saldos y antigüedad)
+            models.Index(fields=["currency", "posted_at"], name="receivable_tail_idx"),
         ]
 
 
@@ -107,3 +111,31 @@ class CustomerStatement(BaseModel):
         verbose_name_plural = "Estados de cuenta"
         unique_together = ("customer", "currency", "period_start", "period_end")
         ordering = ["-period_end", "customer"]
+        indexes = [
+            models.Index(fields=["currency", "period_start"], name="statement_period_idx"),
+        ]
+
+
+class SnapshotRebuildMark(models.Model):
+    """
+    Desde qué mes hay que reconstruir una serie de snapshots por movimientos
+    retroactivos. Se escribe en la misma transacción que la imputación, así
+    que no se pierde aunque se vacíe la cache.
+
+    ``built_through`` es el último mes construido completo (todos los lotes):
+    los lectores no usan meses posteriores, que pueden estar a medio construir.
+    """
+
+    name = models.CharField(max_length=64, unique=True)
+    dirty_from = models.DateField(null=True, blank=True)
+    built_through = models.DateField(null=True, blank=True)
+    # Cambia en cada marca: el builder sólo limpia lo que leyó al arrancar
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Marca de reconstrucción de snapshots"
+        verbose_name_plural = "Marcas de reconstrucción de snapshots"
+
+    def __str__(self) -> str:
+        return f"{self.name}: {self.dirty_from or '-'}"
@@ -0,0 +1,5 @@
+from .ledger_repository import ReceivableLedgerRepository
+
+__all__ = [
+    "ReceivableLedgerRepository",
+]
@@ -0,0 +1,58 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.db import models
+from django.db.models import Sum
+
+from apps.core.db_routing import for_read
+from apps.financial.models import CustomerStatement, ReceivableLedgerEntry
+from apps.financial.services.periods import start_of_day
+
+ZERO = Decimal("0")
+
+
+class ReceivableLedgerRepository:
+    """Lecturas de cuenta corriente de clientes (van a la réplica si está habilitada)."""
+
+    @staticmethod
+    def entries(customer_id: int, currency: str) -> models.QuerySet:
+        return for_read(
+            ReceivableLedgerEntry.objects.filter(customer_id=customer_id, currency=currency, status=True)
+        )
+
+    @staticmethod
+    def entries_between(customer_id: int, currency: str, date_from: date, date_to: date) -> models.QuerySet:
+        return ReceivableLedgerRepository.entries(customer_id, currency).filter(
+            posted_at__gte=start_of_day(date_from),
+            posted_at__lt=start_of_day(date_to + timedelta(days=1)),
+        ).order_by("posted_at", "id")
+
+    @staticmethod
+    def totals(queryset: models.QuerySet) -> tuple[Decimal, Decimal]:
+        sums = queryset.order_by().aggregate(debit=Sum("debit_amount"), credit=Sum("credit_amount"))
+        return sums["debit"] or ZERO, sums["credit"] or ZERO
+
+    @staticmethod
+    def last_statement_before(customer_id: int, currency: str, day: date) -> CustomerStatement | None:
+        return (
+            for_read(CustomerStatement.objects.filter(customer_id=customer_id, currency=currency, status=True))
+            .filter(period_end__lt=day)
+            .order_by("-period_end")
+            .first()
+        )
+
+    @staticmethod
+    def opening_balance(customer_id: int, currency: str, day: date) -> tuple[Decimal, CustomerStatement | None]:
+        """
+        Saldo al inicio de ``day``: cierre del último snapshot anterior más los
+        movimientos entre ese snapshot y ``day``. Nunca suma desde el inicio del
+        historial salvo que no haya snapshots.
+        """
+        statement = ReceivableLedgerRepository.last_statement_before(customer_id, currency, day)
+        gap = ReceivableLedgerRepository.entries(customer_id, currency).filter(posted_at__lt=start_of_day(day))
+        opening = ZERO
+        if statement is not None:
+            opening = statement.closing_balance
+            gap = gap.filter(posted_at__gte=start_of_day(statement.period_end + timedelta(days=1)))
+        debit, credit = ReceivableLedgerRepository.totals(gap)
+        return opening + debit - credit, statement
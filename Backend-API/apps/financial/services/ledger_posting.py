@@ -0,0 +1,230 @@
+# apps/financial/services/ledger_posting.py
+"""
+Motor de imputación de cuentas corrientes (clientes y proveedores).
+
+Cada (titular, moneda) es un stream ordenado por (posted_at, id) y
+``balance_after`` es el saldo acumulado Σ(debe − haber) hasta ese movimiento.
+
+- Alta al final (caso normal): saldo del último movimiento + delta; un SELECT
+  por índice y un INSERT, sin importar el largo del historial.
+- Alta retroactiva: se inserta con el saldo de su predecesor y la ventana
+  posterior a su fecha se corre con un único ``UPDATE balance_after + delta``;
+  el historial anterior no se toca.
+- Lote (importaciones): se agrupa por stream; el acumulado se calcula en
+  memoria desde la fecha más vieja del lote, con ``bulk_create`` para los
+  nuevos y ``bulk_update`` sólo para los existentes cuyo saldo cambió.
+- Cada stream se serializa con su propio lock: advisory lock de transacción en
+  PostgreSQL (sólo ese titular + moneda); en otros motores, ``select_for_update``
+  del último movimiento.
+- Los snapshots ``CustomerStatement`` de los períodos afectados se ajustan en
+  la misma transacción; si el movimiento cae en un mes cerrado, además se marca
+  para que el builder de snapshots lo revise (ver statement_snapshots).
+"""
+import hashlib
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+from functools import lru_cache
+from typing import Iterable, List, Optional
+
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from apps.financial.models.ledger import CustomerStatement, ReceivableLedgerEntry
+from apps.financial.services.periods import month_start
+from apps.financial.services.statement_snapshots import mark_statements_dirty
+from apps.payables.models.ledger import SupplierLedgerEntry
+
+ZERO = Decimal("0")
+BULK_BATCH_SIZE = 500
+STREAM_ORDER = ("posted_at", "id")
+
+
+@dataclass(frozen=True)
+class LedgerSpec:
+    model: type
+    owner_field: str
+    statement_model: Optional[type] = None
+
+    @property
+    def owner_attname(self) -> str:
+        return f"{self.owner_field}_id"
+
+
+RECEIVABLES = LedgerSpec(ReceivableLedgerEntry, "customer", CustomerStatement)
+PAYABLES = LedgerSpec(SupplierLedgerEntry, "supplier")
+
+
+@lru_cache(maxsize=None)
+def _specs():
+    return {spec.model: spec for spec in (RECEIVABLES, PAYABLES)}
+
+
+def spec_for(entry) -> LedgerSpec:
+    try:
+        return _specs()[type(entry)]
+    except KeyError:
+        raise ValueError(f"{type(entry).__name__} no es un movimiento de cuenta corriente") from None
+
+
+def entry_delta(entry) -> Decimal:
+    return Decimal(entry.debit_amount or 0) - Decimal(entry.credit_amount or 0)
+
+
+def stream_queryset(spec: LedgerSpec, owner_id: int, currency: str):
+    return spec.model.objects.filter(**{spec.owner_attname: owner_id}, currency=currency, status=True)
+
+
+def _day(value) -> date:
+    return timezone.localdate(value) if timezone.is_aware(value) else value.date()
+
+
+def _lock_stream(spec: LedgerSpec, owner_id: int, currency: str):
+    """
+    Serializa las imputaciones de un stream y devuelve su último movimiento
+    como ``{'posted_at', 'balance_after'}`` (o None).
+    """
+    stream = stream_queryset(spec, owner_id, currency).order_by("-posted_at", "-id")
+    connection = connections[DEFAULT_DB_ALIAS]
+    if connection.vendor == "postgresql":
+        raw = f"{spec.model._meta.db_table}:{owner_id}:{currency}".encode()
+        key = int.from_bytes(hashlib.blake2b(raw, digest_size=8).digest(), "big", signed=True)
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_xact_lock(%s)", [key])
+    else:
+        stream = stream.select_for_update()
+    return stream.values("posted_at", "balance_after").first()
+
+
+def _apply_to_statements(spec: LedgerSpec, owner_id: int, currency: str, entries: List) -> None:
+    """Corre los snapshots cuyo período contiene o sigue a los movimientos nuevos."""
+    if spec.statement_model is None or not entries:
+        return
+    moves = [(_day(e.posted_at), e) for e in entries]
+    first_day = min(day for day, _ in moves)
+    if first_day < month_start(timezone.localdate()):
+        # Mes ya cerrado: el builder tiene que revisar los streams sin snapshot
+        mark_statements_dirty(first_day)
+    statements = list(
+        spec.statement_model.objects.filter(
+            **{spec.owner_attname: owner_id},
+            currency=currency,
+            status=True,
+            period_end__gte=first_day,
+        )
+    )
+    for statement in statements:
+        for day, entry in moves:
+            delta = entry_delta(entry)
+            if day < statement.period_start:
+                statement.opening_balance += delta
+            elif day <= statement.period_end:
+                statement.debit_total += Decimal(entry.debit_amount or 0)
+                statement.credit_total += Decimal(entry.credit_amount or 0)
+                if statement.last_entry_at is None or entry.posted_at > statement.last_entry_at:
+                    statement.last_entry_at = entry.posted_at
+            else:
+                continue
+            statement.closing_balance += delta
+    if statements:
+        spec.statement_model.objects.bulk_update(
+            statements,
+            ["opening_balance", "debit_total", "credit_total", "closing_balance", "last_entry_at"],
+        )
+
+
+def post_ledger_entry(entry, user=None):
+    """Imputa un movimiento (todavía sin guardar) y mantiene los saldos de su stream."""
+    spec = spec_for(entry)
+    owner_id = getattr(entry, spec.owner_attname)
+    delta = entry_delta(entry)
+    with transaction.atomic():
+        last = _lock_stream(spec, owner_id, entry.currency)
+        stream = stream_queryset(spec, owner_id, entry.currency)
+        if last is None or entry.posted_at >= last["posted_at"]:
+            entry.balance_after = (last["balance_after"] if last else ZERO) + delta
+            entry.save(user=user)
+        else:
+            previous = (
+                stream.filter(posted_at__lte=entry.posted_at)
+                .order_by("-posted_at", "-id")
+                .values_list("balance_after", flat=True)
+                .first()
+            )
+            entry.balance_after = (previous if previous is not None else ZERO) + delta
+            entry.save(user=user)
+            if delta:
+                # Mismo posted_at y id menor va antes: sólo se corre lo estrictamente posterior
+                stream.filter(posted_at__gt=entry.posted_at).update(balance_after=F("balance_after") + delta)
+        _apply_to_statements(spec, owner_id, entry.currency, [entry])
+    return entry
+
+
+def post_ledger_entries(entries: Iterable, user=None, batch_size: int = BULK_BATCH_SIZE) -> List:
+    """
+    Imputa un lote (importaciones). Devuelve los movimientos creados; dentro
+    de un stream, los de igual ``posted_at`` conservan el orden del lote.
+    """
+    streams = defaultdict(list)
+    for entry in entries:
+        spec = spec_for(entry)
+        streams[(spec, getattr(entry, spec.owner_attname), entry.currency)].append(entry)
+
+    created = []
+    with transaction.atomic():
+        # Orden fijo de locks: dos lotes con streams en común no se bloquean mutuamente
+        for spec, owner_id, currency in sorted(streams, key=lambda s: (s[0].model._meta.label, s[1], s[2])):
+            items = sorted(streams[(spec, owner_id, currency)], key=lambda e: e.posted_at)
+            _lock_stream(spec, owner_id, currency)
+            stream = stream_queryset(spec, owner_id, currency)
+            first_at = items[0].posted_at
+            opening = (
+                stream.filter(posted_at__lt=first_at)
+                .order_by("-posted_at", "-id")
+                .values_list("balance_after", flat=True)
+                .first()
+            )
+            window = list(
+                stream.filter(posted_at__gte=first_at)
+                .order_by(*STREAM_ORDER)
+                .only("id", "posted_at", "debit_amount", "credit_amount", "balance_after")
+            )
+            merged = sorted(
+                [(e.posted_at, 0, e.id, e) for e in window] + [(e.posted_at, 1, n, e) for n, e in enumerate(items)],
+                key=lambda row: row[:3],
+            )
+            running = opening if opening is not None else ZERO
+            changed = []
+            for _, is_new, _, entry in merged:
+                running += entry_delta(entry)
+                if is_new:
+                    entry.balance_after = running
+                    if user is not None:
+                        entry.created_by = user
+                elif entry.balance_after != running:
+                    entry.balance_after = running
+                    changed.append(entry)
+
+            created += spec.model.objects.bulk_create(items, batch_size=batch_size)
+            if changed:
+                spec.model.objects.bulk_update(changed, ["balance_after"], batch_size=batch_size)
+            _apply_to_statements(spec, owner_id, currency, items)
+    return created
+
+
+def rebuild_stream(spec: LedgerSpec, owner_id: int, currency: str, batch_size: int = BULK_BATCH_SIZE) -> int:
+    """Recalcula todo el stream desde cero (reparación). Devuelve filas corregidas."""
+    with transaction.atomic():
+        _lock_stream(spec, owner_id, currency)
+        running, changed = ZERO, []
+        for entry in stream_queryset(spec, owner_id, currency).order_by(*STREAM_ORDER).only(
+            "id", "debit_amount", "credit_amount", "balance_after"
+        ).iterator(chunk_size=2000):
+            running += entry_delta(entry)
+            if entry.balance_after != running:
+                entry.balance_after = running
+                changed.append(entry)
+        spec.model.objects.bulk_update(changed, ["balance_after"], batch_size=batch_size)
+    return len(changed)
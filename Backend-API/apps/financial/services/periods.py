@@ -0,0 +1,47 @@
+# apps/financial/services/periods.py
+"""Períodos mensuales de los snapshots (``CustomerStatement`` y ``LedgerSnapshot``)."""
+from datetime import date, datetime, time, timedelta
+from typing import Iterator
+
+from django.utils import timezone
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def next_month(day: date) -> date:
+    return (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def previous_month(day: date) -> date:
+    return (month_start(day) - timedelta(days=1)).replace(day=1)
+
+
+def month_end(day: date) -> date:
+    return next_month(day) - timedelta(days=1)
+
+
+def month_label(day: date) -> str:
+    """Formato de ``LedgerSnapshot.period``: 'YYYY-MM'."""
+    return day.strftime("%Y-%m")
+
+
+def parse_month(label: str) -> date:
+    return datetime.strptime(label, "%Y-%m").date()
+
+
+def months_between(first: date, last: date) -> Iterator[date]:
+    """Inicio de cada mes desde ``first`` hasta ``last`` inclusive."""
+    current = month_start(first)
+    while current <= last:
+        yield current
+        current = next_month(current)
+
+
+def start_of_day(day: date) -> datetime:
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def last_closed_month(today: date | None = None) -> date:
+    return previous_month(today or timezone.localdate())
@@ -0,0 +1,237 @@
+# apps/financial/services/statement_snapshots.py
+"""
+Snapshots mensuales de cuenta corriente (``CustomerStatement``).
+
+- Un snapshot por (cliente, moneda, mes cerrado) con saldo inicial, debe,
+  haber y cierre, para cada stream con movimientos en el mes o saldo distinto
+  de cero. Un cliente sin fila para un mes construido tiene saldo cero.
+- Se construye mes a mes y por lotes de ``SNAPSHOT_BATCH_SIZE`` clientes: por
+  lote, un SELECT de los cierres del mes anterior, un GROUP BY (cliente,
+  moneda) sobre los movimientos del mes y un upsert. Cada lote es una
+  transacción corta, así que un mes en construcción queda a medias: la marca
+  guarda en ``built_through`` el último mes completo (baja al arrancar una
+  reconstrucción y avanza al terminar cada mes) y los reportes leen sólo
+  ``completed_statements()``.
+- Incremental: retoma desde el último mes construido (que se recalcula, así
+  que es idempotente). Si el motor de imputación registró un movimiento
+  retroactivo en un mes ya cerrado, ``mark_statements_dirty`` deja la marca
+  en ``SnapshotRebuildMark`` (en la transacción de la imputación) y la
+  próxima corrida arranca desde ese mes. Una corrida cortada por
+  ``max_months`` deja la marca en el primer mes que no llegó a construir.
+- Corre todas las noches por Celery Beat (``build_statement_snapshots_task``);
+  ``build_snapshots`` lo hace a mano, con ``--from`` para reconstruir.
+"""
+import logging
+from datetime import date
+from decimal import Decimal
+from typing import Dict, Optional
+
+from django.db import transaction
+from django.db.models import F, Max, Min, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Least
+from django.utils import timezone
+
+from apps.customers.models import Customer
+from apps.financial.models.ledger import CustomerStatement, ReceivableLedgerEntry, SnapshotRebuildMark
+from apps.financial.services.periods import (
+    last_closed_month,
+    month_end,
+    month_start,
+    months_between,
+    next_month,
+    previous_month,
+    start_of_day,
+)
+
+logger = logging.getLogger(__name__)
+
+ZERO = Decimal("0")
+SNAPSHOT_BATCH_SIZE = 500
+SNAPSHOT_MAX_MONTHS = 24  # tope por corrida; lo que falte sale en la próxima
+MONTHLY_NOTE = "snapshot mensual"
+REBUILD_MARK = "customer_statements"
+STATEMENT_FIELDS = ["opening_balance", "debit_total", "credit_total", "closing_balance", "last_entry_at", "notes"]
+
+
+def mark_statements_dirty(day: date) -> None:
+    """Un movimiento retroactivo tocó ``day``: la próxima corrida reconstruye desde ese mes."""
+    marks = SnapshotRebuildMark.objects.filter(name=REBUILD_MARK)
+    updated = marks.update(
+        dirty_from=Least(Coalesce("dirty_from", Value(day)), Value(day)),
+        version=F("version") + 1,
+    )
+    if not updated:
+        mark, created = SnapshotRebuildMark.objects.get_or_create(
+            name=REBUILD_MARK, defaults={"dirty_from": day, "version": 1},
+        )
+        if not created:  # otra imputación la creó en el medio
+            mark_statements_dirty(day)
+
+
+def _read_mark():
+    mark, _ = SnapshotRebuildMark.objects.get_or_create(name=REBUILD_MARK)
+    return mark.dirty_from, mark.version
+
+
+def _lower_built_through(month: date) -> None:
+    """Los meses desde ``month`` se van a reescribir: dejan de estar completos."""
+    SnapshotRebuildMark.objects.filter(name=REBUILD_MARK).filter(
+        Q(built_through__isnull=True) | Q(built_through__gte=month)
+    ).update(built_through=previous_month(month))
+
+
+def _advance_built_through(month: date) -> None:
+    """``month`` quedó completo; avanza sólo si no deja un hueco atrás."""
+    SnapshotRebuildMark.objects.filter(
+        name=REBUILD_MARK, built_through=previous_month(month),
+    ).update(built_through=month)
+
+
+def _settle_mark(version: int, next_dirty: Optional[date]) -> None:
+    """
+    Al terminar: sin pendientes la marca se limpia; si la corrida quedó corta,
+    pasa al primer mes sin construir. Si hubo marcas nuevas mientras corría
+    (cambió ``version``) sólo puede retroceder.
+    """
+    updated = SnapshotRebuildMark.objects.filter(name=REBUILD_MARK, version=version).update(dirty_from=next_dirty)
+    if not updated and next_dirty is not None:
+        mark_statements_dirty(next_dirty)
+
+
+def monthly_statements():
+    return CustomerStatement.objects.filter(status=True, notes=MONTHLY_NOTE)
+
+
+def completed_statements():
+    """Snapshots de meses construidos completos (los que pueden leer los reportes)."""
+    built_through = SnapshotRebuildMark.objects.filter(name=REBUILD_MARK).values("built_through")[:1]
+    return monthly_statements().filter(period_start__lte=Subquery(built_through))
+
+
+def last_built_month() -> Optional[date]:
+    return monthly_statements().aggregate(last=Max("period_start"))["last"]
+
+
+def _first_month(dirty: Optional[date]) -> Optional[date]:
+    candidates = [d for d in (last_built_month(), dirty and month_start(dirty)) if d]
+    if candidates:
+        return min(candidates)
+    first = ReceivableLedgerEntry.objects.filter(status=True).aggregate(first=Min("posted_at"))["first"]
+    return month_start(timezone.localdate(first)) if first else None
+
+
+def _openings_from_history(keys, before) -> Dict[tuple, tuple]:
+    """Saldo previo de streams sin snapshot del mes anterior (clientes nuevos o retroactivos)."""
+    rows = (
+        ReceivableLedgerEntry.objects.filter(
+            status=True, customer_id__in={c for c, _ in keys}, posted_at__lt=before,
+        )
+        .values("customer_id", "currency")
+        .annotate(debit=Sum("debit_amount"), credit=Sum("credit_amount"), last=Max("posted_at"))
+        .order_by()
+    )
+    return {
+        (r["customer_id"], r["currency"]): ((r["debit"] or ZERO) - (r["credit"] or ZERO), r["last"])
+        for r in rows
+        if (r["customer_id"], r["currency"]) in keys
+    }
+
+
+def _build_batch(customer_ids, month: date) -> int:
+    prev = previous_month(month)
+    lower, upper = start_of_day(month), start_of_day(next_month(month))
+
+    openings = {
+        (c, cur): (closing, last_at)
+        for c, cur, closing, last_at in monthly_statements()
+        .filter(customer_id__in=customer_ids, period_start=prev)
+        .values_list("customer_id", "currency", "closing_balance", "last_entry_at")
+    }
+    activity = {
+        (r["customer_id"], r["currency"]): r
+        for r in ReceivableLedgerEntry.objects.filter(
+            status=True, customer_id__in=customer_ids, posted_at__gte=lower, posted_at__lt=upper,
+        )
+        .values("customer_id", "currency")
+        .annotate(debit=Sum("debit_amount"), credit=Sum("credit_amount"), last=Max("posted_at"))
+        .order_by()
+    }
+    missing = {key for key in activity if key not in openings}
+    if missing:
+        openings.update(_openings_from_history(missing, lower))
+
+    keys = {k for k, (closing, _) in openings.items() if closing} | set(activity)
+    current = monthly_statements().filter(customer_id__in=customer_ids, period_start=month)
+    stale = [pk for pk, c, cur in current.values_list("id", "customer_id", "currency") if (c, cur) not in keys]
+
+    statements = []
+    for key in sorted(keys):
+        opening, last_at = openings.get(key, (ZERO, None))
+        row = activity.get(key)
+        debit = (row["debit"] or ZERO) if row else ZERO
+        credit = (row["credit"] or ZERO) if row else ZERO
+        statements.append(CustomerStatement(
+            customer_id=key[0],
+            currency=key[1],
+            period_start=month,
+            period_end=month_end(month),
+            opening_balance=opening,
+            debit_total=debit,
+            credit_total=credit,
+            closing_balance=opening + debit - credit,
+            last_entry_at=row["last"] if row else last_at,
+            notes=MONTHLY_NOTE,
+        ))
+    with transaction.atomic():
+        if stale:
+            # Saldo cero y sin movimientos tras un retroactivo: se borra en vez de dejarlo desactualizado
+            CustomerStatement.objects.filter(id__in=stale).delete()
+        if statements:
+            CustomerStatement.objects.bulk_create(
+                statements,
+                update_conflicts=True,
+                unique_fields=["customer", "currency", "period_start", "period_end"],
+                update_fields=STATEMENT_FIELDS,
+            )
+    return len(statements)
+
+
+def build_month(month: date, batch_size: int = SNAPSHOT_BATCH_SIZE) -> int:
+    rows, last_id = 0, 0
+    while True:
+        ids = list(
+            Customer.objects.filter(id__gt=last_id).order_by("id").values_list("id", flat=True)[:batch_size]
+        )
+        if not ids:
+            return rows
+        last_id = ids[-1]
+        rows += _build_batch(ids, month)
+
+
+def build_customer_statements(
+    start: Optional[date] = None,
+    until: Optional[date] = None,
+    batch_size: int = SNAPSHOT_BATCH_SIZE,
+    max_months: int = SNAPSHOT_MAX_MONTHS,
+) -> Dict[str, int]:
+    """Construye los meses pendientes; devuelve {'months': meses, 'rows': snapshots}."""
+    dirty, version = _read_mark()
+    first = month_start(start) if start else _first_month(dirty)
+    until = month_start(until) if until else last_closed_month()
+    if first is None or first > until:
+        return {"months": 0, "rows": 0}
+
+    pending = list(months_between(first, until))
+    months = pending[:max_months]
+    rows = 0
+    _lower_built_through(first)
+    for month in months:
+        rows += build_month(month, batch_size)
+        _advance_built_through(month)
+    # Cortada por max_months: la próxima arranca donde quedó, no en last_built_month()
+    leftover = pending[len(months)] if len(pending) > len(months) else None
+    if dirty is not None and month_start(dirty) < first:
+        leftover = month_start(dirty)  # --from posterior a la marca: esos meses siguen pendientes
+    _settle_mark(version, leftover)
+    logger.info("[Financial][snapshots] %s snapshots en %s meses (%s..%s)", rows, len(months), months[0], months[-1])
+    return {"months": len(months), "rows": rows}
@@ -0,0 +1,9 @@
+# apps/financial/tasks.py
+from celery import shared_task
+
+
+@shared_task
+def build_statement_snapshots_task():
+    """Snapshots mensuales de cuenta corriente (Celery Beat): ver services.statement_snapshots."""
+    from apps.financial.services.statement_snapshots import build_customer_statements
+    return build_customer_statements()
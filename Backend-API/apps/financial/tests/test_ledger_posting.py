@@ -0,0 +1,147 @@
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.customers.models import Customer
+from apps.financial.choices import LedgerEntryKind, LedgerEntrySource
+from apps.financial.models import CustomerStatement, ReceivableLedgerEntry
+from apps.financial.services.ledger_posting import (
+    RECEIVABLES,
+    post_ledger_entries,
+    post_ledger_entry,
+    rebuild_stream,
+)
+from apps.payables.choices import LedgerEntryKind as PayableKind, LedgerEntrySource as PayableSource
+from apps.payables.models import SupplierLedgerEntry
+from apps.suppliers.models import Supplier
+from apps.users.models.user_model import User
+
+
+def at(day, hour=12):
+    return timezone.make_aware(datetime(2025, 1, day, hour))
+
+
+def entry(customer, day, debit=0, credit=0, currency="ARS"):
+    return ReceivableLedgerEntry(
+        customer=customer,
+        entry_kind=LedgerEntryKind.DOCUMENT,
+        entry_source=LedgerEntrySource.SALES,
+        currency=currency,
+        posted_at=at(day),
+        debit_amount=Decimal(debit),
+        credit_amount=Decimal(credit),
+    )
+
+
+def balances(customer, currency="ARS"):
+    qs = ReceivableLedgerEntry.objects.filter(customer=customer, currency=currency).order_by("posted_at", "id")
+    return [b for b in qs.values_list("balance_after", flat=True)]
+
+
+class LedgerPostingTests(TestCase):
+    def setUp(self):
+        self.customer = Customer.objects.create(name="Cliente Uno")
+
+    def test_append_and_back_dated_posting(self):
+        for day, debit, credit in ((1, 100, 0), (5, 50, 0), (9, 0, 30)):
+            post_ledger_entry(entry(self.customer, day, debit, credit))
+        self.assertEqual(balances(self.customer), [100, 150, 120])
+
+        # Otra moneda es otro stream
+        post_ledger_entry(entry(self.customer, 2, 7, currency="USD"))
+
+        # Retroactivo al día 3: se corren sólo los posteriores
+        first = ReceivableLedgerEntry.objects.get(posted_at=at(1))
+        post_ledger_entry(entry(self.customer, 3, 0, 40))
+        self.assertEqual(balances(self.customer), [100, 60, 110, 80])
+        self.assertEqual(balances(self.customer, "USD"), [7])
+        first.refresh_from_db()
+        self.assertIsNone(first.modified_at)
+
+    def test_back_dated_posting_adjusts_statement_snapshots(self):
+        post_ledger_entry(entry(self.customer, 2, 100))
+        post_ledger_entry(entry(self.customer, 20, 10))
+        december = CustomerStatement.objects.create(
+            customer=self.customer, period_start=date(2024, 12, 1), period_end=date(2024, 12, 31),
+        )
+        first_half = CustomerStatement.objects.create(
+            customer=self.customer, period_start=date(2025, 1, 1), period_end=date(2025, 1, 15),
+            debit_total=100, closing_balance=100,
+        )
+        second_half = CustomerStatement.objects.create(
+            customer=self.customer, period_start=date(2025, 1, 16), period_end=date(2025, 1, 31),
+            opening_balance=100, debit_total=10, closing_balance=110,
+        )
+
+        post_ledger_entry(entry(self.customer, 10, 0, 25))
+
+        first_half.refresh_from_db()
+        second_half.refresh_from_db()
+        december.refresh_from_db()
+        self.assertEqual((first_half.credit_total, first_half.closing_balance), (25, 75))
+        self.assertEqual((second_half.opening_balance, second_half.closing_balance), (75, 85))
+        self.assertEqual(december.closing_balance, 0)
+
+    def test_bulk_posting_matches_full_recompute(self):
+        for day, debit in ((4, 10), (8, 20)):
+            post_ledger_entry(entry(self.customer, day, debit))
+        other = Customer.objects.create(name="Cliente Dos")
+
+        batch = [entry(self.customer, 9, 5), entry(self.customer, 2, 1), entry(other, 3, 0, 4),
+                 entry(self.customer, 8, 0, 3), entry(self.customer, 12, 2)]
+        created = post_ledger_entries(batch)
+
+        self.assertEqual(len(created), 5)
+        self.assertEqual(balances(self.customer), [1, 11, 31, 28, 33, 35])
+        self.assertEqual(balances(other), [-4])
+        self.assertEqual(rebuild_stream(RECEIVABLES, self.customer.id, "ARS"), 0)
+
+    def test_supplier_stream(self):
+        supplier = Supplier.objects.create(name="Proveedor")
+
+        def supplier_entry(day, debit=0, credit=0):
+            return SupplierLedgerEntry(
+                supplier=supplier, entry_kind=PayableKind.DOCUMENT, entry_source=PayableSource.PURCHASES,
+                posted_at=at(day), debit_amount=Decimal(debit), credit_amount=Decimal(credit),
+            )
+
+        post_ledger_entry(supplier_entry(5, credit=300))
+        post_ledger_entry(supplier_entry(1, credit=100))
+        post_ledger_entries([supplier_entry(3, debit=50)])
+        self.assertEqual(
+            list(SupplierLedgerEntry.objects.order_by("posted_at").values_list("balance_after", flat=True)),
+            [-100, -50, -350],
+        )
+
+
+class CustomerStatementViewTests(TestCase):
+    def test_statement_uses_snapshot_for_opening_balance(self):
+        customer = Customer.objects.create(name="Cliente Uno")
+        for day, debit, credit in ((2, 100, 0), (6, 0, 30), (11, 40, 0), (14, 0, 10)):
+            post_ledger_entry(entry(customer, day, debit, credit))
+        CustomerStatement.objects.create(
+            customer=customer, period_start=date(2025, 1, 1), period_end=date(2025, 1, 5),
+            debit_total=100, closing_balance=100,
+        )
+        user = User.objects.create_user(
+            username="billing", email="billing@example.com", password="x", name="Bi", last_name="Lling",
+            role=User.Role.BILLING,
+        )
+        client = APIClient()
+        client.force_authenticate(user)
+        url = reverse("financial-api:customer-statement", args=[customer.id])
+
+        response = client.get(url, {"date_from": "2025-01-10", "date_to": "2025-01-31"})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["opening_snapshot_end"], "2025-01-05")
+        self.assertEqual(Decimal(data["opening_balance"]), 70)
+        self.assertEqual(Decimal(data["closing_balance"]), 100)
+        self.assertEqual([Decimal(e["running_balance"]) for e in data["entries"]], [110, 100])
+
+        self.assertEqual(client.get(url, {"date_from": "2025-02-01", "date_to": "2025-01-01"}).status_code, 400)
+        self.assertEqual(client.get(reverse("financial-api:customer-statement", args=[999])).status_code, 404)
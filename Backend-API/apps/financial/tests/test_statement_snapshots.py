@@ -0,0 +1,164 @@
+from datetime import date, datetime
+from decimal import Decimal
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.accounting.models import AccountingEntry, AccountingEntryLine, AccountingEntryStatus, LedgerSnapshot
+from apps.accounting.services.ledger_snapshots import account_balances, build_ledger_snapshots
+from apps.billing.models import BillingDocument
+from apps.customers.models import Customer
+from apps.financial.choices import LedgerEntryKind, LedgerEntrySource
+from apps.financial.models import ReceivableLedgerEntry, SnapshotRebuildMark
+from apps.financial.services.ledger_posting import post_ledger_entry
+from apps.financial.services.receivable_reports import customer_aging, customer_balances
+from apps.financial.services import statement_snapshots
+from apps.financial.services.statement_snapshots import build_customer_statements, monthly_statements
+from apps.users.models.user_model import User
+
+MARCH = date(2025, 3, 1)
+
+
+def on(month, day):
+    return timezone.make_aware(datetime(2025, month, day, 12))
+
+
+def post(customer, month, day, debit=0, credit=0, currency="ARS"):
+    return post_ledger_entry(ReceivableLedgerEntry(
+        customer=customer,
+        entry_kind=LedgerEntryKind.DOCUMENT,
+        entry_source=LedgerEntrySource.SALES,
+        currency=currency,
+        posted_at=on(month, day),
+        debit_amount=Decimal(debit),
+        credit_amount=Decimal(credit),
+    ))
+
+
+def statements(customer):
+    return list(
+        monthly_statements().filter(customer=customer).order_by("period_start").values_list(
+            "period_start", "opening_balance", "debit_total", "credit_total", "closing_balance",
+        )
+    )
+
+
+class StatementSnapshotTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.customer = Customer.objects.create(name="Cliente Uno")
+        self.other = Customer.objects.create(name="Cliente Dos")
+        post(self.customer, 1, 10, 100)
+        post(self.customer, 1, 20, 0, 40)
+        post(self.customer, 3, 5, 30)
+        post(self.other, 2, 1, 0, 15)
+
+    def test_builds_months_and_resumes_incrementally(self):
+        result = build_customer_statements(until=MARCH, batch_size=1)
+        self.assertEqual(result["months"], 3)
+        self.assertEqual(statements(self.customer), [
+            (date(2025, 1, 1), 0, 100, 40, 60),
+            (date(2025, 2, 1), 60, 0, 0, 60),
+            (date(2025, 3, 1), 60, 30, 0, 90),
+        ])
+        self.assertEqual([row[-1] for row in statements(self.other)], [-15, -15])
+
+        # Retroactivo a febrero: la próxima corrida arranca desde ese mes
+        post(self.customer, 4, 2, 5)
+        post(self.other, 2, 10, 15)
+        self.assertEqual(build_customer_statements(until=MARCH)["months"], 2)
+        self.assertEqual(statements(self.customer)[-1][-1], 90)
+        self.assertEqual(statements(self.other), [(date(2025, 2, 1), 0, 15, 15, 0)])
+        self.assertEqual(build_customer_statements(until=MARCH)["months"], 1)
+
+    def test_rebuild_mark_survives_cache_flush_and_truncated_runs(self):
+        build_customer_statements(until=MARCH)
+        post(self.customer, 1, 25, 7)  # retroactivo a enero
+        cache.clear()
+
+        # Tope de un mes: la marca pasa a febrero en vez de perderse
+        self.assertEqual(build_customer_statements(until=MARCH, max_months=1)["months"], 1)
+        self.assertEqual(SnapshotRebuildMark.objects.get().dirty_from, date(2025, 2, 1))
+        self.assertEqual(build_customer_statements(until=MARCH)["months"], 2)
+        self.assertEqual([row[-1] for row in statements(self.customer)], [67, 67, 97])
+        self.assertIsNone(SnapshotRebuildMark.objects.get().dirty_from)
+
+    def test_reports_skip_a_half_built_month(self):
+        build_customer_statements(until=date(2025, 2, 1))
+        real_batch, calls = statement_snapshots._build_batch, []
+
+        def failing_batch(ids, month):
+            calls.append(month)
+            if len(calls) == 4:  # segundo lote de marzo
+                raise RuntimeError("worker caído")
+            return real_batch(ids, month)
+
+        with mock.patch.object(statement_snapshots, "_build_batch", failing_batch):
+            with self.assertRaises(RuntimeError):
+                build_customer_statements(until=MARCH, batch_size=1)
+        self.assertEqual(monthly_statements().filter(period_start=MARCH).count(), 1)
+        self.assertEqual(SnapshotRebuildMark.objects.get().built_through, date(2025, 2, 1))
+
+        expected = {self.customer.id: 90, self.other.id: -15}
+        self.assertEqual(customer_balances(date(2025, 3, 31), "ARS"), expected)
+        build_customer_statements(until=MARCH)
+        self.assertEqual(SnapshotRebuildMark.objects.get().built_through, MARCH)
+        self.assertEqual(customer_balances(date(2025, 3, 31), "ARS"), expected)
+
+    def test_balances_and_aging_from_snapshot_plus_tail(self):
+        build_customer_statements(until=date(2025, 2, 1))
+        post(self.customer, 3, 20, 10)
+
+        balances = customer_balances(date(2025, 3, 31), "ARS")
+        self.assertEqual(balances, {self.customer.id: 100, self.other.id: -15})
+        self.assertEqual(customer_balances(date(2025, 1, 15), "ARS"), {self.customer.id: 100})
+
+        aging = customer_aging(date(2025, 4, 15), "ARS")
+        self.assertEqual(len(aging), 1)
+        self.assertEqual(
+            {k: aging[0][k] for k in ("0_30", "31_60", "61_90", "over_90")},
+            {"0_30": 10, "31_60": 30, "61_90": 0, "over_90": 60},
+        )
+
+        user = User.objects.create_user(
+            username="billing", email="billing@example.com", password="x", name="Bi", last_name="Lling",
+            role=User.Role.BILLING,
+        )
+        client = APIClient()
+        client.force_authenticate(user)
+        response = client.get(reverse("financial-api:customer-aging"), {"as_of": "2025-04-15"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["results"][0]["customer_name"], "Cliente Uno")
+        response = client.get(reverse("financial-api:customer-balances"), {"as_of": "2025-03-31"})
+        self.assertEqual(response.json()["count"], 2)
+
+
+class LedgerSnapshotTests(TestCase):
+    def setUp(self):
+        self.customer = Customer.objects.create(name="Cliente Uno")
+
+    def book(self, day, lines, status=AccountingEntryStatus.POSTED):
+        document = BillingDocument.objects.create(document_type="invoice_a", client=self.customer)
+        entry = AccountingEntry.objects.create(billing_document=document, entry_date=day, status=status)
+        for code, debit, credit in lines:
+            AccountingEntryLine.objects.create(entry=entry, account_code=code, description=code, debit=debit, credit=credit)
+
+    def test_builds_periods_and_balances(self):
+        self.book(date(2025, 1, 5), [("1.1", 100, 0), ("4.1", 0, 100)])
+        self.book(date(2025, 2, 7), [("1.1", 0, 100), ("1.2", 100, 0)])
+        self.book(date(2025, 2, 8), [("1.1", 999, 0)], status=AccountingEntryStatus.PENDING)
+        self.book(date(2025, 3, 3), [("1.2", 0, 25), ("4.1", 25, 0)])
+
+        self.assertEqual(build_ledger_snapshots(until=date(2025, 2, 1)), {"months": 2, "rows": 5})
+        february = {s.account_code: s for s in LedgerSnapshot.objects.filter(period="2025-02")}
+        self.assertEqual(set(february), {"1.1", "1.2", "4.1"})
+        self.assertEqual(
+            (february["1.1"].opening_balance, february["1.1"].credit_total, february["1.1"].balance), (100, 100, 0),
+        )
+
+        self.assertEqual(account_balances(date(2025, 3, 31)), {"1.2": 75, "4.1": -75})
+        self.assertEqual(account_balances(date(2025, 1, 31)), {"1.1": 100, "4.1": -100})
@@ -1,7 +1,5 @@
 import logging
 
-from django.conf import settings
-from django.core.cache import cache
 from django.shortcuts import get_object_or_404
 
 from drf_spectacular.utils import extend_schema
@@ -10,6 +8,7 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from apps.core.cache_aside import cached_response, list_cache_filters
 from apps.core.pagination import Pagination
 from apps.core.utils import broadcast_crud_event
 from apps.inventory_adjustments.api.repositories import StockAdjustmentRepository
@@ -22,45 +21,31 @@ from apps.inventory_adjustments.docs.adjustments_doc import (
     stock_adjustment_delete_doc,
 )
 from apps.inventory_adjustments.utils.cache_invalidation import invalidate_adjustment_cache
-from apps.inventory_adjustments.utils.cache_keys import adjustment_list_cache_key
+from apps.inventory_adjustments.utils.cache_keys import ADJUSTMENT_LIST_CACHE_PREFIX, adjustment_list_cache_key
 
 logger = logging.getLogger(__name__)
 LIST_TTL = 60 * 5
 
 
-def _cache_filters(request):
-    params = request.query_params.copy()
-    filters = {k: params.get(k) for k in params}
-    filters.setdefault("page", params.get("page", 1))
-    filters.setdefault("page_size", params.get("page_size", Pagination.page_size))
-    return filters
-
-
 @extend_schema(methods=["GET"], **stock_adjustment_list_doc)
 @extend_schema(methods=["POST"], **stock_adjustment_create_doc)
 @api_view(["GET", "POST"])
 @permission_classes([IsAuthenticated])
 def stock_adjustment_list_create_view(request):
     if request.method == "GET":
-        filters = _cache_filters(request)
-        cache_key = adjustment_list_cache_key(**filters)
-        use_cache = not settings.DEBUG
-        if use_cache:
-            cached = cache.get(cache_key)
-            if cached is not None:
-                return Response(cached)
+        def build():
+            qs = StockAdjustmentRepository.list_adjustments(
+                search=request.query_params.get("search"),
+                status=request.query_params.get("status"),
+            )
+            paginator = Pagination()
+            page = paginator.paginate_queryset(qs, request)
+            serializer = StockAdjustmentSerializer(page, many=True)
+            return paginator.get_paginated_response(serializer.data)
 
-        qs = StockAdjustmentRepository.list_adjustments(
-            search=request.query_params.get("search"),
-            status=request.query_params.get("status"),
-        )
-        paginator = Pagination()
-        page = paginator.paginate_queryset(qs, request)
-        serializer = StockAdjustmentSerializer(page, many=True)
-        response = paginator.get_paginated_response(serializer.data)
-        if use_cache:
-            cache.set(cache_key, response.data, LIST_TTL)
-        return response
+        filters = list_cache_filters(request)
+        cache_key = adjustment_list_cache_key(**filters)
+        return cached_response(cache_key, build, LIST_TTL, prefix=ADJUSTMENT_LIST_CACHE_PREFIX)
 
     serializer = StockAdjustmentSerializer(data=request.data)
     serializer.is_valid(raise_exception=True)
@@ -1,9 +1,8 @@
 import logging
 
-from django.conf import settings
-from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import transaction
 from django.shortcuts import get_object_or_404
-from django.utils import timezone
 
 from drf_spectacular.utils import extend_schema
 from rest_framework import status
@@ -11,6 +10,7 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from apps.core.cache_aside import cached_response, list_cache_filters
 from apps.core.pagination import Pagination
 from apps.core.utils import broadcast_crud_event
 from apps.inventory_adjustments.api.repositories import InventoryCountRepository
@@ -22,46 +22,36 @@ from apps.inventory_adjustments.docs.adjustments_doc import (
     inventory_count_update_doc,
     inventory_count_delete_doc,
 )
+from apps.inventory_adjustments.services.adjustment_service import AdjustmentService
 from apps.inventory_adjustments.utils.cache_invalidation import invalidate_inventory_count_cache
-from apps.inventory_adjustments.utils.cache_keys import inventory_count_list_cache_key
+from apps.inventory_adjustments.utils.cache_keys import (
+    INVENTORY_COUNT_LIST_CACHE_PREFIX,
+    inventory_count_list_cache_key,
+)
 
 logger = logging.getLogger(__name__)
 LIST_TTL = 60 * 5
 
 
-def _cache_filters(request):
-    params = request.query_params.copy()
-    filters = {k: params.get(k) for k in params}
-    filters.setdefault("page", params.get("page", 1))
-    filters.setdefault("page_size", params.get("page_size", Pagination.page_size))
-    return filters
-
-
 @extend_schema(methods=["GET"], **inventory_count_list_doc)
 @extend_schema(methods=["POST"], **inventory_count_create_doc)
 @api_view(["GET", "POST"])
 @permission_classes([IsAuthenticated])
 def inventory_count_list_create_view(request):
     if request.method == "GET":
-        filters = _cache_filters(request)
-        cache_key = inventory_count_list_cache_key(**filters)
-        use_cache = not settings.DEBUG
-        if use_cache:
-            cached = cache.get(cache_key)
-            if cached is not None:
-                return Response(cached)
+        def build():
+            qs = InventoryCountRepository.list_counts(
+                search=request.query_params.get("search"),
+                status=request.query_params.get("status"),
+            )
+            paginator = Pagination()
+            page = paginator.paginate_queryset(qs, request)
+            serializer = InventoryCountSerializer(page, many=True)
+            return paginator.get_paginated_response(serializer.data)
 
-        qs = InventoryCountRepository.list_counts(
-            search=request.query_params.get("search"),
-            status=request.query_params.get("status"),
-        )
-        paginator = Pagination()
-        page = paginator.paginate_queryset(qs, request)
-        serializer = InventoryCountSerializer(page, many=True)
-        response = paginator.get_paginated_response(serializer.data)
-        if use_cache:
-            cache.set(cache_key, response.data, LIST_TTL)
-        return response
+        filters = list_cache_filters(request)
+        cache_key = inventory_count_list_cache_key(**filters)
+        return cached_response(cache_key, build, LIST_TTL, prefix=INVENTORY_COUNT_LIST_CACHE_PREFIX)
 
     serializer = InventoryCountSerializer(data=request.data)
     serializer.is_valid(raise_exception=True)
@@ -86,9 +76,22 @@ def inventory_count_detail_view(request, count_id: int):
     if request.method == "PUT":
         serializer = InventoryCountSerializer(count, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
-        if serializer.validated_data.get("status_label") == count.Status.CLOSED and count.closed_at is None:
-            serializer.validated_data["closed_at"] = timezone.now()
-        serializer.save(user=request.user)
+        closing = (
+            serializer.validated_data.get("status_label") == count.Status.CLOSED
+            and count.status_label != count.Status.CLOSED
+        )
+        if closing:
+            # El cierre lo hace el servicio: ajusta stock e historial en la misma transacción
+            serializer.validated_data.pop("status_label")
+        try:
+            with transaction.atomic():
+                count = serializer.save(user=request.user)
+                if closing:
+                    count = AdjustmentService.post_count(count, user=request.user)
+        except ValidationError as e:
+            detail = e.message_dict if hasattr(e, "error_dict") else {"detail": e.messages}
+            return Response({"errors": detail}, status=status.HTTP_400_BAD_REQUEST)
+        serializer = InventoryCountSerializer(count)
         invalidate_inventory_count_cache()
         broadcast_crud_event("update", "inventory", "InventoryCount", serializer.data)
         return Response(serializer.data)
@@ -87,6 +87,10 @@ inventory_count_detail_doc = {
 inventory_count_update_doc = {
     "tags": [INV_TAG],
     "summary": "Actualizar conteo",
+    "description": (
+        "Con `status_label=closed` cierra el conteo: el stock de cada producto pasa a lo contado "
+        "(StockEvent + StockHistory en una transacción). Errores de dominio: 400 con `errors`."
+    ),
     "operation_id": "update_inventory_count",
     "request": InventoryCountSerializer,
     "responses": {200: OpenApiResponse(response=InventoryCountSerializer)},
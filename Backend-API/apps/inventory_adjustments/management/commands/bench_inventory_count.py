@@ -0,0 +1,130 @@
+import random
+import time
+from datetime import date
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import OuterRef, Subquery
+
+from apps.inventory_adjustments.models import InventoryCount, InventoryCountItem, StockHistory
+from apps.inventory_adjustments.services.count_posting import post_inventory_count
+from apps.products.models import Category, Product
+from apps.stocks.models import ProductStock
+from apps.stocks.services.product_stock import adjust_product_stock
+
+CHUNK = 2000
+
+
+class _Rollback(Exception):
+    pass
+
+
+class _QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def legacy_close(count, user=None):
+    """Camino sin motor: un ajuste de stock + un histórico por renglón."""
+    for item in count.items.select_related("product__stock_record"):
+        stock = item.product.stock_record
+        item.system_quantity = stock.quantity
+        item.save(user=user)
+        if item.difference:
+            adjust_product_stock(stock, item.difference, f"Inventario {count}", user)
+        StockHistory(
+            product=item.product,
+            movement_type=StockHistory.MovementType.INVENTORY,
+            movement_date=count.count_date,
+            previous_quantity=item.system_quantity,
+            quantity_delta=item.difference,
+            resulting_quantity=item.counted_quantity,
+            inventory_count=count,
+        ).save(user=user)
+    count.status_label = InventoryCount.Status.CLOSED
+    count.save(user=user)
+    return count
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide el cierre de un conteo de inventario de N renglones: ajuste + histórico por "
+        "renglón contra el motor en lote (diferencias en SQL, StockEvent/StockHistory en lote). "
+        "Cada variante corre en una transacción que se revierte al final."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lines', type=int, default=20_000, help='Renglones del conteo')
+        parser.add_argument('--legacy-lines', type=int, default=2_000,
+                            help='Renglones para el camino anterior (se proyecta a --lines); 0 lo saltea')
+
+    def handle(self, *args, **options):
+        lines, legacy_lines = options['lines'], options['legacy_lines']
+        if lines < 1 or legacy_lines < 0:
+            raise CommandError("--lines debe ser positivo y --legacy-lines no negativo")
+        self.stdout.write(f"motor: {connection.vendor}")
+        self.stdout.write(f"{'variante':<10} {'renglones':>10} {'segundos':>9} {'ms/renglón':>11} {'queries':>9}")
+
+        variants = [("motor", post_inventory_count, lines)]
+        if legacy_lines:
+            variants.insert(0, ("anterior", legacy_close, min(legacy_lines, lines)))
+        for label, close, size in variants:
+            try:
+                with transaction.atomic():
+                    count = self._seed(size)
+                    counter = _QueryCounter()
+                    with connection.execute_wrapper(counter):
+                        t0 = time.perf_counter()
+                        close(count)
+                        elapsed = time.perf_counter() - t0
+                    self._check(count)
+                    projected = f"  (~{elapsed * lines / size:,.1f}s para {lines:,})" if size != lines else ""
+                    self.stdout.write(
+                        f"{label:<10} {size:>10,} {elapsed:>9,.2f} {elapsed * 1000 / size:>11,.3f} "
+                        f"{counter.count:>9,}{projected}"
+                    )
+                    raise _Rollback
+            except _Rollback:
+                pass
+
+    def _seed(self, size):
+        rng = random.Random(size)
+        t0 = time.perf_counter()
+        tag = f"bench-inv-{rng.randint(0, 10**9)}"
+        category = Category.objects.create(name=tag)
+        count = InventoryCount.objects.create(count_date=date.today(), description=tag)
+        for offset in range(0, size, CHUNK):
+            products = Product.objects.bulk_create([
+                Product(code=f"{tag}-{i}", name=f"Artículo {i}", category=category)
+                for i in range(offset, min(offset + CHUNK, size))
+            ])
+            quantities = [Decimal(rng.randint(0, 500)) for _ in products]
+            ProductStock.objects.bulk_create([
+                ProductStock(product=p, quantity=qty) for p, qty in zip(products, quantities)
+            ])
+            # ~70% de los renglones con diferencia
+            InventoryCountItem.objects.bulk_create([
+                InventoryCountItem(
+                    count=count, product=p, system_quantity=qty, difference=0,
+                    counted_quantity=Decimal(rng.randint(0, 500)) if rng.random() < 0.7 else qty,
+                )
+                for p, qty in zip(products, quantities)
+            ])
+        self.stdout.write(f"seed {size:,} renglones: {time.perf_counter() - t0:,.1f}s")
+        return count
+
+    def _check(self, count):
+        drift = (
+            InventoryCountItem.objects.filter(count=count)
+            .exclude(counted_quantity=Subquery(
+                ProductStock.objects.filter(product_id=OuterRef("product_id")).values("quantity")[:1]
+            ))
+            .count()
+        )
+        if drift:
+            raise CommandError(f"{drift} productos no quedaron con lo contado")
@@ -15,7 +15,7 @@ class InventoryCount(BaseModel):
     count_date = models.DateField(verbose_name="Fecha del conteo")
     description = models.CharField(max_length=255, blank=True, verbose_name="Descripción")
     notes = models.TextField(blank=True, verbose_name="Notas")
-    legacy_id = models.IntegerField(null=True, blank=True, db_index=True, verbose_name="ID legacy")
+    legacy_id = models.IntegerField(null=True, blank=True, unique=True, verbose_name="ID legacy")
     closed_at = models.DateTimeField(null=True, blank=True, verbose_name="Fecha de cierre")
     status_label = models.CharField(
         max_length=20,
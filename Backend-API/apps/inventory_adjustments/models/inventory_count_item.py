@@ -28,6 +28,10 @@ class InventoryCountItem(BaseModel):
     class Meta:
         verbose_name = "Detalle de conteo"
         verbose_name_plural = "Detalles de conteo"
+        constraints = [
+            # Un renglón por producto (clave natural de inventarios_articulos)
+            models.UniqueConstraint(fields=["count", "product"], name="uniq_inventory_count_product"),
+        ]
 
     def save(self, *args, **kwargs):
         if self.counted_quantity is not None and self.system_quantity is not None:
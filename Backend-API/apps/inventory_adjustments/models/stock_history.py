@@ -45,7 +45,7 @@ class StockHistory(BaseModel):
         null=True,
         blank=True,
     )
-    legacy_id = models.IntegerField(null=True, blank=True, verbose_name="ID legacy")
+    legacy_id = models.IntegerField(null=True, blank=True, unique=True, verbose_name="ID legacy")
 
     class Meta:
         verbose_name = "Histórico de stock"
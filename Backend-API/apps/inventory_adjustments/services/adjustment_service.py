@@ -1,16 +1,16 @@
+from django.db import transaction
 from django.utils import timezone
 
-from apps.inventory_adjustments.api.repositories import (
-    StockAdjustmentRepository,
-    StockHistoryRepository,
-)
-from apps.inventory_adjustments.models import StockAdjustment, StockAdjustmentItem, StockHistory
+from apps.inventory_adjustments.api.repositories import StockAdjustmentRepository
+from apps.inventory_adjustments.models import InventoryCount, StockAdjustment, StockAdjustmentItem, StockHistory
+from apps.inventory_adjustments.services.count_posting import post_inventory_count
 
 
 class AdjustmentService:
     """Lógica de negocio para aplicar ajustes e impactar el historial de stock."""
 
     @staticmethod
+    @transaction.atomic
     def post_adjustment(adjustment: StockAdjustment, *, user=None) -> StockAdjustment:
         if adjustment.status_label == StockAdjustment.Status.POSTED:
             return adjustment
@@ -18,9 +18,9 @@ class AdjustmentService:
         items = StockAdjustmentRepository.list_items(adjustment)
         movement_date = adjustment.adjustment_date
         now_time = timezone.now().time()
-        for item in items:
-            StockHistoryRepository.create_entry(
-                product=item.product,
+        StockHistory.objects.bulk_create([
+            StockHistory(
+                product_id=item.product_id,
                 movement_type=StockHistory.MovementType.ADJUSTMENT,
                 movement_date=movement_date,
                 movement_time=now_time,
@@ -30,8 +30,15 @@ class AdjustmentService:
                 observations=item.reason,
                 detail=adjustment.observations,
                 adjustment=adjustment,
-                user=user,
+                created_by=user,
             )
+            for item in items
+        ])
         adjustment.status_label = StockAdjustment.Status.POSTED
         adjustment.save(user=user)
         return adjustment
+
+    @staticmethod
+    def post_count(count: InventoryCount, *, user=None) -> InventoryCount:
+        """Cierra el conteo e impacta stock + historial (ver services/count_posting.py)."""
+        return post_inventory_count(count, user=user)
@@ -0,0 +1,180 @@
+# apps/inventory_adjustments/services/count_posting.py
+"""
+Cierre de un conteo de inventario en una sola transacción.
+
+En lugar de un ajuste + un histórico por renglón:
+- la diferencia contado vs. sistema se calcula en SQL: un UPDATE deja en cada
+  renglón el stock vigente al cierre (``system_quantity``) y su ``difference``,
+- los StockHistory se escriben con bulk_create,
+- el stock queda en lo contado con un UPDATE por tabla (ProductStock y
+  ``Product.current_stock``) y un StockEvent por renglón con diferencia, en
+  lote. Un conteo fija cantidades absolutas, así que no hace falta el CASE por
+  fila de ``apply_stock_movements``; las reglas que aplican a productos (sin
+  subproductos, resultado no negativo) se validan antes, también en SQL,
+- si algo falla no queda nada: ni histórico, ni eventos, ni conteo cerrado.
+"""
+import logging
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import DecimalField, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from apps.inventory_adjustments.models import InventoryCount, StockHistory
+from apps.inventory_adjustments.utils.cache_invalidation import (
+    invalidate_inventory_count_cache,
+    invalidate_stock_history_cache,
+)
+from apps.products.models.product_model import Product
+from apps.products.services.catalog_facets import schedule_product_facets
+from apps.products.utils.cache_invalidation import invalidate_product_entity_cache
+from apps.products.utils.cache_tags import deferred_invalidation
+from apps.stocks.models import ProductStock, StockEvent
+from apps.stocks.utils.cache_utils import invalidate_product_events
+
+logger = logging.getLogger(__name__)
+
+POSTING_BATCH_SIZE = 1000
+QUANTITY = DecimalField(max_digits=15, decimal_places=3)
+
+
+def _on_hand():
+    """Stock activo del producto del renglón (0 si no tiene fila de stock)."""
+    stock = (
+        ProductStock.objects.filter(product_id=OuterRef("product_id"), status=True)
+        .order_by("pk")
+        .values("quantity")[:1]
+    )
+    return Coalesce(Subquery(stock, output_field=QUANTITY), Value(Decimal("0")), output_field=QUANTITY)
+
+
+def _ensure_stock_rows(product_ids, user) -> None:
+    """Los productos contados sin fila de stock arrancan en 0 (como initialize_product_stock)."""
+    existing = set(
+        ProductStock.objects.filter(product_id__in=product_ids, status=True).values_list("product_id", flat=True)
+    )
+    missing = [pid for pid in product_ids if pid not in existing]
+    if missing:
+        ProductStock.objects.bulk_create(
+            [ProductStock(product_id=pid, quantity=0, created_by=user) for pid in missing],
+            batch_size=POSTING_BATCH_SIZE,
+        )
+
+
+@transaction.atomic
+def post_inventory_count(count: InventoryCount, *, user=None) -> InventoryCount:
+    """
+    Cierra el conteo: el stock de cada producto contado pasa a ser lo contado.
+
+    Idempotente para conteos ya cerrados. Errores: ValidationError, con el
+    product_id como clave cuando el problema es de un renglón.
+    """
+    count = InventoryCount.objects.select_for_update().get(pk=count.pk)
+    if count.status_label == InventoryCount.Status.CLOSED:
+        return count
+    if count.status_label == InventoryCount.Status.CANCELLED:
+        raise ValidationError("No se puede cerrar un conteo anulado.")
+
+    items = count.items.filter(status=True)
+    parents = list(
+        items.filter(product__has_subproducts=True).values_list("product__code", flat=True).order_by("product__code")
+    )
+    if parents:
+        raise ValidationError(
+            f"Productos con subproductos no se ajustan por conteo: {', '.join(parents[:20])}"
+        )
+
+    negative = dict(items.filter(counted_quantity__lt=0).values_list("product_id", "counted_quantity")[:20])
+    if negative:
+        raise ValidationError({pid: f"Cantidad contada negativa: {qty}" for pid, qty in negative.items()})
+
+    # Bloquear el stock de los productos contados antes de leerlo
+    list(
+        ProductStock.objects.select_for_update()
+        .filter(product_id__in=items.values("product_id"), status=True)
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+    now = timezone.now()
+    on_hand = _on_hand()
+    items.update(
+        system_quantity=on_hand,
+        difference=F("counted_quantity") - on_hand,
+        modified_at=now,
+        modified_by=user,
+    )
+    lines = list(
+        items.exclude(difference=0)
+        .order_by("product_id")
+        .values_list("product_id", "system_quantity", "difference", "counted_quantity", "observations")
+    )
+
+    label = f"Inventario {count}"
+    _ensure_stock_rows([line[0] for line in lines if line[2] > 0], user)
+    StockHistory.objects.bulk_create(
+        [
+            StockHistory(
+                product_id=product_id,
+                movement_type=StockHistory.MovementType.INVENTORY,
+                movement_date=count.count_date,
+                movement_time=now.time(),
+                previous_quantity=previous,
+                quantity_delta=delta,
+                resulting_quantity=counted,
+                observations=observations,
+                detail=label,
+                inventory_count=count,
+                created_by=user,
+            )
+            for product_id, previous, delta, counted, observations in lines
+        ],
+        batch_size=POSTING_BATCH_SIZE,
+    )
+
+    changed = items.exclude(difference=0)
+    counted = changed.filter(product_id=OuterRef("product_id")).values("counted_quantity")[:1]
+    ProductStock.objects.filter(product_id__in=changed.values("product_id"), status=True).update(
+        quantity=Subquery(counted), modified_at=now, modified_by=user,
+    )
+    Product.objects.filter(pk__in=changed.values("product_id")).update(
+        current_stock=Subquery(changed.filter(product_id=OuterRef("pk")).values("counted_quantity")[:1]),
+    )
+    stock_ids = dict(
+        ProductStock.objects.filter(product_id__in=changed.values("product_id"), status=True)
+        .values_list("product_id", "pk")
+    )
+    # bulk_create no llama a save()/apply_to_target: las cantidades ya se escribieron arriba
+    StockEvent.objects.bulk_create(
+        [
+            StockEvent(
+                product_stock_id=stock_ids[product_id],
+                quantity_change=delta,
+                event_type="ingreso_ajuste" if delta > 0 else "egreso_ajuste",
+                notes=label,
+                created_by=user,
+            )
+            for product_id, _, delta, _, _ in lines
+        ],
+        batch_size=POSTING_BATCH_SIZE,
+    )
+
+    count.status_label = InventoryCount.Status.CLOSED
+    count.closed_at = now
+    count.save(user=user)
+
+    product_ids = [line[0] for line in lines]
+    schedule_product_facets(product_ids)
+
+    def _invalidate():
+        with deferred_invalidation():
+            for pid in product_ids:
+                invalidate_product_events(pid)
+                invalidate_product_entity_cache(pid)
+            invalidate_inventory_count_cache()
+            invalidate_stock_history_cache()
+
+    transaction.on_commit(_invalidate)
+    logger.info("[InventoryCount] %s cerrado: %s renglones con diferencia", count, len(lines))
+    return count
@@ -0,0 +1,85 @@
+from datetime import date
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.inventory_adjustments.models import InventoryCount, InventoryCountItem, StockHistory
+from apps.inventory_adjustments.services.adjustment_service import AdjustmentService
+from apps.products.models.category_model import Category
+from apps.products.models.product_model import Product
+from apps.stocks.models import ProductStock, StockEvent
+from apps.users.models.user_model import User
+
+
+class CountPostingTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='counter', email='counter@example.com', password='x', name='Con', last_name='Teo'
+        )
+        self.category = Category.objects.create(name='CatConteo', created_by=self.user)
+        self.count = InventoryCount.objects.create(count_date=date(2025, 3, 1), created_by=self.user)
+        self.products = {}
+        for code, on_hand, counted in (('A', '10', '8'), ('B', '4', '4'), ('C', '0', '3'), ('D', None, '2')):
+            product = Product.objects.create(code=code, name=code, category=self.category, created_by=self.user)
+            if on_hand is not None:
+                ProductStock.objects.create(product=product, quantity=Decimal(on_hand), created_by=self.user)
+            # system_quantity desactualizado: el cierre toma el stock vigente
+            InventoryCountItem.objects.create(
+                count=self.count, product=product, system_quantity=Decimal('99'),
+                counted_quantity=Decimal(counted), created_by=self.user,
+            )
+            self.products[code] = product
+
+    def stock(self, code):
+        return ProductStock.objects.get(product=self.products[code]).quantity
+
+    def test_closes_count_setting_stock_to_counted(self):
+        AdjustmentService.post_count(self.count, user=self.user)
+
+        self.assertEqual({code: self.stock(code) for code in 'ABCD'}, {'A': 8, 'B': 4, 'C': 3, 'D': 2})
+        self.products['A'].refresh_from_db()
+        self.assertEqual(self.products['A'].current_stock, 8)
+        history = {
+            h.product.code: (h.previous_quantity, h.quantity_delta, h.resulting_quantity)
+            for h in StockHistory.objects.filter(inventory_count=self.count).select_related('product')
+        }
+        self.assertEqual(history, {'A': (10, -2, 8), 'C': (0, 3, 3), 'D': (0, 2, 2)})
+        self.assertEqual(
+            sorted(StockEvent.objects.values_list('product_stock__product__code', 'event_type', 'quantity_change')),
+            [('A', 'egreso_ajuste', -2), ('C', 'ingreso_ajuste', 3), ('D', 'ingreso_ajuste', 2)],
+        )
+        item = self.count.items.get(product=self.products['A'])
+        self.assertEqual((item.system_quantity, item.difference), (10, -2))
+        self.count.refresh_from_db()
+        self.assertEqual(self.count.status_label, InventoryCount.Status.CLOSED)
+        self.assertIsNotNone(self.count.closed_at)
+
+        # Cerrar de nuevo no vuelve a impactar
+        AdjustmentService.post_count(self.count, user=self.user)
+        self.assertEqual(StockHistory.objects.count(), 3)
+
+    def test_rejects_whole_count_on_invalid_line(self):
+        parent = Product.objects.create(code='P', name='Bobinas', category=self.category,
+                                        has_subproducts=True, created_by=self.user)
+        InventoryCountItem.objects.create(count=self.count, product=parent, counted_quantity=1, created_by=self.user)
+
+        with self.assertRaises(ValidationError):
+            AdjustmentService.post_count(self.count, user=self.user)
+        self.assertEqual(self.stock('A'), 10)
+        self.assertFalse(StockHistory.objects.exists())
+        self.count.refresh_from_db()
+        self.assertEqual(self.count.status_label, InventoryCount.Status.OPEN)
+
+    def test_closing_through_api_posts_the_count(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        url = reverse('inventory-adjustments-api:inventory-count-detail', args=[self.count.pk])
+
+        response = client.put(url, {'status_label': 'closed', 'notes': 'Cierre anual'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['status_label'], 'closed')
+        self.assertEqual(response.json()['notes'], 'Cierre anual')
+        self.assertEqual(self.stock('A'), 8)
@@ -1,4 +1,4 @@
-from apps.products.utils.redis_access import delete_keys_by_pattern
+from apps.products.utils.cache_tags import invalidate_tags
 from .cache_keys import (
     ADJUSTMENT_LIST_CACHE_PREFIX,
     INVENTORY_COUNT_LIST_CACHE_PREFIX,
@@ -7,12 +7,12 @@ from .cache_keys import (
 
 
 def invalidate_adjustment_cache():
-    delete_keys_by_pattern(ADJUSTMENT_LIST_CACHE_PREFIX)
+    invalidate_tags(ADJUSTMENT_LIST_CACHE_PREFIX)
 
 
 def invalidate_inventory_count_cache():
-    delete_keys_by_pattern(INVENTORY_COUNT_LIST_CACHE_PREFIX)
+    invalidate_tags(INVENTORY_COUNT_LIST_CACHE_PREFIX)
 
 
 def invalidate_stock_history_cache():
-    delete_keys_by_pattern(STOCK_HISTORY_LIST_CACHE_PREFIX)
+    invalidate_tags(STOCK_HISTORY_LIST_CACHE_PREFIX)
@@ -23,6 +23,7 @@ class ProductsWithFilesPercentage(APIView):
     # Cache corto (60s) para balancear frescura vs costo de conteos agregados
     METRICS_FILES_PCT_TTL = int(getattr(settings, 'METRICS_FILES_PCT_TTL', 60))
 
+    # Sin réplica: cache_page guarda para todos lo que devuelve cada ejecución
     @method_decorator(cache_page(int(getattr(settings, 'METRICS_FILES_PCT_TTL', 60))))
     def get(self, request):
         # Contamos SOLO productos activos; si querés todos, quita el .filter(status=True)
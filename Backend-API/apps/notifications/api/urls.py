@@ -3,8 +3,10 @@ from apps.notifications.api.views.notification_views import (
     my_notifications_list,
     my_notification_detail,
     my_notifications_summary,
+    my_notifications_unread_count,
     mark_notification_read,
     mark_all_notifications_read,
+    mark_notifications_read,
     notification_cache_metrics,
 )
 
@@ -12,7 +14,9 @@ urlpatterns = [
     path("", my_notifications_list, name="my_notifications_list"),
     path("<int:notif_pk>/", my_notification_detail, name="my_notification_detail"),
     path("summary/", my_notifications_summary, name="my_notifications_summary"),
+    path("unread-count/", my_notifications_unread_count, name="my_notifications_unread_count"),
     path("cache-metrics/", notification_cache_metrics, name="notification_cache_metrics"),
     path("<int:notif_pk>/read/", mark_notification_read, name="mark_notification_read"),
     path("mark-all-read/", mark_all_notifications_read, name="mark_all_notifications_read"),
+    path("mark-read/", mark_notifications_read, name="mark_notifications_read"),
 ]
@@ -4,6 +4,7 @@ from apps.notifications.utils.cache_decorators import cache_decorator_list, cach
 from apps.notifications.utils.cache_invalidation import invalidate_notification_cache
 from apps.core.utils import broadcast_crud_event
 # apps/notifications/api/views/notification_views.py
+from django.db import transaction
 from django.utils import timezone
 from django.shortcuts import get_object_or_404
 
@@ -13,10 +14,11 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiTypes
 
-from apps.core.pagination import Pagination
+from apps.core.pagination import KeysetPagination
 from apps.notifications.models.notification_model import Notification
 from apps.notifications.api.serializers.notification_serializer import NotificationSerializer
 from apps.notifications.utils.cache_decorators import get_notification_cache_metrics
+from apps.notifications.services.unread_counter import get_unread_count, schedule_unread_change
 
 
 @extend_schema(
@@ -46,6 +48,18 @@ from apps.notifications.utils.cache_decorators import get_notification_cache_met
             required=False,
             description="Filter by notification type (exact match)."
         ),
+        OpenApiParameter(
+            name="cursor",
+            type=OpenApiTypes.STR,
+            required=False,
+            description="Keyset pagination: empty for the first page, then the cursor from `next`/`previous`. Ignored if `page` is sent."
+        ),
+        OpenApiParameter(
+            name="count",
+            type=OpenApiTypes.STR,
+            required=False,
+            description="Cursor mode only: none (default), approx or exact."
+        ),
     ],
     tags=["Notifications"],
 )
@@ -72,7 +86,7 @@ def my_notifications_list(request):
     if type_param:
         qs = qs.filter(notif_type=type_param)
 
-    paginator = Pagination()
+    paginator = KeysetPagination()
     page = paginator.paginate_queryset(qs, request)
     ser = NotificationSerializer(page, many=True, context={"request": request})
     return paginator.get_paginated_response(ser.data)
@@ -100,17 +114,18 @@ def my_notification_detail(request, notif_pk: int):
 
 @extend_schema(
     summary="Unread count",
-    description="Returns the count of unread notifications for the authenticated user.",
+    description=(
+        "Returns the count of unread notifications for the authenticated user. "
+        "Served from the per-user counter (no COUNT query); the same value is pushed "
+        "over the user's WebSocket as {type: 'unread_count', unread}."
+    ),
     tags=["Notifications"],
 )
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def my_notifications_unread_count(request):
-    count = Notification.objects.filter(
-        user=request.user, status=True, is_read=False
-    ).count()
     # contrato actual del frontend: { unread }
-    return Response({"unread": count})
+    return Response({"unread": get_unread_count(request.user.id)})
 
 
 @extend_schema(
@@ -144,9 +159,20 @@ def my_notifications_unread_count(request):
 )
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
-@cache_decorator_list
 def my_notifications_summary(request):
     """Devuelve lista paginada + conteo unread en un payload."""
+    response = _summary_page(request)
+    if response.status_code != 200:
+        return response
+    data = dict(response.data)
+    # Conteo unread global (independiente de filtros read= / unread= para que el frontend siempre conozca el total pendiente).
+    # Sale del contador por usuario, fuera de la página cacheada.
+    data["unread"] = get_unread_count(request.user.id)
+    return Response(data)
+
+
+@cache_decorator_list
+def _summary_page(request):
     qs = Notification.objects.filter(user=request.user, status=True).order_by("-created_at")
 
     read_param = request.query_params.get("read", None)
@@ -162,17 +188,10 @@ def my_notifications_summary(request):
     if type_param:
         qs = qs.filter(notif_type=type_param)
 
-    paginator = Pagination()
+    paginator = KeysetPagination()
     page = paginator.paginate_queryset(qs, request)
     ser = NotificationSerializer(page, many=True, context={"request": request})
-
-    # Conteo unread global (independiente de filtros read= / unread= para que el frontend siempre conozca el total pendiente)
-    unread_total = Notification.objects.filter(user=request.user, status=True, is_read=False).count()
-
-    paginated = paginator.get_paginated_response(ser.data)
-    data = paginated.data
-    data["unread"] = unread_total
-    return Response(data)
+    return paginator.get_paginated_response(ser.data)
 
 
 @extend_schema(
@@ -199,10 +218,7 @@ def mark_notification_read(request, notif_pk: int):
         return Response({"detail": "Forbidden."}, status=status.HTTP_403_FORBIDDEN)
 
 
-    if not notif.is_read:
-        notif.is_read = True
-        notif.read_at = timezone.now()
-        notif.save(update_fields=["is_read", "read_at", "modified_at", "modified_by"])
+    if notif.mark_read(user=request.user):
         # Invalidar cache de este usuario
         invalidate_notification_cache(user_id=request.user.id)
         # Emitir evento WebSocket para notificar actualización de notificación
@@ -227,13 +243,15 @@ def mark_notification_read(request, notif_pk: int):
 @permission_classes([IsAuthenticated])
 def mark_all_notifications_read(request):
     qs = Notification.objects.filter(user=request.user, status=True, is_read=False)
+    notif_ids = list(qs.values_list('id', flat=True))
     now = timezone.now()
-    qs.update(is_read=True, read_at=now)
+    # Sólo las que seguían sin leer descuentan del contador
+    updated = qs.filter(pk__in=notif_ids).update(is_read=True, read_at=now, modified_at=now)
+    schedule_unread_change({request.user.id: -updated})
     # Invalidar cache de este usuario
     invalidate_notification_cache(user_id=request.user.id)
     # Emitir evento WebSocket para notificar actualización masiva
     # (Enviamos solo los IDs marcados como leídos)
-    notif_ids = list(qs.values_list('id', flat=True))
     broadcast_crud_event(
         event_type="update",
         app="notifications",
@@ -241,3 +259,54 @@ def mark_all_notifications_read(request):
         data={"ids": notif_ids, "is_read": True},
     )
     return Response({"ok": True})
+
+
+MARK_READ_MAX_IDS = 1000
+
+
+@extend_schema(
+    summary="Mark several notifications as read",
+    description=(
+        "Marks the given notifications of the authenticated user as read with a single UPDATE.\n\n"
+        f"Body: {{ ids: [<int>, ...] }} (max {MARK_READ_MAX_IDS}). Ids that are not yours, "
+        "deleted or already read are ignored. Response: { ok, updated }."
+    ),
+    tags=["Notifications"],
+)
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def mark_notifications_read(request):
+    ids = request.data.get("ids")
+    if (
+        not isinstance(ids, list) or not ids or len(ids) > MARK_READ_MAX_IDS
+        or not all(isinstance(i, int) and not isinstance(i, bool) for i in ids)
+    ):
+        return Response(
+            {"detail": f"ids debe ser una lista de 1 a {MARK_READ_MAX_IDS} enteros."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    now = timezone.now()
+    with transaction.atomic():
+        # Sólo se anuncian las que este UPDATE pasó a leídas (no ajenas, ni ya leídas)
+        changed = list(
+            Notification.objects.select_for_update()
+            .filter(user=request.user, status=True, is_read=False, pk__in=ids)
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+        updated = 0
+        if changed:
+            updated = Notification.objects.filter(pk__in=changed).update(
+                is_read=True, read_at=now, modified_at=now, modified_by=request.user
+            )
+    if updated:
+        schedule_unread_change({request.user.id: -updated})
+        invalidate_notification_cache(user_id=request.user.id)
+        broadcast_crud_event(
+            event_type="update",
+            app="notifications",
+            model="Notification",
+            data={"ids": changed, "is_read": True},
+        )
+    return Response({"ok": True, "updated": updated})
@@ -38,6 +38,12 @@ class NotificationsConsumer(AsyncWebsocketConsumer):
             elapsed = time.time() - start
             log.debug(f"[WS][notifications][disconnect] code={code} elapsed={elapsed:.3f}s")
 
+    async def notify_message(self, event: Dict[str, Any]):
+        # Notificaciones nuevas y contador de no leídas ({"type": "unread_count", ...})
+        payload = event.get("data", event)
+        import json
+        await self.send(text_data=json.dumps(payload))
+
     # Consumer de prueba de salud
 class PingConsumer(AsyncWebsocketConsumer):
     async def connect(self):
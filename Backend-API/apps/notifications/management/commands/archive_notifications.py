@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.notifications.services.retention import (
+    ARCHIVE_BATCH_SIZE, ARCHIVE_MAX_BATCHES, RETENTION_DAYS, archivable_notifications, archive_read_notifications,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Mueve a NotificationArchive las notificaciones leídas más viejas que --days "
+        "días, en lotes acotados (lo mismo que corre Celery Beat cada noche)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=RETENTION_DAYS)
+        parser.add_argument('--batch-size', type=int, default=ARCHIVE_BATCH_SIZE)
+        parser.add_argument('--max-batches', type=int, default=ARCHIVE_MAX_BATCHES)
+        parser.add_argument('--dry-run', action='store_true', help='Sólo informa cuántas se archivarían')
+
+    def handle(self, *args, **options):
+        if options['days'] < 1 or options['batch_size'] < 1 or options['max_batches'] < 1:
+            raise CommandError("--days, --batch-size y --max-batches deben ser positivos")
+        if options['dry_run']:
+            pending = archivable_notifications(options['days']).count()
+            self.stdout.write(f"{pending:,} notificaciones para archivar")
+            return
+        result = archive_read_notifications(options['days'], options['batch_size'], options['max_batches'])
+        self.stdout.write(self.style.SUCCESS(
+            f"{result['archived']:,} notificaciones archivadas en {result['batches']} lotes"
+        ))
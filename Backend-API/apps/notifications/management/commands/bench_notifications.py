@@ -0,0 +1,114 @@
+import asyncio
+import random
+import time
+
+from asgiref.sync import async_to_sync
+from celery import current_app
+from celery.signals import task_prerun
+from channels.layers import get_channel_layer
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+
+from apps.notifications.models.notification_model import Notification
+from apps.notifications.services.notification_service import create_notifications
+from apps.notifications.tasks import push_notification_task
+
+IN_MEMORY_LAYER = {"default": {"BACKEND": "channels.layers.InMemoryChannelLayer", "CONFIG": {"capacity": 10_000}}}
+
+
+def legacy_fan_out(users, notif_type, title, message, payload, actor):
+    """Camino anterior: un INSERT, una task y una relectura por destinatario."""
+    for user in users:
+        n = Notification(user=user, notif_type=notif_type, title=title, message=message,
+                         payload=payload, created_by=actor)
+        n.save(user=actor)
+        push_notification_task.delay(n.id)
+
+
+class _Counter:
+    def __init__(self):
+        self.queries = 0
+        self.tasks = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries += 1
+        return execute(sql, params, many, context)
+
+    def on_task(self, **kwargs):
+        self.tasks += 1
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide el fan-out de notificaciones a N destinatarios: create_notification por "
+        "usuario (camino anterior) contra create_notifications en lote. Usa el channel "
+        "layer en memoria y Celery en modo eager; los usuarios de prueba se borran al final."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--recipients', type=int, default=40, help='Destinatarios por envío')
+        parser.add_argument('--rounds', type=int, default=20, help='Envíos por variante')
+
+    def handle(self, *args, **options):
+        recipients, rounds = options['recipients'], options['rounds']
+        if recipients < 1 or rounds < 1:
+            raise CommandError("--recipients y --rounds deben ser positivos")
+
+        from apps.users.models.user_model import User
+        tag = f"bench-notif-{random.randint(0, 10**9)}"
+        users = [
+            User.objects.create_user(username=f"{tag}-{n}", email=f"{tag}-{n}@example.com",
+                                     password=None, name="Bench", last_name=str(n))
+            for n in range(recipients)
+        ]
+        eager = current_app.conf.task_always_eager
+        current_app.conf.task_always_eager = True
+        try:
+            with override_settings(CHANNEL_LAYERS=IN_MEMORY_LAYER):
+                layer = get_channel_layer()
+                channels = async_to_sync(self._subscribe)(layer, users)
+                self.stdout.write(
+                    f"{'variante':<10} {'queries':>8} {'tasks':>6} {'ms/envío':>9} {'notif/s':>9} {'entregadas':>11}"
+                )
+                for label, fan_out in (("anterior", legacy_fan_out), ("lote", create_notifications)):
+                    self._report(label, fan_out, users, rounds, layer, channels)
+        finally:
+            current_app.conf.task_always_eager = eager
+            User.objects.filter(username__startswith=tag).delete()
+
+    async def _subscribe(self, layer, users):
+        channels = []
+        for user in users:
+            channel = await layer.new_channel()
+            await layer.group_add(f"user_{user.pk}", channel)
+            channels.append(channel)
+        return channels
+
+    async def _drain(self, layer, channels):
+        delivered = 0
+        for channel in channels:
+            while True:
+                try:
+                    await asyncio.wait_for(layer.receive(channel), timeout=0.01)
+                except asyncio.TimeoutError:
+                    break
+                delivered += 1
+        return delivered
+
+    def _report(self, label, fan_out, users, rounds, layer, channels):
+        counter = _Counter()
+        task_prerun.connect(counter.on_task, weak=False)
+        try:
+            with connection.execute_wrapper(counter):
+                t0 = time.perf_counter()
+                for n in range(rounds):
+                    fan_out(users, "cut_status", f"Bench {n}", "", {"round": n}, None)
+                elapsed = time.perf_counter() - t0
+        finally:
+            task_prerun.disconnect(counter.on_task)
+        delivered = async_to_sync(self._drain)(layer, channels)
+        self.stdout.write(
+            f"{label:<10} {counter.queries / rounds:>8,.1f} {counter.tasks / rounds:>6,.1f} "
+            f"{elapsed * 1000 / rounds:>9,.1f} {len(users) * rounds / elapsed:>9,.0f} {delivered:>11,}"
+        )
@@ -0,0 +1,30 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from apps.notifications.services.unread_counter import push_unread_counts, reconcile_unread
+
+CHUNK = 1000
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcula desde la base los contadores de notificaciones no leídas "
+        "(cache notifications:unread:<id>) y opcionalmente los publica por WebSocket."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, action='append', dest='users',
+                            help='ID de usuario (repetible). Por defecto, todos los activos.')
+        parser.add_argument('--push', action='store_true', help='Publicar el valor en el grupo WS de cada usuario')
+
+    def handle(self, *args, **options):
+        user_ids = options['users'] or list(
+            get_user_model().objects.filter(is_active=True).values_list('pk', flat=True)
+        )
+        total = 0
+        for start in range(0, len(user_ids), CHUNK):
+            counts = reconcile_unread(user_ids[start:start + CHUNK])
+            if options['push']:
+                push_unread_counts(counts)
+            total += len(counts)
+        self.stdout.write(self.style.SUCCESS(f"{total:,} contadores reconciliados"))
@@ -3,16 +3,17 @@ from django.contrib.auth.models import AnonymousUser
 from rest_framework_simplejwt.tokens import AccessToken
 from channels.middleware import BaseMiddleware
 from asgiref.sync import sync_to_async
-from django.apps import apps as django_apps
-from django.conf import settings
 
 @sync_to_async
 def _get_user_by_id(user_id):
     try:
-        User = django_apps.get_model(settings.AUTH_USER_MODEL)  # lazy
-        return User.objects.get(id=user_id)
+        from apps.users.authentication import get_cached_user  # lazy
+        user = get_cached_user(user_id)
     except Exception:
         return AnonymousUser()
+    if user is None or not user.is_active:
+        return AnonymousUser()
+    return user
 
 async def _get_user_from_token(token_str):
     try:
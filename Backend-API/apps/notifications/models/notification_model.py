@@ -34,12 +34,81 @@ class Notification(BaseModel):
         verbose_name = "Notification"
         verbose_name_plural = "Notifications"
         ordering = ("-created_at",)
+        indexes = [
+            # Listado paginado por cursor (created_at, id) de cada usuario
+            models.Index(fields=["user", "-created_at", "-id"], name="notification_user_keyset_idx"),
+            # Listado con filtro read= (user, status, is_read) ordenado por fecha
+            models.Index(fields=["user", "status", "is_read", "-created_at"], name="notification_user_state_idx"),
+            # Barrido de retención: leídas más viejas que N días
+            models.Index(fields=["created_at"], condition=models.Q(is_read=True),
+                         name="notification_read_created_idx"),
+            # Reconciliación del contador de no leídas (COUNT por usuario)
+            models.Index(fields=["user"], condition=models.Q(status=True, is_read=False),
+                         name="notification_user_unread_idx"),
+        ]
 
-    def mark_read(self):
-        if not self.is_read:
-            self.is_read = True
-            self.read_at = timezone.now()
-            self.save(update_fields=["is_read", "read_at", "modified_at", "modified_by"])
+    def mark_read(self, user=None):
+        """
+        Marca como leída con un UPDATE condicional: si dos requests compiten,
+        sólo una descuenta del contador de no leídas.
+        """
+        if self.is_read:
+            return False
+        from apps.notifications.services.unread_counter import schedule_unread_change
+
+        now = timezone.now()
+        updated = Notification.objects.filter(pk=self.pk, is_read=False).update(
+            is_read=True, read_at=now, modified_at=now, modified_by=user,
+        )
+        self.is_read, self.read_at, self.modified_at = True, now, now
+        if user:
+            self.modified_by = user
+        if updated and self.status:
+            schedule_unread_change({self.user_id: -1})
+        return bool(updated)
+
+    def delete(self, *args, **kwargs):
+        """Soft delete; si estaba sin leer, descuenta del contador."""
+        from apps.notifications.services.unread_counter import schedule_unread_change
+
+        was_unread = self.status and not self.is_read
+        super().delete(*args, **kwargs)
+        if was_unread:
+            schedule_unread_change({self.user_id: -1})
 
     def __str__(self):
         return f"[{self.notif_type}] {self.title} -> {self.user_id}"
+
+
+class NotificationArchive(models.Model):
+    """
+    Notificaciones leídas que superaron la retención (ver
+    ``apps.notifications.services.retention``). Copia plana, sin auditoría
+    ni soft delete: sólo consulta histórica.
+    """
+    original_id = models.BigIntegerField(unique=True)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="archived_notifications",
+    )
+    notif_type = models.CharField(max_length=50, choices=Notification.TYPE_CHOICES, default="generic")
+    title = models.CharField(max_length=255)
+    message = models.TextField(blank=True, default="")
+    payload = models.JSONField(null=True, blank=True)
+    status = models.BooleanField(default=True)
+    read_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField()
+    created_by_id = models.BigIntegerField(null=True, blank=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Archived notification"
+        verbose_name_plural = "Archived notifications"
+        ordering = ("-created_at",)
+        indexes = [
+            models.Index(fields=["user", "-created_at"], name="notif_archive_user_idx"),
+        ]
+
+    def __str__(self):
+        return f"[{self.notif_type}] {self.title} -> {self.user_id} (archivada)"
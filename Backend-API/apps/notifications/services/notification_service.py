@@ -1,8 +1,60 @@
 # apps/notifications/services/notification_service.py
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable, List, Union
 from django.contrib.auth.models import AbstractBaseUser
+from django.db import transaction
 from apps.notifications.models.notification_model import Notification
-from apps.notifications.tasks import push_notification_task
+from apps.notifications.services.unread_counter import adjust_unread, unread_event
+from apps.notifications.tasks import notification_event, push_notifications_bulk_task
+from apps.notifications.utils.cache_invalidation import invalidate_notification_cache
+
+BULK_BATCH_SIZE = 500
+
+
+def create_notifications(
+    users: Iterable[Union[AbstractBaseUser, int]],
+    notif_type: str,
+    title: str,
+    message: str = "",
+    payload: Optional[Dict[str, Any]] = None,
+    actor: Optional[AbstractBaseUser] = None,
+) -> List[Notification]:
+    """
+    Crea la misma notificación para varios destinatarios (usuarios o ids).
+
+    Un único bulk_create por lote y, al confirmar la transacción, una sola
+    task con los mensajes ya serializados (la task no vuelve a leer la base),
+    incluido el nuevo contador de no leídas de cada destinatario.
+    """
+    recipients = {getattr(u, "pk", u): u for u in users}
+    if not recipients:
+        return []
+
+    notifications = Notification.objects.bulk_create(
+        [
+            Notification(
+                **({"user": user} if isinstance(user, AbstractBaseUser) else {"user_id": user_id}),
+                notif_type=notif_type or "generic",
+                title=(title or "")[:255],
+                message=message or "",
+                payload=payload or {},
+                created_by=actor,
+            )
+            for user_id, user in recipients.items()
+        ],
+        batch_size=BULK_BATCH_SIZE,
+    )
+    messages = [[n.user_id, notification_event(n)] for n in notifications]
+
+    def _after_commit():
+        for user_id in recipients:
+            invalidate_notification_cache(user_id=user_id)
+        counts = adjust_unread(dict.fromkeys(recipients, 1))
+        # Encola envío asíncrono a los WS de todos los destinatarios
+        push_notifications_bulk_task.delay(messages + [[uid, unread_event(n)] for uid, n in counts.items()])
+
+    transaction.on_commit(_after_commit)
+    return notifications
+
 
 def create_notification(
     user: AbstractBaseUser,
@@ -15,19 +67,5 @@ def create_notification(
     """
     Crea, persiste y encola el push de la notificación por WebSocket (Celery).
     """
-    n = Notification(
-        user=user,
-        notif_type=notif_type or "generic",
-        title=(title or "")[:255],
-        message=message or "",
-        payload=payload or {},
-        created_by=actor,
-    )
-    try:
-        n.save(user=actor)
-    except TypeError:
-        n.save()
-
-    # Encola envío asíncrono al WS del usuario
-    push_notification_task.delay(n.id)
+    n, = create_notifications([user], notif_type, title, message, payload, actor)
     return n
@@ -0,0 +1,77 @@
+# apps/notifications/services/retention.py
+"""
+Retención de notificaciones.
+
+Las notificaciones leídas con más de ``NOTIFICATION_RETENTION_DAYS`` días se
+copian a ``NotificationArchive`` y se borran de la tabla caliente, en lotes
+acotados: cada lote es una transacción corta (SELECT de ids por el índice
+parcial de leídas + INSERT + DELETE), así que no bloquea a los usuarios ni
+arma transacciones enormes. Las no leídas nunca se archivan, por lo que el
+contador de no leídas no cambia.
+"""
+import logging
+from datetime import timedelta
+from typing import Dict
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.notifications.models.notification_model import Notification, NotificationArchive
+from apps.notifications.utils.cache_invalidation import invalidate_notification_cache
+
+logger = logging.getLogger(__name__)
+
+RETENTION_DAYS = getattr(settings, "NOTIFICATION_RETENTION_DAYS", 90)
+ARCHIVE_BATCH_SIZE = 1000
+ARCHIVE_MAX_BATCHES = 100  # tope por corrida; lo que quede sale en la próxima
+
+ARCHIVE_FIELDS = ("id", "user_id", "notif_type", "title", "message", "payload", "status",
+                  "read_at", "created_at", "created_by_id")
+
+
+def archivable_notifications(days: int = RETENTION_DAYS):
+    cutoff = timezone.now() - timedelta(days=days)
+    return Notification.objects.filter(is_read=True, created_at__lt=cutoff)
+
+
+def _archive_batch(days: int, batch_size: int):
+    """Archiva un lote. Devuelve (cantidad, ids de usuario afectados)."""
+    with transaction.atomic():
+        qs = archivable_notifications(days).order_by("created_at", "id")
+        if connection.features.has_select_for_update_skip_locked:
+            # Dos corridas en paralelo no se pisan los lotes
+            qs = qs.select_for_update(skip_locked=True)
+        rows = list(qs.values(*ARCHIVE_FIELDS)[:batch_size])
+        if not rows:
+            return 0, set()
+        NotificationArchive.objects.bulk_create(
+            [
+                NotificationArchive(original_id=row["id"], **{f: row[f] for f in ARCHIVE_FIELDS if f != "id"})
+                for row in rows
+            ],
+            ignore_conflicts=True,  # reintento de un lote ya copiado
+        )
+        Notification.objects.filter(pk__in=[row["id"] for row in rows]).delete()
+    return len(rows), {row["user_id"] for row in rows}
+
+
+def archive_read_notifications(
+    days: int = RETENTION_DAYS,
+    batch_size: int = ARCHIVE_BATCH_SIZE,
+    max_batches: int = ARCHIVE_MAX_BATCHES,
+) -> Dict[str, int]:
+    """Archiva en lotes; devuelve {'archived': filas, 'batches': lotes}."""
+    archived = batches = 0
+    users = set()
+    while batches < max_batches:
+        count, affected = _archive_batch(days, batch_size)
+        if not count:
+            break
+        archived += count
+        batches += 1
+        users |= affected
+    for user_id in users:
+        invalidate_notification_cache(user_id=user_id)
+    logger.info("[Notifications][retention] %s archivadas en %s lotes", archived, batches)
+    return {"archived": archived, "batches": batches}
@@ -0,0 +1,129 @@
+# apps/notifications/services/unread_counter.py
+"""
+Contador de notificaciones no leídas por usuario.
+
+- El valor vive en la cache (Redis en producción) bajo ``notifications:unread:<id>``
+  y se mueve con INCR/DECR atómicos al crear, marcar leída(s) o borrar.
+- Los ajustes se aplican al confirmar la transacción: un rollback no lo desfasa.
+- Si la clave no existe (expiró, Redis se reinició, nunca se leyó) se
+  reconcilia con un COUNT sobre la base; el TTL fuerza además una
+  reconciliación periódica. ``reconcile_unread_counters`` lo hace a mano.
+- Cada cambio se publica en el grupo WS del usuario (``user_<id>``) como
+  ``{"type": "unread_count", "unread": n}``: el badge no necesita polling.
+"""
+import logging
+from typing import Dict, Iterable
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count
+
+from apps.notifications.models.notification_model import Notification
+
+logger = logging.getLogger(__name__)
+
+UNREAD_KEY_PREFIX = "notifications:unread"
+UNREAD_TTL = 60 * 60 * 24  # 24 horas: después se reconcilia contra la base
+
+
+def _key(user_id) -> str:
+    return f"{UNREAD_KEY_PREFIX}:{user_id}"
+
+
+def unread_event(count: int) -> dict:
+    return {"type": "notify.message", "data": {"type": "unread_count", "unread": count}}
+
+
+def reconcile_unread(user_ids: Iterable[int], overwrite: bool = True) -> Dict[int, int]:
+    """
+    Recalcula desde la base (un COUNT agrupado). Con ``overwrite=False`` sólo
+    completa claves ausentes (``add``): si otro proceso ya la creó, gana su valor.
+    """
+    user_ids = list(dict.fromkeys(user_ids))
+    if not user_ids:
+        return {}
+    counts = dict.fromkeys(user_ids, 0)
+    counts.update(
+        Notification.objects.filter(user_id__in=user_ids, status=True, is_read=False)
+        .values("user_id").annotate(n=Count("id")).values_list("user_id", "n")
+    )
+    try:
+        if overwrite:
+            cache.set_many({_key(uid): n for uid, n in counts.items()}, UNREAD_TTL)
+        else:
+            for uid, n in counts.items():
+                if not cache.add(_key(uid), n, UNREAD_TTL):
+                    current = cache.get(_key(uid))
+                    counts[uid] = n if current is None else current
+    except Exception as e:
+        logger.debug("[Notifications][unread] reconcile error: %s", e)
+    return counts
+
+
+def get_unread_counts(user_ids: Iterable[int]) -> Dict[int, int]:
+    user_ids = list(dict.fromkeys(user_ids))
+    try:
+        found = cache.get_many([_key(uid) for uid in user_ids])
+    except Exception as e:
+        logger.debug("[Notifications][unread] get_many error: %s", e)
+        found = {}
+    counts = {uid: found[_key(uid)] for uid in user_ids if found.get(_key(uid)) is not None}
+    missing = [uid for uid in user_ids if uid not in counts]
+    if missing:
+        counts.update(reconcile_unread(missing, overwrite=False))
+    return counts
+
+
+def get_unread_count(user_id: int) -> int:
+    return get_unread_counts([user_id])[user_id]
+
+
+def adjust_unread(deltas: Dict[int, int]) -> Dict[int, int]:
+    """
+    Aplica los deltas con INCR/DECR y devuelve los valores resultantes.
+    Las claves ausentes o que quedaron negativas se reconcilian con la base.
+    """
+    counts, stale, negative = {}, [], []
+    for user_id, delta in deltas.items():
+        if not delta:
+            continue
+        try:
+            value = cache.incr(_key(user_id), delta)
+        except ValueError:
+            stale.append(user_id)  # clave inexistente
+            continue
+        except Exception as e:
+            logger.debug("[Notifications][unread] incr error (%s): %s", user_id, e)
+            stale.append(user_id)
+            continue
+        if value < 0:
+            negative.append(user_id)
+        else:
+            counts[user_id] = value
+    if stale:
+        counts.update(reconcile_unread(stale, overwrite=False))
+    if negative:
+        counts.update(reconcile_unread(negative))
+    return counts
+
+
+def push_unread_counts(counts: Dict[int, int]) -> None:
+    channel_layer = get_channel_layer()
+    if not channel_layer or not counts:
+        return
+    from apps.notifications.tasks import _group_send_many
+    try:
+        async_to_sync(_group_send_many)(
+            channel_layer, [[uid, unread_event(n)] for uid, n in counts.items()]
+        )
+    except Exception as e:
+        logger.warning("[Notifications][unread] push error: %s", e)
+
+
+def schedule_unread_change(deltas: Dict[int, int]) -> None:
+    """Ajusta y publica los contadores al confirmar la transacción en curso."""
+    deltas = {uid: d for uid, d in deltas.items() if d}
+    if deltas:
+        transaction.on_commit(lambda: push_unread_counts(adjust_unread(deltas)))
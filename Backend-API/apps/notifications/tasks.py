@@ -1,9 +1,38 @@
 # apps/notifications/tasks.py
+import asyncio
+
 from celery import shared_task
 from asgiref.sync import async_to_sync
 from channels.layers import get_channel_layer
 from apps.notifications.models.notification_model import Notification
 
+# group_send concurrentes por tanda (acota conexiones/pipelines hacia Redis)
+PUSH_CONCURRENCY = 100
+
+
+def notification_event(notif: Notification) -> dict:
+    """Mensaje WS de una notificación (handler en el consumer: notify_message)."""
+    return {
+        "type": "notify.message",
+        "data": {
+            "id": notif.id,
+            "notif_type": notif.notif_type,  # ← unificado con REST
+            "title": notif.title,
+            "message": notif.message,
+            "payload": notif.payload,
+            "created_at": notif.created_at.isoformat(),
+            "is_read": notif.is_read,
+        },
+    }
+
+
+async def _group_send_many(channel_layer, messages):
+    for start in range(0, len(messages), PUSH_CONCURRENCY):
+        await asyncio.gather(*(
+            channel_layer.group_send(f"user_{user_id}", event)
+            for user_id, event in messages[start:start + PUSH_CONCURRENCY]
+        ))
+
 
 @shared_task(bind=True, max_retries=3)
 def push_notification_task(self, notif_id: int):
@@ -20,17 +49,23 @@ def push_notification_task(self, notif_id: int):
         # Si CHANNEL_LAYERS no está ok, evitamos reventar la task
         return
 
-    group = f"user_{notif.user_id}"
-    payload = {
-        "type": "notify.message",  # handler en el consumer: notify_message
-        "data": {
-            "id": notif.id,
-            "notif_type": notif.notif_type,  # ← unificado con REST
-            "title": notif.title,
-            "message": notif.message,
-            "payload": notif.payload,
-            "created_at": notif.created_at.isoformat(),
-            "is_read": notif.is_read,
-        },
-    }
-    async_to_sync(channel_layer.group_send)(group, payload)
+    async_to_sync(channel_layer.group_send)(f"user_{notif.user_id}", notification_event(notif))
+
+
+@shared_task(bind=True, max_retries=3)
+def push_notifications_bulk_task(self, messages):
+    """
+    Envía un lote de notificaciones ya serializadas: ``[[user_id, event], ...]``.
+    No relee la base; los group_send se lanzan concurrentemente por tandas.
+    """
+    channel_layer = get_channel_layer()
+    if not channel_layer or not messages:
+        return
+    async_to_sync(_group_send_many)(channel_layer, messages)
+
+
+@shared_task
+def archive_read_notifications_task():
+    """Retención programada (Celery Beat): ver services.retention."""
+    from apps.notifications.services.retention import archive_read_notifications
+    return archive_read_notifications()
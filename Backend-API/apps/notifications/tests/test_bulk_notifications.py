@@ -0,0 +1,69 @@
+import asyncio
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.notifications.models.notification_model import Notification
+from apps.notifications.services.notification_service import create_notification, create_notifications
+from apps.notifications.services.unread_counter import get_unread_counts
+from apps.users.models.user_model import User
+
+
+async def _subscribe(layer, user_ids):
+    channels = {}
+    for user_id in user_ids:
+        channels[user_id] = await layer.new_channel()
+        await layer.group_add(f"user_{user_id}", channels[user_id])
+    return channels
+
+
+async def _receive_all(layer, channels):
+    return {
+        user_id: await asyncio.wait_for(layer.receive(channel), timeout=1)
+        for user_id, channel in channels.items()
+    }
+
+
+class BulkNotificationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.actor = User.objects.create_user(
+            username="boss", email="boss@example.com", password="x", name="Bo", last_name="Ss",
+        )
+        cls.operators = [
+            User.objects.create_user(
+                username=f"op{n}", email=f"op{n}@example.com", password="x", name="Op", last_name=str(n),
+            )
+            for n in range(40)
+        ]
+
+    def test_fan_out_is_one_insert_and_one_task(self):
+        layer = get_channel_layer()
+        channels = async_to_sync(_subscribe)(layer, [u.pk for u in self.operators])
+        get_unread_counts(u.pk for u in self.operators)  # contadores ya en cache
+
+        with CaptureQueriesContext(connection) as ctx, self.captureOnCommitCallbacks(execute=True):
+            created = create_notifications(
+                self.operators + [self.operators[0].pk], "cut_status", "Orden 7 completada",
+                payload={"order_id": 7}, actor=self.actor,
+            )
+        # un único INSERT para los 40 destinatarios, ninguna relectura ni COUNT
+        self.assertEqual(len(created), 40)
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertEqual(Notification.objects.filter(title="Orden 7 completada", created_by=self.actor).count(), 40)
+
+        received = async_to_sync(_receive_all)(layer, channels)
+        by_user = {n.user_id: n for n in created}
+        for user_id, event in received.items():  # la notificación sale antes que el contador
+            self.assertEqual(event["type"], "notify.message")
+            self.assertEqual(event["data"]["id"], by_user[user_id].pk)
+            self.assertEqual(event["data"]["payload"], {"order_id": 7})
+
+    def test_single_notification_keeps_its_api(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            n = create_notification(self.operators[1], "generic", "Hola", message="Mensaje")
+        self.assertEqual(n.user, self.operators[1])
+        self.assertEqual(Notification.objects.get(pk=n.pk).message, "Mensaje")
@@ -0,0 +1,77 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.notifications.models.notification_model import Notification, NotificationArchive
+from apps.notifications.services.notification_service import create_notifications
+from apps.notifications.services.retention import archive_read_notifications
+from apps.notifications.services.unread_counter import get_unread_count
+from apps.users.models.user_model import User
+
+
+class NotificationRetentionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username="keeper", email="keeper@example.com", password="x", name="Ke", last_name="Eper",
+        )
+        cls.other = User.objects.create_user(
+            username="other", email="other@example.com", password="x", name="Ot", last_name="Her",
+        )
+        with cls.captureOnCommitCallbacks(execute=True):
+            for n in range(6):
+                create_notifications([cls.user], "generic", f"Aviso {n}")
+            create_notifications([cls.other], "generic", "Ajena")
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_bulk_mark_read_locks_then_updates_once(self):
+        mine = list(Notification.objects.filter(user=self.user).order_by("pk").values_list("pk", flat=True))
+        foreign = Notification.objects.get(user=self.other).pk
+        self.assertEqual(get_unread_count(self.user.pk), 6)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("mark_notifications_read"), {"ids": mine[:1]}, format="json")
+
+        with CaptureQueriesContext(connection) as ctx, self.captureOnCommitCallbacks(execute=True), \
+                patch("apps.notifications.api.views.notification_views.broadcast_crud_event") as broadcast:
+            response = self.client.post(reverse("mark_notifications_read"), {"ids": mine[:4] + [foreign]},
+                                        format="json")
+        self.assertEqual(response.json(), {"ok": True, "updated": 3})
+        statements = [q["sql"].split()[0] for q in ctx.captured_queries if "SAVEPOINT" not in q["sql"]]
+        self.assertEqual(statements, ["SELECT", "UPDATE"])
+        self.assertEqual(broadcast.call_args.kwargs["data"]["ids"], mine[1:4])
+        self.assertEqual(get_unread_count(self.user.pk), 2)
+        self.assertFalse(Notification.objects.get(pk=foreign).is_read)
+
+        response = self.client.post(reverse("mark_notifications_read"), {"ids": "1,2"}, format="json")
+        self.assertEqual(response.status_code, 400)
+
+    def test_old_read_notifications_move_to_archive_in_batches(self):
+        old = timezone.now() - timedelta(days=120)
+        Notification.objects.update(created_at=old)
+        Notification.objects.filter(user=self.user, title__in=["Aviso 0", "Aviso 1", "Aviso 2"]).update(
+            is_read=True, read_at=old,
+        )
+        Notification.objects.filter(title="Aviso 5").update(created_at=timezone.now())
+        Notification.objects.filter(title="Aviso 5").update(is_read=True)
+
+        result = archive_read_notifications(days=90, batch_size=2)
+
+        self.assertEqual(result, {"archived": 3, "batches": 2})
+        self.assertEqual(
+            sorted(NotificationArchive.objects.values_list("title", flat=True)), ["Aviso 0", "Aviso 1", "Aviso 2"]
+        )
+        self.assertEqual(Notification.objects.filter(user=self.user).count(), 3)
+        self.assertEqual(archive_read_notifications(days=90), {"archived": 0, "batches": 0})
+        self.assertEqual(get_unread_count(self.user.pk), 2)
@@ -0,0 +1,85 @@
+import asyncio
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.notifications.models.notification_model import Notification
+from apps.notifications.services.notification_service import create_notifications
+from apps.users.models.user_model import User
+
+
+async def _drain(layer, channel):
+    events = []
+    while True:
+        try:
+            events.append(await asyncio.wait_for(layer.receive(channel), timeout=0.05))
+        except asyncio.TimeoutError:
+            return events
+
+
+class UnreadCounterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username="reader", email="reader@example.com", password="x", name="Re", last_name="Ader",
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.layer = get_channel_layer()
+        self.channel = async_to_sync(self.layer.new_channel)()
+        async_to_sync(self.layer.group_add)(f"user_{self.user.pk}", self.channel)
+
+    def _unread(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse("my_notifications_unread_count"))
+        self.assertEqual(len(ctx.captured_queries), 0)
+        return response.json()["unread"]
+
+    def _pushed(self):
+        events = async_to_sync(_drain)(self.layer, self.channel)
+        return [e["data"]["unread"] for e in events if e["data"].get("type") == "unread_count"]
+
+    def test_counter_follows_every_write_path(self):
+        for n in range(4):
+            with self.captureOnCommitCallbacks(execute=True):
+                create_notifications([self.user], "generic", f"Aviso {n}")
+        self.assertEqual(self._pushed(), [1, 2, 3, 4])
+        self.assertEqual(self._unread(), 4)
+
+        first, second, *_ = Notification.objects.filter(user=self.user).order_by("pk")
+        url = reverse("mark_notification_read", args=[first.pk])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(url)
+            self.client.post(url)  # repetir no vuelve a descontar
+        self.assertEqual(self._unread(), 3)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            second.delete(user=self.user)
+        self.assertEqual(self._unread(), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("mark_all_notifications_read"))
+        self.assertEqual(self._pushed(), [3, 2, 0])
+        summary = self.client.get(reverse("my_notifications_summary")).json()
+        self.assertEqual(summary["unread"], 0)
+        self.assertEqual(len(summary["results"]), 3)
+
+    def test_missing_counter_is_reconciled_from_db(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            create_notifications([self.user], "generic", "Uno")
+            create_notifications([self.user], "generic", "Dos")
+        cache.clear()
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse("my_notifications_unread_count"))
+        self.assertEqual(response.json()["unread"], 2)
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertEqual(self._unread(), 2)
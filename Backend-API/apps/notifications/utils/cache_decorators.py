@@ -1,6 +1,9 @@
 from .cache_keys import NOTIFICATION_LIST_CACHE_PREFIX, NOTIFICATION_DETAIL_CACHE_PREFIX
-from .cache_invalidation import invalidate_notification_cache
+from .cache_invalidation import invalidate_notification_cache, user_notification_tags
+from apps.products.utils.cache_tags import versioned_prefix
 from rest_framework.response import Response
+import hashlib
+from urllib.parse import urlencode
 
 # ── CACHE CONFIG ─────────────────────────────────────────────
 LIST_TTL = 60 * 5   # 5 minutos
@@ -28,10 +31,15 @@ def get_notification_cache_metrics():
         return dict(_cache_metrics)
 
 def user_cache_key_list(request):
-    return f"{NOTIFICATION_LIST_CACHE_PREFIX}:{request.user.id}"
+    prefix = versioned_prefix(NOTIFICATION_LIST_CACHE_PREFIX, *user_notification_tags(request.user.id))
+    # Filtros, página y cursor forman parte de la clave
+    query = urlencode(sorted(request.query_params.items()))
+    digest = hashlib.md5(query.encode("utf-8")).hexdigest() if query else "all"
+    return f"{prefix}:{request.user.id}:{request.path}:{digest}"
 
 def user_cache_key_detail(request, notif_pk):
-    return f"{NOTIFICATION_DETAIL_CACHE_PREFIX}:{request.user.id}:{notif_pk}"
+    prefix = versioned_prefix(NOTIFICATION_DETAIL_CACHE_PREFIX, *user_notification_tags(request.user.id))
+    return f"{prefix}:{request.user.id}:{notif_pk}"
 
 def cache_decorator_list(view_func):
     def wrapper(request, *args, **kwargs):
@@ -18,7 +18,7 @@ from apps.orders.choices import (
 class CustomerOrder(BaseModel):
     """Pedido de cliente alineado con la tabla legacy ``pedidos``."""
 
-    legacy_id = models.IntegerField(null=True, blank=True, db_index=True, verbose_name="ID legacy")
+    legacy_id = models.IntegerField(null=True, blank=True, unique=True, verbose_name="ID legacy")
     number = models.CharField(
         max_length=30,
         blank=True,
@@ -17,7 +17,7 @@ class CustomerOrderLine(BaseModel):
         related_name="lines",
         verbose_name="Pedido",
     )
-    legacy_id = models.IntegerField(null=True, blank=True, db_index=True, verbose_name="ID legacy")
+    legacy_id = models.IntegerField(null=True, blank=True, unique=True, verbose_name="ID legacy")
     legacy_sequence = models.IntegerField(null=True, blank=True, verbose_name="Secuencia legacy")
     product = models.ForeignKey(
         Product,
@@ -67,4 +67,5 @@ class SupplierLedgerEntry(BaseModel):
         indexes = [
             models.Index(fields=["supplier", "posted_at"]),
             models.Index(fields=["entry_kind"]),
+            models.Index(fields=["supplier", "currency", "posted_at", "id"], name="supplier_ledger_stream_idx"),
         ]
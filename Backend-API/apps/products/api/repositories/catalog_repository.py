@@ -7,6 +7,7 @@ from django.db.models import (
     Case,
     When,
     Count,
+    BooleanField,
 )
 from django.db.models.functions import Coalesce
 
@@ -14,14 +15,20 @@ from apps.products.models import (
     Product,
     CustomerProduct,
     SupplierProduct,
-    ProductAbbreviation,
-    ProductSynonym,
-    ProductAlias,
 )
 from apps.products.models.metrics_model import ProductMetrics
+from apps.products.services import catalog_search
 from apps.stocks.models import ProductStockHistory
 
 
+def _document_hit(column, keyword):
+    return Case(
+        When(**{f"search_document__{column}__contains": keyword}, then=Value(True)),
+        default=Value(False),
+        output_field=BooleanField(),
+    )
+
+
 class CatalogRepository:
     """Consultas centralizadas para el catálogo maestro."""
 
@@ -39,38 +46,14 @@ class CatalogRepository:
     @staticmethod
     def search_products(keyword=None, filters=None):
         filters = filters or {}
-        keyword = (keyword or "").strip()
         qs = CatalogRepository.base_queryset(
             include_inactive=filters.get("include_inactive", False)
         )
 
-        abbr_exists = ProductAbbreviation.objects.filter(
-            product_id=OuterRef("pk"),
-            abbreviation__icontains=keyword,
-            status=True,
-        )
-        syn_exists = ProductSynonym.objects.filter(
-            product_id=OuterRef("pk"),
-            synonym__icontains=keyword,
-            status=True,
-        )
-        alias_exists = ProductAlias.objects.filter(
-            product_id=OuterRef("pk"),
-            alias_text__icontains=keyword,
-            status=True,
-        )
-
+        keyword = catalog_search.normalize_keyword(keyword)
         if keyword:
-            qs = qs.filter(
-                Q(code__icontains=keyword)
-                | Q(name__icontains=keyword)
-                | Q(detail_public__icontains=keyword)
-                | Q(detail_internal__icontains=keyword)
-                | Q(category__name__icontains=keyword)
-                | Exists(abbr_exists)
-                | Exists(syn_exists)
-                | Exists(alias_exists)
-            )
+            # Un único predicado sobre el documento precalculado (ver catalog_search)
+            qs = qs.filter(catalog_search.keyword_filter(keyword))
 
             qs = qs.annotate(
                 match_score=Case(
@@ -83,9 +66,9 @@ class CatalogRepository:
                     default=Value(25),
                     output_field=IntegerField(),
                 ),
-                synonym_hit=Exists(syn_exists),
-                abbreviation_hit=Exists(abbr_exists),
-                alias_hit=Exists(alias_exists),
+                synonym_hit=_document_hit("synonyms", keyword),
+                abbreviation_hit=_document_hit("abbreviations", keyword),
+                alias_hit=_document_hit("aliases", keyword),
             )
         else:
             qs = qs.annotate(
@@ -1,9 +1,10 @@
 import os
 import logging
 from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.db import IntegrityError, transaction
 from apps.products.models.product_image_model import ProductImage
 from apps.products.models.product_model import Product
-from apps.storages_client.services.products_files import get_product_file_url
+from apps.storages_client.services.products_files import get_product_file_urls
 
 logger = logging.getLogger(__name__)
 
@@ -25,14 +26,16 @@ class ProductFileRepository:
     @staticmethod
     def get_all_by_product(product_id: int):
         """Lista todas las imágenes asociadas a un producto con URL generada."""
+        files = list(ProductImage.objects.filter(product_id=product_id))
+        urls = get_product_file_urls(f.key for f in files)
         return [
             {
                 "key": f.key,
                 "name": f.name,
                 "mimeType": f.mime_type,
-                "url": get_product_file_url(f.key)
+                "url": urls.get(f.key)
             }
-            for f in ProductImage.objects.filter(product_id=product_id)
+            for f in files
         ]
 
     @staticmethod
@@ -65,4 +68,21 @@ class ProductFileRepository:
             url=url,
             name=name,
             mime_type=mime_type
-        )
\ No newline at end of file
+        )
+
+    @staticmethod
+    def get_or_create(product_id: int, key: str, url: str = None, name: str = None,
+                      mime_type: str = None) -> tuple[ProductImage, bool]:
+        """
+        Vincula el archivo ``key`` al producto una sola vez (confirmación de
+        subida directa idempotente). Devuelve (imagen, creada).
+        """
+        existing = ProductImage.objects.filter(product_id=product_id, key=key).first()
+        if existing is not None:
+            return existing, False
+        try:
+            with transaction.atomic():
+                return ProductFileRepository.create(product_id, key, url=url, name=name, mime_type=mime_type), True
+        except IntegrityError:
+            # Otra confirmación concurrente de la misma key ganó la carrera
+            return ProductImage.objects.get(product_id=product_id, key=key), False
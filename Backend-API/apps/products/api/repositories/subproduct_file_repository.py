@@ -4,6 +4,8 @@ from typing import Optional
 import os
 import logging
 
+from django.db import IntegrityError, transaction
+
 from apps.products.models.subproduct_image_model import SubproductImage
 from apps.products.models.subproduct_model import Subproduct
 
@@ -151,3 +153,41 @@ class SubproductFileRepository:
                 )
 
         return img
+
+    @staticmethod
+    def get_or_create(
+        subproduct_id: int,
+        key: str,
+        url: str = "",
+        name: str = "",
+        mime_type: str = "",
+        product_id: Optional[int] = None,
+        set_as_technical_sheet: bool = False,
+        user=None,
+    ) -> tuple[SubproductImage, bool]:
+        """
+        Como ``create``, pero idempotente por (subproducto, key): confirmar dos
+        veces la misma subida directa devuelve la imagen ya vinculada.
+
+        Returns:
+            (SubproductImage, creada)
+        """
+        existing = SubproductImage.objects.filter(subproduct_id=subproduct_id, key=key).first()
+        if existing is not None:
+            return existing, False
+        try:
+            with transaction.atomic():
+                img = SubproductFileRepository.create(
+                    subproduct_id=subproduct_id,
+                    key=key,
+                    url=url,
+                    name=name,
+                    mime_type=mime_type,
+                    product_id=product_id,
+                    set_as_technical_sheet=set_as_technical_sheet,
+                    user=user,
+                )
+                return img, True
+        except IntegrityError:
+            # Otra confirmación concurrente de la misma key ganó la carrera
+            return SubproductImage.objects.get(subproduct_id=subproduct_id, key=key), False
@@ -6,18 +6,24 @@ from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError as DjangoValidationError
 import logging
 
+from apps.core.fieldsets import SparseFieldsetMixin
+
 User = get_user_model()
 
 logger = logging.getLogger(__name__)
 
-class BaseSerializer(serializers.ModelSerializer):
+class BaseSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Clase base para serializers v3.
     - create/update aceptan 'user' explícito.
     - save() extrae 'user' y lo pasa a create/update.
     - Delega a BaseModel.save() pasándole 'user'.
     - Maneja representación y validación.
+    - Admite sparse fieldsets (?fields= / ?expand=, ver apps.core.fieldsets).
     """
+    # Usuarios de auditoría que lee to_representation (ver apps.core.prefetch)
+    prefetch_select_related = ('created_by', 'modified_by', 'deleted_by')
+
     # --- Representación de Campos de Auditoría ---
     created_by_username = serializers.CharField(source='created_by.username', read_only=True)
     modified_by_username = serializers.CharField(source='modified_by.username', read_only=True)
@@ -199,9 +205,10 @@ class BaseSerializer(serializers.ModelSerializer):
 
     def to_representation(self, instance):
         representation = super().to_representation(instance)
-        representation['created_by'] = instance.created_by.username if instance.created_by else None
-        representation['modified_by'] = instance.modified_by.username if instance.modified_by else None
-        representation['deleted_by'] = instance.deleted_by.username if instance.deleted_by else None
+        for name in ('created_by', 'modified_by', 'deleted_by'):
+            if self.wants_field(name):
+                user = getattr(instance, name)
+                representation[name] = user.username if user else None
         representation.pop('created_by_username', None)
         representation.pop('modified_by_username', None)
         representation.pop('deleted_by_username', None)
@@ -1,7 +1,5 @@
 # apps/products/api/serializers/product_serializer.py
 from rest_framework import serializers
-from decimal import Decimal
-from django.db.models import Sum
 
 from apps.products.models.product_model import Product
 from apps.products.models.category_model import Category
@@ -10,7 +8,6 @@ from apps.products.api.serializers.product_image_serializer import ProductImageS
 from apps.suppliers.api.serializers import SupplierProductSerializer
 from apps.products.api.serializers.customer_product_serializer import CustomerProductSerializer
 
-from apps.stocks.models import ProductStock, SubproductStock  # 👈 para el fallback
 from .base_serializer import BaseSerializer
 
 
@@ -18,7 +15,7 @@ class ProductSerializer(BaseSerializer):
     """
     Serializer final para Producto.
     - Usa BaseSerializer para auditoría.
-    - Muestra stock actual calculado ('current_stock').
+    - Muestra el stock materializado ('current_stock', 'reserved_stock').
     - Incluye imágenes relacionadas ('product_images').
     - Acepta ajuste de stock opcional en PUT ('quantity_change', 'reason').
     """
@@ -39,8 +36,9 @@ class ProductSerializer(BaseSerializer):
     suppliers = SupplierProductSerializer(many=True, read_only=True, source="supplier_products")
     customers = CustomerProductSerializer(many=True, read_only=True, source="customer_products")
 
-    # --- Stock actual dinámico (con fallback si no viene anotado en la QuerySet) ---
-    current_stock = serializers.SerializerMethodField(read_only=True)
+    # --- Stock materializado en Product (lo mantiene la app stocks) ---
+    current_stock = serializers.FloatField(read_only=True)
+    reserved_stock = serializers.FloatField(read_only=True)
 
     # --- Ajuste opcional de stock (escritura solamente) ---
     quantity_change = serializers.DecimalField(
@@ -81,7 +79,7 @@ class ProductSerializer(BaseSerializer):
 
             # Subproductos y stock derivado
             'has_subproducts',
-            'current_stock',
+            'current_stock', 'reserved_stock',
             'subproducts',
             'product_images',
 
@@ -94,47 +92,12 @@ class ProductSerializer(BaseSerializer):
             'quantity_change', 'reason',
         ]
         read_only_fields = [
-            'status', 'subproducts', 'current_stock', 'product_images',
+            'status', 'subproducts', 'current_stock', 'reserved_stock', 'product_images',
             'created_at', 'modified_at', 'deleted_at',
             'created_by', 'modified_by', 'deleted_by',
             'category_name',
         ]
 
-    # --- Cálculo de current_stock ---
-    def get_current_stock(self, obj):
-        """
-        1) Si la QuerySet ya trae 'current_stock' anotado (lista), úsalo.
-        2) Si no, calcula:
-           - Si tiene subproductos: suma de SubproductStock activos.
-           - Si no: ProductStock (si existe y está activo).
-        """
-        anotado = getattr(obj, "current_stock", None)
-        if anotado is not None:
-            return float(anotado)
-
-        # Fallback para detail (u otras vistas sin annotate)
-        if getattr(obj, "has_subproducts", False):
-            total = (
-                SubproductStock.objects
-                .filter(
-                    subproduct__parent_id=obj.pk,
-                    status=True,
-                    subproduct__status=True
-                )
-                .aggregate(total=Sum("quantity"))
-                .get("total")
-            )
-            return float(total) if total is not None else 0.0
-
-        # Sin subproductos: usar ProductStock si está activo
-        qty = (
-            ProductStock.objects
-            .filter(product=obj, status=True)
-            .values_list("quantity", flat=True)
-            .first()
-        )
-        return float(qty) if qty is not None else 0.0
-
     # --- Validaciones personalizadas ---
     def validate_name(self, value):
         return self._get_normalized_name(value) if value else value
@@ -164,6 +127,7 @@ class ProductSerializer(BaseSerializer):
         rep = super().to_representation(instance)
 
         # Forzar IDs de FK (opcional; DRF ya los devuelve con PrimaryKeyRelatedField)
-        rep["category"] = instance.category.id if instance.category else None
+        if "category" in rep:
+            rep["category"] = instance.category.id if instance.category else None
 
         return rep
@@ -1,4 +1,5 @@
 from decimal import Decimal, InvalidOperation
+from django.db.models import OuterRef, Subquery
 from rest_framework import serializers
 
 from apps.products.models.subproduct_model import Subproduct
@@ -58,14 +59,26 @@ class SubProductSerializer(BaseSerializer):
         ]
 
     # ---------- presentational stock ----------
-    def get_current_stock(self, obj):
-        # Robusto ante posibles duplicados accidentales (no debería ocurrir)
-        qty = (
+    @classmethod
+    def prepare_queryset(cls, queryset):
+        """Anota el stock activo para no consultar SubproductStock por fila."""
+        return queryset.annotate(active_stock_quantity=Subquery(
             SubproductStock.objects
-            .filter(subproduct=obj, status=True)
-            .values_list('quantity', flat=True)
-            .first()
-        )
+            .filter(subproduct=OuterRef('pk'), status=True)
+            .values('quantity')[:1]
+        ))
+
+    def get_current_stock(self, obj):
+        if hasattr(obj, 'active_stock_quantity'):
+            qty = obj.active_stock_quantity
+        else:
+            # Robusto ante posibles duplicados accidentales (no debería ocurrir)
+            qty = (
+                SubproductStock.objects
+                .filter(subproduct=obj, status=True)
+                .values_list('quantity', flat=True)
+                .first()
+            )
         return qty if qty is not None else Decimal("0.00")
 
     # -------------------- Validaciones de campo --------------------
@@ -4,6 +4,8 @@ from apps.products.api.views.products_view import product_list, product_detail,
 from apps.products.api.views.subproducts_view import subproduct_list, create_subproduct, subproduct_detail
 from apps.products.api.views.product_files_view import (
     product_file_upload_view,
+    product_file_upload_presign_view,
+    product_file_upload_confirm_view,
     product_file_list_view,
     product_file_delete_view,
     product_file_download_view,
@@ -11,6 +13,8 @@ from apps.products.api.views.product_files_view import (
 )
 from apps.products.api.views.subproduct_files_view import (
     subproduct_file_upload_view,
+    subproduct_file_upload_presign_view,
+    subproduct_file_upload_confirm_view,
     subproduct_file_list_view,
     subproduct_file_delete_view,
     subproduct_file_download_view,
@@ -29,6 +33,7 @@ from apps.products.api.views.catalog_view import (
     catalog_product_insight_view,
 )
 from apps.products.api.views.stock_history_view import product_stock_history_view
+from apps.products.api.views.facets_view import product_facets_view, subproduct_facets_view
 from apps.products.api.views.metrics_view import (
     product_metrics_list_view,
     product_metrics_detail_view,
@@ -53,16 +58,20 @@ urlpatterns = [
     # --- 📦 Productos ---
     path('products/', product_list, name='product-list'),
     path('products/create/', create_product, name='product-create'),
+    path('products/facets/', product_facets_view, name='product-facets'),
     path('products/<int:prod_pk>/', product_detail, name='product-detail'),
 
     # --- 🔄 Subproductos ---
     path('products/<int:prod_pk>/subproducts/', subproduct_list, name='subproduct-list'),
     path('products/<int:prod_pk>/subproducts/create/', create_subproduct, name='subproduct-create'),
+    path('products/<int:prod_pk>/subproducts/facets/', subproduct_facets_view, name='subproduct-facets'),
     path('products/<int:prod_pk>/subproducts/<int:subp_pk>/', subproduct_detail, name='subproduct-detail'),
 
     # --- 🎞️ Archivos Multimedia de Productos ---
     path('products/<str:product_id>/files/', product_file_list_view, name='product-file-list'),
     path('products/<str:product_id>/files/upload/', product_file_upload_view, name='product-file-upload'),
+    path('products/<str:product_id>/files/upload/presign/', product_file_upload_presign_view, name='product-file-upload-presign'),
+    path('products/<str:product_id>/files/upload/confirm/', product_file_upload_confirm_view, name='product-file-upload-confirm'),
     path('products/<str:product_id>/files/<path:file_id>/delete/', product_file_delete_view, name='product-file-delete'),
     path('products/<str:product_id>/files/<path:file_id>/download/', product_file_download_view, name='product-file-download'),
 
@@ -72,6 +81,8 @@ urlpatterns = [
     # --- 🎞️ Archivos Multimedia de Subproductos ---
     path('products/<str:product_id>/subproducts/<str:subproduct_id>/files/', subproduct_file_list_view, name='subproduct-file-list'),
     path('products/<str:product_id>/subproducts/<str:subproduct_id>/files/upload/', subproduct_file_upload_view, name='subproduct-file-upload'),
+    path('products/<str:product_id>/subproducts/<str:subproduct_id>/files/upload/presign/', subproduct_file_upload_presign_view, name='subproduct-file-upload-presign'),
+    path('products/<str:product_id>/subproducts/<str:subproduct_id>/files/upload/confirm/', subproduct_file_upload_confirm_view, name='subproduct-file-upload-confirm'),
 
     # 🔑 usar <path:file_id> porque la key puede incluir "/products/.../subproducts/.../archivo.png"
     path('products/<str:product_id>/subproducts/<str:subproduct_id>/files/<path:file_id>/delete/', subproduct_file_delete_view, name='subproduct-file-delete'),
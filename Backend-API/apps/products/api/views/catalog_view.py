@@ -4,6 +4,7 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from drf_spectacular.utils import extend_schema
 
+from apps.core.db_routing import replica_reads
 from apps.core.pagination import Pagination
 from apps.products.api.repositories.catalog_repository import CatalogRepository
 from apps.products.api.serializers.catalog_serializer import (
@@ -18,6 +19,7 @@ from apps.products.models import Product
 @extend_schema(**catalog_search_doc)
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
+@replica_reads
 def catalog_search_view(request):
     """Búsqueda inteligente en el catálogo maestro."""
 
@@ -36,6 +38,7 @@ def catalog_search_view(request):
 @extend_schema(**catalog_insight_doc)
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
+@replica_reads
 def catalog_product_insight_view(request, prod_pk: int):
     """Devuelve todos los satélites del artículo (métricas, alias, history)."""
 
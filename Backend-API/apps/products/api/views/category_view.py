@@ -6,7 +6,7 @@ from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
-from django.views.decorators.cache import cache_page
+from apps.products.utils.cache_tags import tagged_cache_page
 
 from apps.products.models.category_model import Category
 from apps.products.api.serializers.category_serializer import CategorySerializer
@@ -25,7 +25,7 @@ logger = logging.getLogger(__name__)
 # Antes era "None" (infinito hasta invalidación). Reducimos a 60s para evitar servir datos obsoletos mucho tiempo
 # y aun así disminuir hits a DB en escenarios de polling frecuente.
 CATEGORY_LIST_TTL = 60  # 1 minuto
-cache_decorator = cache_page(CATEGORY_LIST_TTL, key_prefix=CATEGORY_LIST_CACHE_PREFIX)
+cache_decorator = tagged_cache_page(CATEGORY_LIST_TTL, key_prefix=CATEGORY_LIST_CACHE_PREFIX)
 
 
 @api_view(['GET'])
@@ -0,0 +1,44 @@
+from django.core.exceptions import ValidationError
+from django.shortcuts import get_object_or_404
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from drf_spectacular.utils import extend_schema
+
+from apps.core.db_routing import replica_reads
+from apps.products.docs.facets_doc import product_facets_doc, subproduct_facets_doc
+from apps.products.models import Product
+from apps.products.services.catalog_facets import product_facets, subproduct_facets
+
+
+def _validation_error_response(exc: ValidationError):
+    detail = exc.message_dict if hasattr(exc, "error_dict") else {"detail": exc.messages}
+    return Response(detail, status=status.HTTP_400_BAD_REQUEST)
+
+
+@extend_schema(**product_facets_doc)
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+@replica_reads
+def product_facets_view(request):
+    """Conteos por categoría, subproductos y estado de stock para la barra de filtros."""
+    try:
+        data = product_facets(request.query_params.dict())
+    except ValidationError as exc:
+        return _validation_error_response(exc)
+    return Response(data, status=status.HTTP_200_OK)
+
+
+@extend_schema(**subproduct_facets_doc)
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+@replica_reads
+def subproduct_facets_view(request, prod_pk: int):
+    """Conteos por estado y stock de los subproductos de un producto activo."""
+    parent = get_object_or_404(Product, pk=prod_pk, status=True)
+    try:
+        data = subproduct_facets(parent.pk, request.query_params.dict())
+    except ValidationError as exc:
+        return _validation_error_response(exc)
+    return Response(data, status=status.HTTP_200_OK)
@@ -5,6 +5,7 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from drf_spectacular.utils import extend_schema
 
+from apps.core.db_routing import replica_reads
 from apps.core.pagination import Pagination
 from apps.products.api.repositories.catalog_repository import CatalogRepository
 from apps.products.api.serializers.metrics_serializer import ProductMetricsSerializer
@@ -30,6 +31,7 @@ def _parse_int(value):
 @extend_schema(**metrics_list_doc)
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
+@replica_reads
 def product_metrics_list_view(request):
     filters = {
         "include_inactive": _parse_bool(request.query_params.get("include_inactive")) or False,
@@ -49,6 +51,7 @@ def product_metrics_list_view(request):
 @extend_schema(**metrics_detail_doc)
 @api_view(["GET", "PUT"])
 @permission_classes([IsAuthenticated])
+@replica_reads
 def product_metrics_detail_view(request, prod_pk: int):
     queryset = CatalogRepository.metrics_queryset({"include_inactive": True})
     metrics = queryset.filter(product_id=prod_pk).first()
@@ -17,14 +17,17 @@ from apps.storages_client.services.products_files import (
     upload_product_file,
     delete_product_file,
     get_product_file_url,
+    presign_product_upload,
+    confirm_product_upload,
 )
+from apps.storages_client.services.uploads import upload_many
 from apps.products.docs.product_image_doc import (
     product_image_upload_doc,
     product_image_list_doc,
     product_image_download_doc,
     product_image_delete_doc,
 )
-from apps.products.utils.cache_invalidation import invalidate_product_cache
+from apps.products.utils.cache_invalidation import invalidate_product_entity_cache
 from apps.core.utils import broadcast_crud_event
 
 logger = logging.getLogger(__name__)
@@ -54,10 +57,17 @@ def product_file_upload_view(request, product_id: str):
     if not files:
         return Response({"detail": "No se proporcionaron archivos."}, status=status.HTTP_400_BAD_REQUEST)
 
+    # Las subidas a S3 corren en paralelo; los registros se crean en este hilo
+    uploads = upload_many([
+        (lambda f=f: upload_product_file(file=f, product_id=str(product.id)))
+        for f in files
+    ])
+
     results, errors = [], []
-    for f in files:
+    for f, (res, exc) in zip(files, uploads):
         try:
-            res = upload_product_file(file=f, product_id=str(product.id))
+            if exc is not None:
+                raise exc
             ProductFileRepository.create(
                 product_id=product.id,
                 key=res["key"],
@@ -72,8 +82,8 @@ def product_file_upload_view(request, product_id: str):
 
     if results:
         # Invalidar caché de lista y detalle y emitir evento WebSocket
-        invalidate_product_cache()
-        logger.debug("[Cache] product_list y product_detail invalidada tras UPLOAD")
+        invalidate_product_entity_cache(product.id)
+        logger.debug("[Cache] product_detail:%s y sus páginas invalidadas tras UPLOAD", product.id)
         broadcast_crud_event(
             event_type="create",
             app="products",
@@ -93,6 +103,82 @@ def product_file_upload_view(request, product_id: str):
     )
 
 
+@extend_schema(
+    tags=product_image_upload_doc["tags"],
+    summary="Formulario firmado para subir un archivo directo al bucket",
+    operation_id="product-file-upload-presign",
+    description=(
+        "Body JSON {filename, content_type}. Devuelve {key, url, fields, expires_in}: el cliente "
+        "hace un POST multipart a `url` con `fields` + `file` y luego llama a /files/upload/confirm/."
+    ),
+    responses={200: {"description": "Formulario firmado"}, 400: {"description": "Datos inválidos"}},
+)
+@api_view(["POST"])
+@permission_classes([IsAdminUser])
+def product_file_upload_presign_view(request, product_id: str):
+    try:
+        product = Product.objects.get(pk=product_id)
+    except Product.DoesNotExist:
+        raise ProductNotFound(f"Producto con ID {product_id} no existe.")
+
+    filename = (request.data.get("filename") or "").strip()
+    if not filename:
+        return Response({"detail": "El campo 'filename' es obligatorio."}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        form = presign_product_upload(filename, request.data.get("content_type"), product_id=product.id)
+    except ValueError as e:
+        return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    except Exception as e:
+        logger.exception(f"❌ Error firmando subida directa para producto {product_id}: {e}")
+        return Response({"detail": "Error generando la subida directa."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    return Response(form, status=status.HTTP_200_OK)
+
+
+@extend_schema(
+    tags=product_image_upload_doc["tags"],
+    summary="Confirma una subida directa al bucket",
+    operation_id="product-file-upload-confirm",
+    description="Body JSON {key, name}. Verifica que el objeto exista y lo vincula al producto.",
+    responses={
+        201: {"description": "Archivo vinculado"},
+        200: {"description": "El archivo ya estaba vinculado"},
+        400: {"description": "Key inválida o inexistente"},
+    },
+)
+@api_view(["POST"])
+@permission_classes([IsAdminUser])
+def product_file_upload_confirm_view(request, product_id: str):
+    try:
+        product = Product.objects.get(pk=product_id)
+    except Product.DoesNotExist:
+        raise ProductNotFound(f"Producto con ID {product_id} no existe.")
+
+    key = (request.data.get("key") or "").strip()
+    try:
+        res = confirm_product_upload(key, request.data.get("name") or "", product_id=product.id)
+    except ValueError as e:
+        return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    _, created = ProductFileRepository.get_or_create(
+        product_id=product.id,
+        key=res["key"],
+        url=res["url"],
+        name=res["name"],
+        mime_type=res["mimeType"],
+    )
+    if not created:
+        # Confirmación repetida: el archivo ya estaba vinculado
+        return Response({"uploaded": [res["key"]], "errors": None}, status=status.HTTP_200_OK)
+    invalidate_product_entity_cache(product.id)
+    broadcast_crud_event(
+        event_type="create",
+        app="products",
+        model="ProductFile",
+        data={"product_id": product_id, "files": [res["key"]]}
+    )
+    return Response({"uploaded": [res["key"]], "errors": None}, status=status.HTTP_201_CREATED)
+
+
 @extend_schema(
     tags=product_image_list_doc["tags"],
     summary=product_image_list_doc["summary"],
@@ -162,8 +248,8 @@ def product_file_delete_view(request, product_id: str, file_id: str):
         delete_product_file(file_id)
         ProductFileRepository.delete(file_id)
         # Invalidar caché de lista y detalle y emitir evento WebSocket
-        invalidate_product_cache()
-        logger.debug("[Cache] product_list y product_detail invalidada tras DELETE")
+        invalidate_product_entity_cache(product_id)
+        logger.debug("[Cache] product_detail:%s y sus páginas invalidadas tras DELETE", product_id)
         broadcast_crud_event(
             event_type="delete",
             app="products",
@@ -1,12 +1,12 @@
 # apps/products/api/views/products_view.py
 
 import logging
+from contextlib import nullcontext
 from decimal import Decimal, InvalidOperation
 
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.db import transaction
-from django.views.decorators.cache import cache_page
 from django.shortcuts import get_object_or_404
 
 from rest_framework import status, serializers
@@ -15,11 +15,14 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from drf_spectacular.utils import extend_schema
 
-from django.db.models import Sum, F, Case, When, DecimalField, OuterRef, Subquery
 
+from apps.core.db_routing import primary_reads, replica_reads
+from apps.core.fieldsets import fieldset_from_request
 from apps.core.pagination import Pagination
+from apps.core.prefetch import plan_queryset
 from apps.products.api.serializers.product_serializer import ProductSerializer
 from apps.products.api.repositories.product_repository import ProductRepository
+from apps.products.models.product_model import Product
 from apps.products.filters.product_filter import ProductFilter
 from apps.products.docs.product_doc import (
     list_product_doc,
@@ -31,16 +34,18 @@ from apps.products.docs.product_doc import (
 
 # Nuevos helpers centralizados
 from apps.products.utils.cache_keys import (
-    PRODUCT_LIST_CACHE_PREFIX,
-    PRODUCT_DETAIL_CACHE_PREFIX,
-    SUBPRODUCT_LIST_CACHE_PREFIX,
-    SUBPRODUCT_DETAIL_CACHE_PREFIX,
+    PRODUCT_WRITE_CLOCK_TAG,
+    product_list_cache_key,
+    product_detail_cache_key,
+    product_entity_tag,
 )
 from apps.products.utils.cache_invalidation import (
-    invalidate_product_cache,
     invalidate_subproduct_cache,
+    register_product_list_family,
 )
-from apps.stocks.models import ProductStock, SubproductStock
+from apps.products.utils.cache_tags import get_tag_versions
+from apps.products.utils.cache_dependencies import dependent_cache_get, dependent_cache_set
+from apps.stocks.models import ProductStock
 from apps.stocks.services import initialize_product_stock, adjust_product_stock
 from apps.core.utils import broadcast_crud_event
 
@@ -50,14 +55,7 @@ logger = logging.getLogger(__name__)
 PRODUCT_LIST_TTL = 60 * 15   # 15 min
 PRODUCT_DETAIL_TTL = 60 * 5  # 5 min
 
-list_cache = (
-    cache_page(PRODUCT_LIST_TTL, key_prefix=PRODUCT_LIST_CACHE_PREFIX)
-    if not settings.DEBUG else (lambda fn: fn)
-)
-detail_cache = (
-    cache_page(PRODUCT_DETAIL_TTL, key_prefix=PRODUCT_DETAIL_CACHE_PREFIX)
-    if not settings.DEBUG else (lambda fn: fn)
-)
+USE_CACHE = not settings.DEBUG
 
 
 @extend_schema(
@@ -70,47 +68,51 @@ detail_cache = (
 )
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
-@list_cache
+@replica_reads
 def product_list(request):
     """
-    Listar productos activos con paginación y stock calculado.
-    TTL de cache: 15min
+    Listar productos activos con paginación y stock materializado.
+    TTL de cache: 15min. Cada página depende de su familia de filtros y de los
+    productos que contiene: guardar un producto sólo invalida esas páginas.
     """
-    # Subqueries para stock
-    product_stock_sq = ProductStock.objects.filter(
-        product=OuterRef('pk'), status=True
-    ).values('quantity')[:1]
-    subp_stock_sq = SubproductStock.objects.filter(
-        subproduct__parent_id=OuterRef('pk'),
-        status=True,
-        subproduct__status=True
-    ).values('subproduct__parent').annotate(total=Sum('quantity')).values('total')
+    cache_key = family_tag = since = None
+    if USE_CACHE:
+        params = request.GET.dict()
+        page_no = params.pop('page', 1)
+        page_size = params.pop('page_size', Pagination.page_size)
+        family_tag = register_product_list_family(params)
+        if family_tag:
+            cache_key = product_list_cache_key(page_no, page_size, **params)
+            cached = dependent_cache_get(cache_key)
+            if cached is not None:
+                return Response(cached)
+            # Leídas antes de la query: una escritura concurrente impide cachear
+            since = get_tag_versions([PRODUCT_WRITE_CLOCK_TAG, family_tag])
 
-    qs = ProductRepository.get_all_active_products().annotate(
-        individual_stock_qty=Subquery(product_stock_sq, output_field=DecimalField()),
-        subproduct_stock_total=Subquery(subp_stock_sq, output_field=DecimalField())
-    ).annotate(
-        current_stock=Case(
-            When(has_subproducts=False, individual_stock_qty__isnull=False,
-                 then=F('individual_stock_qty')),
-            When(has_subproducts=True, subproduct_stock_total__isnull=False,
-                 then=F('subproduct_stock_total')),
-            default=Decimal('0.00'),
-            output_field=DecimalField()
+    # Lo que se va a cachear para todos se lee del primario, no de la réplica
+    with primary_reads() if cache_key else nullcontext():
+        # current_stock/reserved_stock son columnas de Product: sin subqueries por fila.
+        # Relaciones anidadas planificadas desde el serializer: queries fijas por página.
+        # Con ?fields= / ?expand= sólo se planifican y serializan las relaciones pedidas.
+        qs = plan_queryset(
+            ProductSerializer, ProductRepository.get_all_active_products(), fieldset_from_request(request)
         )
-    )
 
-    # Filtrado
-    f = ProductFilter(request.GET, queryset=qs)
-    if not f.is_valid():
-        return Response(f.errors, status=status.HTTP_400_BAD_REQUEST)
-    qs = f.qs
+        # Filtrado
+        f = ProductFilter(request.GET, queryset=qs)
+        if not f.is_valid():
+            return Response(f.errors, status=status.HTTP_400_BAD_REQUEST)
+        qs = f.qs
 
-    # Paginación y serialización
-    paginator = Pagination()
-    page = paginator.paginate_queryset(qs, request)
-    data = ProductSerializer(page, many=True, context={'request': request}).data
-    return paginator.get_paginated_response(data)
+        # Paginación y serialización
+        paginator = Pagination()
+        page = paginator.paginate_queryset(qs, request)
+        data = ProductSerializer(page, many=True, context={'request': request}).data
+        response = paginator.get_paginated_response(data)
+    if cache_key:
+        tags = [family_tag, *(product_entity_tag(obj.pk) for obj in page)]
+        dependent_cache_set(cache_key, response.data, PRODUCT_LIST_TTL, tags, since=since)
+    return response
 
 
 @extend_schema(
@@ -162,9 +164,9 @@ def create_product(request):
                     initial_quantity=initial_qty,
                     reason=reason
                 )
+        product.refresh_from_db(fields=Product.MATERIALIZED_FIELDS)
         response_data = ProductSerializer(product, context={'request': request}).data
-        # Invalidar cache y emitir evento WebSocket
-        invalidate_product_cache()
+        # La invalidación de cache la hacen los signals de Product
         broadcast_crud_event(
             event_type="create",
             app="products",
@@ -214,16 +216,25 @@ def product_detail(request, prod_pk):
     if not product:
         return Response({"detail": "Producto no encontrado."}, status=status.HTTP_404_NOT_FOUND)
 
-    # GET con cache_page
+    # GET con cache dependiente de product:<pk>
     if request.method == 'GET':
-        @detail_cache
-        def cached_get(req, pk):
-            obj = get_object_or_404(
-                ProductRepository.get_all_active_products(), pk=pk
-            )
-            return Response(ProductSerializer(obj, context={'request': req}).data)
+        fieldset = fieldset_from_request(request)
+        cache_key = product_detail_cache_key(prod_pk, fieldset) if USE_CACHE else None
+        if cache_key:
+            cached = dependent_cache_get(cache_key)
+            if cached is not None:
+                return Response(cached)
+            tag = product_entity_tag(prod_pk)
+            since = get_tag_versions([tag])
 
-        return cached_get(request, prod_pk)
+        obj = get_object_or_404(
+            plan_queryset(ProductSerializer, ProductRepository.get_all_active_products(), fieldset),
+            pk=prod_pk,
+        )
+        data = ProductSerializer(obj, context={'request': request}).data
+        if cache_key:
+            dependent_cache_set(cache_key, data, PRODUCT_DETAIL_TTL, [tag], since=since)
+        return Response(data)
 
     # PUT → actualización y ajuste de stock
     if request.method == 'PUT':
@@ -260,10 +271,10 @@ def product_detail(request, prod_pk):
                     else status.HTTP_500_INTERNAL_SERVER_ERROR)
             return Response({"detail": detail}, status=code)
 
-        # Invalidar caches y emitir evento WebSocket
-        invalidate_product_cache()
+        # product_detail/product_list los invalidan los signals (por entidad)
         invalidate_subproduct_cache()
-        logger.debug("[Cache] invalidado tras UPDATE → products y subproducts")
+        logger.debug("[Cache] invalidado tras UPDATE → subproducts")
+        updated.refresh_from_db(fields=Product.MATERIALIZED_FIELDS)
         response_data = ProductSerializer(updated, context={'request': request}).data
         broadcast_crud_event(
             event_type="update",
@@ -279,10 +290,9 @@ def product_detail(request, prod_pk):
             return Response({"detail": "Permiso denegado."}, status=status.HTTP_403_FORBIDDEN)
 
         product.delete(user=request.user)
-        # Invalidar caches y emitir evento WebSocket
-        invalidate_product_cache()
+        # product_detail/product_list los invalidan los signals (por entidad)
         invalidate_subproduct_cache()
-        logger.debug("[Cache] invalidado tras DELETE → products y subproducts")
+        logger.debug("[Cache] invalidado tras DELETE → subproducts")
         broadcast_crud_event(
             event_type="delete",
             app="products",
@@ -4,6 +4,7 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from drf_spectacular.utils import extend_schema
 
+from apps.core.db_routing import replica_reads
 from apps.products.api.repositories.catalog_repository import CatalogRepository
 from apps.products.api.serializers.stock_history_serializer import ProductStockHistorySerializer
 from apps.products.docs.catalog_doc import catalog_history_doc
@@ -13,6 +14,7 @@ from apps.products.models import Product
 @extend_schema(**catalog_history_doc)
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
+@replica_reads
 def product_stock_history_view(request, prod_pk: int):
     try:
         Product.objects.get(pk=prod_pk)
@@ -19,7 +19,10 @@ from apps.storages_client.services.subproducts_files import (
     upload_subproduct_file,
     delete_subproduct_file,
     get_subproduct_file_url,
+    presign_subproduct_upload,
+    confirm_subproduct_upload,
 )
+from apps.storages_client.services.uploads import upload_many
 from apps.products.docs.subproduct_image_doc import (
     subproduct_image_upload_doc,
     subproduct_image_list_doc,
@@ -94,14 +97,21 @@ def subproduct_file_upload_view(request, product_id: str, subproduct_id: str):
     raw_flag = (request.data.get("set_as_technical_sheet") or "").strip().lower()
     set_as_technical_sheet = raw_flag in {"1", "true", "yes", "on"}
 
+    # Las subidas a S3 corren en paralelo; los registros se crean en este hilo
+    uploads = upload_many([
+        (lambda f=f: upload_subproduct_file(
+            file=f,
+            product_id=product.id,     # asegurar pk real
+            subproduct_id=subproduct.id
+        ))
+        for f in files
+    ])
+
     results, errors = [], []
-    for f in files:
+    for f, (res, exc) in zip(files, uploads):
         try:
-            res = upload_subproduct_file(
-                file=f,
-                product_id=product.id,     # asegurar pk real
-                subproduct_id=subproduct.id
-            )
+            if exc is not None:
+                raise exc
             SubproductFileRepository.create(
                 subproduct_id=subproduct.id,
                 key=res["key"],
@@ -140,6 +150,88 @@ def subproduct_file_upload_view(request, product_id: str, subproduct_id: str):
     )
 
 
+@extend_schema(
+    tags=subproduct_image_upload_doc["tags"],
+    summary="Formulario firmado para subir un archivo de subproducto directo al bucket",
+    operation_id="subproduct-file-upload-presign",
+    description=(
+        "Body JSON {filename, content_type}. Devuelve {key, url, fields, expires_in}: el cliente "
+        "hace un POST multipart a `url` con `fields` + `file` y luego llama a /files/upload/confirm/."
+    ),
+    responses={200: {"description": "Formulario firmado"}, 400: {"description": "Datos inválidos"}},
+)
+@api_view(["POST"])
+@permission_classes([IsAdminUser])
+def subproduct_file_upload_presign_view(request, product_id: str, subproduct_id: str):
+    product, subproduct = _get_parent_and_subproduct_or_404(product_id, subproduct_id)
+
+    filename = (request.data.get("filename") or "").strip()
+    if not filename:
+        return Response({"detail": "El campo 'filename' es obligatorio."}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        form = presign_subproduct_upload(
+            filename, request.data.get("content_type"),
+            product_id=product.id, subproduct_id=subproduct.id,
+        )
+    except ValueError as e:
+        return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    except Exception as e:
+        logger.exception(f"❌ Error firmando subida directa para subproducto {subproduct_id}: {e}")
+        return Response({"detail": "Error generando la subida directa."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    return Response(form, status=status.HTTP_200_OK)
+
+
+@extend_schema(
+    tags=subproduct_image_upload_doc["tags"],
+    summary="Confirma una subida directa de subproducto",
+    operation_id="subproduct-file-upload-confirm",
+    description=(
+        "Body JSON {key, name, set_as_technical_sheet?}. Verifica que el objeto exista "
+        "y lo vincula al subproducto."
+    ),
+    responses={
+        201: {"description": "Archivo vinculado"},
+        200: {"description": "El archivo ya estaba vinculado"},
+        400: {"description": "Key inválida o inexistente"},
+    },
+)
+@api_view(["POST"])
+@permission_classes([IsAdminUser])
+def subproduct_file_upload_confirm_view(request, product_id: str, subproduct_id: str):
+    product, subproduct = _get_parent_and_subproduct_or_404(product_id, subproduct_id)
+
+    key = (request.data.get("key") or "").strip()
+    try:
+        res = confirm_subproduct_upload(
+            key, request.data.get("name") or "",
+            product_id=product.id, subproduct_id=subproduct.id,
+        )
+    except ValueError as e:
+        return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    raw_flag = str(request.data.get("set_as_technical_sheet") or "").strip().lower()
+    _, created = SubproductFileRepository.get_or_create(
+        subproduct_id=subproduct.id,
+        key=res["key"],
+        url=res["url"],
+        name=res["name"],
+        mime_type=res["mimeType"],
+        product_id=product.id,
+        set_as_technical_sheet=raw_flag in {"1", "true", "yes", "on"},
+    )
+    if not created:
+        # Confirmación repetida: el archivo ya estaba vinculado
+        return Response({"uploaded": [res["key"]], "errors": None}, status=status.HTTP_200_OK)
+    invalidate_subproduct_cache()
+    broadcast_crud_event(
+        event_type="create",
+        app="products",
+        model="SubproductFile",
+        data={"product_id": product_id, "subproduct_id": subproduct_id, "files": [res["key"]]}
+    )
+    return Response({"uploaded": [res["key"]], "errors": None}, status=status.HTTP_201_CREATED)
+
+
 # ========== List ==============================================================
 
 @extend_schema(
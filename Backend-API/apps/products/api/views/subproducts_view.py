@@ -4,10 +4,8 @@ from decimal import Decimal, InvalidOperation
 from django.conf import settings
 from django.core.exceptions import ValidationError as DjangoValidationError
 from django.db import IntegrityError, transaction
-from django.db.models import DecimalField, OuterRef, Subquery
-from django.db.models.functions import Coalesce
 from django.shortcuts import get_object_or_404
-from django.views.decorators.cache import cache_page
+from apps.products.utils.cache_tags import tagged_cache_page
 
 from drf_spectacular.utils import extend_schema
 from rest_framework import status
@@ -16,7 +14,9 @@ from rest_framework.exceptions import ValidationError as DRFValidationError
 from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 
+from apps.core.fieldsets import fieldset_from_request
 from apps.core.pagination import Pagination
+from apps.core.prefetch import plan_queryset
 from apps.core.utils import broadcast_crud_event
 from apps.products.api.serializers.subproduct_serializer import SubProductSerializer
 from apps.products.docs.subproduct_doc import (
@@ -51,11 +51,11 @@ LIST_TTL = 60 * 15   # 15 minutos
 DETAIL_TTL = 60 * 5  # 5 minutos
 
 list_cache = (
-    cache_page(LIST_TTL, key_prefix=SUBPRODUCT_LIST_CACHE_PREFIX)
+    tagged_cache_page(LIST_TTL, key_prefix=SUBPRODUCT_LIST_CACHE_PREFIX)
     if not settings.DEBUG else (lambda fn: fn)
 )
 detail_cache = (
-    cache_page(DETAIL_TTL, key_prefix=SUBPRODUCT_DETAIL_CACHE_PREFIX)
+    tagged_cache_page(DETAIL_TTL, key_prefix=SUBPRODUCT_DETAIL_CACHE_PREFIX)
     if not settings.DEBUG else (lambda fn: fn)
 )
 
@@ -77,27 +77,11 @@ def subproduct_list(request, prod_pk):
     """
     parent = get_object_or_404(Product, pk=prod_pk, status=True)
 
-    base_qs = (
-        Subproduct.objects.filter(parent=parent)
-        .select_related("parent", "created_by")
-    )
-
-    stock_sq = (
-        SubproductStock.objects
-        .filter(subproduct=OuterRef("pk"), status=True)
-        .values("quantity")[:1]
-    )
-
-    qs = base_qs.annotate(
-        current_stock_val=Subquery(
-            stock_sq, output_field=DecimalField(max_digits=15, decimal_places=2)
-        )
-    ).annotate(
-        current_stock=Coalesce(
-            "current_stock_val",
-            Decimal("0.00"),
-            output_field=DecimalField(max_digits=15, decimal_places=2),
-        )
+    # Relaciones y stock activo planificados desde el serializer (respeta ?fields=/?expand=)
+    qs = plan_queryset(
+        SubProductSerializer,
+        Subproduct.objects.filter(parent=parent),
+        fieldset_from_request(request),
     )
 
     # Filtros
@@ -340,20 +324,8 @@ def subproduct_detail(request, prod_pk, subp_pk):
     if request.method == "GET":
         @detail_cache
         def cached_get(req, prod_id, subp_id):
-            stock_sq = SubproductStock.objects.filter(
-                subproduct=OuterRef("pk"), status=True
-            ).values("quantity")[:1]
-            qs = Subproduct.objects.annotate(
-                current_stock_val=Subquery(
-                    stock_sq, output_field=DecimalField(max_digits=15, decimal_places=2)
-                )
-            ).annotate(
-                current_stock=Coalesce(
-                    "current_stock_val",
-                    Decimal("0.00"),
-                    output_field=DecimalField(max_digits=15, decimal_places=2),
-                )
-            )
+            # Stock activo anotado por el planner (sin subquery extra por fila)
+            qs = plan_queryset(SubProductSerializer, Subproduct.objects.all(), fieldset_from_request(req))
             inst = get_object_or_404(qs, pk=subp_id, parent=parent)
             ser = SubProductSerializer(
                 inst, context={"request": req, "parent_product": parent}
@@ -402,8 +374,8 @@ def subproduct_detail(request, prod_pk, subp_pk):
         invalidate_subproduct_cache()
         # También invalidar cache de producto padre porque puede cambiar stock/flags
         try:
-            from apps.products.utils.cache_invalidation import invalidate_product_cache
-            invalidate_product_cache()
+            from apps.products.utils.cache_invalidation import invalidate_product_entity_cache
+            invalidate_product_entity_cache(parent.pk)
         except Exception:
             pass
         data = SubProductSerializer(
@@ -418,6 +390,7 @@ def subproduct_detail(request, prod_pk, subp_pk):
         # Emitir update del Product padre para refrescar stock/has_subproducts
         try:
             from apps.products.api.serializers.product_serializer import ProductSerializer
+            parent.refresh_from_db(fields=parent.MATERIALIZED_FIELDS)
             parent_ser = ProductSerializer(parent, context={"request": request}).data
             broadcast_crud_event(
                 event_type="update",
@@ -443,8 +416,8 @@ def subproduct_detail(request, prod_pk, subp_pk):
         # Invalidar caché y emitir evento WebSocket
         invalidate_subproduct_cache()
         try:
-            from apps.products.utils.cache_invalidation import invalidate_product_cache
-            invalidate_product_cache()
+            from apps.products.utils.cache_invalidation import invalidate_product_entity_cache
+            invalidate_product_entity_cache(parent.pk)
         except Exception:
             pass
         broadcast_crud_event(
@@ -456,6 +429,7 @@ def subproduct_detail(request, prod_pk, subp_pk):
         # Emitir update del Product padre por posible cambio de stock/has_subproducts
         try:
             from apps.products.api.serializers.product_serializer import ProductSerializer
+            parent.refresh_from_db(fields=parent.MATERIALIZED_FIELDS)
             parent_ser = ProductSerializer(parent, context={"request": request}).data
             broadcast_crud_event(
                 event_type="update",
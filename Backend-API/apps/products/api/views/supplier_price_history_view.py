@@ -2,7 +2,6 @@
 
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from drf_spectacular.utils import extend_schema
 
@@ -23,7 +22,7 @@ from apps.products.docs.supplier_price_history_doc import (
 
 @extend_schema(**list_supplier_price_history_doc)
 @api_view(["GET"])
-@permission_classes([IsAuthenticated, CanViewProducts])
+@permission_classes([CanViewProducts])
 def supplier_price_history_list_view(request, supplier_product_id: int):
     """List all price history records for a supplier product.
 
@@ -52,7 +51,7 @@ def supplier_price_history_list_view(request, supplier_product_id: int):
 
 @extend_schema(**create_supplier_price_history_doc)
 @api_view(["POST"])
-@permission_classes([IsAuthenticated, CanManageProducts])
+@permission_classes([CanManageProducts])
 def supplier_price_history_create_view(request, supplier_product_id: int):
     """Create a new price history record for a supplier product.
 
@@ -95,7 +94,7 @@ def supplier_price_history_create_view(request, supplier_product_id: int):
 
 @extend_schema(**get_supplier_price_history_detail_doc)
 @api_view(["GET"])
-@permission_classes([IsAuthenticated, CanViewProducts])
+@permission_classes([CanViewProducts])
 def supplier_price_history_detail_view(request, supplier_product_id: int, history_id: int):
     """Get details of a specific price history record."""
     try:
@@ -115,7 +114,7 @@ def supplier_price_history_detail_view(request, supplier_product_id: int, histor
 
 @extend_schema(**get_current_supplier_price_doc)
 @api_view(["GET"])
-@permission_classes([IsAuthenticated, CanViewProducts])
+@permission_classes([CanViewProducts])
 def supplier_current_price_view(request, supplier_product_id: int):
     """Get the current active price for a supplier product.
 
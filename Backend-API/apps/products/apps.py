@@ -1,6 +1,17 @@
 # apps/products/apps.py
 
 from django.apps import AppConfig
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models.signals import post_migrate
+
+
+def _prepare_catalog_search(sender, using=DEFAULT_DB_ALIAS, **kwargs):
+    from apps.products.services.catalog_search import backfill_search_documents, ensure_search_indexes
+    ensure_search_indexes()
+    # Los productos que ya existían no tienen documento hasta que se indexan
+    if using == DEFAULT_DB_ALIAS:
+        backfill_search_documents()
+
 
 class ProductsConfig(AppConfig):
     name = "apps.products"
@@ -8,3 +19,6 @@ class ProductsConfig(AppConfig):
     def ready(self):
         # importa el módulo de señales para que se registren
         import apps.products.signals  # noqa
+        # Índice trigram del buscador (sólo PostgreSQL; no se declara en Meta)
+        # y documentos de búsqueda de los productos sin indexar
+        post_migrate.connect(_prepare_catalog_search, sender=self)
@@ -0,0 +1,41 @@
+from drf_spectacular.utils import OpenApiParameter, OpenApiResponse
+
+_FACET_RESPONSE = OpenApiResponse(
+    description=(
+        "{total, facets: {<faceta>: [{value, label, count}]}, source}. Cada faceta se cuenta "
+        "con los filtros de las demás; source indica si salió de los contadores o de una query."
+    )
+)
+
+product_facets_doc = {
+    "tags": ["Products"],
+    "summary": "Facetas de productos activos",
+    "operation_id": "product_facets",
+    "description": (
+        "Devuelve en una sola respuesta los conteos por categoría, por tiene/no tiene "
+        "subproductos y por estado de stock (in_stock, low, out), para los mismos filtros "
+        "del listado de productos. Se sirve desde contadores mantenidos incrementalmente; "
+        "filtros de texto (code, name) se resuelven con una única query agrupada."
+    ),
+    "parameters": [
+        OpenApiParameter(name="category", location=OpenApiParameter.QUERY, description="Nombre de categoría (parcial)", required=False, type=str),
+        OpenApiParameter(name="category_id", location=OpenApiParameter.QUERY, description="IDs de categoría separados por coma", required=False, type=str),
+        OpenApiParameter(name="has_subproducts", location=OpenApiParameter.QUERY, description="Con o sin subproductos", required=False, type=bool),
+        OpenApiParameter(name="stock_state", location=OpenApiParameter.QUERY, description="Estados de stock separados por coma (in_stock, low, out)", required=False, type=str),
+        OpenApiParameter(name="code", location=OpenApiParameter.QUERY, description="Prefijo de código (sólo dígitos)", required=False, type=str),
+        OpenApiParameter(name="name", location=OpenApiParameter.QUERY, description="Nombre (parcial)", required=False, type=str),
+    ],
+    "responses": {200: _FACET_RESPONSE, 400: OpenApiResponse(description="Filtro inválido")},
+}
+
+subproduct_facets_doc = {
+    "tags": ["Subproducts"],
+    "summary": "Facetas de subproductos de un producto",
+    "operation_id": "subproduct_facets",
+    "description": "Conteos por estado (activo/inactivo) y estado de stock de los subproductos del producto.",
+    "parameters": [
+        OpenApiParameter(name="status", location=OpenApiParameter.QUERY, description="Activos o inactivos", required=False, type=bool),
+        OpenApiParameter(name="stock_state", location=OpenApiParameter.QUERY, description="Estados de stock separados por coma (in_stock, out)", required=False, type=str),
+    ],
+    "responses": {200: _FACET_RESPONSE, 404: OpenApiResponse(description="Producto no encontrado")},
+}
@@ -14,7 +14,9 @@ list_product_doc = {
     "parameters": [
         OpenApiParameter(name="category", location=OpenApiParameter.QUERY, description="Filtra productos por ID de categoría", required=False, type=int),
         OpenApiParameter(name="type", location=OpenApiParameter.QUERY, description="Filtra productos por ID de tipo", required=False, type=int),
-        OpenApiParameter(name="status", location=OpenApiParameter.QUERY, description="Filtra productos activos o inactivos", required=False, type=bool)
+        OpenApiParameter(name="status", location=OpenApiParameter.QUERY, description="Filtra productos activos o inactivos", required=False, type=bool),
+        OpenApiParameter(name="fields", location=OpenApiParameter.QUERY, description="Campos a devolver, separados por coma (admite 'subproducts.id')", required=False, type=str),
+        OpenApiParameter(name="expand", location=OpenApiParameter.QUERY, description="Relaciones anidadas a incluir (subproducts, product_images, suppliers, customers)", required=False, type=str)
     ],
     "responses": {
         200: OpenApiResponse(
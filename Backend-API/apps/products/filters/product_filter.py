@@ -37,6 +37,40 @@ class ProductFilter(django_filters.FilterSet):
                 raise ValidationError({"code": f"'{data['code']}' no es un código válido. Debe contener solo números."})
         super().__init__(data, queryset, request=request, prefix=prefix)
 
+    # Mismo mapeo que NullBooleanSelect: otros valores no filtran
+    _BOOL_VALUES = {"true": True, "True": True, "2": True, "false": False, "False": False, "3": False}
+    # Parámetros de la querystring que no son predicados
+    NON_PREDICATE_PARAMS = ("page", "page_size", "fields", "expand")
+
+    @classmethod
+    def matches(cls, params, snapshot):
+        """
+        Evalúa en Python el predicado de ``params`` sobre una foto del producto
+        (ver ``cache_invalidation.product_cache_snapshot``), replicando los filtros
+        de arriba sobre ``get_all_active_products``.
+        Devuelve True/False, o None si algún parámetro no se puede evaluar.
+        """
+        if not snapshot or not snapshot.get("status"):
+            return False
+        for key, raw in params.items():
+            value = "" if raw is None else str(raw)
+            if key in cls.NON_PREDICATE_PARAMS or value == "":
+                continue
+            if key == "code":
+                ok = (snapshot.get("code") or "").startswith(value)
+            elif key == "name":
+                ok = value.lower() in (snapshot.get("name") or "").lower()
+            elif key == "category":
+                ok = value.lower() in (snapshot.get("category_name") or "").lower()
+            elif key in ("status", "has_subproducts"):
+                flag = cls._BOOL_VALUES.get(value)
+                ok = flag is None or bool(snapshot.get(key)) == flag
+            else:
+                return None
+            if not ok:
+                return False
+        return True
+
     def filter_has_subproducts(self, queryset, name, value):
         if value is None:
             return queryset
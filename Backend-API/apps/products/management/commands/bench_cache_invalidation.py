@@ -0,0 +1,84 @@
+import time
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.products.utils.cache_keys import generate_cache_key
+from apps.products.utils.cache_tags import invalidate_tags
+from apps.products.utils.redis_access import delete_keys_by_pattern
+
+BENCH_PREFIX = "bench_product_list"
+FILLER_PREFIX = "bench_filler"
+CHUNK = 10_000
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara la latencia de invalidación por patrón (SCAN+DELETE) contra la "
+        "invalidación por tags (INCR) con distintos tamaños de keyspace."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='10000,100000,1000000',
+                            help='Tamaños de keyspace separados por coma')
+        parser.add_argument('--match-ratio', type=float, default=0.1,
+                            help='Fracción de claves que pertenecen al prefijo invalidado')
+        parser.add_argument('--ttl', type=int, default=600, help='TTL de las claves sembradas')
+
+    def handle(self, *args, **options):
+        try:
+            sizes = [int(s) for s in options['sizes'].split(',') if s.strip()]
+        except ValueError:
+            raise CommandError("--sizes debe ser una lista de enteros separados por coma")
+        ratio = options['match_ratio']
+        if not 0 < ratio <= 1:
+            raise CommandError("--match-ratio debe estar en (0, 1]")
+
+        has_pattern = hasattr(cache, "delete_pattern")
+        if not has_pattern:
+            self.stderr.write(self.style.WARNING(
+                "El backend de cache no soporta delete_pattern (¿locmem?): "
+                "sólo se mide la invalidación por tags."
+            ))
+
+        self.stdout.write(f"{'keys':>10} {'pattern (ms)':>14} {'tags (ms)':>12} {'speedup':>10}")
+        for size in sizes:
+            self._seed_keys(size, ratio, options['ttl'])
+
+            pattern_ms = None
+            if has_pattern:
+                t0 = time.perf_counter()
+                delete_keys_by_pattern(BENCH_PREFIX)
+                pattern_ms = (time.perf_counter() - t0) * 1000
+
+            t0 = time.perf_counter()
+            invalidate_tags(BENCH_PREFIX)
+            tags_ms = (time.perf_counter() - t0) * 1000
+
+            speedup = f"{pattern_ms / tags_ms:,.0f}x" if pattern_ms and tags_ms else "n/a"
+            pattern_txt = f"{pattern_ms:,.2f}" if pattern_ms is not None else "n/a"
+            self.stdout.write(f"{size:>10,} {pattern_txt:>14} {tags_ms:>12,.3f} {speedup:>10}")
+
+            self._cleanup()
+
+    def _seed_keys(self, size, ratio, ttl):
+        matching = max(1, int(size * ratio))
+        base = generate_cache_key(BENCH_PREFIX)
+        batch = {}
+        for i in range(size):
+            if i < matching:
+                key = f"{base}:page={i}"
+            else:
+                key = f"{FILLER_PREFIX}:{i}"
+            batch[key] = i
+            if len(batch) >= CHUNK:
+                cache.set_many(batch, ttl)
+                batch = {}
+        if batch:
+            cache.set_many(batch, ttl)
+
+    def _cleanup(self):
+        if hasattr(cache, "delete_pattern"):
+            cache.delete_pattern("*bench_*")
+        else:
+            cache.clear()
@@ -0,0 +1,150 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Case, Count, Exists, IntegerField, OuterRef, Q, Value, When
+from django.db.models.functions import Coalesce
+
+from apps.products.api.repositories.catalog_repository import CatalogRepository
+from apps.products.models import Category, Product, ProductAbbreviation, ProductAlias, ProductSynonym
+from apps.products.services.catalog_search import (
+    ensure_search_indexes, get_token_index, rebuild_search_documents, reset_token_index,
+)
+
+CHUNK = 5_000
+PAGE_SIZE = 25
+WORDS = [
+    "tornillo", "tuerca", "arandela", "bulon", "perno", "chapa", "cano", "perfil", "angulo",
+    "planchuela", "varilla", "malla", "alambre", "cadena", "bisagra", "soporte", "grampa",
+]
+MATERIALS = ["acero", "inox", "galvanizado", "bronce", "aluminio", "hierro", "zincado"]
+SIZES = ["1/4", "3/8", "1/2", "5/8", "3/4", "10mm", "12mm", "20x20", "40x40"]
+
+
+class _Rollback(Exception):
+    pass
+
+
+def legacy_search(keyword):
+    """Predicado anterior (8 icontains + 3 EXISTS), sólo para comparar."""
+    def exists(model, field):
+        return Exists(model.objects.filter(
+            product_id=OuterRef("pk"), status=True, **{f"{field}__icontains": keyword}
+        ))
+
+    return Product.objects.filter(status=True).filter(
+        Q(code__icontains=keyword)
+        | Q(name__icontains=keyword)
+        | Q(detail_public__icontains=keyword)
+        | Q(detail_internal__icontains=keyword)
+        | Q(category__name__icontains=keyword)
+        | exists(ProductAbbreviation, "abbreviation")
+        | exists(ProductSynonym, "synonym")
+        | exists(ProductAlias, "alias_text")
+    ).annotate(
+        match_score=Case(
+            When(code__istartswith=keyword, then=Value(100)),
+            When(code__icontains=keyword, then=Value(90)),
+            When(name__istartswith=keyword, then=Value(80)),
+            When(name__icontains=keyword, then=Value(70)),
+            When(detail_public__icontains=keyword, then=Value(60)),
+            When(detail_internal__icontains=keyword, then=Value(50)),
+            default=Value(25),
+            output_field=IntegerField(),
+        ),
+        synonym_hit=exists(ProductSynonym, "synonym"),
+        abbreviation_hit=exists(ProductAbbreviation, "abbreviation"),
+        alias_hit=exists(ProductAlias, "alias_text"),
+        customer_match_count=Coalesce(
+            Count("customer_products", filter=Q(customer_products__status=True), distinct=True), Value(0)
+        ),
+        supplier_match_count=Coalesce(
+            Count("supplier_products", filter=Q(supplier_products__status=True), distinct=True), Value(0)
+        ),
+    ).order_by("-match_score", "-synonym_hit", "name")
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara la latencia de la búsqueda del catálogo anterior (icontains + EXISTS) "
+        "contra la búsqueda sobre el documento indexado. Los datos sintéticos se "
+        "crean dentro de una transacción que se revierte al final."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='50000,500000',
+                            help='Cantidad de productos sintéticos, separados por coma')
+        parser.add_argument('--repeat', type=int, default=5, help='Repeticiones por consulta')
+        parser.add_argument('--queries', default='tornillo,inox 1/2,BCH-0001,sinonimo-77,zzzz',
+                            help='Keywords a medir, separados por coma')
+
+    def handle(self, *args, **options):
+        try:
+            sizes = sorted(int(s) for s in options['sizes'].split(',') if s.strip())
+        except ValueError:
+            raise CommandError("--sizes debe ser una lista de enteros separados por coma")
+        queries = [q for q in options['queries'].split(',') if q.strip()]
+        self.stdout.write(f"motor: {connection.vendor}")
+
+        try:
+            with transaction.atomic():
+                ensure_search_indexes()
+                category = Category.objects.create(name=f"bench-catalog-{random.randint(0, 10**9)}")
+                seeded = 0
+                for size in sizes:
+                    seeded = self._seed(category, seeded, size)
+                    self._report(size, queries, options['repeat'])
+                raise _Rollback
+        except _Rollback:
+            pass
+        finally:
+            reset_token_index()
+
+    def _seed(self, category, start, size):
+        rng = random.Random(start)
+        t0 = time.perf_counter()
+        for offset in range(start, size, CHUNK):
+            products = Product.objects.bulk_create([
+                Product(
+                    code=f"BCH-{i:07d}",
+                    name=f"{rng.choice(WORDS)} {rng.choice(MATERIALS)} {rng.choice(SIZES)}",
+                    detail_public=f"{rng.choice(WORDS)} para uso general",
+                    detail_internal=f"lote {i % 977}",
+                    category=category,
+                )
+                for i in range(offset, min(offset + CHUNK, size))
+            ])
+            ProductSynonym.objects.bulk_create([
+                ProductSynonym(product=p, synonym=f"sinonimo-{p.pk % 1000}")
+                for p in products[::10]
+            ])
+            rebuild_search_documents([p.pk for p in products])
+        # El índice en memoria se reconstruye con los datos nuevos
+        reset_token_index()
+        if connection.vendor != "postgresql":
+            t1 = time.perf_counter()
+            get_token_index()
+            self.stdout.write(f"índice en memoria: {(time.perf_counter() - t1) * 1000:,.0f} ms")
+        self.stdout.write(f"seed {start:,} → {size:,}: {time.perf_counter() - t0:,.1f}s")
+        return size
+
+    def _time(self, build_qs, repeat):
+        samples = []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            qs = build_qs()
+            qs.count()
+            list(qs[:PAGE_SIZE])
+            samples.append((time.perf_counter() - t0) * 1000)
+        return statistics.median(samples)
+
+    def _report(self, size, queries, repeat):
+        self.stdout.write(f"\n{size:,} productos")
+        self.stdout.write(f"{'keyword':>16} {'legacy (ms)':>12} {'indexed (ms)':>13} {'speedup':>9}")
+        for keyword in queries:
+            legacy_ms = self._time(lambda: legacy_search(keyword), repeat)
+            indexed_ms = self._time(lambda: CatalogRepository.search_products(keyword), repeat)
+            speedup = f"{legacy_ms / indexed_ms:,.1f}x" if indexed_ms else "n/a"
+            self.stdout.write(f"{keyword:>16} {legacy_ms:>12,.1f} {indexed_ms:>13,.1f} {speedup:>9}")
@@ -0,0 +1,22 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.products.services.catalog_facets import rebuild_catalog_facets
+
+
+class Command(BaseCommand):
+    help = (
+        "Reconstruye desde cero los contadores de facetas del catálogo "
+        "(CatalogFacetCount / CatalogFacetEntry). Necesario una vez al desplegar "
+        "y ante cualquier carga masiva que no pase por señales ni servicios de stock."
+    )
+
+    def handle(self, *args, **options):
+        t0 = time.perf_counter()
+        totals = rebuild_catalog_facets()
+        elapsed = time.perf_counter() - t0
+        self.stdout.write(self.style.SUCCESS(
+            f"{totals['product']:,} productos y {totals['subproduct']:,} subproductos contados "
+            f"en {elapsed:,.1f}s"
+        ))
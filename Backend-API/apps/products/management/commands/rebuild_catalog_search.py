@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.products.models import Product, ProductSearchDocument
+from apps.products.services.catalog_search import (
+    REBUILD_BATCH_SIZE, ensure_search_indexes, rebuild_search_documents,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Reconstruye los documentos de búsqueda del catálogo (ProductSearchDocument) "
+        "y, en PostgreSQL, asegura el índice trigram."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--missing-only', action='store_true',
+                            help='Sólo productos que todavía no tienen documento')
+        parser.add_argument('--batch-size', type=int, default=REBUILD_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        if ensure_search_indexes():
+            self.stdout.write("Índice trigram verificado.")
+
+        ids = Product.objects.order_by("pk").values_list("pk", flat=True)
+        if options['missing_only']:
+            ids = ids.exclude(pk__in=ProductSearchDocument.objects.values("product_id"))
+        ids = list(ids)
+
+        t0 = time.perf_counter()
+        written = 0
+        step = options['batch_size'] * 10
+        for start in range(0, len(ids), step):
+            with transaction.atomic():
+                written += rebuild_search_documents(ids[start:start + step], batch_size=options['batch_size'])
+            self.stdout.write(f"  {written:,}/{len(ids):,}")
+        elapsed = time.perf_counter() - t0
+        self.stdout.write(self.style.SUCCESS(f"{written:,} documentos en {elapsed:,.1f}s"))
@@ -24,6 +24,8 @@ from .dictionary_models import (
 	TermDictionary,
 	ProductAlias,
 )
+from .search_document_model import ProductSearchDocument
+from .facet_model import CatalogFacetCount, CatalogFacetEntry, FacetScope, StockState
 
 __all__ = [
 	"Category",
@@ -39,6 +41,11 @@ __all__ = [
 	"ProductSynonym",
 	"TermDictionary",
 	"ProductAlias",
+	"ProductSearchDocument",
+	"CatalogFacetEntry",
+	"CatalogFacetCount",
+	"FacetScope",
+	"StockState",
 	"SupplierProductDescription",
 	"SupplierProductDiscount",
 ]
@@ -18,6 +18,15 @@ class Category(BaseModel):
         help_text="Nombre del rubro/categoría (rub_desc).",
     )
 
+    # rub_codi: lo usan los artículos legacy para apuntar a su rubro
+    legacy_id = models.IntegerField(
+        null=True,
+        blank=True,
+        unique=True,
+        verbose_name="ID legacy",
+        help_text="Código del rubro en el sistema legacy (rub_codi).",
+    )
+
     # Campo opcional para la descripción de la categoría
     description = models.TextField(
         blank=True,
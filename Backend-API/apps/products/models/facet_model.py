@@ -0,0 +1,76 @@
+from django.db import models
+
+
+class FacetScope(models.TextChoices):
+    PRODUCT = "product", "Producto"
+    SUBPRODUCT = "subproduct", "Subproducto"
+
+
+class StockState(models.TextChoices):
+    IN_STOCK = "in_stock", "Con stock"
+    LOW = "low", "Stock bajo"
+    OUT = "out", "Sin stock"
+
+
+class CatalogFacetEntry(models.Model):
+    """
+    Clave de facetas con la que está contado hoy cada producto/subproducto.
+
+    Al refrescar una entidad se compara su clave actual con la guardada acá y
+    sólo se mueven los contadores si cambió (ver
+    ``apps.products.services.catalog_facets``). ``counted`` es False para las
+    entidades que no entran en ningún conteo (productos inactivos,
+    subproductos de un padre inactivo, bajas físicas).
+    """
+    scope = models.CharField(max_length=12, choices=FacetScope.choices, verbose_name="Ámbito")
+    object_id = models.PositiveIntegerField(verbose_name="ID")
+    counted = models.BooleanField(default=False, verbose_name="Contado")
+    category_id = models.PositiveIntegerField(default=0, verbose_name="Categoría")
+    parent_id = models.PositiveIntegerField(default=0, verbose_name="Producto padre")
+    has_subproducts = models.BooleanField(default=False, verbose_name="Tiene subproductos")
+    active = models.BooleanField(default=True, verbose_name="Activo")
+    stock_state = models.CharField(max_length=10, choices=StockState.choices, default=StockState.OUT,
+                                   verbose_name="Estado de stock")
+
+    class Meta:
+        verbose_name = "Entrada de facetas"
+        verbose_name_plural = "Entradas de facetas"
+        constraints = [
+            models.UniqueConstraint(fields=["scope", "object_id"], name="uniq_facet_entry_scope_object"),
+        ]
+
+    def __str__(self):
+        return f"{self.scope}:{self.object_id}"
+
+
+class CatalogFacetCount(models.Model):
+    """
+    Contador incremental por combinación de facetas.
+
+    - Productos activos: (category_id, has_subproducts, stock_state); parent_id = 0.
+    - Subproductos de padres activos: (parent_id, active, stock_state); category_id = 0.
+
+    Las combinaciones son pocas, así que todas las facetas de un filtro salen
+    de leer las filas del ámbito (una query o una lectura de cache).
+    """
+    scope = models.CharField(max_length=12, choices=FacetScope.choices, verbose_name="Ámbito")
+    category_id = models.PositiveIntegerField(default=0, verbose_name="Categoría")
+    parent_id = models.PositiveIntegerField(default=0, verbose_name="Producto padre")
+    has_subproducts = models.BooleanField(default=False, verbose_name="Tiene subproductos")
+    active = models.BooleanField(default=True, verbose_name="Activo")
+    stock_state = models.CharField(max_length=10, choices=StockState.choices, verbose_name="Estado de stock")
+    count = models.IntegerField(default=0, verbose_name="Cantidad")
+
+    class Meta:
+        verbose_name = "Contador de facetas"
+        verbose_name_plural = "Contadores de facetas"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["scope", "category_id", "parent_id", "has_subproducts", "active", "stock_state"],
+                name="uniq_facet_count_key",
+            ),
+        ]
+        indexes = [models.Index(fields=["scope", "parent_id"])]
+
+    def __str__(self):
+        return f"{self.scope} {self.category_id}/{self.parent_id}/{self.stock_state}: {self.count}"
@@ -35,6 +35,14 @@ class ProductImage(models.Model):
     class Meta:
         verbose_name = "Imagen de Producto"
         verbose_name_plural = "Imágenes de Productos"
+        constraints = [
+            # Una confirmación repetida de la misma subida no duplica la imagen
+            models.UniqueConstraint(
+                fields=["product", "key"],
+                condition=~models.Q(key="temp-key"),
+                name="unique_product_image_key",
+            ),
+        ]
 
     def __str__(self):
         return f"Imagen {self.id} de {self.product.name}"
@@ -194,12 +194,75 @@ class Product(BaseModel):
         help_text="Si es True, el stock real se deriva de subproductos."
     )
 
+    # ------------------------------------------------------------------
+    # Denormalized stock figures, maintained transactionally by the
+    # ``stocks`` app (``StockEvent.apply_to_target``,
+    # ``sync_parent_product_stock`` and the reservation signals).
+    # ``manage.py reconcile_product_stock`` checks them against the
+    # stock rows and the event log.
+    # ------------------------------------------------------------------
+    current_stock = models.DecimalField(
+        max_digits=15,
+        decimal_places=2,
+        default=0,
+        editable=False,
+        verbose_name="Stock actual",
+        help_text="Espejo de ProductStock o suma de SubproductStock activos."
+    )
+
+    reserved_stock = models.DecimalField(
+        max_digits=15,
+        decimal_places=2,
+        default=0,
+        editable=False,
+        verbose_name="Stock reservado",
+        help_text="Cantidad reservada por órdenes de corte activas."
+    )
+
+    # Only written through ``apps.stocks.services.materialized``; a plain
+    # ``save()`` of a stale instance must never overwrite them.
+    MATERIALIZED_FIELDS = ("current_stock", "reserved_stock")
+    # Columns the catalog search document is built from (``catalog_search``).
+    SEARCHABLE_FIELDS = ("code", "name", "detail_public", "detail_internal", "category_id")
+
     class Meta:
         verbose_name = "Producto"
         verbose_name_plural = "Productos"
         # <— Aquí forzamos el orden descendente por fecha de creación
         ordering = ['-created_at']
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_search_values = instance._search_values()
+        return instance
+
+    def _search_values(self):
+        # __dict__ directly: reading a deferred field here would cost a query
+        return tuple(self.__dict__.get(f, models.DEFERRED) for f in self.SEARCHABLE_FIELDS)
+
+    def search_fields_changed(self, update_fields=None) -> bool:
+        """Whether the last save touched a searchable column (unknown counts as changed)."""
+        if update_fields is not None and not {
+            self._meta.get_field(f).attname for f in update_fields
+        } & set(self.SEARCHABLE_FIELDS):
+            return False
+        loaded = getattr(self, "_loaded_search_values", None)
+        return loaded is None or loaded != self._search_values()
+
+    def save(self, *args, **kwargs):
+        """Persist catalog fields; see ``_do_update`` for the stock columns."""
+        super().save(*args, **kwargs)
+        self._loaded_search_values = self._search_values()
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, forced_update):
+        # A full save() leaves the materialized stock columns out of the UPDATE.
+        # Done here rather than by filling in update_fields, so post_save still
+        # tells a full save from a partial one.
+        if update_fields is None:
+            values = [v for v in values if v[0].name not in self.MATERIALIZED_FIELDS]
+        return super()._do_update(base_qs, using, pk_val, values, update_fields, forced_update)
+
     def __str__(self):
         """Human readable representation used in admin and logs."""
 
@@ -0,0 +1,46 @@
+from django.db import models
+from apps.products.models.product_model import Product
+
+
+class ProductSearchDocument(models.Model):
+    """Precomputed, lowercased search text for a product.
+
+    Built from the product itself, its category and its active
+    abbreviations, synonyms and aliases, plus the ``TermDictionary``
+    terms whose value appears in the product text. Each column keeps
+    one entry per line so a keyword (which never contains a newline)
+    can only match inside a single original value, exactly like the
+    ``icontains`` predicates it replaces.
+
+    Maintained by ``apps.products.services.catalog_search`` from the
+    product signals; rebuilt in bulk with ``rebuild_catalog_search``.
+    On PostgreSQL ``document`` carries a ``gin_trgm_ops`` index created
+    by ``ensure_search_indexes`` (not declared here so SQLite can create
+    the table).
+    """
+
+    product = models.OneToOneField(
+        Product,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="search_document",
+        verbose_name="Producto",
+    )
+    abbreviations = models.TextField(default="", blank=True, verbose_name="Abreviaciones")
+    synonyms = models.TextField(default="", blank=True, verbose_name="Sinónimos")
+    aliases = models.TextField(default="", blank=True, verbose_name="Alias")
+    terms = models.TextField(default="", blank=True, verbose_name="Términos de diccionario")
+    document = models.TextField(
+        default="",
+        blank=True,
+        verbose_name="Documento",
+        help_text="code, name, details, category and every column above, one value per line.",
+    )
+    updated_at = models.DateTimeField(auto_now=True, db_index=True, verbose_name="Actualizado")
+
+    class Meta:
+        verbose_name = "Documento de búsqueda"
+        verbose_name_plural = "Documentos de búsqueda"
+
+    def __str__(self) -> str:
+        return f"search document (prod {self.product_id})"
@@ -40,6 +40,14 @@ class SubproductImage(models.Model):
     class Meta:
         verbose_name = "Imagen de Subproducto"
         verbose_name_plural = "Imágenes de Subproductos"
+        constraints = [
+            # Una confirmación repetida de la misma subida no duplica la imagen
+            models.UniqueConstraint(
+                fields=["subproduct", "key"],
+                condition=~models.Q(key="temp-key"),
+                name="unique_subproduct_image_key",
+            ),
+        ]
 
     def __str__(self):
         return f"Imagen {self.id} de Subproducto {self.subproduct.id}"
@@ -0,0 +1,377 @@
+# apps/products/services/catalog_facets.py
+"""
+Facetas del catálogo (conteos para la barra de filtros) sobre contadores
+incrementales.
+
+Cada producto activo cuenta en una fila de ``CatalogFacetCount`` según su
+categoría, si tiene subproductos y su estado de stock; cada subproducto de un
+padre activo, según su padre, su estado y su stock. Las señales de
+``apps/products/signals.py`` y los servicios de stock agendan con
+``schedule_product_facets`` / ``schedule_subproduct_facets`` los ids
+afectados; tras el commit se recalcula la clave de cada entidad, se compara
+con la guardada en ``CatalogFacetEntry`` y sólo se mueven los contadores que
+cambiaron. El refresco lee el estado confirmado y es idempotente, así que
+corre en su propia transacción corta: los contadores (una fila por
+combinación, muy disputadas) no quedan bloqueados durante el movimiento de
+stock que los originó.
+
+La lectura trae todas las filas del ámbito (pocas: categorías × 2 × 3) de una
+lectura de cache o una query, y arma en Python cada faceta aplicando los
+filtros de las demás (conteo disjuntivo, como lo necesita la barra lateral).
+Los filtros que no son facetas (code, name...) se resuelven con una única
+query agrupada sobre el queryset filtrado.
+"""
+import logging
+from collections import Counter, defaultdict
+from decimal import Decimal
+from typing import Callable, Dict, Iterable, List, Optional
+
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import (
+    Case, CharField, Count, DecimalField, Exists, F, OuterRef, Q, Subquery, Value, When,
+)
+
+from apps.core.db_routing import primary_reads
+from apps.products.models import (
+    CatalogFacetCount, CatalogFacetEntry, Category, FacetScope, Product, StockState, Subproduct,
+)
+from apps.products.utils.cache_tags import invalidate_tags, versioned_prefix
+from apps.stocks.models import SubproductStock
+
+logger = logging.getLogger(__name__)
+
+FACETS_TAG = "catalog_facets"
+FACETS_TTL = 60 * 15
+KEY_FIELDS = ("category_id", "parent_id", "has_subproducts", "active", "stock_state")
+ZERO = Decimal("0")
+
+# Mismo mapeo que ProductFilter._BOOL_VALUES
+_BOOL_VALUES = {"true": True, "True": True, "2": True, "false": False, "False": False, "3": False}
+
+
+# ── Estado de stock ──────────────────────────────────────────────────────────
+
+def product_stock_state(current_stock, min_stock) -> str:
+    current = current_stock or ZERO
+    if current <= 0:
+        return StockState.OUT
+    if min_stock is not None and current <= min_stock:
+        return StockState.LOW
+    return StockState.IN_STOCK
+
+
+def product_stock_state_expression():
+    """``product_stock_state`` como expresión SQL (para la query de respaldo)."""
+    return Case(
+        When(current_stock__lte=0, then=Value(StockState.OUT.value)),
+        When(Q(min_stock__isnull=False) & Q(current_stock__lte=F("min_stock")), then=Value(StockState.LOW.value)),
+        default=Value(StockState.IN_STOCK.value),
+        output_field=CharField(),
+    )
+
+
+def subproduct_stock_state(quantity) -> str:
+    return StockState.IN_STOCK if (quantity or ZERO) > 0 else StockState.OUT
+
+
+def _active_stock_quantity():
+    return Subquery(
+        SubproductStock.objects.filter(subproduct_id=OuterRef("pk"), status=True).values("quantity")[:1],
+        output_field=DecimalField(max_digits=15, decimal_places=2),
+    )
+
+
+# ── Mantenimiento incremental ────────────────────────────────────────────────
+
+def _product_keys(product_ids) -> Dict[int, Optional[tuple]]:
+    rows = (
+        Product.objects.filter(pk__in=product_ids)
+        .annotate(has_sps=Exists(Subproduct.objects.filter(parent_id=OuterRef("pk"))))
+        .values_list("pk", "status", "category_id", "has_sps", "current_stock", "min_stock")
+    )
+    return {
+        pk: (category_id, 0, has_sps, True, product_stock_state(current, min_stock)) if status else None
+        for pk, status, category_id, has_sps, current, min_stock in rows
+    }
+
+
+def _subproduct_keys(subproduct_ids) -> Dict[int, Optional[tuple]]:
+    rows = (
+        Subproduct.objects.filter(pk__in=subproduct_ids)
+        .annotate(stock_qty=_active_stock_quantity())
+        .values_list("pk", "status", "parent_id", "parent__status", "stock_qty")
+    )
+    return {
+        pk: (0, parent_id, False, bool(status), subproduct_stock_state(qty)) if parent_status else None
+        for pk, status, parent_id, parent_status, qty in rows
+    }
+
+
+@transaction.atomic
+def _refresh(scope: str, ids: List[int], keys_for: Callable[[List[int]], Dict[int, Optional[tuple]]]) -> None:
+    """
+    Mueve los contadores de ``ids`` a su clave actual. Como en
+    ``refresh_subproduct_reservations``, primero se bloquean las entradas (en
+    orden de id) y recién después se lee el estado: dos refrescos del mismo
+    objeto se serializan y el segundo ve lo que confirmó el último commit.
+    """
+    CatalogFacetEntry.objects.bulk_create(
+        [CatalogFacetEntry(scope=scope, object_id=i) for i in ids], ignore_conflicts=True
+    )
+    entries = list(
+        CatalogFacetEntry.objects.select_for_update()
+        .filter(scope=scope, object_id__in=ids).order_by("object_id")
+    )
+    current = keys_for(ids)
+    deltas, changed, gone = Counter(), [], []
+    for entry in entries:
+        old = tuple(getattr(entry, f) for f in KEY_FIELDS) if entry.counted else None
+        new = current.get(entry.object_id)
+        if old == new and entry.object_id in current:
+            continue
+        if old:
+            deltas[old] -= 1
+        if new:
+            deltas[new] += 1
+        if entry.object_id not in current:
+            gone.append(entry.pk)
+            continue
+        entry.counted = new is not None
+        if new:
+            for field, value in zip(KEY_FIELDS, new):
+                setattr(entry, field, value)
+        changed.append(entry)
+
+    if changed:
+        CatalogFacetEntry.objects.bulk_update(changed, ["counted", *KEY_FIELDS])
+    if gone:
+        CatalogFacetEntry.objects.filter(pk__in=gone).delete()
+    deltas = {key: d for key, d in deltas.items() if d}
+    if not deltas:
+        return
+    CatalogFacetCount.objects.bulk_create(
+        [CatalogFacetCount(scope=scope, **dict(zip(KEY_FIELDS, key))) for key in deltas], ignore_conflicts=True
+    )
+    for key in sorted(deltas, key=repr):
+        CatalogFacetCount.objects.filter(scope=scope, **dict(zip(KEY_FIELDS, key))).update(
+            count=F("count") + deltas[key]
+        )
+    transaction.on_commit(lambda: invalidate_tags(FACETS_TAG))
+
+
+def refresh_product_facets(product_ids: Iterable[int], include_subproducts: bool = False) -> None:
+    """
+    Recalcula la clave de facetas de los productos indicados. Con
+    ``include_subproducts`` también la de sus subproductos (cambió el estado
+    del padre, que decide si se cuentan).
+    """
+    ids = sorted({pid for pid in product_ids if pid})
+    if not ids:
+        return
+    _refresh(FacetScope.PRODUCT, ids, _product_keys)
+    if include_subproducts:
+        refresh_subproduct_facets(Subproduct.objects.filter(parent_id__in=ids).values_list("pk", flat=True))
+
+
+def refresh_subproduct_facets(subproduct_ids: Iterable[int]) -> None:
+    ids = sorted({sid for sid in subproduct_ids if sid})
+    if ids:
+        _refresh(FacetScope.SUBPRODUCT, ids, _subproduct_keys)
+
+
+def schedule_product_facets(product_ids: Iterable[int], include_subproducts: bool = False) -> None:
+    """``refresh_product_facets`` después del commit de la transacción actual."""
+    ids = sorted({pid for pid in product_ids if pid})
+    if ids:
+        transaction.on_commit(lambda: refresh_product_facets(ids, include_subproducts=include_subproducts))
+
+
+def schedule_subproduct_facets(subproduct_ids: Iterable[int]) -> None:
+    ids = sorted({sid for sid in subproduct_ids if sid})
+    if ids:
+        transaction.on_commit(lambda: refresh_subproduct_facets(ids))
+
+
+@transaction.atomic
+def rebuild_catalog_facets() -> Dict[str, int]:
+    """Reconstruye entradas y contadores desde cero (rebuild_catalog_facets)."""
+    CatalogFacetCount.objects.all().delete()
+    CatalogFacetEntry.objects.all().delete()
+    totals = {}
+    for scope, keys in (
+        (FacetScope.PRODUCT, _product_keys(Product.objects.values("pk"))),
+        (FacetScope.SUBPRODUCT, _subproduct_keys(Subproduct.objects.values("pk"))),
+    ):
+        CatalogFacetEntry.objects.bulk_create([
+            CatalogFacetEntry(scope=scope, object_id=pk, counted=key is not None,
+                              **(dict(zip(KEY_FIELDS, key)) if key else {}))
+            for pk, key in keys.items()
+        ], batch_size=2000)
+        counts = Counter(key for key in keys.values() if key)
+        CatalogFacetCount.objects.bulk_create([
+            CatalogFacetCount(scope=scope, count=n, **dict(zip(KEY_FIELDS, key))) for key, n in counts.items()
+        ], batch_size=2000)
+        totals[scope] = sum(counts.values())
+    transaction.on_commit(lambda: invalidate_tags(FACETS_TAG))
+    return totals
+
+
+# ── Lectura ──────────────────────────────────────────────────────────────────
+
+PRODUCT_FACETS = ("category", "has_subproducts", "stock_state")
+SUBPRODUCT_FACETS = ("status", "stock_state")
+# Parámetros que no son predicados (paginación, sparse fieldsets)
+NON_PREDICATE_PARAMS = ("page", "page_size", "fields", "expand")
+
+
+def _counter_rows(scope: str, parent_id: Optional[int] = None) -> List[dict]:
+    """Filas de contadores del ámbito: una lectura de cache o una query."""
+    key = f"{versioned_prefix(FACETS_TAG)}:{scope}:{parent_id or 'all'}"
+    rows = cache.get(key)
+    if rows is None:
+        qs = CatalogFacetCount.objects.filter(scope=scope, count__gt=0)
+        if parent_id is not None:
+            qs = qs.filter(parent_id=parent_id)
+        if scope == FacetScope.PRODUCT:
+            qs = qs.annotate(category_name=Subquery(
+                Category.objects.filter(pk=OuterRef("category_id")).values("name")[:1]
+            ))
+        else:
+            qs = qs.annotate(category_name=Value(None, output_field=CharField()))
+        with primary_reads():  # se cachea para todos: nunca desde la réplica
+            rows = list(qs.values(*KEY_FIELDS, "category_name", "count"))
+        cache.set(key, rows, FACETS_TTL)
+    return rows
+
+
+def _flag(params, name):
+    raw = params.get(name)
+    return None if raw in (None, "") else _BOOL_VALUES.get(str(raw))
+
+
+def _stock_states(params):
+    raw = params.get("stock_state") or ""
+    states = {s.strip() for s in str(raw).split(",") if s.strip()}
+    invalid = states - set(StockState.values)
+    if invalid:
+        raise ValidationError({"stock_state": f"Valores inválidos: {', '.join(sorted(invalid))}."})
+    return states
+
+
+def _category_ids(raw) -> set:
+    try:
+        return {int(v) for v in str(raw).split(",") if v.strip()}
+    except ValueError:
+        raise ValidationError({"category_id": "Debe ser una lista de enteros separados por coma."})
+
+
+def _build(rows, predicates, dimensions) -> dict:
+    """Total con todos los filtros y, por faceta, conteos con los filtros de las demás."""
+    total = sum(r["count"] for r in rows if all(p(r) for p in predicates.values()))
+    facets = {}
+    for name, (value_of, label_of) in dimensions.items():
+        others = [p for dim, p in predicates.items() if dim != name]
+        buckets, labels = defaultdict(int), {}
+        for r in rows:
+            if all(p(r) for p in others):
+                value = value_of(r)
+                buckets[value] += r["count"]
+                labels[value] = label_of(r)
+        facets[name] = [
+            {"value": value, "label": labels[value], "count": n}
+            for value, n in sorted(buckets.items(), key=lambda kv: (-kv[1], str(kv[0])))
+        ]
+    return {"total": total, "facets": facets}
+
+
+def product_facets(params) -> dict:
+    """
+    Facetas de productos activos para los filtros de ``params`` (querystring
+    de ``product_list`` más ``stock_state`` y ``category_id``).
+    """
+    from apps.products.filters.product_filter import ProductFilter
+
+    params = {k: v for k, v in params.items() if k not in NON_PREDICATE_PARAMS and v not in (None, "")}
+    # Sólo se cuentan productos activos: status=true no filtra nada más
+    if _flag(params, "status") is True:
+        params.pop("status")
+
+    conditions = defaultdict(list)
+    if "category" in params:
+        needle = str(params.pop("category")).lower()
+        conditions["category"].append(lambda r: needle in (r["category_name"] or "").lower())
+    if "category_id" in params:
+        ids = _category_ids(params.pop("category_id"))
+        conditions["category"].append(lambda r: r["category_id"] in ids)
+    if "has_subproducts" in params:
+        flag = _flag(params, "has_subproducts")
+        params.pop("has_subproducts")
+        if flag is not None:
+            conditions["has_subproducts"].append(lambda r: r["has_subproducts"] is flag)
+    if "stock_state" in params:
+        states = _stock_states(params)
+        params.pop("stock_state")
+        conditions["stock_state"].append(lambda r: r["stock_state"] in states)
+    predicates = {
+        dim: (lambda r, checks=checks: all(check(r) for check in checks))
+        for dim, checks in conditions.items()
+    }
+
+    if params:
+        rows, source = _product_rows_from_query(ProductFilter, params), "query"
+    else:
+        rows, source = _counter_rows(FacetScope.PRODUCT), "counters"
+
+    labels = dict(StockState.choices)
+    result = _build(rows, predicates, {
+        "category": (lambda r: r["category_id"], lambda r: r["category_name"]),
+        "has_subproducts": (lambda r: r["has_subproducts"],
+                            lambda r: "Con subproductos" if r["has_subproducts"] else "Sin subproductos"),
+        "stock_state": (lambda r: r["stock_state"], lambda r: labels[r["stock_state"]]),
+    })
+    result["source"] = source
+    return result
+
+
+def _product_rows_from_query(filter_class, params) -> List[dict]:
+    """Mismas filas que los contadores, agrupando el queryset filtrado (1 query)."""
+    from apps.products.api.repositories.product_repository import ProductRepository
+
+    f = filter_class(params, queryset=ProductRepository.get_all_active_products())
+    if not f.is_valid():
+        raise ValidationError(f.errors)
+    grouped = (
+        f.qs.order_by()
+        .annotate(
+            facet_has_sps=Exists(Subproduct.objects.filter(parent_id=OuterRef("pk"))),
+            facet_state=product_stock_state_expression(),
+        )
+        .values("category_id", "category__name", "facet_has_sps", "facet_state")
+        .annotate(count=Count("pk"))
+    )
+    return [
+        {"category_id": r["category_id"], "category_name": r["category__name"],
+         "has_subproducts": r["facet_has_sps"], "stock_state": r["facet_state"], "count": r["count"]}
+        for r in grouped
+    ]
+
+
+def subproduct_facets(parent_id: int, params) -> dict:
+    """Facetas (estado y stock) de los subproductos de un producto activo."""
+    predicates = {}
+    status = _flag(params, "status")
+    if status is not None:
+        predicates["status"] = lambda r: r["active"] is status
+    if params.get("stock_state"):
+        states = _stock_states(params)
+        predicates["stock_state"] = lambda r: r["stock_state"] in states
+
+    labels = dict(StockState.choices)
+    result = _build(_counter_rows(FacetScope.SUBPRODUCT, parent_id), predicates, {
+        "status": (lambda r: r["active"], lambda r: "Activo" if r["active"] else "Inactivo"),
+        "stock_state": (lambda r: r["stock_state"], lambda r: labels[r["stock_state"]]),
+    })
+    result["source"] = "counters"
+    return result
@@ -0,0 +1,281 @@
+# apps/products/services/catalog_search.py
+"""
+Motor de búsqueda del catálogo sobre ``ProductSearchDocument``.
+
+El documento de cada producto (código, nombre, detalles, rubro, abreviaciones,
+sinónimos, alias y términos del diccionario) se precalcula en minúsculas y se
+mantiene desde las señales de ``apps/products/signals.py``. Una búsqueda pasa a
+ser un único ``document LIKE '%kw%'`` en lugar de ocho ``icontains`` con tres
+EXISTS:
+
+- PostgreSQL: índice GIN ``gin_trgm_ops`` sobre ``document`` (pg_trgm), que
+  resuelve el LIKE sin recorrer la tabla.
+- Otros motores (SQLite en desarrollo/tests): índice invertido por token en
+  memoria del proceso, con verificación exacta del substring sobre el texto.
+
+La semántica es la de ``icontains`` campo a campo: cada valor ocupa su propia
+línea y el keyword nunca contiene saltos de línea.
+"""
+import logging
+import re
+import threading
+from array import array
+from collections import defaultdict
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional, Set
+
+from django.db import connection, transaction
+from django.db.models import Q
+
+from apps.products.models import (
+    Product,
+    ProductAbbreviation,
+    ProductAlias,
+    ProductSearchDocument,
+    ProductSynonym,
+    TermDictionary,
+)
+from apps.products.utils.cache_tags import get_tag_version, invalidate_tags
+
+logger = logging.getLogger(__name__)
+
+SEARCH_TAG = "catalog_search"
+DOCUMENT_FIELDS = ["abbreviations", "synonyms", "aliases", "terms", "document", "updated_at"]
+TRIGRAM_INDEX_NAME = "products_searchdoc_trgm"
+REBUILD_BATCH_SIZE = 2000
+
+# Índice en memoria: por encima de esta cantidad de hits se filtra en la DB
+MAX_INDEX_HITS = 5000
+# Documentos modificados antes de recompactar los postings
+COMPACT_THRESHOLD = 5000
+# Margen al releer documentos modificados (commits que llegan tarde)
+WATERMARK_MARGIN = timedelta(seconds=30)
+TOKEN_RE = re.compile(r"\w+")
+
+
+def normalize_keyword(keyword) -> str:
+    return (keyword or "").strip().replace("\r", " ").replace("\n", " ").lower()
+
+
+def uses_trigram_index() -> bool:
+    return connection.vendor == "postgresql"
+
+
+# ── Construcción del documento ──────────────────────────────────────────────
+
+def _lines(values) -> str:
+    return "\n".join(v.lower() for v in values if v)
+
+
+def _active_terms():
+    """[(term, value)] del diccionario activo, en minúsculas."""
+    return [
+        (term.lower(), value.lower())
+        for term, value in TermDictionary.objects.filter(status=True)
+        .exclude(value__isnull=True).values_list("term", "value")
+        if value and len(value.strip()) >= 2
+    ]
+
+
+def build_documents(product_ids: Iterable[int], terms=None) -> List[ProductSearchDocument]:
+    """Documentos de los productos indicados (5 queries por lote)."""
+    ids = list(product_ids)
+    if terms is None:
+        terms = _active_terms()
+
+    related = {name: defaultdict(list) for name in ("abbreviations", "synonyms", "aliases")}
+    for name, model, field in (
+        ("abbreviations", ProductAbbreviation, "abbreviation"),
+        ("synonyms", ProductSynonym, "synonym"),
+        ("aliases", ProductAlias, "alias_text"),
+    ):
+        for product_id, text in (
+            model.objects.filter(product_id__in=ids, status=True)
+            .order_by("pk").values_list("product_id", field)
+        ):
+            related[name][product_id].append(text)
+
+    documents = []
+    for pid, code, name, public, internal, category in Product.objects.filter(pk__in=ids).values_list(
+        "pk", "code", "name", "detail_public", "detail_internal", "category__name"
+    ):
+        base = _lines([code, name, public, internal])
+        doc = ProductSearchDocument(
+            product_id=pid,
+            abbreviations=_lines(related["abbreviations"][pid]),
+            synonyms=_lines(related["synonyms"][pid]),
+            aliases=_lines(related["aliases"][pid]),
+            terms=_lines(term for term, value in terms if value in base),
+        )
+        doc.document = "\n".join(
+            part for part in (base, _lines([category]), doc.abbreviations, doc.synonyms, doc.aliases, doc.terms)
+            if part
+        )
+        documents.append(doc)
+    return documents
+
+
+def rebuild_search_documents(product_ids: Optional[Iterable[int]] = None, batch_size: int = REBUILD_BATCH_SIZE) -> int:
+    """
+    Recalcula (upsert) los documentos de los productos indicados, o de todos.
+    Devuelve la cantidad de documentos escritos.
+    """
+    if product_ids is None:
+        ids = list(Product.objects.order_by("pk").values_list("pk", flat=True))
+    else:
+        ids = sorted({pid for pid in product_ids if pid})
+    if not ids:
+        return 0
+
+    terms = _active_terms()
+    written = 0
+    for start in range(0, len(ids), batch_size):
+        documents = build_documents(ids[start:start + batch_size], terms=terms)
+        ProductSearchDocument.objects.bulk_create(
+            documents,
+            update_conflicts=True,
+            unique_fields=["product"],
+            update_fields=DOCUMENT_FIELDS,
+        )
+        written += len(documents)
+    transaction.on_commit(lambda: invalidate_tags(SEARCH_TAG))
+    return written
+
+
+def backfill_search_documents() -> int:
+    """
+    Documentos de los productos que todavía no tienen uno (post_migrate): un
+    deploy sobre un catálogo existente no deja el buscador vacío.
+    """
+    missing = list(Product.objects.filter(search_document__isnull=True).order_by("pk").values_list("pk", flat=True))
+    if not missing:
+        return 0
+    with transaction.atomic():
+        written = rebuild_search_documents(missing)
+    reset_token_index()
+    logger.info("[CatalogSearch] backfill: %s documentos creados", written)
+    return written
+
+
+def products_matching_text(*texts) -> List[int]:
+    """Productos cuyo documento contiene alguno de los textos (para reindexar términos)."""
+    query = Q()
+    for text in {normalize_keyword(t) for t in texts if t}:
+        query |= Q(document__contains=text)
+    if not query:
+        return []
+    return list(ProductSearchDocument.objects.filter(query).values_list("product_id", flat=True))
+
+
+def ensure_search_indexes() -> bool:
+    """Crea pg_trgm y el índice GIN trigram sobre ``document`` (sólo PostgreSQL)."""
+    if not uses_trigram_index():
+        return False
+    table = ProductSearchDocument._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        cursor.execute(
+            f'CREATE INDEX IF NOT EXISTS {TRIGRAM_INDEX_NAME} '
+            f'ON "{table}" USING gin ("document" gin_trgm_ops)'
+        )
+    return True
+
+
+# ── Índice invertido en memoria (motores sin pg_trgm) ───────────────────────
+
+class TokenIndex:
+    """
+    Postings por token (``\\w+``) sobre los documentos. Un keyword se resuelve
+    buscando los tokens del vocabulario que contienen su fragmento más largo y
+    verificando el substring completo sobre el texto del documento.
+    Los documentos modificados tras la construcción se verifican siempre hasta
+    la siguiente compactación.
+    """
+
+    def __init__(self):
+        self.docs: Dict[int, str] = {}
+        self.postings: Dict[str, array] = {}
+        self.dirty: Set[int] = set()
+        self.version = None
+        self.watermark = None
+
+    def load(self, rows) -> None:
+        for pid, text, updated_at in rows:
+            self.docs[pid] = text
+            if self.watermark is None or updated_at > self.watermark:
+                self.watermark = updated_at
+        self.compact()
+
+    def update(self, rows) -> None:
+        for pid, text, updated_at in rows:
+            self.docs[pid] = text
+            self.dirty.add(pid)
+            if self.watermark is None or updated_at > self.watermark:
+                self.watermark = updated_at
+        if len(self.dirty) > COMPACT_THRESHOLD:
+            self.compact()
+
+    def compact(self) -> None:
+        postings = defaultdict(list)
+        for pid, text in self.docs.items():
+            for token in set(TOKEN_RE.findall(text)):
+                postings[token].append(pid)
+        self.postings = {token: array("q", ids) for token, ids in postings.items()}
+        self.dirty = set()
+
+    def search(self, keyword: str) -> Optional[Set[int]]:
+        """ids cuyo documento contiene ``keyword``; None si no es indexable."""
+        pieces = TOKEN_RE.findall(keyword)
+        if not pieces:
+            return None
+        piece = max(pieces, key=len)
+        if len(piece) < 2:
+            return None
+        candidates = set(self.dirty)
+        for token, ids in self.postings.items():
+            if piece in token:
+                candidates.update(ids)
+        docs = self.docs
+        return {pid for pid in candidates if keyword in docs.get(pid, "")}
+
+
+_index = TokenIndex()
+_index_lock = threading.Lock()
+
+
+def _document_rows(queryset):
+    return queryset.values_list("product_id", "document", "updated_at").iterator(chunk_size=REBUILD_BATCH_SIZE)
+
+
+def get_token_index() -> TokenIndex:
+    """Índice del proceso, puesto al día si cambió la generación ``SEARCH_TAG``."""
+    version = get_tag_version(SEARCH_TAG)
+    if _index.version == version:
+        return _index
+    with _index_lock:
+        if _index.version != version:
+            if _index.watermark is None:
+                _index.load(_document_rows(ProductSearchDocument.objects.all()))
+            else:
+                since = _index.watermark - WATERMARK_MARGIN
+                _index.update(_document_rows(ProductSearchDocument.objects.filter(updated_at__gte=since)))
+            _index.version = version
+    return _index
+
+
+def reset_token_index() -> None:
+    global _index
+    with _index_lock:
+        _index = TokenIndex()
+
+
+def keyword_filter(keyword: str) -> Q:
+    """Predicado de búsqueda para ``Product`` (``keyword`` ya normalizado)."""
+    db_filter = Q(search_document__document__contains=keyword)
+    if uses_trigram_index():
+        return db_filter
+    ids = get_token_index().search(keyword)
+    if ids is None or len(ids) > MAX_INDEX_HITS:
+        # Keyword no indexable o demasiados hits para un IN: un LIKE sobre una sola tabla
+        return db_filter
+    return Q(pk__in=ids)
@@ -0,0 +1,246 @@
+# apps/products/services/legacy_tables.py
+"""
+Tablas legacy (VFP9/MySQL) que importa ``import_legacy``, en orden de
+dependencias (ver ANALISIS_MANUFACTURA_Y_MIGRACION.md, fase 3). Las columnas
+son las de structure_db.dbml.
+
+Los derivados que normalmente mantienen las señales se recalculan acá: el
+documento de búsqueda por lote de artículos y las facetas del catálogo una vez
+al final. El stock (``art_stock``) no se toca: entra por los ajustes/eventos.
+"""
+from functools import partial
+
+from django.db import transaction
+
+from apps.core.legacy_import import Column, ForeignKey, TableSpec
+from apps.core.legacy_import.converters import to_date, to_decimal, to_int, to_str, to_time
+from apps.customers.models import Customer
+from apps.customers.utils.cache_invalidation import invalidate_customer_cache
+from apps.financial.choices import CurrencyChoices
+from apps.inventory_adjustments.models import InventoryCount, InventoryCountItem, StockAdjustment, StockHistory
+from apps.inventory_adjustments.utils.cache_invalidation import (
+    invalidate_inventory_count_cache,
+    invalidate_stock_history_cache,
+)
+from apps.orders.models import CustomerOrder, CustomerOrderLine
+from apps.products.models import Category, Product
+from apps.products.services.catalog_facets import rebuild_catalog_facets
+from apps.products.services.catalog_search import rebuild_search_documents
+from apps.products.utils.cache_invalidation import invalidate_category_cache, invalidate_product_cache
+
+MOVEMENT_TYPES = {
+    "AJ": StockHistory.MovementType.ADJUSTMENT,
+    "IN": StockHistory.MovementType.INVENTORY,
+    "RE": StockHistory.MovementType.RECEIPT,
+    "RM": StockHistory.MovementType.SHIPMENT,
+    "FA": StockHistory.MovementType.SALE,
+    "VE": StockHistory.MovementType.SALE,
+    "CO": StockHistory.MovementType.PURCHASE,
+}
+
+
+def _text(max_length=None):
+    return partial(to_str, max_length=max_length)
+
+
+def _money(value):
+    return to_decimal(value, places=2)
+
+
+def _currency(value):
+    text = to_str(value).upper()
+    if text in CurrencyChoices.values:
+        return text
+    return CurrencyChoices.USD if text in {"U", "D", "U$S", "DOLAR"} else CurrencyChoices.ARS
+
+
+def _movement_type(value):
+    return MOVEMENT_TYPES.get(to_str(value).upper()[:2], StockHistory.MovementType.OTHER)
+
+
+def _category_name(category, row):
+    # rub_desc es único en Category; sin descripción se usa el código
+    category.name = category.name or f"Rubro {category.legacy_id}"
+
+
+def _match_categories(categories):
+    """
+    ``name`` también es único en Category. Un rubro cuyo nombre ya existe sin
+    legacy_id adopta esa fila (cargada a mano antes de migrar); si el nombre ya
+    es de otro rubro (en la base o antes en el lote) se desambigua con el código.
+    """
+    names = {c.name for c in categories}
+    owners = dict(Category._base_manager.filter(name__in=names).values_list("name", "legacy_id"))
+    imported = set(
+        Category._base_manager.filter(legacy_id__in=[c.legacy_id for c in categories])
+        .values_list("legacy_id", flat=True)
+    )
+    used = set()
+    for category in categories:
+        name = category.name
+        owner = owners.get(name, category.legacy_id)
+        if owner is None and category.legacy_id not in imported:
+            Category._base_manager.filter(name=name, legacy_id__isnull=True).update(legacy_id=category.legacy_id)
+            owners[name] = owner = category.legacy_id
+        if owner != category.legacy_id or name in used:
+            category.name = f"{name[:240]} ({category.legacy_id})"
+        used.add(category.name)
+
+
+def _order_line_product(line, row):
+    line.product_snapshot_code = to_str(row.get("art_codi"), 40)
+
+
+def _count_difference(item, row):
+    item.difference = item.counted_quantity - item.system_quantity
+
+
+@transaction.atomic
+def _rebuild_facets():
+    rebuild_catalog_facets()
+
+
+def _reindex_products(products):
+    rebuild_search_documents([p.pk for p in products])
+
+
+TABLES = (
+    TableSpec(
+        name="rubros",
+        model=Category,
+        key=("legacy_id",),
+        columns=(
+            Column("legacy_id", "rub_codi", to_int),
+            Column("name", "rub_desc", _text(255)),
+        ),
+        prepare=_category_name,
+        before_write=_match_categories,
+        after_load=(invalidate_category_cache,),
+    ),
+    TableSpec(
+        name="clientes",
+        model=Customer,
+        key=("legacy_id",),
+        columns=(
+            Column("legacy_id", "cli_codi", to_int),
+            Column("name", "cli_nomb", _text(255)),
+            Column("address", "cli_domi", _text(255)),
+            Column("cuit", "cli_cuit", _text(20)),
+            Column("phone_primary", "cli_tel1", _text(30)),
+            Column("phone_secondary", "cli_tel2", _text(30)),
+            Column("mobile_phone", "cli_cel", _text(30)),
+            Column("email", "cli_email", _text(254)),
+            Column("legacy_balance", "cli_saldo", _money, default=0),
+            Column("legacy_credit", "cli_favor", _money, default=0),
+            Column("notes", "cli_deta", _text()),
+        ),
+        after_load=(invalidate_customer_cache,),
+    ),
+    TableSpec(
+        name="articulos",
+        model=Product,
+        key=("code",),
+        columns=(
+            Column("code", "art_codi", _text(20)),
+            Column("name", "art_desc", _text(255)),
+            Column("price", "art_precio", to_decimal),
+            Column("last_purchase_cost", "costo_ultcpra", to_decimal),
+            Column("unit", "art_med", _text(20)),
+            Column("min_stock", "art_stmin", to_decimal),
+            Column("pending_customer_orders", "pedidos", to_decimal),
+            Column("pending_supplier_orders", "pedprov", to_decimal),
+            Column("detail_internal", "art_deta", _text()),
+            Column("detail_public", "art_detaofi", _text()),
+            Column("vat_condition_code", "art_alicuota", to_int),
+        ),
+        foreign_keys=(ForeignKey("category", "rub_codi", Category, required=True),),
+        after_chunk=_reindex_products,
+        after_load=(_rebuild_facets, invalidate_product_cache),
+    ),
+    TableSpec(
+        name="pedidos",
+        model=CustomerOrder,
+        key=("legacy_id",),
+        columns=(
+            Column("legacy_id", "ped_codi", to_int),
+            Column("issue_date", "ped_fech", to_date),
+            Column("issue_time", "ped_hora", to_time, default=CustomerOrder._meta.get_field("issue_time").default),
+            Column("discount_percent", "ped_dto", to_decimal, default=0),
+            Column("quotation_legacy_id", "presup_codi", to_int),
+            Column("transport_legacy_id", "tran_codi", to_int),
+            Column("salesperson_legacy_id", "ven_codi", to_int),
+            Column("iva_condition_code", "iva_codi", to_int),
+            Column("currency", "moneda", _currency),
+            Column("exchange_rate", "cotiz_dolar", to_decimal, default=1),
+            Column("notes", "ped_obser", _text()),
+        ),
+        foreign_keys=(ForeignKey("customer", "cli_codi", Customer),),
+    ),
+    TableSpec(
+        name="pedidos_articulos",
+        model=CustomerOrderLine,
+        key=("legacy_id",),
+        columns=(
+            Column("legacy_id", "artped_codi", to_int),
+            Column("legacy_sequence", "artped_it", to_int),
+            Column("quantity_ordered", "artped_cant", to_decimal, default=0),
+            Column("quantity_delivered", "artped_ent", to_decimal, default=0),
+            Column("unit_price", "artped_precio", to_decimal, default=0),
+            Column("notes", "artped_dasc", _text()),
+        ),
+        foreign_keys=(
+            ForeignKey("order", "ped_codi", CustomerOrder, required=True),
+            ForeignKey("product", "art_codi", Product, lookup="code"),
+        ),
+        prepare=_order_line_product,
+        derived_fields=("product_snapshot_code",),
+    ),
+    TableSpec(
+        name="inventarios",
+        model=InventoryCount,
+        key=("legacy_id",),
+        columns=(
+            Column("legacy_id", "inve_codi", to_int),
+            Column("count_date", "inve_fech", to_date, required=True),
+        ),
+        after_load=(invalidate_inventory_count_cache,),
+    ),
+    TableSpec(
+        name="inventarios_articulos",
+        model=InventoryCountItem,
+        key=("count", "product"),
+        columns=(
+            Column("system_quantity", "artinve_stock", to_decimal, default=0),
+            Column("counted_quantity", "artinve_ctrl", to_decimal, default=0),
+        ),
+        foreign_keys=(
+            ForeignKey("count", "inve_codi", InventoryCount, required=True),
+            ForeignKey("product", "art_codi", Product, lookup="code", required=True),
+        ),
+        prepare=_count_difference,
+        derived_fields=("difference",),
+    ),
+    TableSpec(
+        name="histostock",
+        model=StockHistory,
+        key=("legacy_id",),
+        columns=(
+            Column("legacy_id", "hs_codi", to_int),
+            Column("movement_type", "hs_tipmov", _movement_type),
+            Column("movement_date", "hs_fecha", to_date, required=True),
+            Column("movement_time", "hs_hora", to_time),
+            Column("previous_quantity", "hs_anterior", to_decimal, default=0),
+            Column("quantity_delta", "hs_cant", to_decimal, default=0),
+            Column("resulting_quantity", "hs_saldo", to_decimal, default=0),
+            Column("observations", "hs_obser", _text()),
+            Column("detail", "hs_deta", _text()),
+        ),
+        foreign_keys=(
+            ForeignKey("product", "art_codi", Product, lookup="code", required=True),
+            ForeignKey("adjustment", "aju_codi", StockAdjustment),
+        ),
+        after_load=(invalidate_stock_history_cache,),
+    ),
+)
+
+TABLES_BY_NAME = {spec.name: spec for spec in TABLES}
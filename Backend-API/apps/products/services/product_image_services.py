@@ -6,6 +6,7 @@ from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
 from apps.products.models import ProductImage
 from apps.products.api.repositories.product_file_repository import ProductFileRepository
+from apps.storages_client.services.uploads import MultipartFileStream
 
 # -------------------------------------------------------------------
 # ⚙️ Configuración: URL del microservicio externo
@@ -36,19 +37,13 @@ def upload_product_file(file, product_id: str, token: str) -> dict:
     url = f"{DRIVE_API_BASE_URL.rstrip('/')}/product/{product_id}/upload"
     filename = generate_unique_filename(product_id, file.name)
 
-    file.seek(0)
-    file_bytes = file.read()
-    files = {
-        "file": (
-            filename,
-            file_bytes,
-            getattr(file, "content_type", "application/octet-stream")
-        )
-    }
+    # Cuerpo multipart en streaming: no se carga el archivo completo en memoria
+    body = MultipartFileStream(
+        file, filename, getattr(file, "content_type", None) or "application/octet-stream"
+    )
+    headers = {"Authorization": f"Bearer {token}", "Content-Type": body.content_type}
 
-    headers = {"Authorization": f"Bearer {token}"}
-
-    resp = requests.post(url, headers=headers, files=files)
+    resp = requests.post(url, headers=headers, data=body)
     resp.raise_for_status()
     data = resp.json()
 
@@ -2,39 +2,182 @@
 
 import logging
 
-from django.db.models.signals import post_save, post_delete, pre_save
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_save, pre_delete
 from django.dispatch import receiver
 
-from apps.products.models import Product, Category, Subproduct, SupplierProduct
+from apps.products.models import (
+    Product, Category, Subproduct, SupplierProduct, CustomerProduct, ProductImage,
+    ProductAbbreviation, ProductSynonym, ProductAlias, TermDictionary,
+)
+from apps.stocks.models import ProductStock, SubproductStock
 
 from apps.products.utils.cache_invalidation import (
-    invalidate_product_cache, invalidate_subproduct_cache, invalidate_category_cache
+    invalidate_product_cache, invalidate_subproduct_cache, invalidate_category_cache,
+    invalidate_product_entity_cache, product_cache_snapshot, normalize_product_snapshot,
 )
 from apps.products.services.supplier_price_history_service import SupplierPriceHistoryService
+from apps.products.utils.cache_tags import invalidate_tags
+from apps.products.services import catalog_facets, catalog_search
 
 logger = logging.getLogger(__name__)
 
 
 
+def _on_commit_entity(product_id, before=None, after=None, membership_changed=False):
+    """Invalida tras el commit, para que ningún lector recachee datos previos."""
+    if not product_id:
+        return
+    transaction.on_commit(
+        lambda: invalidate_product_entity_cache(
+            product_id, before=before, after=after, membership_changed=membership_changed
+        )
+    )
+
+
 @receiver([post_save, post_delete], sender=Category)
 def clear_category_cache(sender, **kwargs):
     invalidate_category_cache()
+    # El nombre de la categoría se muestra y filtra en los listados de productos
+    transaction.on_commit(invalidate_product_cache)
     logger.debug("[Cache][Signal] category_list invalidada.")
 
 
+@receiver([pre_save, pre_delete], sender=Product)
+def snapshot_product_before_write(sender, instance, **kwargs):
+    instance._cache_before = (
+        normalize_product_snapshot(product_cache_snapshot(instance.pk)) if instance.pk else None
+    )
 
-@receiver([post_save, post_delete], sender=Product)
-def clear_product_cache(sender, **kwargs):
-    invalidate_product_cache()
-    logger.debug("[Cache][Signal] product_list y product_detail invalidados.")
 
+@receiver(post_save, sender=Product)
+def clear_product_cache(sender, instance, created, **kwargs):
+    before = getattr(instance, "_cache_before", None)
+    after = dict(before or {}, has_subproducts=bool(before and before["has_subproducts"]))
+    after.update(status=instance.status, code=instance.code, name=instance.name)
+    if after.get("category_id") != instance.category_id:
+        category = instance.category if instance.category_id else None
+        after.update(category_id=instance.category_id, category_name=getattr(category, "name", None))
+    _on_commit_entity(instance.pk, before, after, membership_changed=created or before != after)
+    logger.debug("[Cache][Signal] product_detail:%s y páginas dependientes invalidadas.", instance.pk)
+
+
+@receiver(post_delete, sender=Product)
+def clear_deleted_product_cache(sender, instance, **kwargs):
+    # Baja física (la baja suave pasa por post_save con status=False)
+    before = getattr(instance, "_cache_before", None)
+    _on_commit_entity(instance.pk, before, None, membership_changed=True)
 
 
 @receiver([post_save, post_delete], sender=Subproduct)
-def clear_subproduct_cache(sender, **kwargs):
+def clear_subproduct_cache(sender, instance, created=False, **kwargs):
     invalidate_subproduct_cache()
     logger.debug("[Cache][Signal] subproduct_list y subproduct_detail invalidados.")
 
+    parent_id = instance.parent_id
+    if not created and kwargs.get("signal") is post_save:
+        _on_commit_entity(parent_id)
+        return
+    # Alta o baja física: puede cambiar el filtro has_subproducts del padre
+    snap = normalize_product_snapshot(product_cache_snapshot(parent_id))
+    if snap is None:
+        return
+    others = Subproduct.objects.filter(parent_id=parent_id).exclude(pk=instance.pk).exists()
+    before = dict(snap, has_subproducts=others if created else True)
+    after = dict(snap, has_subproducts=True if created else others)
+    _on_commit_entity(parent_id, before, after, membership_changed=before != after)
+
+
+@receiver([post_save, post_delete], sender=ProductStock)
+@receiver([post_save, post_delete], sender=ProductImage)
+@receiver([post_save, post_delete], sender=SupplierProduct)
+@receiver([post_save, post_delete], sender=CustomerProduct)
+def clear_product_related_cache(sender, instance, **kwargs):
+    _on_commit_entity(instance.product_id)
+
+
+@receiver([post_save, post_delete], sender=SubproductStock)
+def clear_subproduct_stock_cache(sender, instance, **kwargs):
+    parent_id = (
+        Subproduct.objects.filter(pk=instance.subproduct_id).values_list("parent_id", flat=True).first()
+    )
+    _on_commit_entity(parent_id)
+
+
+# ── Documento de búsqueda del catálogo ──────────────────────────────────────
+# Se reescribe dentro de la misma transacción que el cambio que lo origina.
+
+@receiver(post_save, sender=Product)
+def reindex_product_search_document(sender, instance, created, update_fields=None, **kwargs):
+    if created or instance.search_fields_changed(update_fields):
+        catalog_search.rebuild_search_documents([instance.pk])
+
+
+@receiver(post_save, sender=Category)
+def reindex_category_search_documents(sender, instance, created, **kwargs):
+    if not created:
+        catalog_search.rebuild_search_documents(
+            Product.objects.filter(category_id=instance.pk).values_list("pk", flat=True)
+        )
+
+
+@receiver([post_save, post_delete], sender=ProductAbbreviation)
+@receiver([post_save, post_delete], sender=ProductSynonym)
+@receiver([post_save, post_delete], sender=ProductAlias)
+def reindex_dictionary_search_document(sender, instance, **kwargs):
+    catalog_search.rebuild_search_documents([instance.product_id])
+
+
+@receiver(pre_save, sender=TermDictionary)
+def snapshot_term_before_write(sender, instance, **kwargs):
+    instance._search_value_before = (
+        TermDictionary.objects.filter(pk=instance.pk).values_list("value", flat=True).first()
+        if instance.pk else None
+    )
+
+
+@receiver([post_save, post_delete], sender=TermDictionary)
+def reindex_term_search_documents(sender, instance, **kwargs):
+    # Productos que contenían el valor anterior o contienen el nuevo
+    catalog_search.rebuild_search_documents(
+        catalog_search.products_matching_text(getattr(instance, "_search_value_before", None), instance.value)
+    )
+
+
+# ── Contadores de facetas ───────────────────────────────────────────────────
+# Se refrescan tras el commit (ver catalog_facets); los cambios de stock que se
+# escriben con UPDATE directo los agendan los servicios de apps.stocks.
+
+@receiver([post_save, post_delete], sender=Category)
+def refresh_category_facet_labels(sender, **kwargs):
+    # Los contadores guardan el id; el nombre se resuelve al leer
+    transaction.on_commit(lambda: invalidate_tags(catalog_facets.FACETS_TAG))
+
+
+@receiver(post_save, sender=Product)
+def refresh_product_facet_counts(sender, instance, created, **kwargs):
+    before = getattr(instance, "_cache_before", None)
+    status_changed = created or not before or before.get("status") != instance.status
+    catalog_facets.schedule_product_facets([instance.pk], include_subproducts=status_changed)
+
+
+@receiver(post_delete, sender=Product)
+def drop_product_facet_counts(sender, instance, **kwargs):
+    catalog_facets.schedule_product_facets([instance.pk])
+
+
+@receiver([post_save, post_delete], sender=Subproduct)
+def refresh_subproduct_facet_counts(sender, instance, created=False, **kwargs):
+    catalog_facets.schedule_subproduct_facets([instance.pk])
+    if created or kwargs.get("signal") is post_delete:
+        # Puede cambiar has_subproducts del padre
+        catalog_facets.schedule_product_facets([instance.parent_id])
+
+
+@receiver([post_save, post_delete], sender=SubproductStock)
+def refresh_subproduct_stock_facet_counts(sender, instance, **kwargs):
+    catalog_facets.schedule_subproduct_facets([instance.subproduct_id])
+
 
 @receiver(post_save, sender=SupplierProduct)
 def track_supplier_price_changes(sender, instance, created, **kwargs):
@@ -0,0 +1,50 @@
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from apps.products.filters.product_filter import ProductFilter
+from apps.products.utils.cache_dependencies import dependent_cache_get, dependent_cache_set
+from apps.products.utils.cache_keys import product_entity_tag
+from apps.products.utils.cache_tags import get_tag_versions, invalidate_tags
+
+
+class DependentCacheTestCase(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_only_entries_depending_on_entity_are_dropped(self):
+        dependent_cache_set("page:1", ["a"], 60, [product_entity_tag(1), product_entity_tag(2)])
+        dependent_cache_set("page:2", ["b"], 60, [product_entity_tag(3)])
+
+        invalidate_tags(product_entity_tag(2))
+
+        self.assertIsNone(dependent_cache_get("page:1"))
+        self.assertEqual(dependent_cache_get("page:2"), ["b"])
+
+    def test_concurrent_write_prevents_caching(self):
+        since = get_tag_versions(["product_write_clock"])
+        invalidate_tags("product_write_clock")
+
+        stored = dependent_cache_set("page:1", ["stale"], 60, [product_entity_tag(1)], since=since)
+
+        self.assertFalse(stored)
+        self.assertIsNone(dependent_cache_get("page:1"))
+
+
+class ProductFilterMatchesTestCase(SimpleTestCase):
+    snapshot = {
+        "status": True, "code": "1234", "name": "Cable Cobre",
+        "category_id": 1, "category_name": "Electricidad", "has_subproducts": False,
+    }
+
+    def test_predicates(self):
+        self.assertTrue(ProductFilter.matches({"code": "12", "name": "cobre"}, self.snapshot))
+        self.assertFalse(ProductFilter.matches({"category": "plom"}, self.snapshot))
+        self.assertFalse(ProductFilter.matches({"has_subproducts": "true"}, self.snapshot))
+        self.assertTrue(ProductFilter.matches({"page": "3", "name": ""}, self.snapshot))
+
+    def test_inactive_or_missing_never_matches(self):
+        self.assertFalse(ProductFilter.matches({}, dict(self.snapshot, status=False)))
+        self.assertFalse(ProductFilter.matches({}, None))
+
+    def test_unknown_param_is_undecidable(self):
+        self.assertIsNone(ProductFilter.matches({"ordering": "name"}, self.snapshot))
@@ -0,0 +1,36 @@
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from apps.products.utils.cache_keys import product_list_cache_key
+from apps.products.utils.cache_tags import get_tag_version, invalidate_tags, versioned_prefix
+from apps.products.utils.cache_invalidation import invalidate_product_cache
+
+
+class CacheTagsTestCase(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_invalidate_bumps_generation(self):
+        before = get_tag_version("product_list")
+        invalidate_tags("product_list")
+        self.assertEqual(get_tag_version("product_list"), before + 1)
+
+    def test_generated_keys_change_after_invalidation(self):
+        key = product_list_cache_key(page=1, page_size=10)
+        cache.set(key, {"results": []}, 60)
+        self.assertEqual(product_list_cache_key(page=1, page_size=10), key)
+
+        invalidate_product_cache()
+
+        new_key = product_list_cache_key(page=1, page_size=10)
+        self.assertNotEqual(new_key, key)
+        self.assertIsNone(cache.get(new_key))
+
+    def test_unrelated_tag_is_untouched(self):
+        prefix = versioned_prefix("category_list")
+        invalidate_product_cache()
+        self.assertEqual(versioned_prefix("category_list"), prefix)
+
+    def test_missing_counter_is_reseeded(self):
+        invalidate_tags("fresh_tag")
+        self.assertIsNotNone(get_tag_version("fresh_tag"))
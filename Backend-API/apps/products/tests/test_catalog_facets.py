@@ -0,0 +1,133 @@
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.products.models import CatalogFacetCount, CatalogFacetEntry, Category, FacetScope, Product, Subproduct
+from apps.products.services.catalog_facets import rebuild_catalog_facets, refresh_product_facets
+from apps.stocks.services import initialize_product_stock
+from apps.stocks.services.bulk_movements import StockMovement, apply_stock_movements
+from apps.stocks.services.subproduct_stock import initialize_subproduct_stock
+from apps.users.models.user_model import User
+
+
+def _counts(facet):
+    return {bucket["value"]: bucket["count"] for bucket in facet}
+
+
+class CatalogFacetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username="facets", email="facets@example.com", password="x", name="Fa", last_name="Cets",
+        )
+        with cls.captureOnCommitCallbacks(execute=True):
+            cls.chapas = Category.objects.create(name="Chapas")
+            cls.tornillos = Category.objects.create(name="Tornillos")
+            cls.products = {}
+            # (código, categoría, stock inicial, mínimo)
+            for code, category, qty, min_stock in (
+                ("100", cls.chapas, "50", None),
+                ("101", cls.chapas, "5", "10"),
+                ("102", cls.chapas, "0", None),
+                ("200", cls.tornillos, "8", "2"),
+            ):
+                product = Product(code=code, name=f"Artículo {code}", category=category,
+                                  min_stock=Decimal(min_stock) if min_stock else None)
+                product.save(user=cls.user)
+                initialize_product_stock(product, cls.user, Decimal(qty))
+                cls.products[code] = product
+
+            cls.coils = Product(code="300", name="Bobinas", category=cls.tornillos, has_subproducts=True)
+            cls.coils.save(user=cls.user)
+            cls.subs = []
+            for n, qty in enumerate(("30", "0", "12")):
+                sub = Subproduct(parent=cls.coils, number_coil=f"B{n}", initial_stock_quantity=Decimal(qty))
+                sub.save(user=cls.user)
+                initialize_subproduct_stock(sub, cls.user, Decimal(qty))
+                cls.subs.append(sub)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _facets(self, url=None, **params):
+        response = self.client.get(url or reverse("product-facets"), params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def _counter_snapshot(self):
+        return sorted(
+            CatalogFacetCount.objects.filter(count__gt=0)
+            .values_list("scope", "category_id", "parent_id", "has_subproducts", "active", "stock_state", "count")
+        )
+
+    def test_counts_follow_signals_and_stock_services(self):
+        data = self._facets()
+        self.assertEqual(data["source"], "counters")
+        self.assertEqual(data["total"], 5)
+        self.assertEqual(_counts(data["facets"]["category"]), {self.chapas.pk: 3, self.tornillos.pk: 2})
+        self.assertEqual(_counts(data["facets"]["has_subproducts"]), {False: 4, True: 1})
+        self.assertEqual(_counts(data["facets"]["stock_state"]), {"in_stock": 3, "low": 1, "out": 1})
+
+        # Movimientos en lote (UPDATE directo, sin señales) y baja de un producto
+        with self.captureOnCommitCallbacks(execute=True):
+            apply_stock_movements([
+                StockMovement(quantity_change=Decimal("-50"), event_type="egreso_venta",
+                              product_id=self.products["100"].pk),
+                StockMovement(quantity_change=Decimal("-30"), event_type="egreso_venta",
+                              subproduct_id=self.subs[0].pk),
+            ], self.user)
+            self.products["200"].status = False
+            self.products["200"].save(user=self.user)
+
+        data = self._facets()
+        self.assertEqual(data["total"], 4)
+        self.assertEqual(_counts(data["facets"]["stock_state"]), {"in_stock": 1, "low": 1, "out": 2})
+        subs = self._facets(reverse("subproduct-facets", args=[self.coils.pk]))
+        self.assertEqual(_counts(subs["facets"]["stock_state"]), {"in_stock": 1, "out": 2})
+        self.assertEqual(_counts(subs["facets"]["status"]), {True: 1, False: 2})
+
+        # Lo incremental coincide con una reconstrucción completa
+        incremental = self._counter_snapshot()
+        rebuild_catalog_facets()
+        self.assertEqual(self._counter_snapshot(), incremental)
+
+    def test_refresh_reads_state_after_locking_entries(self):
+        product = self.products["100"]
+        entries = CatalogFacetEntry._meta.db_table
+        with CaptureQueriesContext(connection) as ctx:
+            refresh_product_facets([product.pk, 999999])
+
+        sqls = [q["sql"] for q in ctx.captured_queries]
+        locked = next(i for i, sql in enumerate(sqls) if sql.startswith("SELECT") and entries in sql)
+        state = next(i for i, sql in enumerate(sqls) if "current_stock" in sql)
+        self.assertLess(locked, state)
+        # Un id que ya no existe no deja entrada
+        self.assertFalse(CatalogFacetEntry.objects.filter(scope=FacetScope.PRODUCT, object_id=999999).exists())
+
+    def test_facets_are_disjunctive_and_cached(self):
+        self._facets()  # calienta la cache
+        with CaptureQueriesContext(connection) as ctx:
+            data = self._facets(category="chap", stock_state="in_stock,low")
+        self.assertEqual(len(ctx.captured_queries), 0)  # los contadores salen de la cache
+        self.assertEqual(data["total"], 2)
+        # La faceta de categoría ignora su propio filtro, la de stock también
+        self.assertEqual(_counts(data["facets"]["category"]), {self.chapas.pk: 2, self.tornillos.pk: 2})
+        self.assertEqual(_counts(data["facets"]["stock_state"]), {"in_stock": 1, "low": 1, "out": 1})
+
+    def test_text_filters_use_single_grouped_query(self):
+        with CaptureQueriesContext(connection) as ctx:
+            data = self._facets(code="10", has_subproducts="false")
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertEqual(data["source"], "query")
+        self.assertEqual(data["total"], 3)
+        self.assertEqual(_counts(data["facets"]["has_subproducts"]), {False: 3})
+
+        response = self.client.get(reverse("product-facets"), {"stock_state": "lots"})
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,88 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management.sql import emit_post_migrate_signal
+from django.db import DEFAULT_DB_ALIAS
+from django.test import TestCase
+
+from apps.products.api.repositories.catalog_repository import CatalogRepository
+from apps.products.models import (
+    Category, Product, ProductAbbreviation, ProductSearchDocument, ProductSynonym, TermDictionary,
+)
+from apps.products.services import catalog_search
+
+
+class CatalogSearchTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        catalog_search.reset_token_index()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.category = Category.objects.create(name="Bulonería")
+            self.bolt = Product.objects.create(code="TOR-10", name="Tornillo hexagonal", category=self.category)
+            self.nut = Product.objects.create(code="TU-5", name="Tuerca", detail_internal="para tornillo",
+                                              category=self.category)
+            self.washer = Product.objects.create(code="AR-1", name="Arandela plana", category=self.category)
+            ProductSynonym.objects.create(product=self.washer, synonym="Golilla")
+            ProductAbbreviation.objects.create(product=self.nut, abbreviation="TCA", full_word="tuerca")
+
+    def _search(self, keyword):
+        return list(CatalogRepository.search_products(keyword))
+
+    def test_reindexes_only_when_searchable_fields_change(self):
+        bolt = Product.objects.get(pk=self.bolt.pk)
+        with mock.patch.object(catalog_search, "rebuild_search_documents") as rebuild:
+            bolt.price = 99
+            bolt.save()
+            bolt.save(update_fields=["price"])
+            rebuild.assert_not_called()
+            bolt.name = "Tornillo allen"
+            bolt.save()
+            rebuild.assert_called_once_with([bolt.pk])
+
+    def test_post_migrate_backfills_missing_documents(self):
+        ProductSearchDocument.objects.filter(product__in=[self.bolt, self.washer]).delete()
+        catalog_search.reset_token_index()
+        self.assertEqual(self._search("tornillo hex"), [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            emit_post_migrate_signal(verbosity=0, interactive=False, db=DEFAULT_DB_ALIAS)
+        self.assertEqual(ProductSearchDocument.objects.count(), 3)
+        self.assertEqual([p.pk for p in self._search("tornillo hex")], [self.bolt.pk])
+
+    def test_ranking_and_hits_match_previous_semantics(self):
+        results = self._search("tornillo")
+        self.assertEqual([p.pk for p in results], [self.bolt.pk, self.nut.pk])
+        self.assertEqual([p.match_score for p in results], [80, 50])
+
+        washer, = self._search("GOLI")
+        self.assertEqual(washer.pk, self.washer.pk)
+        self.assertEqual(washer.match_score, 25)
+        self.assertTrue(washer.synonym_hit)
+        self.assertFalse(washer.abbreviation_hit)
+
+        self.assertEqual(len(self._search("bulonería")), 3)
+        self.assertEqual(self._search("hexagonal\nplana"), [])
+
+    def test_document_follows_dictionary_changes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            ProductSynonym.objects.get(product=self.washer).delete()
+        self.assertEqual(self._search("golilla"), [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            TermDictionary.objects.create(term="perno", value="hexagonal")
+        self.assertEqual([p.pk for p in self._search("perno")], [self.bolt.pk])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.bolt.name = "Tornillo allen"
+            self.bolt.save()
+        self.assertEqual(self._search("perno"), [])
+        self.assertIn("tornillo allen", ProductSearchDocument.objects.get(pk=self.bolt.pk).document)
+
+    def test_database_fallback_returns_same_rows(self):
+        for keyword in ("torn", "tca", "a", "-"):
+            indexed = {p.pk for p in self._search(keyword)}
+            scanned = set(
+                Product.objects.filter(catalog_search.Q(search_document__document__contains=keyword))
+                .values_list("pk", flat=True)
+            )
+            self.assertEqual(indexed, scanned, keyword)
@@ -0,0 +1,61 @@
+import os
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.products.models import Category, Product, ProductImage, Subproduct, SubproductImage
+from apps.users.models.user_model import User
+
+VIEWS = "apps.products.api.views"
+
+
+def _confirmed(key, name="manual.pdf"):
+    return {"key": key, "url": f"https://files.example.com/{key}", "name": name,
+            "mimeType": "application/pdf", "size": 400}
+
+
+@patch.dict(os.environ, {"ALLOWED_UPLOAD_EXTENSIONS": ".pdf,.png"})
+class DirectUploadConfirmTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            username="admin", email="admin@example.com", password="x", name="Ad", last_name="Min",
+        )
+        cls.product = Product(code="MAN-1", name="Manual", category=Category.objects.create(name="Docs"))
+        cls.product.save(user=cls.admin)
+        cls.sub = Subproduct(parent=cls.product, number_coil="B1", initial_stock_quantity=Decimal("1"))
+        cls.sub.save(user=cls.admin)
+
+    def setUp(self):
+        cache.clear()
+        self.admin.is_staff = True  # IsAdminUser; el modelo no tiene la columna
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_confirming_twice_links_the_product_file_once(self):
+        key = f"products/{self.product.pk}/abc.pdf"
+        url = reverse("product-file-upload-confirm", args=[self.product.pk])
+        with patch(f"{VIEWS}.product_files_view.confirm_product_upload", return_value=_confirmed(key)), \
+                patch(f"{VIEWS}.product_files_view.broadcast_crud_event") as broadcast:
+            first = self.client.post(url, {"key": key, "name": "manual.pdf"}, format="json")
+            second = self.client.post(url, {"key": key, "name": "manual.pdf"}, format="json")
+
+        self.assertEqual((first.status_code, second.status_code), (201, 200))
+        self.assertEqual(second.json(), {"uploaded": [key], "errors": None})
+        self.assertEqual(ProductImage.objects.filter(product=self.product, key=key).count(), 1)
+        self.assertEqual(broadcast.call_count, 1)
+
+    def test_confirming_twice_links_the_subproduct_file_once(self):
+        key = f"products/{self.product.pk}/subproducts/{self.sub.pk}/abc.pdf"
+        url = reverse("subproduct-file-upload-confirm", args=[self.product.pk, self.sub.pk])
+        with patch(f"{VIEWS}.subproduct_files_view.confirm_subproduct_upload", return_value=_confirmed(key)), \
+                patch(f"{VIEWS}.subproduct_files_view.broadcast_crud_event"):
+            first = self.client.post(url, {"key": key}, format="json")
+            second = self.client.post(url, {"key": key}, format="json")
+
+        self.assertEqual((first.status_code, second.status_code), (201, 200))
+        self.assertEqual(SubproductImage.objects.filter(subproduct=self.sub, key=key).count(), 1)
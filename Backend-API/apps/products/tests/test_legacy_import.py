@@ -0,0 +1,123 @@
+import dataclasses
+import json
+import shutil
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.db.models.signals import post_save
+from django.test import TestCase
+
+from apps.core.legacy_import import Checkpoint, IdMaps, import_mode, load_table, read_rows
+from apps.customers.models import Customer
+from apps.inventory_adjustments.models import InventoryCountItem, StockHistory
+from apps.products.models import Category, Product, ProductSearchDocument
+from apps.products.services.legacy_tables import TABLES_BY_NAME
+from apps.products.utils.cache_invalidation import invalidate_category_cache
+from apps.products.utils.cache_keys import CATEGORY_LIST_CACHE_PREFIX
+from apps.products.utils.cache_tags import get_tag_version
+
+EXPORTS = {
+    "rubros.csv": "rub_codi,rub_desc\n1,Tornillos\n2,Tuercas\n",
+    "clientes.csv": "cli_codi,cli_nomb,cli_saldo\n10,Ferretería Sur,1500.5\n11,Corralón Norte,\n",
+    "articulos.csv": (
+        "art_codi,art_desc,rub_codi,art_precio\n"
+        "100,Tornillo 1/4,1,12.5\n101,Tuerca M6,2,3\n102,Arandela,9,1\n103,Bulón,1,40\n"
+    ),
+    "inventarios.csv": "inve_codi,inve_fech\n5,2024-03-01\n",
+    "inventarios_articulos.csv": "inve_codi,art_codi,artinve_stock,artinve_ctrl\n5,100,10,8\n5,101,4,4\n",
+    "histostock.csv": (
+        "hs_codi,art_codi,hs_fecha,hs_tipmov,hs_anterior,hs_cant,hs_saldo\n"
+        "1,100,2024-01-02,AJUSTE,0,10,10\n2,100,2024-03-01,INVENTARIO,10,-2,8\n3,999,2024-03-02,VENTA,0,1,1\n"
+    ),
+}
+
+
+class LegacyImportTests(TestCase):
+    def setUp(self):
+        self.dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.dir)
+        for name, content in EXPORTS.items():
+            (self.dir / name).write_text(content, encoding="utf-8")
+
+    def run_import(self, *args):
+        out = StringIO()
+        call_command("import_legacy", str(self.dir), "--chunk-size", "2", *args, stdout=out)
+        return out.getvalue()
+
+    def test_imports_resolves_legacy_ids_and_reports_rate(self):
+        output = self.run_import()
+
+        self.assertEqual(Customer.objects.get(legacy_id=10).legacy_balance, 1500.5)
+        self.assertEqual(Product.objects.get(code="100").category.name, "Tornillos")
+        # rub_codi 9 no existe y art_codi 999 tampoco: filas rechazadas, no abortan la carga
+        self.assertFalse(Product.objects.filter(code="102").exists())
+        self.assertEqual(StockHistory.objects.count(), 2)
+        self.assertEqual(StockHistory.objects.get(legacy_id=1).movement_type, StockHistory.MovementType.ADJUSTMENT)
+        item = InventoryCountItem.objects.get(product__code="100")
+        self.assertEqual((item.count.legacy_id, item.difference), (5, -2))
+        # Los derivados de las señales se recalculan igual
+        self.assertEqual(ProductSearchDocument.objects.count(), 3)
+        self.assertIn("filas/s", output)
+        self.assertIn("fila 3: rub_codi='9' sin Category", output)
+
+        checkpoint = json.loads((self.dir / ".import_checkpoint.json").read_text())
+        self.assertEqual(checkpoint["articulos"], {"source": "articulos.csv", "offset": 4})
+
+    def test_resumes_from_checkpoint_and_upserts_on_restart(self):
+        self.run_import("--tables", "rubros", "clientes")
+        (self.dir / "clientes.csv").write_text("cli_codi,cli_nomb\n10,Ferretería Sur SA\n12,Nuevo\n")
+
+        # Checkpoint: las 2 primeras filas ya están, sólo entra la tercera (12)
+        self.run_import("--tables", "clientes")
+        self.assertEqual(Customer.objects.get(legacy_id=10).name, "Ferretería Sur")
+        self.assertEqual(Customer.objects.count(), 2)
+
+        self.run_import("--tables", "clientes", "--restart")
+        self.assertEqual(Customer.objects.get(legacy_id=10).name, "Ferretería Sur SA")
+        self.assertEqual(sorted(Customer.objects.values_list("legacy_id", flat=True)), [10, 11, 12])
+        self.assertEqual(Category.objects.count(), 2)
+
+    def test_import_mode_mutes_signals_and_defers_invalidation(self):
+        calls = []
+        receiver = lambda **kwargs: calls.append(kwargs["sender"])  # noqa: E731
+        post_save.connect(receiver, sender=Category, weak=False)
+        self.addCleanup(post_save.disconnect, receiver, sender=Category)
+        before = get_tag_version(CATEGORY_LIST_CACHE_PREFIX)
+
+        with import_mode():
+            Category.objects.create(name="Sin señal")
+            invalidate_category_cache()
+            invalidate_category_cache()
+            self.assertEqual(get_tag_version(CATEGORY_LIST_CACHE_PREFIX), before)
+        self.assertEqual(calls, [])
+        self.assertEqual(get_tag_version(CATEGORY_LIST_CACHE_PREFIX), before + 1)
+
+        Category.objects.create(name="Con señal")
+        self.assertEqual(calls, [Category])
+
+    def test_categories_adopt_existing_names_and_disambiguate_duplicates(self):
+        manual = Category.objects.create(name="Tornillos")
+        (self.dir / "rubros.csv").write_text("rub_codi,rub_desc\n1,Tornillos\n2,Tuercas\n3,Tuercas\n")
+
+        self.run_import("--tables", "rubros")
+        manual.refresh_from_db()
+        self.assertEqual(manual.legacy_id, 1)
+        self.assertEqual(
+            sorted(Category.objects.values_list("legacy_id", "name")),
+            [(1, "Tornillos"), (2, "Tuercas"), (3, "Tuercas (3)")],
+        )
+        self.run_import("--tables", "rubros", "--restart")
+        self.assertEqual(Category.objects.count(), 3)
+
+    def test_unique_conflicts_reject_rows_instead_of_aborting(self):
+        Category.objects.create(name="Tornillos")
+        spec = dataclasses.replace(TABLES_BY_NAME["rubros"], before_write=None)
+        path = self.dir / "rubros.csv"
+
+        result = load_table(spec, read_rows(path), path, id_maps=IdMaps(),
+                            checkpoint=Checkpoint(self.dir / "cp.json"), chunk_size=10)
+        self.assertEqual((result.written, result.rejected), (1, 1))
+        self.assertIn("fila 1:", result.samples[0])
+        self.assertEqual(Category.objects.get(legacy_id=2).name, "Tuercas")
@@ -0,0 +1,127 @@
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.core.prefetch import build_plan
+from apps.products.api.serializers.product_serializer import ProductSerializer
+from apps.products.models import Category, CustomerProduct, Product, ProductImage, Subproduct, SupplierProduct
+from apps.stocks.models.stock_subproduct_model import SubproductStock
+from apps.users.models.user_model import User
+
+# 1 COUNT + 1 productos (con category y usuarios por JOIN) + 4 prefetch
+# (subproductos con stock anotado, imágenes, proveedores, clientes)
+LIST_QUERIES = 6
+DETAIL_QUERIES = 6  # get_by_id + producto planificado + 4 prefetch
+
+
+class ProductSerializerQueryCountTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username="auditor", email="auditor@example.com", password="x", name="Au", last_name="Ditor",
+        )
+        cls.editor = User.objects.create_user(
+            username="editor", email="editor@example.com", password="x", name="Ed", last_name="Itor",
+        )
+        category = Category.objects.create(name="Chapas")
+        for i in range(12):
+            product = Product(code=f"CH-{i:03d}", name=f"Chapa {i}", category=category)
+            product.save(user=cls.user)
+            product.save(user=cls.editor)
+            for j in range(2):
+                sub = Subproduct(parent=product, number_coil=f"B{i}-{j}", initial_stock_quantity=Decimal("5"))
+                sub.save(user=cls.user)
+                SubproductStock.objects.update_or_create(
+                    subproduct=sub, defaults={"quantity": Decimal(i + j)},
+                )
+            ProductImage.objects.create(product=product, key=f"products/{product.pk}/a.png", name="a.png")
+            SupplierProduct(product=product, supplier_legacy_id=i, price_list_number=1).save(user=cls.user)
+            CustomerProduct(product=product, customer_legacy_id=i).save(user=cls.editor)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _get(self, url, **params):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json(), len(ctx.captured_queries)
+
+    def test_plan_covers_nested_serializers(self):
+        plan = build_plan(ProductSerializer, Product)
+        self.assertEqual(plan.select, {"category", "created_by", "modified_by", "deleted_by"})
+        self.assertEqual(
+            set(plan.prefetch), {"subproducts", "product_images", "supplier_products", "customer_products"},
+        )
+        # El padre del subproducto ya viene cacheado por el prefetch inverso
+        self.assertNotIn("parent", plan.prefetch["subproducts"].select)
+
+    def test_list_query_count_is_independent_of_page_size(self):
+        small, small_queries = self._get(reverse("product-list"), page_size=2)
+        full, full_queries = self._get(reverse("product-list"), page_size=12)
+
+        self.assertEqual(len(small["results"]), 2)
+        self.assertEqual(len(full["results"]), 12)
+        self.assertEqual(small_queries, LIST_QUERIES)
+        self.assertEqual(full_queries, LIST_QUERIES)
+
+        row = next(r for r in full["results"] if r["code"] == "CH-005")
+        self.assertEqual((row["created_by"], row["modified_by"]), ("auditor", "editor"))
+        self.assertEqual(sorted(s["current_stock"] for s in row["subproducts"]), [5.0, 6.0])
+        self.assertEqual(row["subproducts"][0]["parent_code"], "CH-005")
+        self.assertEqual(row["customers"][0]["created_by"], "editor")
+
+    def test_detail_query_count(self):
+        product = Product.objects.get(code="CH-007")
+        data, queries = self._get(reverse("product-detail", args=[product.pk]))
+        self.assertEqual(queries, DETAIL_QUERIES)
+        self.assertEqual(len(data["subproducts"]), 2)
+        self.assertEqual(data["suppliers"][0]["created_by"], "auditor")
+
+    def test_sparse_fieldset_prunes_fields_and_queries(self):
+        data, queries = self._get(reverse("product-list"), page_size=12, fields="id,code,name")
+        self.assertEqual(queries, 2)  # COUNT + productos, sin JOINs ni prefetch
+        self.assertEqual(set(data["results"][0]), {"id", "code", "name"})
+
+        data, queries = self._get(
+            reverse("product-list"), page_size=12, fields="code,subproducts.current_stock",
+        )
+        self.assertEqual(queries, 3)
+        row = next(r for r in data["results"] if r["code"] == "CH-005")
+        self.assertEqual(row["subproducts"], [{"current_stock": 6.0}, {"current_stock": 5.0}])
+
+        data, queries = self._get(reverse("product-list"), page_size=12, expand="product_images")
+        self.assertEqual(queries, 3)
+        row = data["results"][0]
+        self.assertIn("product_images", row)
+        self.assertIn("modified_by", row)
+        self.assertFalse({"subproducts", "suppliers", "customers"} & set(row))
+
+    def test_detail_fieldset(self):
+        product = Product.objects.get(code="CH-007")
+        data, _ = self._get(reverse("product-detail", args=[product.pk]), fields="id,category,customers.id")
+        self.assertEqual(data["category"], product.category_id)
+        self.assertEqual(set(data), {"id", "category", "customers"})
+        self.assertEqual(list(data["customers"][0]), ["id"])
+
+    def test_subproduct_endpoints_annotate_stock_once(self):
+        product = Product.objects.get(code="CH-005")
+        data, _ = self._get(reverse("subproduct-list", args=[product.pk]))
+        rows = data["results"] if isinstance(data, dict) else data
+        self.assertEqual(sorted(s["current_stock"] for s in rows), [5.0, 6.0])
+
+        sub = product.subproducts.order_by("pk").first()
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse("subproduct-detail", args=[product.pk, sub.pk]))
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.json()["current_stock"], 5.0)
+        stock_table = SubproductStock._meta.db_table
+        for query in ctx.captured_queries:
+            self.assertLessEqual(query["sql"].count(stock_table), 1, query["sql"])
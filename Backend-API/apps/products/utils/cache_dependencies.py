@@ -0,0 +1,58 @@
+# apps/products/utils/cache_dependencies.py
+"""
+Entradas de cache con dependencias explícitas.
+
+Cada entrada guarda, junto con los datos, la generación de los tags de los que
+depende (p.ej. ``product:42`` por cada producto de una página). Al leerla se
+comparan esas generaciones con las actuales en un solo ``get_many``: si alguna
+cambió la entrada se descarta. Así, guardar el producto 42 sólo invalida las
+entradas que efectivamente lo contienen.
+"""
+import logging
+from typing import Dict, Iterable, Optional
+
+from django.core.cache import cache
+
+from .cache_tags import get_tag_versions
+
+logger = logging.getLogger(__name__)
+
+
+def dependent_cache_get(key: str):
+    """Devuelve los datos cacheados si ninguna de sus dependencias cambió."""
+    entry = cache.get(key)
+    if not isinstance(entry, dict) or "data" not in entry:
+        return None
+    deps: Dict[str, int] = entry.get("deps") or {}
+    if deps:
+        current = get_tag_versions(deps)
+        stale = [t for t, v in deps.items() if current.get(t) != v]
+        if stale:
+            logger.debug("[Cache][deps] %s descartada por %s", key, stale[:5])
+            return None
+    return entry["data"]
+
+
+def dependent_cache_set(
+    key: str,
+    data,
+    timeout: int,
+    tags: Iterable[str],
+    *,
+    since: Optional[Dict[str, int]] = None,
+) -> bool:
+    """
+    Guarda ``data`` junto con la generación actual de ``tags``.
+
+    ``since`` son generaciones leídas ANTES de calcular ``data``: si alguna
+    cambió mientras tanto (escritura concurrente) no se guarda nada, para no
+    fijar datos viejos con generaciones nuevas.
+    """
+    since = since or {}
+    tags = list(dict.fromkeys(tags))
+    versions = get_tag_versions([*tags, *since])
+    if any(versions[t] != v for t, v in since.items()):
+        logger.debug("[Cache][deps] %s no cacheada: escritura concurrente", key)
+        return False
+    cache.set(key, {"deps": {t: versions[t] for t in tags}, "data": data}, timeout)
+    return True
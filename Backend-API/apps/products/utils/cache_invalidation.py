@@ -1,19 +1,135 @@
-from .redis_access import delete_keys_by_pattern
+import hashlib
+import json
+import logging
+
+from django.core.cache import cache
+
+from .cache_tags import invalidate_tags
 from .cache_keys import (
     PRODUCT_LIST_CACHE_PREFIX,
     PRODUCT_DETAIL_CACHE_PREFIX,
     SUBPRODUCT_LIST_CACHE_PREFIX,
     SUBPRODUCT_DETAIL_CACHE_PREFIX,
     CATEGORY_LIST_CACHE_PREFIX,
+    PRODUCT_WRITE_CLOCK_TAG,
+    PRODUCT_LIST_FAMILY_REGISTRY_KEY,
+    product_entity_tag,
+    product_list_family_tag,
 )
 
+logger = logging.getLogger(__name__)
+
+# Máximo de combinaciones de filtros seguidas antes de reiniciar el registro
+MAX_PRODUCT_LIST_FAMILIES = 1000
+_REGISTRY_LOCK_KEY = f"{PRODUCT_LIST_FAMILY_REGISTRY_KEY}:lock"
+
+
 def invalidate_product_cache():
-    delete_keys_by_pattern(PRODUCT_LIST_CACHE_PREFIX)
-    delete_keys_by_pattern(PRODUCT_DETAIL_CACHE_PREFIX)
+    invalidate_tags(PRODUCT_LIST_CACHE_PREFIX, PRODUCT_DETAIL_CACHE_PREFIX)
 
 def invalidate_subproduct_cache():
-    delete_keys_by_pattern(SUBPRODUCT_LIST_CACHE_PREFIX)
-    delete_keys_by_pattern(SUBPRODUCT_DETAIL_CACHE_PREFIX)
+    invalidate_tags(SUBPRODUCT_LIST_CACHE_PREFIX, SUBPRODUCT_DETAIL_CACHE_PREFIX)
 
 def invalidate_category_cache():
-    delete_keys_by_pattern(CATEGORY_LIST_CACHE_PREFIX)
\ No newline at end of file
+    invalidate_tags(CATEGORY_LIST_CACHE_PREFIX)
+
+
+# ── Invalidación por entidad (product_detail:<id> + páginas que lo contienen) ──
+
+def product_list_signature(params) -> str:
+    """Firma estable de los filtros de un listado (sin paginación)."""
+    from apps.products.filters.product_filter import ProductFilter
+
+    clean = {
+        k: ("" if v is None else str(v))
+        for k, v in params.items()
+        if k not in ProductFilter.NON_PREDICATE_PARAMS
+    }
+    raw = json.dumps(clean, sort_keys=True, ensure_ascii=True)
+    return hashlib.md5(raw.encode("utf-8")).hexdigest()
+
+
+def register_product_list_family(params):
+    """
+    Registra la combinación de filtros de un listado para poder evaluar luego
+    su predicado cuando cambie un producto. Devuelve el tag de la familia, o
+    None si la página no debe cachearse (registro ocupado o recién reiniciado).
+    """
+    from apps.products.filters.product_filter import ProductFilter
+
+    signature = product_list_signature(params)
+    registry = cache.get(PRODUCT_LIST_FAMILY_REGISTRY_KEY)
+    if registry is not None and signature in registry:
+        return product_list_family_tag(signature)
+
+    if not cache.add(_REGISTRY_LOCK_KEY, 1, 5):
+        return None
+    try:
+        registry = cache.get(PRODUCT_LIST_FAMILY_REGISTRY_KEY)
+        fresh = registry is None or len(registry) >= MAX_PRODUCT_LIST_FAMILIES
+        if fresh:
+            # Las páginas cacheadas sin registro no podrían invalidarse por
+            # predicado: se descartan todas y se empieza un registro nuevo.
+            invalidate_tags(PRODUCT_LIST_CACHE_PREFIX)
+            registry = {}
+        registry[signature] = {
+            k: v for k, v in params.items() if k not in ProductFilter.NON_PREDICATE_PARAMS
+        }
+        cache.set(PRODUCT_LIST_FAMILY_REGISTRY_KEY, registry, None)
+    finally:
+        cache.delete(_REGISTRY_LOCK_KEY)
+    # Si se reinició, la clave de la página ya quedó con la generación vieja
+    return None if fresh else product_list_family_tag(signature)
+
+
+def product_cache_snapshot(product_id):
+    """Foto de los campos que usan los filtros del listado (1 query)."""
+    from django.db.models import Exists, OuterRef
+    from apps.products.models import Product, Subproduct
+
+    return (
+        Product.objects.filter(pk=product_id)
+        .annotate(has_subproducts_any=Exists(Subproduct.objects.filter(parent_id=OuterRef("pk"))))
+        .values("status", "code", "name", "category_id", "category__name", "has_subproducts_any")
+        .first()
+    )
+
+
+def normalize_product_snapshot(values):
+    if not values:
+        return None
+    return {
+        "status": values.get("status"),
+        "code": values.get("code"),
+        "name": values.get("name"),
+        "category_id": values.get("category_id"),
+        "category_name": values.get("category__name"),
+        "has_subproducts": values.get("has_subproducts_any"),
+    }
+
+
+def invalidate_product_entity_cache(product_id, before=None, after=None, membership_changed=False):
+    """
+    Invalida el detalle del producto y las páginas de listado que lo contienen.
+
+    Con ``membership_changed`` se evalúan además ``before``/``after`` (fotos
+    normalizadas o None si no existía / ya no existe) contra cada familia de
+    filtros registrada: las familias donde el producto entra o sale se
+    invalidan completas, porque cambia la composición de sus páginas.
+    """
+    invalidate_tags(product_entity_tag(product_id), PRODUCT_WRITE_CLOCK_TAG)
+    if not membership_changed:
+        return
+
+    from apps.products.filters.product_filter import ProductFilter
+
+    registry = cache.get(PRODUCT_LIST_FAMILY_REGISTRY_KEY) or {}
+    stale = []
+    for signature, params in registry.items():
+        was = ProductFilter.matches(params, before)
+        now = ProductFilter.matches(params, after)
+        if was is None or now is None or was != now:
+            stale.append(product_list_family_tag(signature))
+    if stale:
+        invalidate_tags(*stale)
+    logger.debug("[Cache] producto %s: %s familias de listado invalidadas", product_id, len(stale))
@@ -1,6 +1,9 @@
+import hashlib
 from urllib.parse import urlencode
 from typing import Any, List, Tuple
 
+from .cache_tags import versioned_prefix
+
 # Namespace y versionado lógico de tus claves
 CACHE_NS = "inventory"
 CACHE_LOGICAL_VERSION = "v2"
@@ -15,14 +18,18 @@ def _normalize_value(v: Any) -> str:
 def namespaced_prefix(prefix: str) -> str:
     return f"{CACHE_NS}:{CACHE_LOGICAL_VERSION}:{prefix}"
 
+def tagged_prefix(prefix: str) -> str:
+    # El prefijo lógico es también el tag de namespace (ver cache_tags)
+    return namespaced_prefix(versioned_prefix(prefix))
+
 def generate_cache_key(prefix: str, **params: Any) -> str:
-    nsprefix = namespaced_prefix(prefix)
+    nsprefix = tagged_prefix(prefix)
     items: List[Tuple[str, str]] = sorted((k, _normalize_value(v)) for k, v in params.items())
     query_string = urlencode(items)
     return f"{nsprefix}:{query_string}" if query_string else nsprefix
 
 def generate_detail_key(prefix: str, *ids: Any) -> str:
-    nsprefix = namespaced_prefix(prefix)
+    nsprefix = tagged_prefix(prefix)
     id_parts = ":".join(_normalize_value(i) for i in ids)
     return f"{nsprefix}:{id_parts}" if id_parts else nsprefix
 
@@ -35,7 +42,11 @@ CATEGORY_LIST_CACHE_PREFIX = "category_list"
 def product_list_cache_key(page=1, page_size=10, **filters):
     return generate_cache_key(PRODUCT_LIST_CACHE_PREFIX, page=page, page_size=page_size, **filters)
 
-def product_detail_cache_key(prod_pk):
+def product_detail_cache_key(prod_pk, fieldset=None):
+    # Cada selección de campos (?fields=/?expand=) es una variante propia
+    if fieldset is not None:
+        token = hashlib.md5(fieldset.cache_token.encode("utf-8")).hexdigest()
+        return generate_detail_key(PRODUCT_DETAIL_CACHE_PREFIX, prod_pk, token)
     return generate_detail_key(PRODUCT_DETAIL_CACHE_PREFIX, prod_pk)
 
 def subproduct_list_cache_key(page=1, page_size=10, **filters):
@@ -47,3 +58,13 @@ def subproduct_detail_cache_key(sub_pk):
 def category_list_cache_key():
     return generate_cache_key(CATEGORY_LIST_CACHE_PREFIX)
 
+
+# ── Tags de dependencias (invalidación por entidad) ──────────────
+PRODUCT_WRITE_CLOCK_TAG = "product_write_clock"
+PRODUCT_LIST_FAMILY_REGISTRY_KEY = namespaced_prefix("product_list_families")
+
+def product_entity_tag(prod_pk):
+    return f"product:{prod_pk}"
+
+def product_list_family_tag(signature):
+    return f"{PRODUCT_LIST_CACHE_PREFIX}:f:{signature}"
@@ -0,0 +1,140 @@
+# apps/products/utils/cache_tags.py
+"""
+Invalidación de cache por tags/generaciones.
+
+Cada entrada cacheada (claves propias y entradas de ``cache_page``) incorpora en
+su nombre la generación actual de uno o más tags. Invalidar un tag es un único
+``INCR`` O(1) sobre su contador: las claves viejas dejan de ser alcanzables y
+expiran solas por TTL, sin SCAN ni DELETE sobre todo el keyspace.
+"""
+import contextvars
+import logging
+import time
+from contextlib import contextmanager
+from functools import lru_cache, wraps
+from typing import Dict, Iterable
+
+from django.core.cache import cache
+from django.views.decorators.cache import cache_page
+
+logger = logging.getLogger(__name__)
+
+TAG_KEY_NS = "inventory:tag"
+
+# Tags pendientes mientras la invalidación está diferida (None = inmediata)
+_deferred: contextvars.ContextVar = contextvars.ContextVar("cache_tags_deferred", default=None)
+
+
+def _tag_key(tag: str) -> str:
+    return f"{TAG_KEY_NS}:{tag}"
+
+
+def _seed() -> int:
+    """
+    Generación inicial basada en el reloj (ms). Si Redis desaloja un contador,
+    la nueva semilla nunca coincide con una generación anterior y no se
+    resucitan entradas obsoletas.
+    """
+    return int(time.time() * 1000)
+
+
+def get_tag_versions(tags: Iterable[str]) -> Dict[str, int]:
+    """Devuelve {tag: generación} con un único get_many (inicializa faltantes)."""
+    tags = list(dict.fromkeys(tags))
+    keys = {_tag_key(t): t for t in tags}
+    try:
+        found = cache.get_many(list(keys)) or {}
+    except Exception as e:
+        logger.debug("[Cache][tags] get_many error: %s", e)
+        found = {}
+
+    versions: Dict[str, int] = {}
+    for key, tag in keys.items():
+        value = found.get(key)
+        if value is None:
+            seed = _seed()
+            try:
+                # add() es atómico: si otro proceso ya lo inicializó, lo respetamos
+                if not cache.add(key, seed, None):
+                    value = cache.get(key)
+            except Exception as e:
+                logger.debug("[Cache][tags] add error (%s): %s", tag, e)
+            value = value if value is not None else seed
+        versions[tag] = int(value)
+    return versions
+
+
+def get_tag_version(tag: str) -> int:
+    return get_tag_versions([tag])[tag]
+
+
+def invalidate_tags(*tags: str) -> None:
+    """Incrementa (O(1)) la generación de cada tag."""
+    pending = _deferred.get()
+    if pending is not None:
+        pending.update(tags)
+        return
+    for tag in dict.fromkeys(tags):
+        key = _tag_key(tag)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Contador inexistente: nueva semilla, distinta a cualquier previa
+            try:
+                cache.set(key, _seed(), None)
+            except Exception as e:
+                logger.debug("[Cache][tags] set error (%s): %s", tag, e)
+        except Exception as e:
+            logger.debug("[Cache][tags] incr error (%s): %s", tag, e)
+        logger.debug("[Cache][tags] tag '%s' invalidado", tag)
+
+
+@contextmanager
+def deferred_invalidation():
+    """
+    Junta las invalidaciones del bloque y las aplica una sola vez al salir
+    (cargas masivas: un INCR por tag en vez de uno por fila o lote).
+    """
+    if _deferred.get() is not None:
+        yield
+        return
+    pending = set()
+    token = _deferred.set(pending)
+    try:
+        yield
+    finally:
+        _deferred.reset(token)
+        invalidate_tags(*sorted(pending))
+
+
+def versioned_prefix(prefix: str, *tags: str) -> str:
+    """
+    Prefijo lógico + generaciones de sus tags, p.ej. 'product_list@g1712..'.
+    Sin tags explícitos, el propio prefijo actúa como tag de namespace.
+    """
+    tags = tags or (prefix,)
+    versions = get_tag_versions(tags)
+    gens = ".".join(str(versions[t]) for t in dict.fromkeys(tags))
+    return f"{prefix}@g{gens}"
+
+
+@lru_cache(maxsize=256)
+def _page_cached_view(view_func, timeout, key_prefix):
+    return cache_page(timeout, key_prefix=key_prefix)(view_func)
+
+
+def tagged_cache_page(timeout, *, key_prefix: str, tags: Iterable[str] = ()):
+    """
+    Equivalente a ``cache_page(timeout, key_prefix=...)`` pero con el key_prefix
+    versionado por tags, de modo que ``invalidate_tags(key_prefix)`` descarta
+    todas las páginas cacheadas de ese namespace.
+    """
+    tag_list = tuple(tags) or (key_prefix,)
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def _wrapped(request, *args, **kwargs):
+            prefix = versioned_prefix(key_prefix, *tag_list)
+            return _page_cached_view(view_func, timeout, prefix)(request, *args, **kwargs)
+        return _wrapped
+    return decorator
@@ -30,6 +30,9 @@ def delete_keys_by_pattern(prefix: str) -> int:
     Cubre tanto claves propias como las generadas por cache_page con key_prefix.
     IMPORTANTE: No incluir KEY_PREFIX ni version en el patrón; django-redis
     lo añade automáticamente cuando usa delete_pattern/scan_iter.
+
+    Recorre todo el keyspace (SCAN): para invalidar en el camino caliente usar
+    ``cache_tags.invalidate_tags``. Se conserva para limpiezas y benchmarks.
     """
     patterns = [
         f"*{prefix}*",
@@ -1,7 +1,5 @@
 import logging
 
-from django.conf import settings
-from django.core.cache import cache
 from django.shortcuts import get_object_or_404
 
 from drf_spectacular.utils import extend_schema
@@ -10,7 +8,8 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
-from apps.core.pagination import Pagination
+from apps.core.cache_aside import cached_response, list_cache_filters
+from apps.core.pagination import KeysetPagination
 from apps.core.utils import broadcast_crud_event
 from apps.purchases.api.repositories import PurchaseReceiptRepository
 from apps.purchases.api.serializers import PurchaseReceiptSerializer
@@ -22,42 +21,31 @@ from apps.purchases.docs.purchase_doc import (
     purchase_receipt_delete_doc,
 )
 from apps.purchases.utils.cache_invalidation import invalidate_purchase_receipt_cache
-from apps.purchases.utils.cache_keys import purchase_receipt_list_cache_key
+from apps.purchases.utils.cache_keys import (
+    PURCHASE_RECEIPT_LIST_CACHE_PREFIX,
+    purchase_receipt_list_cache_key,
+)
 
 logger = logging.getLogger(__name__)
 RECEIPT_LIST_TTL = 60 * 5
 
 
-def _cache_filters(request):
-    params = request.query_params.copy()
-    filters = {k: params.get(k) for k in params}
-    filters.setdefault("page", params.get("page", 1))
-    filters.setdefault("page_size", params.get("page_size", Pagination.page_size))
-    return filters
-
-
 @extend_schema(methods=["GET"], **purchase_receipt_list_doc)
 @extend_schema(methods=["POST"], **purchase_receipt_create_doc)
 @api_view(["GET", "POST"])
 @permission_classes([IsAuthenticated])
 def purchase_receipt_list_create_view(request):
     if request.method == "GET":
-        filters = _cache_filters(request)
-        cache_key = purchase_receipt_list_cache_key(**filters)
-        use_cache = not settings.DEBUG
-        if use_cache:
-            cached = cache.get(cache_key)
-            if cached is not None:
-                return Response(cached)
+        def build():
+            qs = PurchaseReceiptRepository.list_receipts(search=request.query_params.get("search"))
+            paginator = KeysetPagination()
+            page = paginator.paginate_queryset(qs, request)
+            serializer = PurchaseReceiptSerializer(page, many=True)
+            return paginator.get_paginated_response(serializer.data)
 
-        qs = PurchaseReceiptRepository.list_receipts(search=request.query_params.get("search"))
-        paginator = Pagination()
-        page = paginator.paginate_queryset(qs, request)
-        serializer = PurchaseReceiptSerializer(page, many=True)
-        response = paginator.get_paginated_response(serializer.data)
-        if use_cache:
-            cache.set(cache_key, response.data, RECEIPT_LIST_TTL)
-        return response
+        filters = list_cache_filters(request)
+        cache_key = purchase_receipt_list_cache_key(**filters)
+        return cached_response(cache_key, build, RECEIPT_LIST_TTL, prefix=PURCHASE_RECEIPT_LIST_CACHE_PREFIX)
 
     serializer = PurchaseReceiptSerializer(data=request.data)
     serializer.is_valid(raise_exception=True)
@@ -54,6 +54,7 @@ class PurchaseOrder(BaseModel):
         verbose_name = "Orden de compra"
         verbose_name_plural = "Ordenes de compra"
         ordering = ["-order_date", "-id"]
+        indexes = [models.Index(fields=["-created_at", "-id"], name="purchaseorder_keyset_idx")]
 
     def __str__(self) -> str:
         return f"OC-{self.id or 'new'} {self.supplier.name}"
@@ -25,6 +25,7 @@ class PurchasePayment(BaseModel):
         verbose_name = "Pago a proveedor"
         verbose_name_plural = "Pagos a proveedores"
         ordering = ["-payment_date", "-id"]
+        indexes = [models.Index(fields=["-created_at", "-id"], name="purchasepayment_keyset_idx")]
 
     def __str__(self) -> str:
         return f"Pago {self.id or '-'}"
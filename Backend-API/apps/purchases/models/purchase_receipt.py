@@ -37,6 +37,7 @@ class PurchaseReceipt(BaseModel):
         verbose_name = "Recepción de compra"
         verbose_name_plural = "Recepciones de compra"
         ordering = ["-receipt_date", "-id"]
+        indexes = [models.Index(fields=["-created_at", "-id"], name="purchasereceipt_keyset_idx")]
 
     def __str__(self) -> str:
         return f"Recep {self.id or '-'}"
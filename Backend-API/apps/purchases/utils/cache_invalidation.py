@@ -1,4 +1,4 @@
-from apps.products.utils.redis_access import delete_keys_by_pattern
+from apps.products.utils.cache_tags import invalidate_tags
 from .cache_keys import (
     PURCHASE_ORDER_LIST_CACHE_PREFIX,
     PURCHASE_RECEIPT_LIST_CACHE_PREFIX,
@@ -7,12 +7,12 @@ from .cache_keys import (
 
 
 def invalidate_purchase_order_cache():
-    delete_keys_by_pattern(PURCHASE_ORDER_LIST_CACHE_PREFIX)
+    invalidate_tags(PURCHASE_ORDER_LIST_CACHE_PREFIX)
 
 
 def invalidate_purchase_receipt_cache():
-    delete_keys_by_pattern(PURCHASE_RECEIPT_LIST_CACHE_PREFIX)
+    invalidate_tags(PURCHASE_RECEIPT_LIST_CACHE_PREFIX)
 
 
 def invalidate_purchase_payment_cache():
-    delete_keys_by_pattern(PURCHASE_PAYMENT_LIST_CACHE_PREFIX)
+    invalidate_tags(PURCHASE_PAYMENT_LIST_CACHE_PREFIX)
@@ -54,6 +54,7 @@ class SalesInvoice(BaseModel):
         verbose_name = "Factura de venta"
         verbose_name_plural = "Facturas de venta"
         ordering = ["-issue_date", "-id"]
+        indexes = [models.Index(fields=["-created_at", "-id"], name="salesinvoice_keyset_idx")]
 
     def __str__(self) -> str:
         return f"Factura {self.invoice_type}-{self.point_of_sale}-{self.invoice_number}"
@@ -35,6 +35,7 @@ class SalesOrder(BaseModel):
         verbose_name = "Pedido de venta"
         verbose_name_plural = "Pedidos de venta"
         ordering = ["-order_date", "-id"]
+        indexes = [models.Index(fields=["-created_at", "-id"], name="salesorder_keyset_idx")]
 
     def __str__(self) -> str:
         return f"SO-{self.id or 'new'} ({self.customer_legacy_id})"
@@ -38,6 +38,7 @@ class SalesShipment(BaseModel):
         verbose_name = "Remito de venta"
         verbose_name_plural = "Remitos de venta"
         ordering = ["-shipment_date", "-id"]
+        indexes = [models.Index(fields=["-created_at", "-id"], name="salesshipment_keyset_idx")]
 
     def __str__(self) -> str:
         return f"Remito {self.id or '-'}"
@@ -1,4 +1,4 @@
-from apps.products.utils.redis_access import delete_keys_by_pattern
+from apps.products.utils.cache_tags import invalidate_tags
 from .cache_keys import (
     SALES_ORDER_LIST_CACHE_PREFIX,
     SALES_SHIPMENT_LIST_CACHE_PREFIX,
@@ -7,12 +7,12 @@ from .cache_keys import (
 
 
 def invalidate_sales_order_cache():
-    delete_keys_by_pattern(SALES_ORDER_LIST_CACHE_PREFIX)
+    invalidate_tags(SALES_ORDER_LIST_CACHE_PREFIX)
 
 
 def invalidate_sales_shipment_cache():
-    delete_keys_by_pattern(SALES_SHIPMENT_LIST_CACHE_PREFIX)
+    invalidate_tags(SALES_SHIPMENT_LIST_CACHE_PREFIX)
 
 
 def invalidate_sales_invoice_cache():
-    delete_keys_by_pattern(SALES_INVOICE_LIST_CACHE_PREFIX)
+    invalidate_tags(SALES_INVOICE_LIST_CACHE_PREFIX)
@@ -19,3 +19,32 @@ class StockAdjustInputSerializer(serializers.Serializer):
         if et == "egreso_ajuste" and qty > 0:
             attrs["quantity_change"] = -qty
         return attrs
+
+
+MAX_BULK_MOVEMENTS = 1000
+
+
+class StockMovementInputSerializer(serializers.Serializer):
+    product_id = serializers.IntegerField(required=False, allow_null=True)
+    subproduct_id = serializers.IntegerField(required=False, allow_null=True)
+    event_type = serializers.ChoiceField(choices=[
+        "ingreso", "egreso_venta", "egreso_corte", "egreso_ajuste", "ingreso_ajuste",
+        "traslado_salida", "traslado_entrada",
+    ])
+    quantity_change = serializers.DecimalField(max_digits=18, decimal_places=2)
+    notes = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+
+    def validate(self, attrs):
+        if (attrs.get("product_id") is None) == (attrs.get("subproduct_id") is None):
+            raise serializers.ValidationError("Indique SOLO product_id o SOLO subproduct_id.")
+        qty = attrs["quantity_change"]
+        if qty == 0:
+            raise serializers.ValidationError("quantity_change no puede ser 0")
+        # Normaliza el signo según el tipo (ingreso*/traslado_entrada suman, el resto resta)
+        incoming = attrs["event_type"].startswith("ingreso") or attrs["event_type"] == "traslado_entrada"
+        attrs["quantity_change"] = abs(qty) if incoming else -abs(qty)
+        return attrs
+
+
+class BulkStockMovementInputSerializer(serializers.Serializer):
+    movements = StockMovementInputSerializer(many=True, allow_empty=False, max_length=MAX_BULK_MOVEMENTS)
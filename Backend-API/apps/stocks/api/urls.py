@@ -14,6 +14,7 @@ from apps.stocks.api.views.stock_event_subproduct_view import (
 from apps.stocks.api.views.stock_adjust_views import (
     subproduct_stock_adjust,
     product_stock_adjust,
+    stock_movements_bulk,
 )
 
 urlpatterns = [
@@ -57,4 +58,10 @@ urlpatterns = [
         product_stock_adjust,
         name="product_stock_adjust",
     ),
+    # Movimientos masivos (recepción de compras, lotes de corte, etc.)
+    path(
+        "movements/bulk/",
+        stock_movements_bulk,
+        name="stock_movements_bulk",
+    ),
 ]
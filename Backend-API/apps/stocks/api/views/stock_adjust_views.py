@@ -4,16 +4,25 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
 from rest_framework import status
+from django.core.exceptions import ValidationError
 from django.shortcuts import get_object_or_404
 
 from apps.stocks.models import SubproductStock, ProductStock, StockEvent
 from apps.stocks.api.serializers.stock_event_serializer import StockEventSerializer
-from apps.stocks.api.serializers.stock_adjust_serializer import StockAdjustInputSerializer
-from apps.stocks.services import adjust_subproduct_stock, adjust_product_stock
+from apps.stocks.api.serializers.stock_adjust_serializer import (
+    StockAdjustInputSerializer,
+    BulkStockMovementInputSerializer,
+)
+from apps.stocks.services import (
+    adjust_subproduct_stock,
+    adjust_product_stock,
+    apply_stock_movements,
+    StockMovement,
+)
 from apps.products.api.serializers.product_serializer import ProductSerializer
 from apps.products.api.serializers.subproduct_serializer import SubProductSerializer
 from apps.products.utils.cache_invalidation import (
-    invalidate_product_cache,
+    invalidate_product_entity_cache,
     invalidate_subproduct_cache,
 )
 
@@ -88,7 +97,7 @@ def subproduct_stock_adjust(request, subproduct_id: int):
         subp = stock.subproduct  # relacionado por FK
         invalidate_subproduct_cache()
         if subp and getattr(subp, "parent_id", None):
-            invalidate_product_cache()
+            invalidate_product_entity_cache(subp.parent_id)
         # Broadcast del Subproduct actualizado
         subp_ser = SubProductSerializer(subp, context={"request": request, "parent_product": getattr(subp, "parent", None)}).data
         broadcast_crud_event(
@@ -99,6 +108,7 @@ def subproduct_stock_adjust(request, subproduct_id: int):
         )
         # Broadcast del Product padre actualizado
         if getattr(subp, "parent", None):
+            subp.parent.refresh_from_db(fields=subp.parent.MATERIALIZED_FIELDS)
             prod_ser = ProductSerializer(subp.parent, context={"request": request}).data
             broadcast_crud_event(
                 event_type="update",
@@ -159,7 +169,8 @@ def product_stock_adjust(request, product_id: int):
     # Además, invalidar caches y emitir update del producto para refrescar stock en UI
     try:
         prod = stock.product
-        invalidate_product_cache()
+        invalidate_product_entity_cache(prod.pk)
+        prod.refresh_from_db(fields=prod.MATERIALIZED_FIELDS)
         prod_ser = ProductSerializer(prod, context={"request": request}).data
         broadcast_crud_event(
             event_type="update",
@@ -170,3 +181,36 @@ def product_stock_adjust(request, product_id: int):
     except Exception:
         pass
     return Response(out.data, status=status.HTTP_201_CREATED)
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated, IsAdminUser])  # solo staff
+def stock_movements_bulk(request):
+    """
+    Aplica N movimientos de stock en una única transacción (todo o nada).
+    Espera: { movements: [{ product_id|subproduct_id, event_type, quantity_change, notes? }, ...] }
+    Errores de dominio: 400 con { errors: { <índice>: [mensaje] } }.
+    """
+    ser_in = BulkStockMovementInputSerializer(data=request.data)
+    ser_in.is_valid(raise_exception=True)
+
+    movements = [StockMovement(**mv) for mv in ser_in.validated_data["movements"]]
+    try:
+        events = apply_stock_movements(movements, user=request.user)
+    except ValidationError as e:
+        detail = e.message_dict if hasattr(e, "error_dict") else {"detail": e.messages}
+        return Response({"errors": detail}, status=status.HTTP_400_BAD_REQUEST)
+
+    out = StockEventSerializer(events, many=True, context={"request": request}).data
+    # Un único aviso WebSocket por lote (los caches se invalidan en el servicio)
+    broadcast_crud_event(
+        event_type="bulk_create",
+        app="stocks",
+        model="StockEvent",
+        data={
+            "count": len(events),
+            "product_ids": sorted({mv.product_id for mv in movements if mv.product_id}),
+            "subproduct_ids": sorted({mv.subproduct_id for mv in movements if mv.subproduct_id}),
+        },
+    )
+    return Response({"count": len(events), "events": out}, status=status.HTTP_201_CREATED)
@@ -6,7 +6,8 @@ from drf_spectacular.utils import extend_schema
 from django.shortcuts import get_object_or_404
 from django.utils.dateparse import parse_datetime
 
-from apps.core.pagination import Pagination
+from apps.core.db_routing import primary_reads, replica_reads
+from apps.core.pagination import KeysetPagination
 from apps.stocks.api.serializers.stock_event_serializer import StockEventSerializer
 from apps.stocks.api.repositories.stock_product_repository import StockProductRepository
 from apps.products.models.product_model import Product
@@ -24,7 +25,7 @@ from drf_spectacular.utils import extend_schema
 from django.shortcuts import get_object_or_404
 from django.utils.dateparse import parse_datetime
 
-from apps.core.pagination import Pagination
+from apps.core.pagination import KeysetPagination
 from apps.stocks.api.serializers.stock_event_serializer import StockEventSerializer
 from apps.stocks.api.repositories.stock_product_repository import StockProductRepository
 from apps.products.models.product_model import Product
@@ -42,6 +43,7 @@ from apps.stocks.utils.cache_utils import cache_get, cache_set, key_prod_events,
 )
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@replica_reads
 def product_stock_event_history(request, pk):
     # ⚠️ Permitir ver historial aunque el producto esté inactivo
     product = get_object_or_404(Product, pk=pk)
@@ -66,6 +68,10 @@ def product_stock_event_history(request, pk):
         "event_type": request.query_params.get('event_type'),
         "direction": (request.query_params.get('direction') or '').strip().lower(),
         "page": request.query_params.get('page') or "1",
+        "cursor": request.query_params.get('cursor'),
+        "pagination": request.query_params.get('pagination'),
+        "count": request.query_params.get('count'),
+        "page_size": request.query_params.get('page_size'),
     }
     cache_key = key_prod_events(product.id, params)
     cached = cache_get(cache_key)
@@ -91,10 +97,12 @@ def product_stock_event_history(request, pk):
     elif direction == 'egreso':
         qs = qs.filter(quantity_change__lt=0)
 
-    paginator = Pagination()
-    page = paginator.paginate_queryset(qs, request)
-    ser = StockEventSerializer(page, many=True, context={'request': request})
-    resp = paginator.get_paginated_response(ser.data)
+    # Va a una cache compartida: se evalúa contra el primario, no la réplica
+    with primary_reads():
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(qs, request)
+        ser = StockEventSerializer(page, many=True, context={'request': request})
+        resp = paginator.get_paginated_response(ser.data)
 
     cache_set(cache_key, resp.data, index_key=None)  # indexado interno en cache_utils
     return resp
@@ -108,6 +116,7 @@ def product_stock_event_history(request, pk):
 )
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@replica_reads
 def product_subproducts_stock_event_history(request, product_pk):
     # ⚠️ Permitir ver historial aunque el producto esté inactivo
     product = get_object_or_404(Product, pk=product_pk)
@@ -118,6 +127,10 @@ def product_subproducts_stock_event_history(request, product_pk):
         "event_type": request.query_params.get('event_type'),
         "direction": (request.query_params.get('direction') or '').strip().lower(),
         "page": request.query_params.get('page') or "1",
+        "cursor": request.query_params.get('cursor'),
+        "pagination": request.query_params.get('pagination'),
+        "count": request.query_params.get('count'),
+        "page_size": request.query_params.get('page_size'),
         "_agg": "sub",  # marca para distinguir cache
     }
 
@@ -147,10 +160,12 @@ def product_subproducts_stock_event_history(request, product_pk):
     elif direction == 'egreso':
         qs = qs.filter(quantity_change__lt=0)
 
-    paginator = Pagination()
-    page = paginator.paginate_queryset(qs, request)
-    ser = StockEventSerializer(page, many=True, context={'request': request})
-    resp = paginator.get_paginated_response(ser.data)
+    # Va a una cache compartida: se evalúa contra el primario, no la réplica
+    with primary_reads():
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(qs, request)
+        ser = StockEventSerializer(page, many=True, context={'request': request})
+        resp = paginator.get_paginated_response(ser.data)
 
     cache_set(cache_key, resp.data, index_key=None)
     return resp
@@ -6,7 +6,8 @@ from drf_spectacular.utils import extend_schema
 from django.shortcuts import get_object_or_404
 from django.utils.dateparse import parse_datetime
 
-from apps.core.pagination import Pagination
+from apps.core.db_routing import primary_reads, replica_reads
+from apps.core.pagination import KeysetPagination
 from apps.stocks.api.serializers.stock_event_serializer import StockEventSerializer
 from apps.stocks.models.stock_event_model import StockEvent
 from apps.products.models.subproduct_model import Subproduct
@@ -22,6 +23,7 @@ from apps.stocks.utils.cache_utils import cache_get, cache_set, key_sub_events,
 )
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@replica_reads
 def subproduct_stock_event_history(request, product_pk, subproduct_pk):
     # ⚠️ Permitir ver historial aunque el Subproduct esté inactivo
     subproduct = get_object_or_404(Subproduct, pk=subproduct_pk, parent_id=product_pk)
@@ -32,6 +34,10 @@ def subproduct_stock_event_history(request, product_pk, subproduct_pk):
         "event_type": request.query_params.get('event_type'),
         "direction": (request.query_params.get('direction') or '').strip().lower(),
         "page": request.query_params.get('page') or "1",
+        "cursor": request.query_params.get('cursor'),
+        "pagination": request.query_params.get('pagination'),
+        "count": request.query_params.get('count'),
+        "page_size": request.query_params.get('page_size'),
     }
     cache_key = key_sub_events(subproduct.id, params)
     cached = cache_get(cache_key)
@@ -57,10 +63,12 @@ def subproduct_stock_event_history(request, product_pk, subproduct_pk):
     elif direction == 'egreso':
         qs = qs.filter(quantity_change__lt=0)
 
-    paginator = Pagination()
-    page = paginator.paginate_queryset(qs, request)
-    ser = StockEventSerializer(page, many=True, context={'request': request})
-    resp = paginator.get_paginated_response(ser.data)
+    # Va a una cache compartida: se evalúa contra el primario, no la réplica
+    with primary_reads():
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(qs, request)
+        ser = StockEventSerializer(page, many=True, context={'request': request})
+        resp = paginator.get_paginated_response(ser.data)
 
     cache_set(cache_key, resp.data, index_key=None)
     return resp
@@ -73,6 +81,7 @@ def subproduct_stock_event_history(request, product_pk, subproduct_pk):
 )
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@replica_reads
 def subproduct_stock_event_history_by_id(request, subproduct_pk):
     # ⚠️ Permitir ver historial aunque el Subproduct esté inactivo
     subproduct = get_object_or_404(Subproduct, pk=subproduct_pk)
@@ -83,6 +92,10 @@ def subproduct_stock_event_history_by_id(request, subproduct_pk):
         "event_type": request.query_params.get('event_type'),
         "direction": (request.query_params.get('direction') or '').strip().lower(),
         "page": request.query_params.get('page') or "1",
+        "cursor": request.query_params.get('cursor'),
+        "pagination": request.query_params.get('pagination'),
+        "count": request.query_params.get('count'),
+        "page_size": request.query_params.get('page_size'),
     }
     cache_key = key_sub_events(subproduct.id, params)
     cached = cache_get(cache_key)
@@ -108,10 +121,12 @@ def subproduct_stock_event_history_by_id(request, subproduct_pk):
     elif direction == 'egreso':
         qs = qs.filter(quantity_change__lt=0)
 
-    paginator = Pagination()
-    page = paginator.paginate_queryset(qs, request)
-    ser = StockEventSerializer(page, many=True, context={'request': request})
-    resp = paginator.get_paginated_response(ser.data)
+    # Va a una cache compartida: se evalúa contra el primario, no la réplica
+    with primary_reads():
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(qs, request)
+        ser = StockEventSerializer(page, many=True, context={'request': request})
+        resp = paginator.get_paginated_response(ser.data)
 
     cache_set(cache_key, resp.data, index_key=None)
     return resp
@@ -1,5 +1,19 @@
 # apps/stocks/apps.py
 from django.apps import AppConfig
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models.signals import post_migrate
+
+
+def _backfill_stock_aggregates(sender, using=DEFAULT_DB_ALIAS, **kwargs):
+    if using != DEFAULT_DB_ALIAS:
+        return
+    from apps.stocks.services.materialized import backfill_materialized_stock
+    from apps.stocks.services.reservations import backfill_subproduct_reservations
+    # Las órdenes de corte que ya existían no tienen fila en SubproductReservation
+    backfill_subproduct_reservations()
+    # Ni los productos existentes current_stock / reserved_stock
+    backfill_materialized_stock()
+
 
 class StocksConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
@@ -7,3 +21,4 @@ class StocksConfig(AppConfig):
 
     def ready(self):
         import apps.stocks.signals  # noqa: F401
+        post_migrate.connect(_backfill_stock_aggregates, sender=self)
@@ -0,0 +1,130 @@
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Sum
+
+from apps.products.models.product_model import Product
+from apps.products.services.catalog_facets import refresh_product_facets
+from apps.stocks.models import StockEvent, SubproductReservation
+from apps.stocks.services.materialized import compute_current_stock, compute_reserved_stock
+from apps.stocks.services.reservations import active_reservation_items, refresh_subproduct_reservations
+
+ZERO = Decimal("0.00")
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara Product.current_stock / reserved_stock y SubproductReservation "
+        "contra las filas de stock, los ítems de corte activos y el log de "
+        "StockEvent. Con --fix reescribe los valores desviados."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--product', type=int, action='append', dest='product_ids',
+                            help='Limitar a un producto (repetible)')
+        parser.add_argument('--fix', action='store_true',
+                            help='Corrige current_stock/reserved_stock desviados')
+
+    def handle(self, *args, **options):
+        ids = options['product_ids']
+        products = Product.objects.all()
+        if ids:
+            products = products.filter(pk__in=ids)
+        ledger_drift = self._check_reservation_ledger(ids)
+        if ledger_drift and options['fix']:
+            refresh_subproduct_reservations(ledger_drift)
+            self.stdout.write(self.style.SUCCESS(f"✓ {len(ledger_drift)} reservas de subproductos recalculadas"))
+
+        materialized = {
+            pk: (cur, rsv)
+            for pk, cur, rsv in products.values_list('pk', 'current_stock', 'reserved_stock')
+        }
+
+        stock_rows = compute_current_stock(ids)
+        reserved = compute_reserved_stock(ids)
+        ledger = self._event_log_totals(ids)
+
+        drift = []
+        ledger_gaps = 0
+        for pk, (cur, rsv) in materialized.items():
+            expected_cur = stock_rows.get(pk) or ZERO
+            expected_rsv = reserved.get(pk) or ZERO
+            from_events = ledger.get(pk) or ZERO
+            if cur != expected_cur or rsv != expected_rsv:
+                drift.append((pk, expected_cur, expected_rsv))
+                self.stdout.write(self.style.WARNING(
+                    f"Producto {pk}: current_stock={cur} (filas {expected_cur}), "
+                    f"reserved_stock={rsv} (reservas {expected_rsv})"
+                ))
+            if from_events != expected_cur:
+                # Los egresos que dejaron stock negativo se truncan a 0 al aplicarse
+                ledger_gaps += 1
+                self.stdout.write(
+                    f"Producto {pk}: stock en filas {expected_cur} ≠ suma de eventos {from_events}"
+                )
+
+        if drift and options['fix']:
+            with transaction.atomic():
+                for pk, cur, rsv in drift:
+                    Product.objects.filter(pk=pk).update(current_stock=cur, reserved_stock=rsv)
+                refresh_product_facets(pk for pk, _, _ in drift)
+            self.stdout.write(self.style.SUCCESS(f"✓ {len(drift)} productos corregidos"))
+
+        summary = (
+            f"{len(materialized)} productos revisados, {len(drift)} con columnas desviadas, "
+            f"{ledger_gaps} con diferencias contra el log de eventos, "
+            f"{len(ledger_drift)} reservas de subproductos desviadas"
+        )
+        style = self.style.SUCCESS if not (drift or ledger_gaps or ledger_drift) else self.style.WARNING
+        self.stdout.write(style(summary))
+
+    def _event_log_totals(self, ids):
+        """Stock esperado por producto según la suma de StockEvent (2 queries)."""
+        events = StockEvent.objects.filter(status=True)
+        own = events.filter(product_stock__status=True, product_stock__product__has_subproducts=False)
+        subs = events.filter(
+            subproduct_stock__status=True, subproduct_stock__subproduct__status=True
+        )
+        if ids:
+            own = own.filter(product_stock__product_id__in=ids)
+            subs = subs.filter(subproduct_stock__subproduct__parent_id__in=ids)
+
+        totals = dict(
+            own.values('product_stock__product_id').annotate(total=Sum('quantity_change'))
+            .values_list('product_stock__product_id', 'total')
+        )
+        totals.update(
+            subs.values('subproduct_stock__subproduct__parent_id').annotate(total=Sum('quantity_change'))
+            .values_list('subproduct_stock__subproduct__parent_id', 'total')
+        )
+        return totals
+
+    def _check_reservation_ledger(self, ids):
+        """Subproductos cuyo SubproductReservation no coincide con los ítems activos."""
+        live_qs = active_reservation_items()
+        ledger_qs = SubproductReservation.objects.all()
+        if ids:
+            live_qs = live_qs.filter(subproduct__parent_id__in=ids)
+            ledger_qs = ledger_qs.filter(subproduct__parent_id__in=ids)
+
+        live = {
+            r['subproduct_id']: (r['total'], r['orders'])
+            for r in live_qs.values('subproduct_id')
+            .annotate(total=Sum('cutting_quantity'), orders=Count('order_id', distinct=True))
+        }
+        stored = {
+            pk: (qty, orders)
+            for pk, qty, orders in ledger_qs.values_list('pk', 'reserved_quantity', 'active_orders')
+        }
+        drifted = []
+        for sid in sorted(set(live) | set(stored)):
+            expected = live.get(sid, (ZERO, 0))
+            current = stored.get(sid, (ZERO, 0))
+            if expected != current:
+                drifted.append(sid)
+                self.stdout.write(self.style.WARNING(
+                    f"Subproducto {sid}: reservado={current[0]} en {current[1]} órdenes "
+                    f"(ítems activos {expected[0]} en {expected[1]})"
+                ))
+        return drifted
@@ -3,6 +3,7 @@ from .stock_subproduct_model import SubproductStock
 from .stock_event_model import StockEvent
 from .adjustment_models import StockAdjustment, StockAdjustmentItem
 from .history_models import ProductStockHistory, SupplierCostHistory
+from .reservation_model import SubproductReservation
 
 __all__ = [
 	"ProductStock",
@@ -12,4 +13,5 @@ __all__ = [
 	"StockAdjustmentItem",
 	"ProductStockHistory",
 	"SupplierCostHistory",
+	"SubproductReservation",
 ]
@@ -0,0 +1,41 @@
+# apps/stocks/models/reservation_model.py
+from decimal import Decimal
+from django.db import models
+from apps.products.models.subproduct_model import Subproduct
+
+
+class SubproductReservation(models.Model):
+    """
+    Agregado de reservas lógicas por subproducto (órdenes de corte activas).
+
+    Lo mantiene ``apps.stocks.services.reservations.refresh_subproduct_reservations``
+    cada vez que cambia un ítem de corte, una orden o el estado del pedido, de
+    modo que la disponibilidad se resuelve con una lectura por PK en lugar de
+    un SUM sobre CuttingOrderItem ⋈ CuttingOrder ⋈ CustomerOrder.
+    """
+    subproduct = models.OneToOneField(
+        Subproduct,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='reservation',
+        verbose_name="Subproducto",
+    )
+    reserved_quantity = models.DecimalField(
+        max_digits=15,
+        decimal_places=2,
+        default=Decimal('0.00'),
+        verbose_name="Cantidad reservada",
+    )
+    active_orders = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Órdenes activas",
+        help_text="Órdenes de corte activas que reservan este subproducto.",
+    )
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Actualizado")
+
+    class Meta:
+        verbose_name = "Reserva de Subproducto"
+        verbose_name_plural = "Reservas de Subproductos"
+
+    def __str__(self):
+        return f"Reservas de {self.subproduct_id}: {self.reserved_quantity} ({self.active_orders} órdenes)"
@@ -59,6 +59,11 @@ class StockEvent(BaseModel):
                 ),
             ),
         ]
+        indexes = [
+            # Historial paginado por cursor (created_at, id) de cada stock
+            models.Index(fields=["product_stock", "-created_at", "-id"], name="stockevent_ps_keyset_idx"),
+            models.Index(fields=["subproduct_stock", "-created_at", "-id"], name="stockevent_ss_keyset_idx"),
+        ]
 
     def __str__(self):
         target = self.product_stock or self.subproduct_stock or "Stock Desconocido"
@@ -74,17 +79,27 @@ class StockEvent(BaseModel):
             raise ValidationError("La cantidad de cambio no puede ser cero.")
 
     def apply_to_target(self):
-        """Aplica quantity_change al target correspondiente y sincroniza status."""
+        """
+        Aplica quantity_change al target correspondiente, sincroniza status y
+        mantiene Product.current_stock en la misma transacción.
+        """
+        from apps.stocks.services.materialized import (
+            set_product_current_stock, shift_product_current_stock,
+        )
+
         if self.product_stock:
             ps = self.product_stock
             ps.quantity = (ps.quantity or Decimal('0')) + self.quantity_change
             if ps.quantity < 0:
                 ps.quantity = Decimal('0')
             ps.save(update_fields=['quantity', 'modified_at', 'modified_by'])
+            if ps.status:
+                set_product_current_stock(ps.product_id, ps.quantity)
             return
 
         ss: SubproductStock = self.subproduct_stock
-        ss.quantity = (ss.quantity or Decimal('0')) + self.quantity_change
+        old_qty = ss.quantity or Decimal('0')
+        ss.quantity = old_qty + self.quantity_change
         if ss.quantity < 0:
             ss.quantity = Decimal('0')
         ss.save(update_fields=['quantity', 'modified_at', 'modified_by'])
@@ -93,12 +108,17 @@ class StockEvent(BaseModel):
         import logging
         logger = logging.getLogger(__name__)
         sp = ss.subproduct
+        old_contribution = old_qty if sp.status else Decimal('0')
         new_status = ss.quantity > 0
         if sp.status != new_status:
             sp.status = new_status
             sp.save(update_fields=['status', 'modified_at', 'modified_by'])
             logger.debug(f"StockEvent.apply_to_target: Subproduct {sp.pk} -> status={new_status} by qty={ss.quantity}")
 
+        # Sólo stock activo de subproductos activos suma al padre
+        if ss.status:
+            shift_product_current_stock(sp.parent_id, ss.quantity - old_contribution)
+
     def save(self, *args, **kwargs):
         # Aplica el cambio SOLO al crear el evento (evita re-aplicar en updates)
         is_create = self.pk is None
@@ -8,6 +8,7 @@ from .subproduct_stock import (
     adjust_subproduct_stock,
     dispatch_subproduct_stock_for_cut,
 )
+from .bulk_movements import StockMovement, apply_stock_movements
 
 __all__ = [
     "ensure_subproduct_status_from_stock",
@@ -15,4 +16,5 @@ __all__ = [
     "check_subproduct_stock",
     "initialize_product_stock", "adjust_product_stock",
     "initialize_subproduct_stock", "adjust_subproduct_stock", "dispatch_subproduct_stock_for_cut",
+    "StockMovement", "apply_stock_movements",
 ]
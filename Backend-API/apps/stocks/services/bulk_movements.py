@@ -0,0 +1,222 @@
+# apps/stocks/services/bulk_movements.py
+"""
+Aplicación masiva de movimientos de stock en una sola transacción.
+
+Reemplaza N llamadas a adjust_*/dispatch_* (cada una con su select_for_update,
+su SUM de reservas, su evento y su resincronización del padre) por un número
+constante de queries:
+- un SELECT ... FOR UPDATE por tabla de stock, en orden de pk (sin deadlocks
+  entre lotes concurrentes que toquen las mismas filas),
+- una lectura por PK del agregado de reservas (SubproductReservation),
+- bulk_create de los StockEvent y bulk_update de las cantidades,
+- una resincronización por producto padre afectado.
+"""
+from collections import OrderedDict
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Case, DecimalField, Value, When
+from django.utils import timezone
+
+from apps.products.models.product_model import Product
+from apps.products.models.subproduct_model import Subproduct
+from apps.products.services.catalog_facets import schedule_product_facets, schedule_subproduct_facets
+from apps.stocks.models import ProductStock, StockEvent, SubproductStock
+from apps.stocks.services.common import decimal_or_zero
+from apps.stocks.services.reservations import reservations_for
+from apps.stocks.services.sync import sync_parent_product_stock
+from apps.stocks.utils.cache_utils import invalidate_product_events, invalidate_subproduct_events
+
+EVENT_TYPE_CODES = {code for code, _ in StockEvent.EVENT_TYPES}
+
+
+@dataclass(frozen=True)
+class StockMovement:
+    """Un movimiento a aplicar sobre el stock de un producto o un subproducto."""
+    quantity_change: Decimal
+    event_type: str
+    product_id: Optional[int] = None
+    subproduct_id: Optional[int] = None
+    notes: str = ""
+
+
+def _validate_shape(movements: List[StockMovement]) -> None:
+    errors = {}
+    for idx, mv in enumerate(movements):
+        if (mv.product_id is None) == (mv.subproduct_id is None):
+            errors[idx] = "Indique SOLO product_id o SOLO subproduct_id."
+        elif mv.event_type not in EVENT_TYPE_CODES:
+            errors[idx] = f"Tipo de evento inválido: {mv.event_type}."
+        elif decimal_or_zero(mv.quantity_change) == 0:
+            errors[idx] = "La cantidad de cambio no puede ser cero."
+    if errors:
+        raise ValidationError(errors)
+
+
+def _lock_product_stocks(product_ids) -> Dict[int, ProductStock]:
+    if not product_ids:
+        return {}
+    rows = (
+        ProductStock.objects.select_for_update(of=("self",))
+        .select_related("product")
+        .filter(product_id__in=product_ids, status=True)
+        .order_by("pk")
+    )
+    return {ps.product_id: ps for ps in rows}
+
+
+def _lock_subproduct_stocks(subproduct_ids) -> Dict[int, SubproductStock]:
+    if not subproduct_ids:
+        return {}
+    rows = (
+        SubproductStock.objects.select_for_update(of=("self",))
+        .select_related("subproduct")
+        .filter(subproduct_id__in=subproduct_ids, status=True)
+        .order_by("pk")
+    )
+    locked: Dict[int, SubproductStock] = {}
+    for ss in rows:
+        # Si hubiera más de una fila activa, se usa la más antigua
+        locked.setdefault(ss.subproduct_id, ss)
+    return locked
+
+
+def _reserved_by_subproduct(subproduct_ids) -> Dict[int, Decimal]:
+    if not subproduct_ids:
+        return {}
+    return {sid: row.reserved_quantity for sid, row in reservations_for(subproduct_ids).items()}
+
+
+@transaction.atomic
+def apply_stock_movements(movements: Iterable[StockMovement], user) -> List[StockEvent]:
+    """
+    Aplica todos los movimientos o ninguno.
+
+    Reglas (las mismas que adjust_product_stock / adjust_subproduct_stock):
+    - el stock resultante no puede ser negativo,
+    - no se ajusta stock propio de un producto con subproductos,
+    - un egreso no puede dejar un subproducto por debajo de lo reservado.
+    Los movimientos se evalúan en orden, acumulando sobre el mismo target.
+    Errores: ValidationError({indice: mensaje}).
+    """
+    movements = list(movements)
+    if not movements:
+        return []
+    _validate_shape(movements)
+
+    product_ids = sorted({mv.product_id for mv in movements if mv.product_id is not None})
+    subproduct_ids = sorted({mv.subproduct_id for mv in movements if mv.subproduct_id is not None})
+    product_stocks = _lock_product_stocks(product_ids)
+    subproduct_stocks = _lock_subproduct_stocks(subproduct_ids)
+    reserved = _reserved_by_subproduct(subproduct_ids)
+
+    # Simulación en memoria, en el orden recibido
+    running: Dict[tuple, Decimal] = {}
+    errors = {}
+    events: List[StockEvent] = []
+    for idx, mv in enumerate(movements):
+        change = decimal_or_zero(mv.quantity_change)
+        if mv.product_id is not None:
+            stock = product_stocks.get(mv.product_id)
+            if stock is None:
+                errors[idx] = f"No hay stock activo para el producto {mv.product_id}."
+                continue
+            if stock.product.has_subproducts:
+                errors[idx] = "No se puede ajustar stock del producto padre; ajuste subproductos."
+                continue
+            key, floor = ("p", mv.product_id), Decimal("0")
+        else:
+            stock = subproduct_stocks.get(mv.subproduct_id)
+            if stock is None:
+                errors[idx] = f"No hay stock activo para el subproducto {mv.subproduct_id}."
+                continue
+            key = ("s", mv.subproduct_id)
+            floor = decimal_or_zero(reserved.get(mv.subproduct_id)) if change < 0 else Decimal("0")
+
+        current = running.get(key, decimal_or_zero(stock.quantity))
+        result = current + change
+        if result < 0:
+            errors[idx] = f"Stock resultante negativo para '{stock}'. Disponible: {current}"
+            continue
+        if result < floor:
+            errors[idx] = f"No se puede descontar por debajo de lo reservado ({floor})."
+            continue
+        running[key] = result
+        events.append(StockEvent(
+            product_stock=stock if mv.product_id is not None else None,
+            subproduct_stock=stock if mv.subproduct_id is not None else None,
+            quantity_change=change,
+            event_type=mv.event_type,
+            notes=mv.notes or "",
+            created_by=user,
+        ))
+    if errors:
+        raise ValidationError(errors)
+
+    # bulk_create no llama a save()/apply_to_target: las cantidades se escriben abajo
+    created = StockEvent.objects.bulk_create(events)
+
+    now = timezone.now()
+    touched_ps, touched_ss = [], []
+    for (kind, target_id), qty in running.items():
+        stock = product_stocks[target_id] if kind == "p" else subproduct_stocks[target_id]
+        stock.quantity = qty
+        stock.modified_at = now
+        stock.modified_by = user
+        (touched_ps if kind == "p" else touched_ss).append(stock)
+    if touched_ps:
+        ProductStock.objects.bulk_update(touched_ps, ["quantity", "modified_at", "modified_by"])
+        Product.objects.filter(pk__in=[ps.product_id for ps in touched_ps]).update(
+            current_stock=Case(
+                *[When(pk=ps.product_id, then=Value(ps.quantity)) for ps in touched_ps],
+                output_field=DecimalField(max_digits=15, decimal_places=2),
+            )
+        )
+    if touched_ss:
+        SubproductStock.objects.bulk_update(touched_ss, ["quantity", "modified_at", "modified_by"])
+        # status := stock > 0 (ensure_subproduct_status_from_stock, en lote)
+        for desired in (True, False):
+            ids = [ss.subproduct_id for ss in touched_ss
+                   if (ss.quantity > 0) is desired and ss.subproduct.status is not desired]
+            if ids:
+                Subproduct.objects.filter(pk__in=ids).update(
+                    status=desired, modified_at=now, modified_by=user
+                )
+
+    # Una única resincronización por padre afectado
+    parent_ids = {ss.subproduct.parent_id for ss in touched_ss}
+    for parent in Product.objects.filter(pk__in=parent_ids).order_by("pk"):
+        sync_parent_product_stock(parent, acting_user=user)
+
+    # Los UPDATE en lote no disparan señales: un refresco de facetas tras el commit
+    schedule_product_facets(ps.product_id for ps in touched_ps)
+    schedule_subproduct_facets(ss.subproduct_id for ss in touched_ss)
+
+    _invalidate_after_commit(
+        product_ids=[ps.product_id for ps in touched_ps] + sorted(parent_ids),
+        subproduct_ids=[ss.subproduct_id for ss in touched_ss],
+    )
+    return created
+
+
+def _invalidate_after_commit(*, product_ids, subproduct_ids) -> None:
+    from apps.products.utils.cache_invalidation import (
+        invalidate_product_entity_cache, invalidate_subproduct_cache,
+    )
+
+    product_ids = list(OrderedDict.fromkeys(product_ids))
+    subproduct_ids = list(OrderedDict.fromkeys(subproduct_ids))
+
+    def _run():
+        for pid in product_ids:
+            invalidate_product_events(pid)
+            invalidate_product_entity_cache(pid)
+        for sid in subproduct_ids:
+            invalidate_subproduct_events(sid)
+        if subproduct_ids:
+            invalidate_subproduct_cache()
+
+    transaction.on_commit(_run)
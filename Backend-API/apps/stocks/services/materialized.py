@@ -0,0 +1,103 @@
+# apps/stocks/services/materialized.py
+"""
+Mantenimiento de las columnas desnormalizadas de Product:
+- current_stock: ProductStock activo, o suma de SubproductStock activos si el
+  producto tiene subproductos.
+- reserved_stock: suma de SubproductReservation de sus subproductos.
+
+Todas las escrituras son UPDATE sobre la fila del producto dentro de la
+transacción del movimiento que las origina. Como no disparan señales, acá se
+agenda también el refresco de las facetas del catálogo (estado de stock).
+"""
+from decimal import Decimal
+from typing import Dict, Iterable, Optional
+
+from django.db import transaction
+from django.db.models import F, Sum
+
+from apps.products.models.product_model import Product
+from apps.products.services.catalog_facets import schedule_product_facets
+from apps.stocks.models import ProductStock, SubproductStock
+
+ZERO = Decimal("0.00")
+
+
+def set_product_current_stock(product_id: int, quantity) -> None:
+    Product.objects.filter(pk=product_id).update(current_stock=quantity or ZERO)
+    schedule_product_facets([product_id])
+
+
+def shift_product_current_stock(product_id: int, delta) -> None:
+    """Suma ``delta`` a current_stock sin leer la fila (UPDATE ... SET x = x + d)."""
+    if delta:
+        Product.objects.filter(pk=product_id).update(current_stock=F("current_stock") + delta)
+        schedule_product_facets([product_id])
+
+
+def compute_current_stock(product_ids: Optional[Iterable[int]] = None) -> Dict[int, Decimal]:
+    """Stock real por producto calculado desde las filas de stock (2 queries)."""
+    own = ProductStock.objects.filter(status=True, product__has_subproducts=False)
+    subs = SubproductStock.objects.filter(status=True, subproduct__status=True)
+    if product_ids is not None:
+        product_ids = list(product_ids)
+        own = own.filter(product_id__in=product_ids)
+        subs = subs.filter(subproduct__parent_id__in=product_ids)
+
+    totals: Dict[int, Decimal] = dict(own.values_list("product_id", "quantity"))
+    for parent_id, total in (
+        subs.values("subproduct__parent_id").annotate(total=Sum("quantity"))
+        .values_list("subproduct__parent_id", "total")
+    ):
+        totals[parent_id] = total or ZERO
+    return totals
+
+
+def compute_reserved_stock(product_ids: Optional[Iterable[int]] = None) -> Dict[int, Decimal]:
+    """Reservas activas por producto padre calculadas desde los ítems de corte (1 query)."""
+    from apps.stocks.services.reservations import active_reservation_items
+
+    qs = active_reservation_items()
+    if product_ids is not None:
+        qs = qs.filter(subproduct__parent_id__in=list(product_ids))
+    return dict(
+        qs.values("subproduct__parent_id").annotate(total=Sum("cutting_quantity"))
+        .values_list("subproduct__parent_id", "total")
+    )
+
+
+def backfill_materialized_stock() -> int:
+    """
+    Pone current_stock / reserved_stock de cada producto en su valor real
+    (post_migrate): un deploy sobre un catálogo existente no deja todo en 0.
+    Sólo escribe los productos desviados, así que repetirlo es barato.
+    """
+    current = compute_current_stock()
+    reserved = compute_reserved_stock()
+    drift = [
+        (pk, current.get(pk) or ZERO, reserved.get(pk) or ZERO)
+        for pk, cur, rsv in Product.objects.values_list("pk", "current_stock", "reserved_stock").iterator()
+        if cur != (current.get(pk) or ZERO) or rsv != (reserved.get(pk) or ZERO)
+    ]
+    if not drift:
+        return 0
+    with transaction.atomic():
+        for pk, cur, rsv in drift:
+            Product.objects.filter(pk=pk).update(current_stock=cur, reserved_stock=rsv)
+        schedule_product_facets(pk for pk, _, _ in drift)
+    return len(drift)
+
+
+def refresh_product_reserved_stock(product_ids: Iterable[int]) -> None:
+    """Recalcula reserved_stock de los productos desde el agregado por subproducto."""
+    from apps.stocks.models import SubproductReservation
+
+    product_ids = {pid for pid in product_ids if pid}
+    if not product_ids:
+        return
+    reserved = dict(
+        SubproductReservation.objects.filter(subproduct__parent_id__in=product_ids)
+        .values("subproduct__parent_id").annotate(total=Sum("reserved_quantity"))
+        .values_list("subproduct__parent_id", "total")
+    )
+    for pid in product_ids:
+        Product.objects.filter(pk=pid).update(reserved_stock=reserved.get(pid) or ZERO)
@@ -1,15 +1,234 @@
 # apps/stocks/services/reservations.py
+"""
+Reservas lógicas de stock por órdenes de corte.
+
+El total reservado por subproducto vive en ``SubproductReservation`` y se
+recalcula sólo para los subproductos afectados cuando cambia una orden, sus
+ítems o el estado del pedido (ver ``apps/stocks/signals.py``). Las consultas de
+disponibilidad leen esa fila por PK.
+"""
 from decimal import Decimal
-from django.db.models import Sum
+from typing import Dict, Iterable, Optional
+
+from django.db import transaction
+from django.db.models import Count, DecimalField, IntegerField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
 from apps.cuts.models.cutting_order_model import CuttingOrderItem
+from apps.orders.choices import OrderStatus
+from apps.stocks.models import SubproductReservation, SubproductStock
+
+# El estado de flujo de la orden de corte vive en el pedido asociado
+ACTIVE_RESERVATION_STATUSES = (OrderStatus.PENDING, OrderStatus.IN_PROCESS)
+ZERO = Decimal("0.00")
+
+
+def active_reservation_items():
+    """Ítems de órdenes de corte que reservan stock (orden activa y pedido abierto)."""
+    return CuttingOrderItem.objects.filter(
+        order__status=True,
+        order__order__status__in=ACTIVE_RESERVATION_STATUSES,
+    )
+
+
+@transaction.atomic
+def refresh_subproduct_reservations(subproduct_ids: Iterable[int]) -> None:
+    """
+    Recalcula el agregado de los subproductos indicados dentro de la
+    transacción actual. Las filas se bloquean (en orden de pk) ANTES de sumar:
+    una transacción concurrente sobre el mismo subproducto espera y luego suma
+    viendo los ítems ya confirmados, sin pisar su resultado.
+    """
+    from apps.stocks.services.materialized import refresh_product_reserved_stock
+
+    ids = sorted({sid for sid in subproduct_ids if sid})
+    if not ids:
+        return
+    SubproductReservation.objects.bulk_create(
+        [SubproductReservation(subproduct_id=sid) for sid in ids], ignore_conflicts=True
+    )
+    rows = list(
+        SubproductReservation.objects.select_for_update()
+        .select_related("subproduct")
+        .filter(pk__in=ids)
+        .order_by("pk")
+    )
+    totals = {
+        r["subproduct_id"]: r
+        for r in active_reservation_items()
+        .filter(subproduct_id__in=ids)
+        .values("subproduct_id")
+        .annotate(total=Sum("cutting_quantity"), orders=Count("order_id", distinct=True))
+    }
+    now = timezone.now()
+    for row in rows:
+        agg = totals.get(row.pk) or {}
+        row.updated_at = now
+        row.reserved_quantity = agg.get("total") or ZERO
+        row.active_orders = agg.get("orders") or 0
+    SubproductReservation.objects.bulk_update(rows, ["reserved_quantity", "active_orders", "updated_at"])
+
+    refresh_product_reserved_stock({row.subproduct.parent_id for row in rows})
+
+
+def backfill_subproduct_reservations(batch_size: int = 500) -> int:
+    """
+    Crea el agregado de los subproductos con ítems activos que todavía no
+    tienen fila (post_migrate): un deploy sobre órdenes de corte existentes no
+    deja las reservas en 0. Las filas ya creadas se mantienen por señales.
+    """
+    missing = list(
+        active_reservation_items()
+        .exclude(subproduct_id__in=SubproductReservation.objects.values("pk"))
+        .order_by("subproduct_id")
+        .values_list("subproduct_id", flat=True)
+        .distinct()
+    )
+    for start in range(0, len(missing), batch_size):
+        refresh_subproduct_reservations(missing[start:start + batch_size])
+    return len(missing)
+
+
+def reservations_for(subproduct_ids: Iterable[int]) -> Dict[int, SubproductReservation]:
+    """{subproduct_id: SubproductReservation} en una query (faltantes = sin reservas)."""
+    return SubproductReservation.objects.in_bulk(list(subproduct_ids))
+
 
 def reserved_qty(subproduct_id: int) -> Decimal:
     return (
-        CuttingOrderItem.objects
-        .filter(
-            subproduct_id=subproduct_id,
-            order__status=True,
-            order__workflow_status__in=['pending', 'in_process'],
+        SubproductReservation.objects.filter(pk=subproduct_id)
+        .values_list("reserved_quantity", flat=True).first()
+        or Decimal('0')
+    )
+
+
+def order_reserved_by_subproduct(order_id: int, subproduct_ids: Optional[Iterable[int]] = None) -> Dict[int, Decimal]:
+    """Lo que reserva la propia orden (si está activa), por subproducto."""
+    qs = active_reservation_items().filter(order_id=order_id)
+    if subproduct_ids is not None:
+        qs = qs.filter(subproduct_id__in=list(subproduct_ids))
+    return dict(
+        qs.values("subproduct_id").annotate(total=Sum("cutting_quantity"))
+        .values_list("subproduct_id", "total")
+    )
+
+
+def reserved_qty_excluding_order(subproduct_id: int, exclude_order_id: Optional[int] = None) -> Decimal:
+    reserved = reserved_qty(subproduct_id)
+    if exclude_order_id:
+        reserved -= order_reserved_by_subproduct(exclude_order_id, [subproduct_id]).get(subproduct_id, ZERO)
+    return reserved
+
+
+def available_qty(subproduct_id: int, exclude_order_id: Optional[int] = None) -> Decimal:
+    """Disponibilidad = stock físico activo - reservas de (otras) órdenes activas."""
+    base = (
+        SubproductStock.objects.filter(subproduct_id=subproduct_id, status=True)
+        .values_list("quantity", flat=True).first()
+        or ZERO
+    )
+    return Decimal(base) - reserved_qty_excluding_order(subproduct_id, exclude_order_id)
+
+
+def available_quantities(subproduct_ids: Iterable[int], exclude_order_id: Optional[int] = None) -> Dict[int, Decimal]:
+    """``available_qty`` para varios subproductos en un número fijo de queries."""
+    subproduct_ids = list(dict.fromkeys(subproduct_ids))
+    ledger = reservations_for(subproduct_ids)
+    own = order_reserved_by_subproduct(exclude_order_id, subproduct_ids) if exclude_order_id else {}
+    stock = _stock_by_subproduct(subproduct_ids)
+    return {
+        sid: Decimal(stock.get(sid) or ZERO)
+        - ((ledger[sid].reserved_quantity if sid in ledger else ZERO) - own.get(sid, ZERO))
+        for sid in subproduct_ids
+    }
+
+
+def reservation_summary_for_order(order_id: int, subproduct_ids: Iterable[int]) -> Dict[int, Dict]:
+    """
+    Por subproducto de la orden: reservas y cantidad de OTRAS órdenes activas y
+    disponibilidad excluyéndolas. Cantidad de queries constante (3).
+    """
+    subproduct_ids = list(dict.fromkeys(subproduct_ids))
+    ledger = reservations_for(subproduct_ids)
+    own = order_reserved_by_subproduct(order_id, subproduct_ids)
+    stock = _stock_by_subproduct(subproduct_ids)
+
+    summary = {}
+    for sid in subproduct_ids:
+        row = ledger.get(sid)
+        summary[sid] = _summary_row(
+            stock=stock.get(sid),
+            total=row.reserved_quantity if row else ZERO,
+            orders=row.active_orders if row else 0,
+            own=own.get(sid),
         )
-        .aggregate(total=Sum('cutting_quantity'))['total'] or Decimal('0')
+    return summary
+
+
+# ── Anotaciones para listados ────────────────────────────────────────────────
+
+def annotate_item_stock(items_qs):
+    """
+    Anota cada CuttingOrderItem con el stock activo y el agregado de reservas de
+    su subproducto (``stock_quantity``, ``reserved_total``, ``reserving_orders``).
+    Todo sale en la misma query del prefetch de ítems, sin importar cuántas
+    órdenes ni ítems haya en la página.
+    """
+    ledger = SubproductReservation.objects.filter(pk=OuterRef("subproduct_id"))
+    return items_qs.annotate(
+        stock_quantity=Subquery(
+            SubproductStock.objects.filter(subproduct_id=OuterRef("subproduct_id"), status=True)
+            .values("quantity")[:1],
+            output_field=DecimalField(max_digits=15, decimal_places=2),
+        ),
+        reserved_total=Coalesce(
+            Subquery(ledger.values("reserved_quantity")[:1]),
+            Value(ZERO),
+            output_field=DecimalField(max_digits=15, decimal_places=2),
+        ),
+        reserving_orders=Coalesce(
+            Subquery(ledger.values("active_orders")[:1]), Value(0), output_field=IntegerField(),
+        ),
     )
+
+
+def reservation_summary_from_items(order, items) -> Optional[Dict[int, Dict]]:
+    """
+    Igual que ``reservation_summary_for_order`` pero a partir de ítems ya
+    anotados con ``annotate_item_stock`` (sin queries). None si no lo están.
+    ``order.order`` debe venir cargado (select_related) para saber si la orden
+    reserva.
+    """
+    if any(not hasattr(it, "reserved_total") for it in items):
+        return None
+    if not items:
+        return {}
+    reserving = bool(order.status) and order.order.status in ACTIVE_RESERVATION_STATUSES
+    own: Dict[int, Decimal] = {}
+    if reserving:
+        for it in items:
+            own[it.subproduct_id] = own.get(it.subproduct_id, ZERO) + it.cutting_quantity
+    return {
+        it.subproduct_id: _summary_row(
+            stock=it.stock_quantity, total=it.reserved_total, orders=it.reserving_orders,
+            own=own.get(it.subproduct_id),
+        )
+        for it in items
+    }
+
+
+def _stock_by_subproduct(subproduct_ids) -> Dict[int, Decimal]:
+    return dict(
+        SubproductStock.objects.filter(subproduct_id__in=subproduct_ids, status=True)
+        .values_list("subproduct_id", "quantity")
+    )
+
+
+def _summary_row(stock, total, orders, own) -> Dict:
+    other_reserved = total - (own or ZERO)
+    return {
+        "other_reserved_qty": other_reserved,
+        "other_active_orders_count": max(orders - (1 if own is not None else 0), 0),
+        "available_excluding_others": Decimal(stock or ZERO) - other_reserved,
+    }
@@ -4,6 +4,7 @@ from django.db import transaction
 from django.db.models import Sum
 from apps.products.models.product_model import Product
 from apps.stocks.models import ProductStock, SubproductStock
+from apps.stocks.services.materialized import set_product_current_stock
 
 
 @transaction.atomic
@@ -20,6 +21,7 @@ def sync_parent_product_stock(parent: Product, acting_user=None) -> None:
         .filter(subproduct__parent=parent, status=True, subproduct__status=True)
         .aggregate(total=Sum("quantity"))["total"] or Decimal("0.00")
     )
+    set_product_current_stock(parent.pk, total)
 
     try:
         ps = ProductStock.objects.select_for_update().get(product=parent)
@@ -45,6 +47,7 @@ def validate_and_correct_stock():
             .filter(subproduct__parent=product, status=True, subproduct__status=True)
             .aggregate(total=Sum("quantity"))["total"] or Decimal("0.00")
         )
+        set_product_current_stock(product.pk, total)
         try:
             stock_record = ProductStock.objects.select_for_update().get(product=product)
         except ProductStock.DoesNotExist:
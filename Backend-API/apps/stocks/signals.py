@@ -2,11 +2,14 @@
 from decimal import Decimal
 import logging
 
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 
 from apps.stocks.models.stock_subproduct_model import SubproductStock
 from apps.products.models.subproduct_model import Subproduct  # ⬅️ importar modelo
+from apps.cuts.models.cutting_order_model import CuttingOrder, CuttingOrderItem
+from apps.orders.models import CustomerOrder
+from apps.stocks.services.reservations import refresh_subproduct_reservations
 
 logger = logging.getLogger(__name__)
 
@@ -19,3 +22,29 @@ def sync_status_on_stock_change(sender, instance: SubproductStock, **kwargs):
         sp.status = desired
         sp.save(update_fields=['status', 'modified_at', 'modified_by'])
         logger.debug("sync_status_on_stock_change: Subproduct %s -> status=%s by stock=%s", sp.pk, desired, instance.quantity)
+
+
+# ── Reservas (SubproductReservation + Product.reserved_stock) ─────────
+# Se recalculan en la misma transacción que el cambio. Los altas con
+# bulk_create de ítems (que no emiten señales) llaman al refresh explícitamente.
+
+@receiver([post_save, post_delete], sender=CuttingOrderItem)
+def refresh_reservations_on_cutting_item(sender, instance: CuttingOrderItem, **kwargs):
+    refresh_subproduct_reservations([instance.subproduct_id])
+
+
+@receiver(post_save, sender=CuttingOrder)
+def refresh_reservations_on_cutting_order(sender, instance: CuttingOrder, created=False, **kwargs):
+    if created:
+        return  # todavía sin ítems
+    refresh_subproduct_reservations(instance.items.values_list("subproduct_id", flat=True))
+
+
+@receiver(post_save, sender=CustomerOrder)
+def refresh_reservations_on_order_status(sender, instance: CustomerOrder, created=False, update_fields=None, **kwargs):
+    # El workflow de las órdenes de corte es el estado del pedido
+    if created or (update_fields is not None and "status" not in update_fields):
+        return
+    refresh_subproduct_reservations(
+        CuttingOrderItem.objects.filter(order__order_id=instance.pk).values_list("subproduct_id", flat=True)
+    )
@@ -0,0 +1,82 @@
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.products.models.category_model import Category
+from apps.products.models.product_model import Product
+from apps.products.models.subproduct_model import Subproduct
+from apps.stocks.models import ProductStock, StockEvent, SubproductReservation, SubproductStock
+from apps.stocks.services import StockMovement, apply_stock_movements
+from apps.users.models.user_model import User
+
+
+class BulkStockMovementsTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='bulkuser', email='bulk@example.com', password='x', name='Bulk', last_name='User'
+        )
+        category = Category.objects.create(name='CatBulk', created_by=self.user)
+        self.product = Product.objects.create(code='10', name='Simple', category=category, created_by=self.user)
+        self.stock = ProductStock.objects.create(product=self.product, quantity=Decimal('5'), created_by=self.user)
+        self.parent = Product.objects.create(code='20', name='Bobinas', category=category,
+                                             has_subproducts=True, created_by=self.user)
+        self.subs = []
+        for n in range(6):
+            sub = Subproduct.objects.create(parent=self.parent, brand='B', number_coil=str(n), created_by=self.user)
+            SubproductStock.objects.create(subproduct=sub, quantity=Decimal('0'), created_by=self.user)
+            self.subs.append(sub)
+
+    def _receive(self, subs, qty='10'):
+        return [StockMovement(subproduct_id=s.pk, quantity_change=Decimal(qty), event_type='ingreso') for s in subs]
+
+    def test_applies_all_movements_and_resyncs_parent(self):
+        events = apply_stock_movements(
+            self._receive(self.subs) + [
+                StockMovement(product_id=self.product.pk, quantity_change=Decimal('-2'), event_type='egreso_venta'),
+                StockMovement(product_id=self.product.pk, quantity_change=Decimal('-1'), event_type='egreso_venta'),
+            ],
+            user=self.user,
+        )
+        self.assertEqual(len(events), 8)
+        self.stock.refresh_from_db()
+        self.assertEqual(self.stock.quantity, Decimal('2.00'))
+        self.parent.refresh_from_db()
+        self.product.refresh_from_db()
+        self.assertEqual(self.parent.current_stock, Decimal('60.00'))
+        self.assertEqual(self.product.current_stock, Decimal('2.00'))
+        self.assertTrue(all(Subproduct.objects.filter(parent=self.parent).values_list('status', flat=True)))
+
+    def test_any_invalid_movement_rolls_back_the_batch(self):
+        with self.assertRaises(ValidationError) as ctx:
+            apply_stock_movements(
+                self._receive(self.subs[:2]) + [
+                    StockMovement(product_id=self.product.pk, quantity_change=Decimal('-9'), event_type='egreso_venta'),
+                ],
+                user=self.user,
+            )
+        self.assertIn(2, ctx.exception.message_dict)
+        self.assertEqual(StockEvent.objects.count(), 0)
+        self.assertEqual(SubproductStock.objects.filter(quantity__gt=0).count(), 0)
+
+    def test_query_count_does_not_grow_with_batch_size(self):
+        with CaptureQueriesContext(connection) as small:
+            apply_stock_movements(self._receive(self.subs[:2]), user=self.user)
+        with CaptureQueriesContext(connection) as large:
+            apply_stock_movements(self._receive(self.subs, qty='1'), user=self.user)
+        self.assertEqual(len(small), len(large))
+
+    def test_egress_floor_reads_the_reservation_ledger(self):
+        apply_stock_movements(self._receive(self.subs[:1]), user=self.user)
+        SubproductReservation.objects.create(subproduct=self.subs[0], reserved_quantity=Decimal('8'), active_orders=1)
+        egress = [StockMovement(subproduct_id=self.subs[0].pk, quantity_change=Decimal('-3'), event_type='egreso_venta')]
+
+        with self.assertRaises(ValidationError) as ctx:
+            apply_stock_movements(egress, user=self.user)
+        self.assertIn(0, ctx.exception.message_dict)
+
+        SubproductReservation.objects.filter(pk=self.subs[0].pk).update(reserved_quantity=Decimal('7'))
+        apply_stock_movements(egress, user=self.user)
+        self.assertEqual(SubproductStock.objects.get(subproduct=self.subs[0]).quantity, Decimal('7.00'))
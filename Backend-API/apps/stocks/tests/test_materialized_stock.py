@@ -0,0 +1,91 @@
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.sql import emit_post_migrate_signal
+from django.db import DEFAULT_DB_ALIAS
+from django.test import TestCase
+
+from apps.products.models import CatalogFacetEntry, FacetScope, StockState
+from apps.products.models.category_model import Category
+from apps.products.models.product_model import Product
+from apps.products.models.subproduct_model import Subproduct
+from apps.stocks.models import ProductStock, StockEvent, SubproductStock
+from apps.stocks.services import sync_parent_product_stock
+from apps.users.models.user_model import User
+
+
+class MaterializedProductStockTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='stockuser', email='stock@example.com', password='x', name='Stock', last_name='User'
+        )
+        self.category = Category.objects.create(name='CatStock', created_by=self.user)
+
+    def _product(self, code, **kwargs):
+        return Product.objects.create(code=code, name=f'Prod {code}', category=self.category,
+                                      created_by=self.user, **kwargs)
+
+    def test_product_event_updates_current_stock(self):
+        product = self._product('100')
+        stock = ProductStock.objects.create(product=product, quantity=Decimal('0'), created_by=self.user)
+        StockEvent.objects.create(product_stock=stock, quantity_change=Decimal('7.50'),
+                                  event_type='ingreso', created_by=self.user)
+        product.refresh_from_db()
+        self.assertEqual(product.current_stock, Decimal('7.50'))
+
+        # Un save() de catálogo con la instancia vieja no pisa la columna materializada
+        stale = Product.objects.get(pk=product.pk)
+        StockEvent.objects.create(product_stock=stock, quantity_change=Decimal('-2.50'),
+                                  event_type='egreso_ajuste', created_by=self.user)
+        stale.name = 'Renombrado'
+        stale.save()
+        product.refresh_from_db()
+        self.assertEqual(product.current_stock, Decimal('5.00'))
+
+    def test_subproduct_events_and_sync_update_parent(self):
+        parent = self._product('200', has_subproducts=True)
+        sub = Subproduct.objects.create(parent=parent, brand='B', number_coil='1', created_by=self.user)
+        ss = SubproductStock.objects.create(subproduct=sub, quantity=Decimal('0'), created_by=self.user)
+        StockEvent.objects.create(subproduct_stock=ss, quantity_change=Decimal('10'),
+                                  event_type='ingreso', created_by=self.user)
+        parent.refresh_from_db()
+        self.assertEqual(parent.current_stock, Decimal('10.00'))
+
+        Product.objects.filter(pk=parent.pk).update(current_stock=Decimal('99'))
+        sync_parent_product_stock(parent)
+        parent.refresh_from_db()
+        self.assertEqual(parent.current_stock, Decimal('10.00'))
+
+    def test_post_migrate_fills_columns_of_existing_products(self):
+        simple = self._product('400')
+        ProductStock.objects.create(product=simple, quantity=Decimal('3'), created_by=self.user)
+        parent = self._product('500', has_subproducts=True)
+        sub = Subproduct.objects.create(parent=parent, brand='B', number_coil='1', created_by=self.user)
+        SubproductStock.objects.create(subproduct=sub, quantity=Decimal('8'), created_by=self.user)
+        # Columnas recién agregadas: todo en 0
+        Product.objects.update(current_stock=0, reserved_stock=0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            emit_post_migrate_signal(verbosity=0, interactive=False, db=DEFAULT_DB_ALIAS)
+
+        self.assertEqual(
+            dict(Product.objects.filter(pk__in=[simple.pk, parent.pk]).values_list('pk', 'current_stock')),
+            {simple.pk: Decimal('3.00'), parent.pk: Decimal('8.00')},
+        )
+        entry = CatalogFacetEntry.objects.get(scope=FacetScope.PRODUCT, object_id=simple.pk)
+        self.assertEqual(entry.stock_state, StockState.IN_STOCK)
+
+    def test_reconcile_reports_and_fixes_drift(self):
+        product = self._product('300')
+        stock = ProductStock.objects.create(product=product, quantity=Decimal('0'), created_by=self.user)
+        StockEvent.objects.create(product_stock=stock, quantity_change=Decimal('4'),
+                                  event_type='ingreso', created_by=self.user)
+        Product.objects.filter(pk=product.pk).update(current_stock=Decimal('1'))
+
+        out = StringIO()
+        call_command('reconcile_product_stock', '--fix', stdout=out)
+
+        self.assertIn('1 con columnas desviadas', out.getvalue())
+        product.refresh_from_db()
+        self.assertEqual(product.current_stock, Decimal('4.00'))
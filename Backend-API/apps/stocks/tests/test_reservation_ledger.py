@@ -0,0 +1,93 @@
+from decimal import Decimal
+
+from django.core.management.sql import emit_post_migrate_signal
+from django.db import DEFAULT_DB_ALIAS, connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.cuts.models.cutting_order_model import CuttingOrder, CuttingOrderItem
+from apps.cuts.services.cuts_services import active_reservations_summary_for_order
+from apps.orders.choices import OrderStatus
+from apps.orders.models import CustomerOrder
+from apps.products.models.category_model import Category
+from apps.products.models.product_model import Product
+from apps.products.models.subproduct_model import Subproduct
+from apps.stocks.models import SubproductReservation, SubproductStock
+from apps.stocks.services.reservations import available_qty, refresh_subproduct_reservations
+from apps.users.models.user_model import User
+
+
+class ReservationLedgerTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='rsvuser', email='rsv@example.com', password='x', name='Rsv', last_name='User'
+        )
+        category = Category.objects.create(name='CatRsv', created_by=self.user)
+        self.parent = Product.objects.create(code='30', name='Bobinas', category=category,
+                                             has_subproducts=True, created_by=self.user)
+        self.subs = []
+        for n in range(5):
+            sub = Subproduct.objects.create(parent=self.parent, brand='B', number_coil=str(n), created_by=self.user)
+            SubproductStock.objects.create(subproduct=sub, quantity=Decimal('100'), created_by=self.user)
+            self.subs.append(sub)
+
+    def _cutting_order(self, number, subs, qty='10'):
+        customer_order = CustomerOrder.objects.create(created_by=self.user)
+        order = CuttingOrder.objects.create(
+            order=customer_order, order_number=number, product=self.parent, customer='ACME',
+            quantity_to_cut=Decimal('1000'), created_by=self.user,
+        )
+        CuttingOrderItem.objects.bulk_create([
+            CuttingOrderItem(order=order, subproduct=s, cutting_quantity=Decimal(qty)) for s in subs
+        ])
+        refresh_subproduct_reservations(s.pk for s in subs)
+        return order
+
+    def test_ledger_follows_items_and_order_status(self):
+        first = self._cutting_order(1, self.subs[:2])
+        self._cutting_order(2, self.subs[:1], qty='5')
+
+        row = SubproductReservation.objects.get(pk=self.subs[0].pk)
+        self.assertEqual((row.reserved_quantity, row.active_orders), (Decimal('15.00'), 2))
+        self.assertEqual(available_qty(self.subs[0].pk, exclude_order_id=first.pk), Decimal('95.00'))
+        self.parent.refresh_from_db()
+        self.assertEqual(self.parent.reserved_stock, Decimal('25.00'))
+
+        first.order.status = OrderStatus.CANCELLED
+        first.order.save(update_fields=['status'])
+        row.refresh_from_db()
+        self.assertEqual((row.reserved_quantity, row.active_orders), (Decimal('5.00'), 1))
+
+        CuttingOrderItem.objects.filter(order__order_number=2).delete()
+        row.refresh_from_db()
+        self.assertEqual(row.reserved_quantity, Decimal('0.00'))
+
+    def test_post_migrate_backfills_existing_orders(self):
+        self._cutting_order(1, self.subs[:2])
+        self._cutting_order(2, self.subs[:1], qty='5')
+        # Órdenes anteriores al agregado: sin filas y reserved_stock en 0
+        SubproductReservation.objects.all().delete()
+        Product.objects.filter(pk=self.parent.pk).update(reserved_stock=0)
+
+        emit_post_migrate_signal(verbosity=0, interactive=False, db=DEFAULT_DB_ALIAS)
+
+        ledger = dict(SubproductReservation.objects.values_list('pk', 'reserved_quantity'))
+        self.assertEqual(ledger, {self.subs[0].pk: Decimal('15.00'), self.subs[1].pk: Decimal('10.00')})
+        self.assertEqual(available_qty(self.subs[0].pk), Decimal('85.00'))
+        self.parent.refresh_from_db()
+        self.assertEqual(self.parent.reserved_stock, Decimal('25.00'))
+
+    def test_order_summary_runs_in_constant_queries(self):
+        self._cutting_order(1, self.subs)
+        small = self._cutting_order(2, self.subs[:1])
+        large = self._cutting_order(3, self.subs)
+
+        with CaptureQueriesContext(connection) as q_small:
+            active_reservations_summary_for_order(small)
+        with CaptureQueriesContext(connection) as q_large:
+            summary = active_reservations_summary_for_order(large)
+
+        self.assertEqual(len(q_small), len(q_large))
+        self.assertEqual(len(summary), 5)
+        self.assertEqual(summary[0]['other_active_orders_count'], 2)
+        self.assertEqual(summary[0]['other_reserved_qty'], Decimal('20.00'))
@@ -1,3 +1,3 @@
-from .utils import generate_presigned_url
+from .utils import generate_presigned_url, generate_presigned_urls
 
-__all__ = ["generate_presigned_url"]
+__all__ = ["generate_presigned_url", "generate_presigned_urls"]
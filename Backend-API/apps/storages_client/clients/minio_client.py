@@ -1,11 +1,55 @@
+import os
+import threading
+
 import boto3
+from botocore.config import Config
 from django.conf import settings
 
+# Un cliente por proceso (y por configuración). Los clientes de boto3 son
+# thread-safe; construirlos no lo es y cuesta decenas de ms.
+_clients = {}
+_lock = threading.Lock()
+
+
+def _client_config() -> Config:
+    return Config(
+        signature_version="s3v4",
+        max_pool_connections=getattr(settings, "AWS_S3_MAX_POOL_CONNECTIONS", 50),
+        connect_timeout=getattr(settings, "AWS_S3_CONNECT_TIMEOUT", 5),
+        read_timeout=getattr(settings, "AWS_S3_READ_TIMEOUT", 60),
+        retries={"max_attempts": getattr(settings, "AWS_S3_MAX_ATTEMPTS", 3), "mode": "standard"},
+        tcp_keepalive=True,
+    )
+
+
 def get_minio_client():
-    return boto3.client(
-        "s3",
-        endpoint_url=settings.AWS_S3_ENDPOINT_URL,
-        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-        region_name=settings.AWS_S3_REGION_NAME,
+    # El pid forma parte de la clave: tras un fork (celery prefork, gunicorn
+    # preload) el pool de conexiones del padre no se reutiliza.
+    key = (
+        os.getpid(),
+        settings.AWS_S3_ENDPOINT_URL,
+        settings.AWS_ACCESS_KEY_ID,
+        settings.AWS_SECRET_ACCESS_KEY,
+        settings.AWS_S3_REGION_NAME,
     )
+    client = _clients.get(key)
+    if client is None:
+        with _lock:
+            client = _clients.get(key)
+            if client is None:
+                _clients.clear()
+                client = boto3.session.Session().client(
+                    "s3",
+                    endpoint_url=settings.AWS_S3_ENDPOINT_URL,
+                    aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+                    aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+                    region_name=settings.AWS_S3_REGION_NAME,
+                    config=_client_config(),
+                )
+                _clients[key] = client
+    return client
+
+
+def reset_minio_client():
+    with _lock:
+        _clients.clear()
@@ -0,0 +1,177 @@
+# apps/storages_client/clients/s3_stand_in.py
+"""
+Servidor S3 mínimo en proceso para benchmarks y tests (reemplaza a MinIO).
+
+Implementa lo que usa el pipeline de subidas: PutObject, CreateMultipartUpload,
+UploadPart, CompleteMultipartUpload y HeadObject; cualquier otro POST se
+acepta como formulario (sirve también de stand-in de la API de Drive). Los cuerpos se leen por
+bloques y se descartan; sólo se guarda el tamaño y el Content-Type de cada
+objeto, así el servidor no afecta la memoria medida del cliente.
+"""
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+
+READ_BLOCK = 64 * 1024
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    # ── Helpers ──────────────────────────────────────────────────────────────
+
+    def _target(self):
+        parsed = urlparse(self.path)
+        return unquote(parsed.path.lstrip("/")), parse_qs(parsed.query, keep_blank_values=True)
+
+    def _drain(self) -> int:
+        """Lee y descarta el cuerpo; devuelve los bytes útiles recibidos."""
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            total = 0
+            while True:
+                size = int(self.rfile.readline().split(b";")[0].strip() or b"0", 16)
+                if size == 0:
+                    # trailers hasta la línea vacía
+                    while self.rfile.readline() not in (b"\r\n", b"\n", b""):
+                        pass
+                    break
+                total += self._skip(size)
+                self.rfile.readline()
+        else:
+            total = self._skip(int(self.headers.get("Content-Length") or 0))
+        decoded = self.headers.get("X-Amz-Decoded-Content-Length")
+        return int(decoded) if decoded else total
+
+    def _skip(self, remaining: int) -> int:
+        read = 0
+        while remaining > 0:
+            block = self.rfile.read(min(READ_BLOCK, remaining))
+            if not block:
+                break
+            read += len(block)
+            remaining -= len(block)
+        return read
+
+    def _reply(self, code: int = 200, body: bytes = b"", headers: dict = None):
+        self.send_response(code)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body and self.command != "HEAD":
+            self.wfile.write(body)
+
+    # ── Operaciones ──────────────────────────────────────────────────────────
+
+    def do_PUT(self):
+        key, query = self._target()
+        size = self._drain()
+        store = self.server.store
+        if "uploadId" in query:
+            with store.lock:
+                store.uploads[query["uploadId"][0]][0] += size
+                store.parts += 1
+        else:
+            store.put(key, size, self.headers.get("Content-Type"))
+        self._reply(headers={"ETag": f'"{uuid.uuid4().hex}"'})
+
+    def do_POST(self):
+        key, query = self._target()
+        size = self._drain()
+        store = self.server.store
+        bucket, _, name = key.partition("/")
+        if "uploads" in query:
+            upload_id = uuid.uuid4().hex
+            with store.lock:
+                store.uploads[upload_id] = [0, self.headers.get("Content-Type")]
+            body = (
+                "<InitiateMultipartUploadResult>"
+                f"<Bucket>{bucket}</Bucket><Key>{name}</Key><UploadId>{upload_id}</UploadId>"
+                "</InitiateMultipartUploadResult>"
+            )
+        elif "uploadId" in query:
+            with store.lock:
+                size, content_type = store.uploads.pop(query["uploadId"][0])
+            store.put(key, size, content_type)
+            body = (
+                "<CompleteMultipartUploadResult>"
+                f"<Bucket>{bucket}</Bucket><Key>{name}</Key><ETag>\"{uuid.uuid4().hex}\"</ETag>"
+                "</CompleteMultipartUploadResult>"
+            )
+        else:
+            # POST de formulario (presigned POST / API de Drive): se registra el cuerpo
+            store.put(key, size, self.headers.get("Content-Type"))
+            body = f'{{"file_id": "{uuid.uuid4().hex}"}}'
+            return self._reply(body=body.encode(), headers={"Content-Type": "application/json"})
+        self._reply(body=body.encode(), headers={"Content-Type": "application/xml"})
+
+    def do_HEAD(self):
+        key, _ = self._target()
+        obj = self.server.store.objects.get(key)
+        if obj is None:
+            return self._reply(404)
+        # HEAD anuncia el tamaño del objeto sin enviar cuerpo
+        self.send_response(200)
+        self.send_header("Content-Type", obj["content_type"] or "binary/octet-stream")
+        self.send_header("Content-Length", str(obj["size"]))
+        self.send_header("ETag", '"stand-in"')
+        self.end_headers()
+
+    def do_DELETE(self):
+        key, _ = self._target()
+        self.server.store.objects.pop(key, None)
+        self._reply(204)
+
+
+class _Store:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.objects = {}
+        self.uploads = {}
+        self.parts = 0
+
+    def put(self, key, size, content_type):
+        with self.lock:
+            self.objects[key] = {"size": size, "content_type": content_type}
+
+
+class S3StandIn:
+    """
+    Uso::
+
+        with S3StandIn() as s3:
+            override_settings(AWS_S3_ENDPOINT_URL=s3.endpoint_url, ...)
+            ...
+            s3.objects  # {"bucket/key": {"size", "content_type"}}
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.server = ThreadingHTTPServer((host, port), _Handler)
+        self.server.daemon_threads = True
+        self.server.store = _Store()
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def endpoint_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def objects(self) -> dict:
+        return self.server.store.objects
+
+    @property
+    def parts(self) -> int:
+        return self.server.store.parts
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
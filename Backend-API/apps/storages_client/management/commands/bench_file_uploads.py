@@ -0,0 +1,190 @@
+import multiprocessing
+import os
+import resource
+import shutil
+import tempfile
+import time
+import tracemalloc
+from contextlib import ExitStack
+
+import requests
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+
+from apps.storages_client.clients.minio_client import get_minio_client, reset_minio_client
+from apps.storages_client.clients.s3_stand_in import S3StandIn
+from apps.storages_client.services.products_files import upload_product_file
+from apps.storages_client.services.uploads import MultipartFileStream, upload_many
+
+MB = 1024 * 1024
+BENCH_PRODUCT_ID = "bench"
+
+
+class _DiskUpload(UploadedFile):
+    """Como TemporaryUploadedFile (lo que Django entrega para archivos grandes)."""
+
+    def temporary_file_path(self):
+        return self.file.name
+
+
+def _open(paths):
+    return [
+        _DiskUpload(file=open(path, "rb"), name=os.path.basename(path), content_type="video/mp4")
+        for path in paths
+    ]
+
+
+def legacy_s3(paths, bucket, endpoint):
+    """Subida anterior: archivo por archivo, sin TransferConfig propio."""
+    s3 = get_minio_client()
+    for f in _open(paths):
+        with f:
+            f.seek(0)
+            s3.upload_fileobj(Fileobj=f, Bucket=bucket, Key=f"products/bench/{f.name}",
+                              ExtraArgs={"ContentType": f.content_type})
+
+
+def pipeline_s3(paths, bucket, endpoint):
+    files = _open(paths)
+    try:
+        results = upload_many([
+            (lambda f=f: upload_product_file(file=f, product_id=BENCH_PRODUCT_ID)) for f in files
+        ])
+    finally:
+        for f in files:
+            f.close()
+    failed = [exc for _, exc in results if exc is not None]
+    if failed:
+        raise failed[0]
+
+
+def legacy_drive(paths, bucket, endpoint):
+    """POST multipart leyendo el archivo completo (como hacía el servicio de Drive)."""
+    for f in _open(paths):
+        with f:
+            f.seek(0)
+            resp = requests.post(f"{endpoint}/drive/upload",
+                                 files={"file": (f.name, f.read(), f.content_type)})
+            resp.raise_for_status()
+
+
+def pipeline_drive(paths, bucket, endpoint):
+    for f in _open(paths):
+        with f:
+            body = MultipartFileStream(f, f.name, f.content_type)
+            resp = requests.post(f"{endpoint}/drive/upload", data=body,
+                                 headers={"Content-Type": body.content_type})
+            resp.raise_for_status()
+
+
+MODES = {
+    "s3-legacy": legacy_s3,
+    "s3-pipeline": pipeline_s3,
+    "drive-legacy": legacy_drive,
+    "drive-stream": pipeline_drive,
+}
+
+
+def _measure(mode, paths, bucket, endpoint, queue):
+    """Corre en un proceso hijo para que el pico de RSS sea propio del modo."""
+    try:
+        reset_minio_client()
+        rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        t0 = time.perf_counter()
+        MODES[mode](paths, bucket, endpoint)
+        elapsed = time.perf_counter() - t0
+        rss_delta = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before
+
+        # Segunda pasada sólo para medir el pico de memoria Python asignada
+        tracemalloc.start()
+        MODES[mode](paths, bucket, endpoint)
+        _, traced_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        queue.put((elapsed, rss_delta * 1024, traced_peak, None))
+    except Exception as e:
+        queue.put((None, None, None, repr(e)))
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide throughput y pico de memoria de la subida de archivos: subida anterior "
+        "(secuencial / lectura completa) contra el pipeline en streaming. Con --stand-in "
+        "usa un servidor S3 local en proceso en lugar de MinIO."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='1,16,64',
+                            help='Tamaños de archivo en MB, separados por coma')
+        parser.add_argument('--files', type=int, default=4, help='Archivos por request')
+        parser.add_argument('--modes', default=','.join(MODES), help='Modos a medir')
+        parser.add_argument('--stand-in', action='store_true',
+                            help='Usar el stand-in S3 local en vez del endpoint configurado')
+        parser.add_argument('--bucket', default=None, help='Bucket (por defecto AWS_PRODUCT_BUCKET_NAME)')
+
+    def handle(self, *args, **options):
+        try:
+            sizes = [int(s) for s in options['sizes'].split(',') if s.strip()]
+        except ValueError:
+            raise CommandError("--sizes debe ser una lista de enteros separados por coma")
+        modes = [m for m in options['modes'].split(',') if m.strip()]
+        unknown = set(modes) - set(MODES)
+        if unknown:
+            raise CommandError(f"Modos desconocidos: {', '.join(sorted(unknown))}")
+
+        workdir = tempfile.mkdtemp(prefix="bench-uploads-")
+        try:
+            with ExitStack() as stack:
+                bucket = options['bucket'] or getattr(settings, "AWS_PRODUCT_BUCKET_NAME", None) or "bench"
+                if options['stand_in']:
+                    s3 = stack.enter_context(S3StandIn())
+                    stack.enter_context(override_settings(
+                        AWS_S3_ENDPOINT_URL=s3.endpoint_url,
+                        AWS_ACCESS_KEY_ID="bench",
+                        AWS_SECRET_ACCESS_KEY="bench-secret",
+                        AWS_S3_REGION_NAME="us-east-1",
+                        AWS_PRODUCT_BUCKET_NAME=bucket,
+                        MINIO_PUBLIC_URL=s3.endpoint_url,
+                    ))
+                    endpoint = s3.endpoint_url
+                else:
+                    endpoint = settings.AWS_S3_ENDPOINT_URL
+                    if any(m.startswith("drive-") for m in modes):
+                        raise CommandError("Los modos drive-* requieren --stand-in")
+                self.stdout.write(f"endpoint: {endpoint}  bucket: {bucket}  archivos/request: {options['files']}")
+                for size in sizes:
+                    paths = self._make_files(workdir, size, options['files'])
+                    self._report(size, options['files'], modes, paths, bucket, endpoint)
+        finally:
+            reset_minio_client()
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    def _make_files(self, workdir, size_mb, count):
+        paths = []
+        block = os.urandom(MB)
+        for i in range(count):
+            path = os.path.join(workdir, f"bench-{size_mb}mb-{i}.mp4")
+            with open(path, "wb") as fh:
+                for _ in range(size_mb):
+                    fh.write(block)
+            paths.append(path)
+        return paths
+
+    def _report(self, size, count, modes, paths, bucket, endpoint):
+        total_mb = size * count
+        self.stdout.write(f"\n{count} x {size} MB")
+        self.stdout.write(f"{'modo':>14} {'MB/s':>9} {'Δ RSS (MB)':>11} {'pico py (MB)':>13}")
+        ctx = multiprocessing.get_context("fork")
+        for mode in modes:
+            queue = ctx.Queue()
+            proc = ctx.Process(target=_measure, args=(mode, paths, bucket, endpoint, queue))
+            proc.start()
+            elapsed, rss, traced, error = queue.get()
+            proc.join()
+            if error:
+                self.stdout.write(f"{mode:>14} error: {error}")
+                continue
+            self.stdout.write(
+                f"{mode:>14} {total_mb / elapsed:>9,.1f} {rss / MB:>11,.1f} {traced / MB:>13,.1f}"
+            )
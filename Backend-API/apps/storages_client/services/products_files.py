@@ -5,7 +5,8 @@ from mimetypes import guess_type
 import logging
 from django.conf import settings
 from apps.storages_client.clients.minio_client import get_minio_client
-from apps.storages_client.services.s3_file_access import generate_presigned_url
+from apps.storages_client.services.uploads import confirm_direct_upload, presign_direct_upload, upload_stream
+from apps.storages_client.services.s3_file_access import generate_presigned_url, generate_presigned_urls
 
 logger = logging.getLogger(__name__)
 
@@ -30,15 +31,8 @@ def upload_product_file(file, product_id: int) -> dict:
     unique_id = uuid.uuid4().hex
     key = f"products/{product_id}/{unique_id}{ext}"
 
-    s3 = get_minio_client()
-    file.seek(0)
-
-    s3.upload_fileobj(
-        Fileobj=file,
-        Bucket=settings.AWS_PRODUCT_BUCKET_NAME,
-        Key=key,
-        ExtraArgs={"ContentType": file.content_type},
-    )
+    # Streaming: multipart por partes acotadas, sin leer el archivo entero
+    upload_stream(file, settings.AWS_PRODUCT_BUCKET_NAME, key, file.content_type)
 
     mime_type, _ = guess_type(file.name)
     url = generate_presigned_url(bucket=settings.AWS_PRODUCT_BUCKET_NAME, object_name=key)
@@ -51,6 +45,24 @@ def upload_product_file(file, product_id: int) -> dict:
     }
 
 
+
+def presign_product_upload(filename: str, content_type: str, product_id: int) -> dict:
+    """
+    Formulario firmado para que el cliente suba un archivo de producto directo
+    al bucket (archivos grandes que no deben pasar por el worker).
+    """
+    _validate_file_extension(filename)
+    return presign_direct_upload(settings.AWS_PRODUCT_BUCKET_NAME, f"products/{product_id}/", filename, content_type)
+
+
+def confirm_product_upload(key: str, filename: str, product_id: int) -> dict:
+    """
+    Confirma una subida directa de producto: valida que la key pertenezca al
+    recurso y que el objeto exista. Lanza ValueError si no.
+    """
+    _validate_file_extension(filename or key)
+    return confirm_direct_upload(settings.AWS_PRODUCT_BUCKET_NAME, f"products/{product_id}/", key, filename)
+
 def delete_product_file(key: str) -> bool:
     """
     Elimina un archivo del bucket de productos por su key.
@@ -80,3 +92,19 @@ def get_product_file_url(key: str, expiry_seconds: int = 300) -> str | None:
             f"❌ Error al generar URL firmada para archivo de producto ({key}): {e}"
         )
         return None
+
+
+def get_product_file_urls(keys, expiry_seconds: int = 300) -> dict:
+    """
+    URLs firmadas para varios archivos de producto de una vez ({key: url | None}).
+    """
+    keys = list(keys)
+    try:
+        return generate_presigned_urls(
+            bucket=settings.AWS_PRODUCT_BUCKET_NAME,
+            object_names=keys,
+            expiry_seconds=expiry_seconds
+        )
+    except Exception as e:
+        logger.error(f"❌ Error al generar URLs firmadas para archivos de producto: {e}")
+        return {key: None for key in keys}
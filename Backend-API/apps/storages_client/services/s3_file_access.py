@@ -1,46 +1,107 @@
 #/home/emadiaz/Escritorio/InventoryManagementSystem/InventoryManagementSystem-API/apps/storages_client/services/s3_file_access.py
-from django.conf import settings
-from apps.storages_client.clients.minio_client import get_minio_client
+import hashlib
 import logging
+from typing import Dict, Iterable, Optional
 from urllib.parse import urlparse, urlunparse
 
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.storages_client.clients.minio_client import get_minio_client
+
 logger = logging.getLogger(__name__)
 
+PRESIGNED_CACHE_PREFIX = "storages:presigned"
+
+
+def _public_base():
+    public = settings.MINIO_PUBLIC_URL
+    if not public:
+        raise Exception("MINIO_PUBLIC_URL no configurado correctamente.")
+    pub_parsed = urlparse(public)
+    # si public no trae esquema, asumimos http
+    return pub_parsed.scheme or 'http', pub_parsed.netloc or pub_parsed.path
+
+
+def _cache_ttl(expiry_seconds: int) -> int:
+    """
+    Tiempo durante el cual se reutiliza una URL firmada: se deja de servir
+    ``margin`` segundos antes de que venza, para que el cliente siempre reciba
+    una URL con vida útil suficiente.
+    """
+    margin = max(int(expiry_seconds * 0.2), getattr(settings, "PRESIGNED_URL_MIN_REMAINING", 30))
+    return max(expiry_seconds - margin, 0)
+
+
+def presigned_cache_key(bucket: str, object_name: str, expiry_seconds: int) -> str:
+    digest = hashlib.md5(f"{bucket}/{object_name}".encode("utf-8")).hexdigest()
+    return f"{PRESIGNED_CACHE_PREFIX}:{expiry_seconds}:{digest}"
+
+
+def _sign(client, bucket: str, object_name: str, expiry_seconds: int, public) -> str:
+    # 1) Generamos la URL presignada con MinIO
+    url = client.generate_presigned_url(
+        ClientMethod='get_object',
+        Params={'Bucket': bucket, 'Key': object_name},
+        ExpiresIn=expiry_seconds
+    )
+    # 2) Sustituimos host+puerto público y esquema
+    scheme, netloc = public
+    return urlunparse(urlparse(url)._replace(scheme=scheme, netloc=netloc))
+
+
 def generate_presigned_url(bucket: str, object_name: str, expiry_seconds: int = 300) -> str:
     """
     Genera una URL presignada temporal para acceder a un objeto privado en MinIO/S3.
     Reemplaza host y esquema por los configurados en MINIO_PUBLIC_URL.
+    La URL se reutiliza (cache por bucket, key y expiración) hasta poco antes de vencer.
     """
     if not bucket or not object_name:
         raise ValueError("Se requieren bucket y object_name para generar la URL presignada.")
 
-    client = get_minio_client()
+    cache_key = presigned_cache_key(bucket, object_name, expiry_seconds)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached
 
     try:
-        # 1) Generamos la URL presignada con MinIO
-        url = client.generate_presigned_url(
-            ClientMethod='get_object',
-            Params={'Bucket': bucket, 'Key': object_name},
-            ExpiresIn=expiry_seconds
-        )
-
-        # 2) Parseamos la URL y sustituimos host+puerto público y esquema
-        parsed = urlparse(url)
-        public = settings.MINIO_PUBLIC_URL
-        if not public:
-            raise Exception("MINIO_PUBLIC_URL no configurado correctamente.")
-
-        pub_parsed = urlparse(public)
-        # si public no trae esquema, asumimos http
-        scheme = pub_parsed.scheme or 'http'
-        netloc = pub_parsed.netloc or pub_parsed.path
-
-        # 3) Reemplazamos scheme y netloc
-        secured = parsed._replace(scheme=scheme, netloc=netloc)
-
-        # 4) Reconstruimos la URL final
-        return urlunparse(secured)
-
+        url = _sign(get_minio_client(), bucket, object_name, expiry_seconds, _public_base())
     except Exception as e:
         logger.error(f"❌ Error al generar URL presignada para '{object_name}': {e}")
         raise Exception(f"Error al generar URL presignada para '{object_name}': {e}")
+
+    ttl = _cache_ttl(expiry_seconds)
+    if ttl:
+        cache.set(cache_key, url, ttl)
+    return url
+
+
+def generate_presigned_urls(bucket: str, object_names: Iterable[str], expiry_seconds: int = 300) -> Dict[str, Optional[str]]:
+    """
+    Versión en lote para listados: un ``get_many`` al cache, firma local de
+    las faltantes con el cliente compartido y un ``set_many``.
+    Devuelve {object_name: url}; None para las que no se pudieron firmar.
+    """
+    names = [n for n in dict.fromkeys(object_names) if n]
+    if not names:
+        return {}
+    keys = {presigned_cache_key(bucket, n, expiry_seconds): n for n in names}
+    found = cache.get_many(list(keys))
+    urls = {keys[k]: url for k, url in found.items()}
+
+    missing = [n for n in names if n not in urls]
+    if missing:
+        client, public = get_minio_client(), _public_base()
+        fresh = {}
+        for name in missing:
+            try:
+                urls[name] = _sign(client, bucket, name, expiry_seconds, public)
+                fresh[presigned_cache_key(bucket, name, expiry_seconds)] = urls[name]
+            except Exception as e:
+                logger.error(f"❌ Error al generar URL presignada para '{name}': {e}")
+                urls[name] = None
+        ttl = _cache_ttl(expiry_seconds)
+        if fresh and ttl:
+            cache.set_many(fresh, ttl)
+    return urls
+
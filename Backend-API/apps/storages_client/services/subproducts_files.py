@@ -5,6 +5,7 @@ from mimetypes import guess_type
 import logging
 from django.conf import settings
 from apps.storages_client.clients.minio_client import get_minio_client
+from apps.storages_client.services.uploads import confirm_direct_upload, presign_direct_upload, upload_stream
 from apps.storages_client.services.s3_file_access import generate_presigned_url
 
 logger = logging.getLogger(__name__)
@@ -30,15 +31,8 @@ def upload_subproduct_file(file, product_id: int, subproduct_id: int) -> dict:
     unique_id = uuid.uuid4().hex
     key = f"products/{product_id}/subproducts/{subproduct_id}/{unique_id}{ext}"
 
-    s3 = get_minio_client()
-    file.seek(0)
-
-    s3.upload_fileobj(
-        Fileobj=file,
-        Bucket=settings.AWS_PRODUCT_BUCKET_NAME,
-        Key=key,
-        ExtraArgs={"ContentType": file.content_type},
-    )
+    # Streaming: multipart por partes acotadas, sin leer el archivo entero
+    upload_stream(file, settings.AWS_PRODUCT_BUCKET_NAME, key, file.content_type)
 
     mime_type, _ = guess_type(file.name)
     url = generate_presigned_url(bucket=settings.AWS_PRODUCT_BUCKET_NAME, object_name=key)
@@ -51,6 +45,24 @@ def upload_subproduct_file(file, product_id: int, subproduct_id: int) -> dict:
     }
 
 
+
+def presign_subproduct_upload(filename: str, content_type: str, product_id: int, subproduct_id: int) -> dict:
+    """
+    Formulario firmado para que el cliente suba un archivo de subproducto directo
+    al bucket (archivos grandes que no deben pasar por el worker).
+    """
+    _validate_file_extension(filename)
+    return presign_direct_upload(settings.AWS_PRODUCT_BUCKET_NAME, f"products/{product_id}/subproducts/{subproduct_id}/", filename, content_type)
+
+
+def confirm_subproduct_upload(key: str, filename: str, product_id: int, subproduct_id: int) -> dict:
+    """
+    Confirma una subida directa de subproducto: valida que la key pertenezca al
+    recurso y que el objeto exista. Lanza ValueError si no.
+    """
+    _validate_file_extension(filename or key)
+    return confirm_direct_upload(settings.AWS_PRODUCT_BUCKET_NAME, f"products/{product_id}/subproducts/{subproduct_id}/", key, filename)
+
 def delete_subproduct_file(key: str) -> bool:
     """
     Elimina un archivo de subproducto por su key.
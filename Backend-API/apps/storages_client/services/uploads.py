@@ -0,0 +1,187 @@
+# apps/storages_client/services/uploads.py
+"""
+Pipeline de subida a MinIO/S3.
+
+- Multipart por partes de ``AWS_S3_MULTIPART_CHUNKSIZE`` (por defecto 8 MB)
+  a partir de ``AWS_S3_MULTIPART_THRESHOLD``: boto3 lee el archivo de a una
+  parte, así que la memoria queda acotada a ~chunksize x concurrencia sin
+  importar el tamaño del archivo (Django ya deja en disco los uploads mayores
+  a FILE_UPLOAD_MAX_MEMORY_SIZE).
+- Varias subidas de una misma request corren en paralelo (``upload_many``).
+- ``MultipartFileStream`` arma un cuerpo multipart/form-data leído por partes
+  para POSTs a servicios HTTP (API de Drive).
+- ``create_presigned_post`` permite que el navegador suba directo al bucket
+  (videos/PDF grandes) sin pasar por el worker de Django.
+"""
+import logging
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from mimetypes import guess_type
+from typing import Callable, List, Sequence, Tuple
+from urllib.parse import urlparse, urlunparse
+
+from boto3.s3.transfer import TransferConfig
+from django.conf import settings
+
+from apps.storages_client.clients.minio_client import get_minio_client
+from apps.storages_client.services.s3_file_access import _public_base, generate_presigned_url
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+
+def transfer_config() -> TransferConfig:
+    concurrency = getattr(settings, "AWS_S3_MULTIPART_CONCURRENCY", 4)
+    config = TransferConfig(
+        multipart_threshold=getattr(settings, "AWS_S3_MULTIPART_THRESHOLD", 8 * MB),
+        multipart_chunksize=getattr(settings, "AWS_S3_MULTIPART_CHUNKSIZE", 8 * MB),
+        max_concurrency=concurrency,
+        use_threads=True,
+    )
+    # s3transfer retiene hasta 10 partes en memoria por stream (no expuesto en
+    # el constructor de boto3); se acota a las que efectivamente se envían.
+    config.max_in_memory_upload_chunks = concurrency
+    return config
+
+
+def upload_stream(file, bucket: str, key: str, content_type: str = None) -> None:
+    """
+    Sube un archivo en streaming (multipart si supera el umbral). Si Django ya
+    lo dejó en disco (TemporaryUploadedFile) se sube desde la ruta: cada parte
+    se lee del disco al enviarse y no se copia a memoria.
+    """
+    extra = {"ContentType": content_type} if content_type else None
+    s3 = get_minio_client()
+    path = file.temporary_file_path() if hasattr(file, "temporary_file_path") else None
+    if path:
+        s3.upload_file(Filename=path, Bucket=bucket, Key=key, ExtraArgs=extra, Config=transfer_config())
+        return
+    file.seek(0)
+    s3.upload_fileobj(Fileobj=file, Bucket=bucket, Key=key, ExtraArgs=extra, Config=transfer_config())
+
+
+class MultipartFileStream:
+    """
+    File-like de sólo lectura con un único campo ``file``. ``requests`` lo envía
+    por partes y usa ``len`` para el Content-Length, así que la memoria no
+    depende del tamaño del archivo.
+    """
+
+    def __init__(self, file, filename: str, content_type: str, field: str = "file"):
+        self.boundary = uuid.uuid4().hex
+        self.content_type = f"multipart/form-data; boundary={self.boundary}"
+        head = (
+            f"--{self.boundary}\r\n"
+            f'Content-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+            f"Content-Type: {content_type}\r\n\r\n"
+        ).encode()
+        tail = f"\r\n--{self.boundary}--\r\n".encode()
+        file.seek(0, os.SEEK_END)
+        size = file.tell()
+        file.seek(0)
+        self.len = len(head) + size + len(tail)
+        self._parts = [BytesIO(head), file, BytesIO(tail)]
+
+    def __len__(self):
+        return self.len
+
+    def read(self, size: int = -1) -> bytes:
+        out = bytearray()
+        while self._parts and (size < 0 or len(out) < size):
+            chunk = self._parts[0].read(-1 if size < 0 else size - len(out))
+            if not chunk:
+                self._parts.pop(0)
+                continue
+            out += chunk
+        return bytes(out)
+
+
+def upload_many(jobs: Sequence[Callable[[], dict]], max_workers: int = None) -> List[Tuple[dict, Exception]]:
+    """
+    Ejecuta las subidas en paralelo y devuelve, en el mismo orden,
+    ``(resultado, None)`` o ``(None, excepción)`` por cada una.
+    """
+    if not jobs:
+        return []
+    workers = min(len(jobs), max_workers or getattr(settings, "AWS_S3_UPLOAD_WORKERS", 4))
+    if workers <= 1:
+        return [_run(job) for job in jobs]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="s3-upload") as pool:
+        return list(pool.map(_run, jobs))
+
+
+def _run(job):
+    try:
+        return job(), None
+    except Exception as e:
+        return None, e
+
+
+def create_presigned_post(bucket: str, key: str, content_type: str, max_bytes: int, expiry_seconds: int = 900) -> dict:
+    """
+    Formulario firmado para subir ``key`` directo al bucket. Se fuerzan el
+    Content-Type y el tamaño máximo. La URL apunta a MINIO_PUBLIC_URL.
+    """
+    post = get_minio_client().generate_presigned_post(
+        Bucket=bucket,
+        Key=key,
+        Fields={"Content-Type": content_type},
+        Conditions=[
+            {"Content-Type": content_type},
+            ["content-length-range", 1, max_bytes],
+        ],
+        ExpiresIn=expiry_seconds,
+    )
+    scheme, netloc = _public_base()
+    url = urlunparse(urlparse(post["url"])._replace(scheme=scheme, netloc=netloc))
+    return {"url": url, "fields": post["fields"], "expires_in": expiry_seconds}
+
+
+def stat_object(bucket: str, key: str) -> dict | None:
+    """HEAD del objeto: {size, content_type} o None si no existe."""
+    try:
+        head = get_minio_client().head_object(Bucket=bucket, Key=key)
+    except Exception as e:
+        logger.info(f"HEAD {bucket}/{key} falló: {e}")
+        return None
+    return {"size": head.get("ContentLength"), "content_type": head.get("ContentType")}
+
+
+def presign_direct_upload(bucket: str, prefix: str, filename: str, content_type: str) -> dict:
+    """
+    Reserva una key única bajo ``prefix`` y devuelve el formulario firmado
+    para subirla desde el cliente: {key, url, fields, expires_in}.
+    """
+    _, ext = os.path.splitext(filename)
+    key = f"{prefix}{uuid.uuid4().hex}{ext.lower()}"
+    post = create_presigned_post(
+        bucket,
+        key,
+        content_type or "application/octet-stream",
+        max_bytes=getattr(settings, "DIRECT_UPLOAD_MAX_BYTES", 2 * 1024 * MB),
+        expiry_seconds=getattr(settings, "DIRECT_UPLOAD_EXPIRY_SECONDS", 900),
+    )
+    return {"key": key, **post}
+
+
+def confirm_direct_upload(bucket: str, prefix: str, key: str, filename: str) -> dict:
+    """
+    Verifica que una subida directa haya llegado al bucket y devuelve el mismo
+    dict que las subidas por Django ({key, url, name, mimeType}).
+    """
+    if not key or not key.startswith(prefix) or ".." in key or "/" in key[len(prefix):]:
+        raise ValueError("Key inválida para este recurso.")
+    info = stat_object(bucket, key)
+    if info is None:
+        raise ValueError("El archivo no fue subido al bucket.")
+    mime_type = info["content_type"] or guess_type(filename or key)[0]
+    return {
+        "key": key,
+        "url": generate_presigned_url(bucket=bucket, object_name=key),
+        "name": filename or os.path.basename(key),
+        "mimeType": mime_type or "application/octet-stream",
+        "size": info["size"],
+    }
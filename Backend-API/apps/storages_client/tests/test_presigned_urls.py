@@ -0,0 +1,47 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from apps.storages_client.clients.minio_client import get_minio_client, reset_minio_client
+from apps.storages_client.services.s3_file_access import generate_presigned_url, generate_presigned_urls
+
+S3_SETTINGS = dict(
+    AWS_S3_ENDPOINT_URL="http://minio.internal:9000",
+    AWS_ACCESS_KEY_ID="test",
+    AWS_SECRET_ACCESS_KEY="test-secret",
+    AWS_S3_REGION_NAME="us-east-1",
+    MINIO_PUBLIC_URL="https://files.example.com",
+)
+
+
+@override_settings(**S3_SETTINGS)
+class PresignedUrlTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        reset_minio_client()
+
+    def test_client_is_shared(self):
+        self.assertIs(get_minio_client(), get_minio_client())
+        self.assertEqual(get_minio_client().meta.config.max_pool_connections, 50)
+
+    def test_url_is_reused_and_points_to_public_host(self):
+        url = generate_presigned_url("products", "products/1/a.png")
+        self.assertTrue(url.startswith("https://files.example.com/products/products/1/a.png?"))
+        with mock.patch(
+            "apps.storages_client.services.s3_file_access.get_minio_client"
+        ) as client:
+            self.assertEqual(generate_presigned_url("products", "products/1/a.png"), url)
+            client.assert_not_called()
+        # Otra expiración, otra URL
+        self.assertNotEqual(generate_presigned_url("products", "products/1/a.png", 3600), url)
+
+    def test_batch_signs_only_missing_keys(self):
+        cached = generate_presigned_url("products", "k1")
+        client = get_minio_client()
+        with mock.patch.object(client, "generate_presigned_url", wraps=client.generate_presigned_url) as sign:
+            urls = generate_presigned_urls("products", ["k1", "k2", "k3", "k2"])
+        self.assertEqual(list(urls), ["k1", "k2", "k3"])
+        self.assertEqual(urls["k1"], cached)
+        self.assertEqual(sign.call_count, 2)
+        self.assertEqual(generate_presigned_urls("products", ["k2"])["k2"], urls["k2"])
@@ -0,0 +1,95 @@
+import io
+from email.parser import BytesParser
+from email.policy import HTTP
+
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, override_settings
+
+from apps.storages_client.clients.minio_client import reset_minio_client
+from apps.storages_client.clients.s3_stand_in import S3StandIn
+from apps.storages_client.services.products_files import confirm_product_upload, upload_product_file
+from apps.storages_client.services.uploads import (
+    MB, MultipartFileStream, presign_direct_upload, upload_many, upload_stream,
+)
+
+
+class UploadPipelineTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.s3 = S3StandIn().__enter__()
+        cls.settings_override = override_settings(
+            AWS_S3_ENDPOINT_URL=cls.s3.endpoint_url,
+            AWS_ACCESS_KEY_ID="test",
+            AWS_SECRET_ACCESS_KEY="test-secret",
+            AWS_S3_REGION_NAME="us-east-1",
+            AWS_PRODUCT_BUCKET_NAME="products",
+            MINIO_PUBLIC_URL="https://files.example.com",
+            AWS_S3_MULTIPART_THRESHOLD=5 * MB,
+            AWS_S3_MULTIPART_CHUNKSIZE=5 * MB,
+        )
+        cls.settings_override.enable()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.settings_override.disable()
+        cls.s3.__exit__(None, None, None)
+        reset_minio_client()
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+        reset_minio_client()
+
+    def test_large_file_goes_multipart(self):
+        parts_before = self.s3.parts
+        upload_stream(io.BytesIO(b"x" * (11 * MB)), "products", "big.mp4", "video/mp4")
+        self.assertEqual(self.s3.objects["products/big.mp4"], {"size": 11 * MB, "content_type": "video/mp4"})
+        self.assertEqual(self.s3.parts - parts_before, 3)
+
+    def test_upload_many_keeps_order_and_captures_errors(self):
+        files = [
+            SimpleUploadedFile("a.png", b"a" * 10, content_type="image/png"),
+            SimpleUploadedFile("b.exe", b"b", content_type="application/octet-stream"),
+            SimpleUploadedFile("c.pdf", b"c" * 20, content_type="application/pdf"),
+        ]
+        results = upload_many([(lambda f=f: upload_product_file(f, product_id=7)) for f in files])
+
+        self.assertEqual([r["name"] if r else None for r, _ in results], ["a.png", None, "c.pdf"])
+        self.assertIsInstance(results[1][1], ValueError)
+        self.assertEqual(self.s3.objects[f"products/{results[2][0]['key']}"]["size"], 20)
+
+    def test_direct_upload_confirmation(self):
+        form = presign_direct_upload("products", "products/7/", "manual.PDF", "application/pdf")
+        self.assertRegex(form["key"], r"^products/7/[0-9a-f]{32}\.pdf$")
+        self.assertTrue(form["url"].startswith("https://files.example.com/"))
+        self.assertEqual(form["fields"]["Content-Type"], "application/pdf")
+
+        with self.assertRaisesMessage(ValueError, "no fue subido"):
+            confirm_product_upload(form["key"], "manual.pdf", product_id=7)
+        with self.assertRaisesMessage(ValueError, "Key inválida"):
+            confirm_product_upload(form["key"], "manual.pdf", product_id=8)
+        with self.assertRaisesMessage(ValueError, "Key inválida"):
+            confirm_product_upload("products/7/subproducts/1/x.pdf", "x.pdf", product_id=7)
+
+        upload_stream(io.BytesIO(b"%PDF" * 100), "products", form["key"], "application/pdf")
+        res = confirm_product_upload(form["key"], "manual.pdf", product_id=7)
+        self.assertEqual((res["name"], res["mimeType"], res["size"]), ("manual.pdf", "application/pdf", 400))
+
+
+class MultipartFileStreamTests(SimpleTestCase):
+    def test_body_is_valid_multipart_and_read_in_chunks(self):
+        payload = bytes(range(256)) * 1000
+        body = MultipartFileStream(io.BytesIO(payload), "doc.pdf", "application/pdf")
+
+        chunks = iter(lambda: body.read(4096), b"")
+        raw = b"".join(chunks)
+        self.assertEqual(len(raw), len(body))
+
+        message = BytesParser(policy=HTTP).parsebytes(
+            f"Content-Type: {body.content_type}\r\n\r\n".encode() + raw
+        )
+        (part,) = message.iter_parts()
+        self.assertEqual(part.get_filename(), "doc.pdf")
+        self.assertEqual(part.get_content(), payload)
@@ -1,7 +1,7 @@
 
 """Utilidades públicas para operaciones comunes de almacenamiento."""
 
-from .services.s3_file_access import generate_presigned_url
+from .services.s3_file_access import generate_presigned_url, generate_presigned_urls
 
-__all__ = ["generate_presigned_url"]
+__all__ = ["generate_presigned_url", "generate_presigned_urls"]
 
@@ -1,8 +1,6 @@
 import logging
 from datetime import datetime
 
-from django.conf import settings
-from django.core.cache import cache
 from django.shortcuts import get_object_or_404
 
 from drf_spectacular.utils import extend_schema
@@ -11,6 +9,7 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from apps.core.cache_aside import cached_response, list_cache_filters
 from apps.core.pagination import Pagination
 from apps.core.utils import broadcast_crud_event
 from apps.products.models.supplier_product_model import SupplierProduct
@@ -42,6 +41,9 @@ from apps.suppliers.utils.cache_invalidation import (
     invalidate_supplier_discount_cache,
 )
 from apps.suppliers.utils.cache_keys import (
+    SUPPLIER_DESCRIPTION_LIST_CACHE_PREFIX,
+    SUPPLIER_DISCOUNT_LIST_CACHE_PREFIX,
+    SUPPLIER_COST_HISTORY_CACHE_PREFIX,
     supplier_description_list_cache_key,
     supplier_discount_list_cache_key,
     supplier_cost_history_cache_key,
@@ -63,14 +65,6 @@ def _get_supplier_product(prod_pk: int, sp_pk: int) -> SupplierProduct:
     )
 
 
-def _cache_filters(request):
-    params = request.query_params.copy()
-    filters = {k: params.get(k) for k in params}
-    filters.setdefault("page", params.get("page", 1))
-    filters.setdefault("page_size", params.get("page_size", Pagination.page_size))
-    return filters
-
-
 def _parse_bool(value):
     if value is None:
         return None
@@ -99,33 +93,26 @@ def supplier_description_list_create_view(request, prod_pk: int, sp_pk: int):
     supplier_product = _get_supplier_product(prod_pk, sp_pk)
 
     if request.method == "GET":
-        filters = _cache_filters(request)
+        def build():
+            qs = SupplierProductDescriptionRepository.list_active(
+                supplier_product,
+                search=request.query_params.get("search"),
+            )
+            paginator = Pagination()
+            page = paginator.paginate_queryset(qs, request)
+            serializer = SupplierProductDescriptionSerializer(
+                page,
+                many=True,
+                context={"request": request},
+            )
+            return paginator.get_paginated_response(serializer.data)
+
+        filters = list_cache_filters(request)
         cache_key = supplier_description_list_cache_key(
             supplier_product_id=supplier_product.id,
             **filters,
         )
-        use_cache = not settings.DEBUG
-        if use_cache:
-            cached = cache.get(cache_key)
-            if cached is not None:
-                return Response(cached)
-
-        qs = SupplierProductDescriptionRepository.list_active(
-            supplier_product,
-            search=request.query_params.get("search"),
-        )
-        paginator = Pagination()
-        page = paginator.paginate_queryset(qs, request)
-        serializer = SupplierProductDescriptionSerializer(
-            page,
-            many=True,
-            context={"request": request},
-        )
-        response = paginator.get_paginated_response(serializer.data)
-
-        if use_cache:
-            cache.set(cache_key, response.data, DESC_LIST_TTL)
-        return response
+        return cached_response(cache_key, build, DESC_LIST_TTL, prefix=SUPPLIER_DESCRIPTION_LIST_CACHE_PREFIX)
 
     if not request.user.is_staff:
         return Response({"detail": "Solo administradores."}, status=status.HTTP_403_FORBIDDEN)
@@ -192,31 +179,24 @@ def supplier_discount_list_create_view(request, prod_pk: int, sp_pk: int):
     supplier_product = _get_supplier_product(prod_pk, sp_pk)
 
     if request.method == "GET":
-        filters = _cache_filters(request)
+        def build():
+            negative_only = _parse_bool(request.query_params.get("negative_only"))
+            qs = SupplierProductDiscountRepository.list_active(
+                supplier_product,
+                search=request.query_params.get("search"),
+                negative_only=negative_only,
+            )
+            paginator = Pagination()
+            page = paginator.paginate_queryset(qs, request)
+            serializer = SupplierProductDiscountSerializer(page, many=True)
+            return paginator.get_paginated_response(serializer.data)
+
+        filters = list_cache_filters(request)
         cache_key = supplier_discount_list_cache_key(
             supplier_product_id=supplier_product.id,
             **filters,
         )
-        use_cache = not settings.DEBUG
-        if use_cache:
-            cached = cache.get(cache_key)
-            if cached is not None:
-                return Response(cached)
-
-        negative_only = _parse_bool(request.query_params.get("negative_only"))
-        qs = SupplierProductDiscountRepository.list_active(
-            supplier_product,
-            search=request.query_params.get("search"),
-            negative_only=negative_only,
-        )
-        paginator = Pagination()
-        page = paginator.paginate_queryset(qs, request)
-        serializer = SupplierProductDiscountSerializer(page, many=True)
-        response = paginator.get_paginated_response(serializer.data)
-
-        if use_cache:
-            cache.set(cache_key, response.data, DISCOUNT_LIST_TTL)
-        return response
+        return cached_response(cache_key, build, DISCOUNT_LIST_TTL, prefix=SUPPLIER_DISCOUNT_LIST_CACHE_PREFIX)
 
     if not request.user.is_staff:
         return Response({"detail": "Solo administradores."}, status=status.HTTP_403_FORBIDDEN)
@@ -280,34 +260,27 @@ def supplier_discount_detail_view(request, prod_pk: int, sp_pk: int, disc_pk: in
 @permission_classes([IsAuthenticated])
 def supplier_cost_history_list_view(request, prod_pk: int, sp_pk: int):
     supplier_product = _get_supplier_product(prod_pk, sp_pk)
-    filters = _cache_filters(request)
+    def build():
+        try:
+            date_from = _parse_date(request.query_params.get("date_from"))
+            date_to = _parse_date(request.query_params.get("date_to"))
+        except ValueError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        qs = SupplierCostHistoryRepository.list_by_supplier_product(
+            supplier_product,
+            date_from=date_from,
+            date_to=date_to,
+            currency=request.query_params.get("currency"),
+        )
+        paginator = Pagination()
+        page = paginator.paginate_queryset(qs, request)
+        serializer = SupplierCostHistorySerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+    filters = list_cache_filters(request)
     cache_key = supplier_cost_history_cache_key(
         supplier_product_id=supplier_product.id,
         **filters,
     )
-    use_cache = not settings.DEBUG
-    if use_cache:
-        cached = cache.get(cache_key)
-        if cached is not None:
-            return Response(cached)
-
-    try:
-        date_from = _parse_date(request.query_params.get("date_from"))
-        date_to = _parse_date(request.query_params.get("date_to"))
-    except ValueError as exc:
-        return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
-
-    qs = SupplierCostHistoryRepository.list_by_supplier_product(
-        supplier_product,
-        date_from=date_from,
-        date_to=date_to,
-        currency=request.query_params.get("currency"),
-    )
-    paginator = Pagination()
-    page = paginator.paginate_queryset(qs, request)
-    serializer = SupplierCostHistorySerializer(page, many=True)
-    response = paginator.get_paginated_response(serializer.data)
-
-    if use_cache:
-        cache.set(cache_key, response.data, COST_HISTORY_TTL)
-    return response
+    return cached_response(cache_key, build, COST_HISTORY_TTL, prefix=SUPPLIER_COST_HISTORY_CACHE_PREFIX)
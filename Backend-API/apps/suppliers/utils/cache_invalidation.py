@@ -1,4 +1,4 @@
-from apps.products.utils.redis_access import delete_keys_by_pattern
+from apps.products.utils.cache_tags import invalidate_tags
 from .cache_keys import (
     SUPPLIER_DESCRIPTION_LIST_CACHE_PREFIX,
     SUPPLIER_DISCOUNT_LIST_CACHE_PREFIX,
@@ -7,12 +7,12 @@ from .cache_keys import (
 
 
 def invalidate_supplier_description_cache():
-    delete_keys_by_pattern(SUPPLIER_DESCRIPTION_LIST_CACHE_PREFIX)
+    invalidate_tags(SUPPLIER_DESCRIPTION_LIST_CACHE_PREFIX)
 
 
 def invalidate_supplier_discount_cache():
-    delete_keys_by_pattern(SUPPLIER_DISCOUNT_LIST_CACHE_PREFIX)
+    invalidate_tags(SUPPLIER_DISCOUNT_LIST_CACHE_PREFIX)
 
 
 def invalidate_supplier_cost_history_cache():
-    delete_keys_by_pattern(SUPPLIER_COST_HISTORY_CACHE_PREFIX)
+    invalidate_tags(SUPPLIER_COST_HISTORY_CACHE_PREFIX)
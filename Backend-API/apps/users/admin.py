@@ -1,5 +1,9 @@
 from django.contrib import admin
+from django.db import transaction
+
+from apps.products.utils.cache_tags import deferred_invalidation
 from .models.user_model import User
+from .utils.cache_invalidation import invalidate_user_cache
 
 class UserAdmin(admin.ModelAdmin):
     list_display = ('username', 'email', 'name', 'last_name', 'status', 'is_active')
@@ -7,17 +11,34 @@ class UserAdmin(admin.ModelAdmin):
     list_filter = ('status', 'is_active')
     list_editable = ('status', 'is_active')  # Hacer que los campos status e is_active sean editables en línea
 
+    def _set_active(self, queryset, is_active):
+        """
+        UPDATE masivo de ``is_active``. No pasa por save(), así que los
+        usuarios afectados se invalidan acá (cache de autenticación incluida),
+        en el momento y otra vez al confirmar, como en apps.users.signals.
+        """
+        user_ids = list(queryset.values_list('pk', flat=True))
+        queryset.update(is_active=is_active)
+
+        def _invalidate():
+            with deferred_invalidation():
+                for user_id in user_ids:
+                    invalidate_user_cache(user_id)
+
+        _invalidate()
+        transaction.on_commit(_invalidate)
+
     def activate_users(self, request, queryset):
         """
         Acción personalizada para activar usuarios seleccionados.
         """
-        queryset.update(is_active=True)
+        self._set_active(queryset, True)
 
     def deactivate_users(self, request, queryset):
         """
         Acción personalizada para desactivar usuarios seleccionados.
         """
-        queryset.update(is_active=False)
+        self._set_active(queryset, False)
 
     # Registrar las acciones personalizadas
     actions = ['activate_users', 'deactivate_users']
@@ -5,6 +5,7 @@ from apps.users.api.views.user import (
     image_delete_view, image_replace_view, user_lookup_view
 )
 from apps.users.api.views.reset_password import password_reset_confirm
+from apps.users.api.views.permissions import permission_matrix_view
 
 urlpatterns = [
     # Rutas para el restablecimiento de contraseña
@@ -19,6 +20,7 @@ urlpatterns = [
     path('profile/', profile_view, name='profile'),
     path('list/', user_list_view, name='user_list'),
     path('lookup/', user_lookup_view, name='user_lookup'),
+    path('permissions/matrix/', permission_matrix_view, name='permission_matrix'),
     path('<int:pk>/', user_detail_view, name='user_detail'),
 
     # 🖼️ Rutas del proxy de imagen
@@ -0,0 +1,18 @@
+from drf_spectacular.utils import extend_schema
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+
+from apps.users.docs.user_doc import permission_matrix_doc
+from apps.users.models.user_model import User
+from apps.users.permissions import CanViewUsers, effective_matrix
+
+
+@extend_schema(**permission_matrix_doc)
+@api_view(['GET'])
+@permission_classes([CanViewUsers])
+def permission_matrix_view(request):
+    role = request.GET.get('role') or None
+    if role and role not in User.Role.values:
+        return Response({'detail': f'Rol inválido: {role}.'}, status=status.HTTP_400_BAD_REQUEST)
+    return Response(effective_matrix(role))
@@ -0,0 +1,105 @@
+# apps/users/authentication.py
+"""
+Resolución de usuarios autenticados por JWT con cache.
+
+simplejwt valida la firma del token sin tocar la base, pero ``get_user`` hace
+un SELECT sobre ``users_user`` en cada request (y en cada conexión WebSocket).
+Acá el usuario se cachea por un TTL corto bajo una clave que incluye su id y
+la generación de su tag ``auth_user:<id>``: cualquier ``save()`` del usuario
+(cambio de rol, baja, ``is_active``) incrementa el tag y la próxima request
+vuelve a leer la fila, así que la revocación es inmediata.
+
+El hash de la contraseña no se guarda en la cache: el usuario cacheado lleva
+``password`` diferido (si algo lo lee, Django lo trae de la base) y solo el
+digest que simplejwt compara contra el claim de revocación.
+"""
+import copy
+import logging
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from apps.products.utils.cache_tags import get_tag_version, invalidate_tags
+
+logger = logging.getLogger(__name__)
+
+AUTH_USER_TAG_PREFIX = "auth_user"
+AUTH_USER_CACHE_PREFIX = "auth:user"
+AUTH_USER_TTL = getattr(settings, "AUTH_USER_CACHE_TTL", 60)  # 1 minuto
+
+
+def _user_tag(user_id) -> str:
+    return f"{AUTH_USER_TAG_PREFIX}:{user_id}"
+
+
+def invalidate_auth_user(user_id) -> None:
+    """Fuerza a releer el usuario en la próxima request autenticada."""
+    invalidate_tags(_user_tag(user_id))
+
+
+def _without_password(user):
+    """Copia del usuario sin el hash de la contraseña, lista para cachear."""
+    cached = copy.copy(user)
+    cached._password_digest = get_md5_hash_password(user.password)
+    # Sin el atributo en __dict__ el campo queda diferido: save() no lo pisa
+    cached.__dict__.pop("password", None)
+    return cached
+
+
+def _password_digest(user) -> str:
+    digest = getattr(user, "_password_digest", None)
+    return digest if digest is not None else get_md5_hash_password(user.password)
+
+
+def get_cached_user(user_id):
+    """
+    Devuelve el usuario ``user_id`` (o None si no existe), desde la cache
+    mientras su tag no haya cambiado.
+    """
+    key = f"{AUTH_USER_CACHE_PREFIX}:{user_id}:{get_tag_version(_user_tag(user_id))}"
+    try:
+        user = cache.get(key)
+    except Exception as e:
+        logger.debug("[Auth][cache] get error: %s", e)
+        user = None
+    if user is not None:
+        return user
+
+    User = get_user_model()
+    try:
+        user = User.objects.get(**{api_settings.USER_ID_FIELD: user_id})
+    except User.DoesNotExist:
+        return None
+    user = _without_password(user)
+    try:
+        cache.set(key, user, AUTH_USER_TTL)
+    except Exception as e:
+        logger.debug("[Auth][cache] set error: %s", e)
+    return user
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """``JWTAuthentication`` que resuelve el usuario con ``get_cached_user``."""
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        user = get_cached_user(user_id)
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if api_settings.CHECK_REVOKE_TOKEN and (
+            validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != _password_digest(user)
+        ):
+            raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+        return user
@@ -237,3 +237,24 @@ user_lookup_doc = {
         401: OpenApiResponse(description="No autenticado")
     }
 }
+
+# --- Matriz de permisos por rol ---
+permission_matrix_doc = {
+    "tags": ["Users"],
+    "summary": "Matriz efectiva de permisos",
+    "operation_id": "permission_matrix",
+    "description": (
+        "Devuelve la matriz compilada de `apps.users.permissions`: `methods` lista, por módulo y rol, "
+        "los métodos HTTP que aceptan las clases de permiso; `actions` lista, por módulo y acción, "
+        "los roles que habilita `user_can`. Con `?role=` se limita a un rol."
+    ),
+    "parameters": [
+        OpenApiParameter(name="role", description="Rol a consultar (ADMIN, MANAGER, ...)", required=False, type=str),
+    ],
+    "responses": {
+        200: OpenApiResponse(description="Matriz de permisos"),
+        400: OpenApiResponse(description="Rol inválido"),
+        401: OpenApiResponse(description="No autenticado"),
+        403: OpenApiResponse(description="Sin permiso para ver usuarios"),
+    }
+}
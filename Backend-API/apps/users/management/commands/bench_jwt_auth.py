@@ -0,0 +1,81 @@
+import random
+import statistics
+import time
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.users.authentication import CachedJWTAuthentication, invalidate_auth_user
+
+
+class _Rollback(Exception):
+    pass
+
+
+class QueryCounter:
+    """execute_wrapper que cuenta queries (sin el límite del log de DEBUG)."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide queries y latencia por request de la autenticación JWT con "
+        "simplejwt (SELECT del usuario en cada request) y con el usuario "
+        "cacheado. El usuario de prueba se crea en una transacción que se revierte."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=2000, help='Requests autenticadas por variante')
+        parser.add_argument('--invalidate-every', type=int, default=0,
+                            help='Invalida el usuario cada N requests (0 = nunca)')
+
+    def handle(self, *args, **options):
+        total = options['requests']
+        every = options['invalidate_every']
+        if total < 1 or every < 0:
+            raise CommandError("--requests debe ser positivo e --invalidate-every no negativo")
+
+        from apps.users.models.user_model import User
+        self.stdout.write(f"motor: {connection.vendor} | cache: {cache.__class__.__name__}")
+        try:
+            with transaction.atomic():
+                user = User.objects.create_user(
+                    username=f"bench-auth-{random.randint(0, 10**9)}", email="bench-auth@example.com",
+                    password=None, name="Bench", last_name="Auth",
+                )
+                header = f"Bearer {AccessToken.for_user(user)}"
+                factory = APIRequestFactory()
+                self.stdout.write(
+                    f"{'variante':<10} {'queries/req':>12} {'p50 (µs)':>10} {'p99 (µs)':>10}"
+                )
+                for label, auth in (("simplejwt", JWTAuthentication()), ("cacheada", CachedJWTAuthentication())):
+                    self._report(label, auth, factory, header, user.pk, total, every)
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def _report(self, label, auth, factory, header, user_id, total, every):
+        samples, counter = [], QueryCounter()
+        with connection.execute_wrapper(counter):
+            for n in range(total):
+                if every and n % every == 0:
+                    invalidate_auth_user(user_id)
+                request = factory.get('/', HTTP_AUTHORIZATION=header)
+                t0 = time.perf_counter()
+                auth.authenticate(request)
+                samples.append((time.perf_counter() - t0) * 1e6)
+        samples.sort()
+        p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+        self.stdout.write(
+            f"{label:<10} {counter.count / total:>12,.3f} {statistics.median(samples):>10,.0f} {p99:>10,.0f}"
+        )
@@ -0,0 +1,73 @@
+import itertools
+import time
+from types import SimpleNamespace
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.permissions import BasePermission, IsAuthenticated
+
+from apps.users.models.user_model import User
+from apps.users.permissions import ALL_METHODS, CanManageProducts, CanViewProducts
+
+
+# Implementación anterior (listas de roles armadas en cada chequeo), sólo para comparar
+class LegacyCanViewProducts(BasePermission):
+    def has_permission(self, request, view):
+        return request.user.is_authenticated and request.user.role in [
+            User.Role.ADMIN, User.Role.MANAGER, User.Role.SALES, User.Role.BILLING,
+            User.Role.TRAVELER, User.Role.OPERATOR, User.Role.WAREHOUSE, User.Role.READONLY,
+        ]
+
+
+class LegacyCanManageProducts(BasePermission):
+    def has_permission(self, request, view):
+        if not request.user.is_authenticated:
+            return False
+        if request.user.role in [User.Role.ADMIN, User.Role.MANAGER]:
+            return True
+        if request.user.role == User.Role.WAREHOUSE:
+            return request.method in ['GET', 'PUT', 'PATCH']
+        return False
+
+
+LEGACY_CHAIN = (IsAuthenticated, LegacyCanViewProducts, LegacyCanManageProducts)
+MATRIX_CHAIN = (CanViewProducts, CanManageProducts)
+
+
+def check_chain(chain, request):
+    """Como APIView.check_permissions: instancia cada clase y corta en el primer rechazo."""
+    return all(permission().has_permission(request, None) for permission in chain)
+
+
+class Command(BaseCommand):
+    help = (
+        "Micro-benchmark de chequeo de permisos: la cadena anterior "
+        "(IsAuthenticated + CanViewProducts + CanManageProducts con listas de roles) "
+        "contra las clases resueltas sobre la matriz compilada."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=200_000, help='Chequeos por variante')
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        if iterations < 1:
+            raise CommandError("--iterations debe ser positivo")
+
+        requests = [
+            SimpleNamespace(user=SimpleNamespace(is_authenticated=True, role=role), method=method)
+            for role, method in itertools.product(User.Role.values, ALL_METHODS)
+        ]
+        mismatches = [r for r in requests if check_chain(LEGACY_CHAIN, r) != check_chain(MATRIX_CHAIN, r)]
+        if mismatches:
+            raise CommandError(f"La matriz difiere de la cadena anterior en {len(mismatches)} casos")
+
+        self.stdout.write(f"{'variante':<10} {'ns/chequeo':>12} {'speedup':>8}")
+        baseline = None
+        for label, chain in (("anterior", LEGACY_CHAIN), ("matriz", MATRIX_CHAIN)):
+            cycle = itertools.islice(itertools.cycle(requests), iterations)
+            t0 = time.perf_counter()
+            for request in cycle:
+                check_chain(chain, request)
+            ns = (time.perf_counter() - t0) * 1e9 / iterations
+            baseline = baseline or ns
+            self.stdout.write(f"{label:<10} {ns:>12,.0f} {baseline / ns:>7.1f}x")
@@ -14,29 +14,120 @@ Roles disponibles:
 - OPERATOR: Ejecución de órdenes de producción
 - WAREHOUSE: Control de inventario y logística
 - READONLY: Solo lectura en todos los módulos
+
+Todas las reglas están declaradas en ``ROLE_RULES`` (módulo -> rol -> métodos)
+y se compilan una única vez, al importar el módulo, en ``PERMISSION_MATRIX``:
+un conjunto de tuplas (rol, módulo, método). Cada clase de permiso es una
+``RolePermission`` con su ``module`` y chequea con un único lookup, sin armar
+listas de roles por request.
 """
+from functools import lru_cache
 
 from rest_framework.permissions import BasePermission
 from apps.users.models.user_model import User
 
+Role = User.Role
+
+ALL_METHODS = ('GET', 'HEAD', 'OPTIONS', 'POST', 'PUT', 'PATCH', 'DELETE')
+READ = ('GET',)
+READ_CREATE = ('GET', 'POST')
+READ_UPDATE = ('GET', 'PUT', 'PATCH')
+READ_WRITE = ('GET', 'POST', 'PUT', 'PATCH')
+
+
+def _full(*roles):
+    return {role: ALL_METHODS for role in roles}
+
+
+# ============================================================================
+# MATRIZ DE PERMISOS: módulo -> {rol: métodos HTTP permitidos}
+# ============================================================================
+
+ROLE_RULES = {
+    'admin': _full(Role.ADMIN),
+    'admin_or_manager': _full(Role.ADMIN, Role.MANAGER),
+    'users': _full(Role.ADMIN),
+    'users.view': _full(Role.ADMIN, Role.MANAGER, Role.READONLY),
+    'products': {**_full(Role.ADMIN, Role.MANAGER), Role.WAREHOUSE: READ_UPDATE},
+    'products.view': _full(*Role.values),
+    'customers': {**_full(Role.ADMIN, Role.MANAGER), Role.SALES: READ_WRITE, Role.TRAVELER: READ_UPDATE},
+    'customers.view': _full(*(r for r in Role.values if r != Role.OPERATOR)),
+    'suppliers': {**_full(Role.ADMIN, Role.MANAGER), Role.WAREHOUSE: READ_UPDATE},
+    'sales': {**_full(Role.ADMIN, Role.MANAGER), Role.SALES: READ_WRITE, Role.TRAVELER: READ_WRITE,
+              Role.BILLING: READ},
+    'sales.approve': _full(Role.ADMIN, Role.MANAGER),
+    'purchases': {**_full(Role.ADMIN, Role.MANAGER), Role.WAREHOUSE: READ_WRITE},
+    'purchases.receive': _full(Role.ADMIN, Role.MANAGER, Role.WAREHOUSE),
+    'billing': {**_full(Role.ADMIN, Role.MANAGER), Role.BILLING: READ_WRITE},
+    'billing.view': _full(Role.ADMIN, Role.MANAGER, Role.BILLING, Role.SALES, Role.READONLY),
+    'delivery_notes': {**_full(Role.ADMIN, Role.MANAGER), Role.WAREHOUSE: READ_WRITE, Role.BILLING: READ},
+    'stocks': {**_full(Role.ADMIN, Role.MANAGER), Role.WAREHOUSE: READ_UPDATE},
+    'inventory_adjustments': _full(Role.ADMIN, Role.MANAGER, Role.WAREHOUSE),
+    'stocks.history': _full(*(r for r in Role.values if r != Role.TRAVELER)),
+    'manufacturing': {**_full(Role.ADMIN, Role.MANAGER), Role.OPERATOR: READ_UPDATE},
+    'external_processes': {**_full(Role.ADMIN, Role.MANAGER), Role.OPERATOR: READ_WRITE},
+    'supplies': {**_full(Role.ADMIN, Role.MANAGER), Role.WAREHOUSE: READ_UPDATE, Role.OPERATOR: READ},
+    'cuts': {**_full(Role.ADMIN, Role.MANAGER), Role.OPERATOR: READ_UPDATE},
+    'expenses': {**_full(Role.ADMIN, Role.MANAGER), Role.BILLING: READ_CREATE},
+    'treasury': {**_full(Role.ADMIN, Role.MANAGER), Role.BILLING: READ_CREATE},
+    'accounting': {**_full(Role.ADMIN, Role.MANAGER), Role.BILLING: READ},
+    'reports': _full(Role.ADMIN, Role.MANAGER, Role.BILLING, Role.SALES, Role.WAREHOUSE, Role.READONLY),
+    'reports.financial': _full(Role.ADMIN, Role.MANAGER, Role.BILLING),
+}
+
+
+def compile_matrix(rules):
+    """Aplana ``{módulo: {rol: métodos}}`` en un frozenset de (rol, módulo, método)."""
+    return frozenset(
+        (str(role), module, method)
+        for module, by_role in rules.items()
+        for role, methods in by_role.items()
+        for method in methods
+    )
+
+
+PERMISSION_MATRIX = compile_matrix(ROLE_RULES)
+
+
+def role_allows(role, module: str, method: str) -> bool:
+    return (role, module, method) in PERMISSION_MATRIX
+
+
+class RolePermission(BasePermission):
+    """
+    Permiso por rol resuelto contra ``PERMISSION_MATRIX``.
+
+    Incluye el chequeo de autenticación, así que no hace falta apilarlo con
+    ``IsAuthenticated``. Para vistas sin clase propia:
+    ``@permission_classes([RolePermission.for_module('products')])``.
+    """
+    module = None
+
+    def has_permission(self, request, view):
+        user = request.user
+        return (getattr(user, 'role', None), self.module, request.method) in PERMISSION_MATRIX \
+            and user.is_authenticated
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def for_module(cls, module: str):
+        if module not in ROLE_RULES:
+            raise ValueError(f"Módulo de permisos desconocido: {module}")
+        return type(f"RolePermission[{module}]", (cls,), {'module': module})
+
 
 # ============================================================================
 # PERMISOS BASE POR ROL
 # ============================================================================
 
-class IsAdmin(BasePermission):
+class IsAdmin(RolePermission):
     """Solo usuarios con rol ADMIN"""
-    def has_permission(self, request, view):
-        return request.user.is_authenticated and request.user.role == User.Role.ADMIN
+    module = "admin"
 
 
-class IsAdminOrManager(BasePermission):
+class IsAdminOrManager(RolePermission):
     """Usuarios con rol ADMIN o MANAGER"""
-    def has_permission(self, request, view):
-        return request.user.is_authenticated and request.user.role in [
-            User.Role.ADMIN,
-            User.Role.MANAGER
-        ]
+    module = "admin_or_manager"
 
 
 class IsReadOnly(BasePermission):
@@ -49,78 +140,50 @@ class IsReadOnly(BasePermission):
 # PERMISOS: GESTIÓN DE USUARIOS
 # ============================================================================
 
-class CanManageUsers(BasePermission):
+class CanManageUsers(RolePermission):
     """
     Gestión completa de usuarios (CRUD)
     - ADMIN: Acceso total
     """
-    def has_permission(self, request, view):
-        return request.user.is_authenticated and request.user.role == User.Role.ADMIN
+    module = "users"
 
 
-class CanViewUsers(BasePermission):
+class CanViewUsers(RolePermission):
     """
     Ver listado y detalle de usuarios
     - ADMIN, MANAGER: Acceso completo
     - READONLY: Solo lectura
     """
-    def has_permission(self, request, view):
-        return request.user.is_authenticated and request.user.role in [
-            User.Role.ADMIN,
-            User.Role.MANAGER,
-            User.Role.READONLY
-        ]
+    module = "users.view"
 
 
 # ============================================================================
 # PERMISOS: PRODUCTOS (products)
 # ============================================================================
 
-class CanManageProducts(BasePermission):
+class CanManageProducts(RolePermission):
     """
     Gestión completa de productos, categorías y subproductos
     - ADMIN: Acceso total
     - MANAGER: Acceso total
     - WAREHOUSE: Puede actualizar stock y ver productos
     """
-    def has_permission(self, request, view):
-        if not request.user.is_authenticated:
-            return False
-
-        # ADMIN y MANAGER pueden todo
-        if request.user.role in [User.Role.ADMIN, User.Role.MANAGER]:
-            return True
-
-        # WAREHOUSE solo puede leer y actualizar (no crear/eliminar)
-        if request.user.role == User.Role.WAREHOUSE:
-            return request.method in ['GET', 'PUT', 'PATCH']
-
-        return False
+    module = "products"
 
 
-class CanViewProducts(BasePermission):
+class CanViewProducts(RolePermission):
     """
     Ver productos y categorías
     - Todos los roles excepto READONLY tienen acceso
     """
-    def has_permission(self, request, view):
-        return request.user.is_authenticated and request.user.role in [
-            User.Role.ADMIN,
-            User.Role.MANAGER,
-            User.Role.SALES,
-            User.Role.BILLING,
-            User.Role.TRAVELER,
-            User.Role.OPERATOR,
-            User.Role.WAREHOUSE,
-            User.Role.READONLY
-        ]
+    module = "products.view"
 
 
 # ============================================================================
 # PERMISOS: CLIENTES (customers)
 # ============================================================================
 
-class CanManageCustomers(BasePermission):
+class CanManageCustomers(RolePermission):
     """
     Gestión completa de clientes
     - ADMIN: Acceso total
@@ -128,68 +191,33 @@ class CanManageCustomers(BasePermission):
     - SALES: Puede crear y actualizar clientes
     - TRAVELER: Puede actualizar clientes (datos de contacto, notas)
     """
-    def has_permission(self, request, view):
-        if not request.user.is_authenticated:
-            return False
-
-        # ADMIN y MANAGER pueden todo
-        if request.user.role in [User.Role.ADMIN, User.Role.MANAGER]:
-            return True
+    module = "customers"
 
-        # SALES puede crear, leer y actualizar (no eliminar)
-        if request.user.role == User.Role.SALES:
-            return request.method in ['GET', 'POST', 'PUT', 'PATCH']
 
-        # TRAVELER solo puede leer y actualizar
-        if request.user.role == User.Role.TRAVELER:
-            return request.method in ['GET', 'PUT', 'PATCH']
-
-        return False
-
-
-class CanViewCustomers(BasePermission):
+class CanViewCustomers(RolePermission):
     """Ver clientes - Todos menos OPERATOR"""
-    def has_permission(self, request, view):
-        return request.user.is_authenticated and request.user.role in [
-            User.Role.ADMIN,
-            User.Role.MANAGER,
-            User.Role.SALES,
-            User.Role.BILLING,
-            User.Role.TRAVELER,
-            User.Role.WAREHOUSE,
-            User.Role.READONLY
-        ]
+    module = "customers.view"
 
 
 # ============================================================================
 # PERMISOS: PROVEEDORES (suppliers)
 # ============================================================================
 
-class CanManageSuppliers(BasePermission):
+class CanManageSuppliers(RolePermission):
     """
     Gestión de proveedores
     - ADMIN: Acceso total
     - MANAGER: Acceso total
     - WAREHOUSE: Puede actualizar (contacto, notas)
     """
-    def has_permission(self, request, view):
-        if not request.user.is_authenticated:
-            return False
-
-        if request.user.role in [User.Role.ADMIN, User.Role.MANAGER]:
-            return True
-
-        if request.user.role == User.Role.WAREHOUSE:
-            return request.method in ['GET', 'PUT', 'PATCH']
-
-        return False
+    module = "suppliers"
 
 
 # ============================================================================
 # PERMISOS: VENTAS (sales, presupuestos, pedidos)
 # ============================================================================
 
-class CanManageSales(BasePermission):
+class CanManageSales(RolePermission):
     """
     Gestión de presupuestos y pedidos de venta
     - ADMIN, MANAGER: Acceso total
@@ -197,390 +225,330 @@ class CanManageSales(BasePermission):
     - TRAVELER: Puede crear y actualizar pedidos
     - BILLING: Solo lectura
     """
-    def has_permission(self, request, view):
-        if not request.user.is_authenticated:
-            return False
-
-        # ADMIN y MANAGER pueden todo
-        if request.user.role in [User.Role.ADMIN, User.Role.MANAGER]:
-            return True
-
-        # SALES puede crear, leer y actualizar (no eliminar)
-        if request.user.role == User.Role.SALES:
-            return request.method in ['GET', 'POST', 'PUT', 'PATCH']
-
-        # TRAVELER puede crear, leer y actualizar
-        if request.user.role == User.Role.TRAVELER:
-            return request.method in ['GET', 'POST', 'PUT', 'PATCH']
-
-        # BILLING solo puede leer
-        if request.user.role == User.Role.BILLING:
-            return request.method == 'GET'
-
-        return False
+    module = "sales"
 
 
-class CanApproveSalesOrders(BasePermission):
+class CanApproveSalesOrders(RolePermission):
     """
     Aprobar/rechazar pedidos de venta
     - ADMIN, MANAGER: Pueden aprobar
     """
-    def has_permission(self, request, view):
-        return request.user.is_authenticated and request.user.role in [
-            User.Role.ADMIN,
-            User.Role.MANAGER
-        ]
+    module = "sales.approve"
 
 
 # ============================================================================
 # PERMISOS: COMPRAS (purchases)
 # ============================================================================
 
-class CanManagePurchases(BasePermission):
+class CanManagePurchases(RolePermission):
     """
     Gestión de órdenes de compra
     - ADMIN, MANAGER: Acceso total
     - WAREHOUSE: Puede crear y actualizar órdenes
     """
-    def has_permission(self, request, view):
-        if not request.user.is_authenticated:
-            return False
-
-        if request.user.role in [User.Role.ADMIN, User.Role.MANAGER]:
-            return True
+    module = "purchases"
 
-        if request.user.role == User.Role.WAREHOUSE:
-            return request.method in ['GET', 'POST', 'PUT', 'PATCH']
 
-        return False
-
-
-class CanReceivePurchases(BasePermission):
+class CanReceivePurchases(RolePermission):
     """
     Recibir mercadería (PurchaseReceipt)
     - ADMIN, MANAGER, WAREHOUSE
     """
-    def has_permission(self, request, view):
-        return request.user.is_authenticated and request.user.role in [
-            User.Role.ADMIN,
-            User.Role.MANAGER,
-            User.Role.WAREHOUSE
-        ]
+    module = "purchases.receive"
 
 
 # ============================================================================
 # PERMISOS: FACTURACIÓN (billing)
 # ============================================================================
 
-class CanManageBilling(BasePermission):
+class CanManageBilling(RolePermission):
     """
     Gestión de facturas, notas de crédito/débito
     - ADMIN, MANAGER: Acceso total
     - BILLING: Puede crear, leer y actualizar
     """
-    def has_permission(self, request, view):
-        if not request.user.is_authenticated:
-            return False
-
-        if request.user.role in [User.Role.ADMIN, User.Role.MANAGER]:
-            return True
-
-        if request.user.role == User.Role.BILLING:
-            return request.method in ['GET', 'POST', 'PUT', 'PATCH']
-
-        return False
+    module = "billing"
 
 
-class CanViewBilling(BasePermission):
+class CanViewBilling(RolePermission):
     """Ver facturas - ADMIN, MANAGER, BILLING, SALES, READONLY"""
-    def has_permission(self, request, view):
-        return request.user.is_authenticated and request.user.role in [
-            User.Role.ADMIN,
-            User.Role.MANAGER,
-            User.Role.BILLING,
-            User.Role.SALES,
-            User.Role.READONLY
-        ]
+    module = "billing.view"
 
 
 # ============================================================================
 # PERMISOS: REMITOS (delivery_notes)
 # ============================================================================
 
-class CanManageDeliveryNotes(BasePermission):
+class CanManageDeliveryNotes(RolePermission):
     """
     Gestión de remitos
     - ADMIN, MANAGER: Acceso total
     - WAREHOUSE: Puede crear y actualizar
     - BILLING: Solo lectura
     """
-    def has_permission(self, request, view):
-        if not request.user.is_authenticated:
-            return False
-
-        if request.user.role in [User.Role.ADMIN, User.Role.MANAGER]:
-            return True
-
-        if request.user.role == User.Role.WAREHOUSE:
-            return request.method in ['GET', 'POST', 'PUT', 'PATCH']
-
-        if request.user.role == User.Role.BILLING:
-            return request.method == 'GET'
-
-        return False
+    module = "delivery_notes"
 
 
 # ============================================================================
 # PERMISOS: STOCK (stocks, inventory_adjustments)
 # ============================================================================
 
-class CanManageStock(BasePermission):
+class CanManageStock(RolePermission):
     """
     Gestión de stock (movimientos, ajustes)
     - ADMIN, MANAGER: Acceso total
     - WAREHOUSE: Puede ver y actualizar stock
     """
-    def has_permission(self, request, view):
-        if not request.user.is_authenticated:
-            return False
-
-        if request.user.role in [User.Role.ADMIN, User.Role.MANAGER]:
-            return True
-
-        if request.user.role == User.Role.WAREHOUSE:
-            return request.method in ['GET', 'PUT', 'PATCH']
-
-        return False
+    module = "stocks"
 
 
-class CanMakeInventoryAdjustments(BasePermission):
+class CanMakeInventoryAdjustments(RolePermission):
     """
     Crear ajustes de inventario (inventory_adjustments)
     - ADMIN, MANAGER: Pueden crear ajustes
     - WAREHOUSE: Puede crear ajustes (con aprobación posterior)
     """
-    def has_permission(self, request, view):
-        return request.user.is_authenticated and request.user.role in [
-            User.Role.ADMIN,
-            User.Role.MANAGER,
-            User.Role.WAREHOUSE
-        ]
+    module = "inventory_adjustments"
 
 
-class CanViewStockHistory(BasePermission):
+class CanViewStockHistory(RolePermission):
     """
     Ver histórico de movimientos de stock
     - Todos excepto TRAVELER pueden ver
     """
-    def has_permission(self, request, view):
-        return request.user.is_authenticated and request.user.role in [
-            User.Role.ADMIN,
-            User.Role.MANAGER,
-            User.Role.SALES,
-            User.Role.BILLING,
-            User.Role.OPERATOR,
-            User.Role.WAREHOUSE,
-            User.Role.READONLY
-        ]
+    module = "stocks.history"
 
 
 # ============================================================================
 # PERMISOS: MANUFACTURA (manufacturing, manufacturing_pro)
 # ============================================================================
 
-class CanManageManufacturing(BasePermission):
+class CanManageManufacturing(RolePermission):
     """
     Gestión de órdenes de manufactura, BOM, work orders
     - ADMIN, MANAGER: Acceso total
     - OPERATOR: Puede ver y actualizar estado de órdenes
     """
-    def has_permission(self, request, view):
-        if not request.user.is_authenticated:
-            return False
-
-        if request.user.role in [User.Role.ADMIN, User.Role.MANAGER]:
-            return True
+    module = "manufacturing"
 
-        if request.user.role == User.Role.OPERATOR:
-            return request.method in ['GET', 'PUT', 'PATCH']
 
-        return False
-
-
-class CanManageExternalProcesses(BasePermission):
+class CanManageExternalProcesses(RolePermission):
     """
     Gestión de procesos externos (galvanizado, pintura, etc.)
     - ADMIN, MANAGER: Acceso total
     - OPERATOR: Puede ver y registrar recepciones
     """
-    def has_permission(self, request, view):
-        if not request.user.is_authenticated:
-            return False
+    module = "external_processes"
 
-        if request.user.role in [User.Role.ADMIN, User.Role.MANAGER]:
-            return True
 
-        if request.user.role == User.Role.OPERATOR:
-            return request.method in ['GET', 'POST', 'PUT', 'PATCH']
-
-        return False
-
-
-class CanManageSupplies(BasePermission):
+class CanManageSupplies(RolePermission):
     """
     Gestión de insumos (manufacturing_pro)
     - ADMIN, MANAGER: Acceso total
     - WAREHOUSE: Puede ver y actualizar stock
     - OPERATOR: Solo lectura
     """
-    def has_permission(self, request, view):
-        if not request.user.is_authenticated:
-            return False
-
-        if request.user.role in [User.Role.ADMIN, User.Role.MANAGER]:
-            return True
-
-        if request.user.role == User.Role.WAREHOUSE:
-            return request.method in ['GET', 'PUT', 'PATCH']
-
-        if request.user.role == User.Role.OPERATOR:
-            return request.method == 'GET'
-
-        return False
+    module = "supplies"
 
 
 # ============================================================================
 # PERMISOS: ÓRDENES DE CORTE (cuts)
 # ============================================================================
 
-class CanManageCuttingOrders(BasePermission):
+class CanManageCuttingOrders(RolePermission):
     """
     Gestión de órdenes de corte
     - ADMIN, MANAGER: Acceso total
     - OPERATOR: Puede ver y actualizar estado
     """
-    def has_permission(self, request, view):
-        if not request.user.is_authenticated:
-            return False
-
-        if request.user.role in [User.Role.ADMIN, User.Role.MANAGER]:
-            return True
-
-        if request.user.role == User.Role.OPERATOR:
-            return request.method in ['GET', 'PUT', 'PATCH']
-
-        return False
+    module = "cuts"
 
 
 # ============================================================================
 # PERMISOS: GASTOS (expenses)
 # ============================================================================
 
-class CanManageExpenses(BasePermission):
+class CanManageExpenses(RolePermission):
     """
     Gestión de gastos
     - ADMIN, MANAGER: Acceso total
     - BILLING: Puede crear y ver
     """
-    def has_permission(self, request, view):
-        if not request.user.is_authenticated:
-            return False
-
-        if request.user.role in [User.Role.ADMIN, User.Role.MANAGER]:
-            return True
-
-        if request.user.role == User.Role.BILLING:
-            return request.method in ['GET', 'POST']
-
-        return False
+    module = "expenses"
 
 
 # ============================================================================
 # PERMISOS: TESORERÍA (treasury)
 # ============================================================================
 
-class CanManageTreasury(BasePermission):
+class CanManageTreasury(RolePermission):
     """
     Gestión de bancos, recibos, pagos, cobranzas
     - ADMIN, MANAGER: Acceso total
     - BILLING: Puede ver y crear recibos
     """
-    def has_permission(self, request, view):
-        if not request.user.is_authenticated:
-            return False
-
-        if request.user.role in [User.Role.ADMIN, User.Role.MANAGER]:
-            return True
-
-        if request.user.role == User.Role.BILLING:
-            return request.method in ['GET', 'POST']
-
-        return False
+    module = "treasury"
 
 
 # ============================================================================
 # PERMISOS: CONTABILIDAD (accounting, financial)
 # ============================================================================
 
-class CanManageAccounting(BasePermission):
+class CanManageAccounting(RolePermission):
     """
     Gestión de asientos contables y libro mayor
     - ADMIN, MANAGER: Acceso total
     - BILLING: Solo lectura
     """
-    def has_permission(self, request, view):
-        if not request.user.is_authenticated:
-            return False
-
-        if request.user.role in [User.Role.ADMIN, User.Role.MANAGER]:
-            return True
-
-        if request.user.role == User.Role.BILLING:
-            return request.method == 'GET'
-
-        return False
+    module = "accounting"
 
 
 # ============================================================================
 # PERMISOS: REPORTES Y MÉTRICAS
 # ============================================================================
 
-class CanViewReports(BasePermission):
+class CanViewReports(RolePermission):
     """
     Ver reportes y métricas
     - ADMIN, MANAGER, BILLING: Acceso completo
     - SALES, WAREHOUSE: Reportes de su área
     - READONLY: Solo lectura de todo
     """
-    def has_permission(self, request, view):
-        return request.user.is_authenticated and request.user.role in [
-            User.Role.ADMIN,
-            User.Role.MANAGER,
-            User.Role.BILLING,
-            User.Role.SALES,
-            User.Role.WAREHOUSE,
-            User.Role.READONLY
-        ]
+    module = "reports"
 
 
-class CanViewFinancialReports(BasePermission):
+class CanViewFinancialReports(RolePermission):
     """
     Ver reportes financieros (P&L, balance, flujo de caja)
     - ADMIN, MANAGER: Acceso completo
     - BILLING: Solo lectura
     """
-    def has_permission(self, request, view):
-        return request.user.is_authenticated and request.user.role in [
-            User.Role.ADMIN,
-            User.Role.MANAGER,
-            User.Role.BILLING
-        ]
+    module = "reports.financial"
 
 
 # ============================================================================
 # HELPER: Verificar permisos por acción y módulo
 # ============================================================================
 
+# Mapa de permisos por módulo y acción (para chequeos dentro de las vistas)
+ACTION_RULES = {
+    'users': {
+        'create': [Role.ADMIN],
+        'read': [Role.ADMIN, Role.MANAGER, Role.READONLY],
+        'update': [Role.ADMIN],
+        'delete': [Role.ADMIN],
+    },
+    'products': {
+        'create': [Role.ADMIN, Role.MANAGER],
+        'read': [Role.ADMIN, Role.MANAGER, Role.SALES, Role.BILLING,
+                 Role.TRAVELER, Role.OPERATOR, Role.WAREHOUSE, Role.READONLY],
+        'update': [Role.ADMIN, Role.MANAGER, Role.WAREHOUSE],
+        'delete': [Role.ADMIN, Role.MANAGER],
+    },
+    'customers': {
+        'create': [Role.ADMIN, Role.MANAGER, Role.SALES],
+        'read': [Role.ADMIN, Role.MANAGER, Role.SALES, Role.BILLING,
+                 Role.TRAVELER, Role.WAREHOUSE, Role.READONLY],
+        'update': [Role.ADMIN, Role.MANAGER, Role.SALES, Role.TRAVELER],
+        'delete': [Role.ADMIN, Role.MANAGER],
+    },
+    'suppliers': {
+        'create': [Role.ADMIN, Role.MANAGER],
+        'read': [Role.ADMIN, Role.MANAGER, Role.WAREHOUSE, Role.READONLY],
+        'update': [Role.ADMIN, Role.MANAGER, Role.WAREHOUSE],
+        'delete': [Role.ADMIN, Role.MANAGER],
+    },
+    'sales': {
+        'create': [Role.ADMIN, Role.MANAGER, Role.SALES, Role.TRAVELER],
+        'read': [Role.ADMIN, Role.MANAGER, Role.SALES, Role.TRAVELER,
+                 Role.BILLING, Role.READONLY],
+        'update': [Role.ADMIN, Role.MANAGER, Role.SALES, Role.TRAVELER],
+        'delete': [Role.ADMIN, Role.MANAGER],
+        'approve': [Role.ADMIN, Role.MANAGER],
+    },
+    'purchases': {
+        'create': [Role.ADMIN, Role.MANAGER, Role.WAREHOUSE],
+        'read': [Role.ADMIN, Role.MANAGER, Role.WAREHOUSE, Role.READONLY],
+        'update': [Role.ADMIN, Role.MANAGER, Role.WAREHOUSE],
+        'delete': [Role.ADMIN, Role.MANAGER],
+    },
+    'billing': {
+        'create': [Role.ADMIN, Role.MANAGER, Role.BILLING],
+        'read': [Role.ADMIN, Role.MANAGER, Role.BILLING, Role.SALES, Role.READONLY],
+        'update': [Role.ADMIN, Role.MANAGER, Role.BILLING],
+        'delete': [Role.ADMIN, Role.MANAGER],
+    },
+    'delivery_notes': {
+        'create': [Role.ADMIN, Role.MANAGER, Role.WAREHOUSE],
+        'read': [Role.ADMIN, Role.MANAGER, Role.WAREHOUSE, Role.BILLING, Role.READONLY],
+        'update': [Role.ADMIN, Role.MANAGER, Role.WAREHOUSE],
+        'delete': [Role.ADMIN, Role.MANAGER],
+    },
+    'stocks': {
+        'create': [Role.ADMIN, Role.MANAGER, Role.WAREHOUSE],
+        'read': [Role.ADMIN, Role.MANAGER, Role.SALES, Role.BILLING,
+                 Role.OPERATOR, Role.WAREHOUSE, Role.READONLY],
+        'update': [Role.ADMIN, Role.MANAGER, Role.WAREHOUSE],
+        'delete': [Role.ADMIN, Role.MANAGER],
+    },
+    'inventory_adjustments': {
+        'create': [Role.ADMIN, Role.MANAGER, Role.WAREHOUSE],
+        'read': [Role.ADMIN, Role.MANAGER, Role.WAREHOUSE, Role.READONLY],
+        'update': [Role.ADMIN, Role.MANAGER],
+        'delete': [Role.ADMIN],
+    },
+    'manufacturing': {
+        'create': [Role.ADMIN, Role.MANAGER],
+        'read': [Role.ADMIN, Role.MANAGER, Role.OPERATOR, Role.WAREHOUSE, Role.READONLY],
+        'update': [Role.ADMIN, Role.MANAGER, Role.OPERATOR],
+        'delete': [Role.ADMIN, Role.MANAGER],
+    },
+    'external_processes': {
+        'create': [Role.ADMIN, Role.MANAGER, Role.OPERATOR],
+        'read': [Role.ADMIN, Role.MANAGER, Role.OPERATOR, Role.WAREHOUSE, Role.READONLY],
+        'update': [Role.ADMIN, Role.MANAGER, Role.OPERATOR],
+        'delete': [Role.ADMIN, Role.MANAGER],
+    },
+    'supplies': {
+        'create': [Role.ADMIN, Role.MANAGER],
+        'read': [Role.ADMIN, Role.MANAGER, Role.OPERATOR, Role.WAREHOUSE, Role.READONLY],
+        'update': [Role.ADMIN, Role.MANAGER, Role.WAREHOUSE],
+        'delete': [Role.ADMIN, Role.MANAGER],
+    },
+    'cuts': {
+        'create': [Role.ADMIN, Role.MANAGER],
+        'read': [Role.ADMIN, Role.MANAGER, Role.OPERATOR, Role.READONLY],
+        'update': [Role.ADMIN, Role.MANAGER, Role.OPERATOR],
+        'delete': [Role.ADMIN, Role.MANAGER],
+    },
+    'expenses': {
+        'create': [Role.ADMIN, Role.MANAGER, Role.BILLING],
+        'read': [Role.ADMIN, Role.MANAGER, Role.BILLING, Role.READONLY],
+        'update': [Role.ADMIN, Role.MANAGER],
+        'delete': [Role.ADMIN, Role.MANAGER],
+    },
+    'treasury': {
+        'create': [Role.ADMIN, Role.MANAGER, Role.BILLING],
+        'read': [Role.ADMIN, Role.MANAGER, Role.BILLING, Role.READONLY],
+        'update': [Role.ADMIN, Role.MANAGER],
+        'delete': [Role.ADMIN, Role.MANAGER],
+    },
+    'accounting': {
+        'create': [Role.ADMIN, Role.MANAGER],
+        'read': [Role.ADMIN, Role.MANAGER, Role.BILLING, Role.READONLY],
+        'update': [Role.ADMIN, Role.MANAGER],
+        'delete': [Role.ADMIN],
+    },
+}
+
+ACTION_MATRIX = frozenset(
+    (str(role), module, action)
+    for module, by_action in ACTION_RULES.items()
+    for action, roles in by_action.items()
+    for role in roles
+)
+
+
 def user_can(user, module: str, action: str) -> bool:
     """
     Verifica si un usuario puede realizar una acción en un módulo específico.
@@ -598,121 +566,21 @@ def user_can(user, module: str, action: str) -> bool:
             # Permitir crear pedido de venta
             ...
     """
-    # Mapa de permisos por módulo y acción
-    PERMISSION_MAP = {
-        'users': {
-            'create': [User.Role.ADMIN],
-            'read': [User.Role.ADMIN, User.Role.MANAGER, User.Role.READONLY],
-            'update': [User.Role.ADMIN],
-            'delete': [User.Role.ADMIN],
-        },
-        'products': {
-            'create': [User.Role.ADMIN, User.Role.MANAGER],
-            'read': [User.Role.ADMIN, User.Role.MANAGER, User.Role.SALES, User.Role.BILLING,
-                     User.Role.TRAVELER, User.Role.OPERATOR, User.Role.WAREHOUSE, User.Role.READONLY],
-            'update': [User.Role.ADMIN, User.Role.MANAGER, User.Role.WAREHOUSE],
-            'delete': [User.Role.ADMIN, User.Role.MANAGER],
-        },
-        'customers': {
-            'create': [User.Role.ADMIN, User.Role.MANAGER, User.Role.SALES],
-            'read': [User.Role.ADMIN, User.Role.MANAGER, User.Role.SALES, User.Role.BILLING,
-                     User.Role.TRAVELER, User.Role.WAREHOUSE, User.Role.READONLY],
-            'update': [User.Role.ADMIN, User.Role.MANAGER, User.Role.SALES, User.Role.TRAVELER],
-            'delete': [User.Role.ADMIN, User.Role.MANAGER],
-        },
-        'suppliers': {
-            'create': [User.Role.ADMIN, User.Role.MANAGER],
-            'read': [User.Role.ADMIN, User.Role.MANAGER, User.Role.WAREHOUSE, User.Role.READONLY],
-            'update': [User.Role.ADMIN, User.Role.MANAGER, User.Role.WAREHOUSE],
-            'delete': [User.Role.ADMIN, User.Role.MANAGER],
-        },
-        'sales': {
-            'create': [User.Role.ADMIN, User.Role.MANAGER, User.Role.SALES, User.Role.TRAVELER],
-            'read': [User.Role.ADMIN, User.Role.MANAGER, User.Role.SALES, User.Role.TRAVELER,
-                     User.Role.BILLING, User.Role.READONLY],
-            'update': [User.Role.ADMIN, User.Role.MANAGER, User.Role.SALES, User.Role.TRAVELER],
-            'delete': [User.Role.ADMIN, User.Role.MANAGER],
-            'approve': [User.Role.ADMIN, User.Role.MANAGER],
-        },
-        'purchases': {
-            'create': [User.Role.ADMIN, User.Role.MANAGER, User.Role.WAREHOUSE],
-            'read': [User.Role.ADMIN, User.Role.MANAGER, User.Role.WAREHOUSE, User.Role.READONLY],
-            'update': [User.Role.ADMIN, User.Role.MANAGER, User.Role.WAREHOUSE],
-            'delete': [User.Role.ADMIN, User.Role.MANAGER],
-        },
-        'billing': {
-            'create': [User.Role.ADMIN, User.Role.MANAGER, User.Role.BILLING],
-            'read': [User.Role.ADMIN, User.Role.MANAGER, User.Role.BILLING, User.Role.SALES, User.Role.READONLY],
-            'update': [User.Role.ADMIN, User.Role.MANAGER, User.Role.BILLING],
-            'delete': [User.Role.ADMIN, User.Role.MANAGER],
-        },
-        'delivery_notes': {
-            'create': [User.Role.ADMIN, User.Role.MANAGER, User.Role.WAREHOUSE],
-            'read': [User.Role.ADMIN, User.Role.MANAGER, User.Role.WAREHOUSE, User.Role.BILLING, User.Role.READONLY],
-            'update': [User.Role.ADMIN, User.Role.MANAGER, User.Role.WAREHOUSE],
-            'delete': [User.Role.ADMIN, User.Role.MANAGER],
-        },
-        'stocks': {
-            'create': [User.Role.ADMIN, User.Role.MANAGER, User.Role.WAREHOUSE],
-            'read': [User.Role.ADMIN, User.Role.MANAGER, User.Role.SALES, User.Role.BILLING,
-                     User.Role.OPERATOR, User.Role.WAREHOUSE, User.Role.READONLY],
-            'update': [User.Role.ADMIN, User.Role.MANAGER, User.Role.WAREHOUSE],
-            'delete': [User.Role.ADMIN, User.Role.MANAGER],
-        },
-        'inventory_adjustments': {
-            'create': [User.Role.ADMIN, User.Role.MANAGER, User.Role.WAREHOUSE],
-            'read': [User.Role.ADMIN, User.Role.MANAGER, User.Role.WAREHOUSE, User.Role.READONLY],
-            'update': [User.Role.ADMIN, User.Role.MANAGER],
-            'delete': [User.Role.ADMIN],
-        },
-        'manufacturing': {
-            'create': [User.Role.ADMIN, User.Role.MANAGER],
-            'read': [User.Role.ADMIN, User.Role.MANAGER, User.Role.OPERATOR, User.Role.WAREHOUSE, User.Role.READONLY],
-            'update': [User.Role.ADMIN, User.Role.MANAGER, User.Role.OPERATOR],
-            'delete': [User.Role.ADMIN, User.Role.MANAGER],
-        },
-        'external_processes': {
-            'create': [User.Role.ADMIN, User.Role.MANAGER, User.Role.OPERATOR],
-            'read': [User.Role.ADMIN, User.Role.MANAGER, User.Role.OPERATOR, User.Role.WAREHOUSE, User.Role.READONLY],
-            'update': [User.Role.ADMIN, User.Role.MANAGER, User.Role.OPERATOR],
-            'delete': [User.Role.ADMIN, User.Role.MANAGER],
-        },
-        'supplies': {
-            'create': [User.Role.ADMIN, User.Role.MANAGER],
-            'read': [User.Role.ADMIN, User.Role.MANAGER, User.Role.OPERATOR, User.Role.WAREHOUSE, User.Role.READONLY],
-            'update': [User.Role.ADMIN, User.Role.MANAGER, User.Role.WAREHOUSE],
-            'delete': [User.Role.ADMIN, User.Role.MANAGER],
-        },
-        'cuts': {
-            'create': [User.Role.ADMIN, User.Role.MANAGER],
-            'read': [User.Role.ADMIN, User.Role.MANAGER, User.Role.OPERATOR, User.Role.READONLY],
-            'update': [User.Role.ADMIN, User.Role.MANAGER, User.Role.OPERATOR],
-            'delete': [User.Role.ADMIN, User.Role.MANAGER],
-        },
-        'expenses': {
-            'create': [User.Role.ADMIN, User.Role.MANAGER, User.Role.BILLING],
-            'read': [User.Role.ADMIN, User.Role.MANAGER, User.Role.BILLING, User.Role.READONLY],
-            'update': [User.Role.ADMIN, User.Role.MANAGER],
-            'delete': [User.Role.ADMIN, User.Role.MANAGER],
-        },
-        'treasury': {
-            'create': [User.Role.ADMIN, User.Role.MANAGER, User.Role.BILLING],
-            'read': [User.Role.ADMIN, User.Role.MANAGER, User.Role.BILLING, User.Role.READONLY],
-            'update': [User.Role.ADMIN, User.Role.MANAGER],
-            'delete': [User.Role.ADMIN, User.Role.MANAGER],
-        },
-        'accounting': {
-            'create': [User.Role.ADMIN, User.Role.MANAGER],
-            'read': [User.Role.ADMIN, User.Role.MANAGER, User.Role.BILLING, User.Role.READONLY],
-            'update': [User.Role.ADMIN, User.Role.MANAGER],
-            'delete': [User.Role.ADMIN],
-        },
-    }
-
-    if module not in PERMISSION_MAP:
-        return False
+    return (getattr(user, 'role', None), module, action) in ACTION_MATRIX
 
-    if action not in PERMISSION_MAP[module]:
-        return False
 
-    return user.role in PERMISSION_MAP[module][action]
+def effective_matrix(role=None):
+    """
+    Matriz efectiva para inspección: ``methods`` (clases de permiso, por
+    módulo y rol) y ``actions`` (``user_can``, por módulo y acción).
+    """
+    roles = [role] if role else list(Role.values)
+    methods = {
+        module: {r: [m for m in ALL_METHODS if (r, module, m) in PERMISSION_MATRIX] for r in roles}
+        for module in ROLE_RULES
+    }
+    actions = {
+        module: {a: [r for r in roles if (r, module, a) in ACTION_MATRIX] for a in by_action}
+        for module, by_action in ACTION_RULES.items()
+    }
+    return {'roles': roles, 'methods': methods, 'actions': actions}
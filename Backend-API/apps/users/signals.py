@@ -0,0 +1,34 @@
+# apps/users/signals.py
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from apps.users.authentication import invalidate_auth_user
+from apps.users.models.user_model import User
+
+
+# ── Cache de autenticación (apps.users.authentication) ─────────────────
+# Se invalida en el momento y otra vez al confirmar la transacción: una
+# request concurrente que lea la fila vieja antes del COMMIT no deja
+# cacheado un usuario ya dado de baja o con otro rol.
+
+def _invalidate(user_id):
+    invalidate_auth_user(user_id)
+    transaction.on_commit(lambda: invalidate_auth_user(user_id))
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_auth_cache_on_user_change(sender, instance: User, **kwargs):
+    _invalidate(instance.pk)
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+@receiver(m2m_changed, sender=User.user_permissions.through)
+def invalidate_auth_cache_on_permissions(sender, instance, action, reverse, pk_set, **kwargs):
+    if not action.startswith("post_"):
+        return
+    if not reverse:
+        _invalidate(instance.pk)
+    else:
+        for user_id in pk_set or ():
+            _invalidate(user_id)
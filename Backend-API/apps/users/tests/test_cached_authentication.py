@@ -0,0 +1,64 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.users.api.repositories.user_repository import UserRepository
+from apps.users.authentication import get_cached_user
+from apps.users.models.user_model import User
+
+
+class CachedJWTAuthenticationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username="auth", email="auth@example.com", password="x", name="Au", last_name="Th",
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def _client(self, user):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+        return client
+
+    def test_user_is_resolved_from_cache(self):
+        client = self._client(self.user)
+        self.assertEqual(client.get(reverse("profile")).status_code, 200)
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get(reverse("profile"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+    def test_role_change_and_soft_delete_revoke_immediately(self):
+        client = self._client(self.user)
+        self.assertEqual(client.get(reverse("profile")).json()["role"], User.Role.OPERATOR)
+
+        user = UserRepository.get_by_id(self.user.pk)
+        UserRepository.update(user, role=User.Role.SALES)
+        self.assertEqual(client.get(reverse("profile")).json()["role"], User.Role.SALES)
+
+        UserRepository.soft_delete(user)
+        self.assertEqual(client.get(reverse("profile")).status_code, 401)
+
+    def test_admin_deactivate_action_revokes_immediately(self):
+        from django.contrib.admin.sites import site
+
+        client = self._client(self.user)
+        self.assertEqual(client.get(reverse("profile")).status_code, 200)
+
+        site._registry[User].deactivate_users(None, User.objects.filter(pk=self.user.pk))
+        self.assertEqual(client.get(reverse("profile")).status_code, 401)
+
+    def test_password_hash_is_not_cached(self):
+        client = self._client(self.user)
+        self.assertEqual(client.get(reverse("profile")).status_code, 200)
+
+        cached = get_cached_user(self.user.pk)
+        self.assertNotIn("password", cached.__dict__)
+        self.assertIn("password", cached.get_deferred_fields())
+        self.assertTrue(cached.check_password("x"))  # si hace falta, se lee de la base
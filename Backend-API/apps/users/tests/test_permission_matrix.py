@@ -0,0 +1,59 @@
+import itertools
+from types import SimpleNamespace
+
+from django.contrib.auth.models import AnonymousUser
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.users.management.commands.bench_permissions import LEGACY_CHAIN, MATRIX_CHAIN, check_chain
+from apps.users.models.user_model import User
+from apps.users.permissions import ALL_METHODS, CanManageSales, RolePermission, user_can
+
+
+class PermissionMatrixTests(SimpleTestCase):
+    def test_matrix_matches_previous_class_chain(self):
+        for role, method in itertools.product(User.Role.values, ALL_METHODS):
+            request = SimpleNamespace(user=SimpleNamespace(is_authenticated=True, role=role), method=method)
+            self.assertEqual(check_chain(MATRIX_CHAIN, request), check_chain(LEGACY_CHAIN, request), (role, method))
+
+        anonymous = SimpleNamespace(user=AnonymousUser(), method='GET')
+        self.assertFalse(check_chain(MATRIX_CHAIN, anonymous))
+
+    def test_single_class_per_module(self):
+        def allowed(permission, role, method):
+            request = SimpleNamespace(user=SimpleNamespace(is_authenticated=True, role=role), method=method)
+            return permission().has_permission(request, None)
+
+        sales = RolePermission.for_module('sales')
+        self.assertIs(sales, RolePermission.for_module('sales'))
+        for role, method in itertools.product(User.Role.values, ALL_METHODS):
+            self.assertEqual(allowed(sales, role, method), allowed(CanManageSales, role, method))
+        self.assertTrue(allowed(sales, User.Role.BILLING, 'GET'))
+        self.assertFalse(allowed(sales, User.Role.BILLING, 'POST'))
+        with self.assertRaises(ValueError):
+            RolePermission.for_module('nope')
+
+        self.assertTrue(user_can(SimpleNamespace(role=User.Role.WAREHOUSE), 'inventory_adjustments', 'create'))
+        self.assertFalse(user_can(SimpleNamespace(role=User.Role.WAREHOUSE), 'inventory_adjustments', 'delete'))
+
+
+class PermissionMatrixViewTests(TestCase):
+    def test_dump_requires_users_view_role(self):
+        manager = User.objects.create_user(
+            username="mgr", email="mgr@example.com", password="x", name="Ma", last_name="Nager",
+            role=User.Role.MANAGER,
+        )
+        operator = User.objects.create_user(
+            username="op", email="op@example.com", password="x", name="Op", last_name="Erator",
+        )
+        client = APIClient()
+        client.force_authenticate(operator)
+        self.assertEqual(client.get(reverse("permission_matrix")).status_code, 403)
+
+        client.force_authenticate(manager)
+        data = client.get(reverse("permission_matrix"), {"role": User.Role.WAREHOUSE}).json()
+        self.assertEqual(data["roles"], [User.Role.WAREHOUSE])
+        self.assertEqual(data["methods"]["products"][User.Role.WAREHOUSE], ["GET", "PUT", "PATCH"])
+        self.assertEqual(data["actions"]["products"]["update"], [User.Role.WAREHOUSE])
+        self.assertEqual(client.get(reverse("permission_matrix"), {"role": "BOSS"}).status_code, 400)
@@ -1,12 +1,12 @@
-from django.core.cache import caches
+from apps.products.utils.cache_tags import invalidate_tags
+from apps.users.authentication import invalidate_auth_user
 from .cache_keys import USER_LIST_CACHE_PREFIX, USER_DETAIL_CACHE_PREFIX
 
 
 def invalidate_user_cache(user_id=None):
-    deleted = 0
+    tags = [USER_LIST_CACHE_PREFIX]
     if user_id is not None:
-        pattern = f"{USER_DETAIL_CACHE_PREFIX}:{user_id}*"
-        deleted += caches["default"].delete_pattern(pattern)
-    pattern = f"{USER_LIST_CACHE_PREFIX}*"
-    deleted += caches["default"].delete_pattern(pattern)
-    return deleted
+        # detail_cache es un cache_page por URL: se versiona con un único tag
+        tags.append(USER_DETAIL_CACHE_PREFIX)
+        invalidate_auth_user(user_id)
+    invalidate_tags(*tags)